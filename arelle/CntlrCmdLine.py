@@ -168,18 +168,64 @@ def parseAndRun(args):
     parser.add_option("--testReportCols", action="store", dest="testReportCols",
                       help=_("Columns for test report file"))
     parser.add_option("--testreportcols", action="store", dest="testReportCols", help=SUPPRESS_HELP)
+    parser.add_option("--testcaseWorkers", type="int", dest="testcaseWorkers",
+                      help=_("Specify number of worker processes validating the variations of testcases in parallel "
+                             "(where processes can be forked), results and test report are in original order, "
+                             "useful with --dtsImages and --taxonomyCache for conformance suites sharing taxonomies."))
+    parser.add_option("--testcaseworkers", type="int", dest="testcaseWorkers", help=SUPPRESS_HELP)
     parser.add_option("--rssReport", action="store", dest="rssReport",
                       help=_("Write RSS report into FILE"))
     parser.add_option("--rssreport", action="store", dest="rssReport", help=SUPPRESS_HELP)
     parser.add_option("--rssReportCols", action="store", dest="rssReportCols",
                       help=_("Columns for RSS report file"))
     parser.add_option("--rssreportcols", action="store", dest="rssReportCols", help=SUPPRESS_HELP)
+    parser.add_option("--rssWorkers", type="int", dest="rssWorkers",
+                      help=_("Specify number of worker processes validating the filings of an RSS feed in parallel "
+                             "(where processes can be forked), each filing is closed by its worker when validated."))
+    parser.add_option("--rssworkers", type="int", dest="rssWorkers", help=SUPPRESS_HELP)
+    parser.add_option("--rssWatch", action="store", dest="rssWatch",
+                      help=_("Watch the RSS feed of the entry point file continuously, validating each new filing once, "
+                             "with the SQLite ledger FILE of filings processed, which persists across restarts."))
+    parser.add_option("--rsswatch", action="store", dest="rssWatch", help=SUPPRESS_HELP)
+    parser.add_option("--rssWatchInterval", type="int", dest="rssWatchInterval",
+                      help=_("Seconds between checks of the watched RSS feed (default 600)."))
+    parser.add_option("--rsswatchinterval", type="int", dest="rssWatchInterval", help=SUPPRESS_HELP)
+    parser.add_option("--rssWatchMetrics", action="store", dest="rssWatchMetrics",
+                      help=_("Write throughput and progress metrics of RSS watching into json FILE."))
+    parser.add_option("--rsswatchmetrics", action="store", dest="rssWatchMetrics", help=SUPPRESS_HELP)
+    parser.add_option("--rssBackfill", action="store", dest="rssBackfill",
+                      help=_("Instead of watching, process the archived monthly EDGAR XBRL RSS feeds of months YYYY-MM "
+                             "or YYYY-MM:YYYY-MM, with the ledger of --rssWatch."))
+    parser.add_option("--rssbackfill", action="store", dest="rssBackfill", help=SUPPRESS_HELP)
     parser.add_option("--skipDTS", action="store_true", dest="skipDTS",
                       help=_("Skip DTS activities (loading, discovery, validation), useful when an instance needs only to be parsed."))
     parser.add_option("--skipdts", action="store_true", dest="skipDTS", help=SUPPRESS_HELP)
     parser.add_option("--skipLoading", action="store", dest="skipLoading",
                       help=_("Skip loading discovered or schemaLocated files matching pattern (unix-style file name patterns separated by '|'), useful when not all linkbases are needed."))
     parser.add_option("--skiploading", action="store", dest="skipLoading", help=SUPPRESS_HELP)
+    parser.add_option("--dtsImages", action="store_true", dest="dtsImages",
+                      help=_("Save DTS images of the schema validation results of taxonomy documents (in the web cache directory), "
+                             "and use them when loading any DTS referencing the same taxonomy, "
+                             "useful when validating many filings of the same taxonomies.  An image is saved when a taxonomy "
+                             "entry point, or an instance referencing taxonomies outside its directory (by schemaRef, or by "
+                             "imports of its extension schema), is closed after loading without errors, keyed by the taxonomy "
+                             "entry point; documents in the instance's directory are not saved.  An image only saves "
+                             "schema validation: documents are still parsed and discovered, so loading is faster but not "
+                             "immediate.  Documents in archives are not saved, and changed documents are validated again."))
+    parser.add_option("--dtsimages", action="store_true", dest="dtsImages", help=SUPPRESS_HELP)
+    parser.add_option("--taxonomyCache", type="int", dest="taxonomyCache",
+                      help=_("Specify memory budget in MB of a cache of the taxonomies discovered by filings, "
+                             "so that filings subsequently loaded by this process (such as from a list of entry points, "
+                             "an RSS feed or the web server) attach them instead of discovering them again."))
+    parser.add_option("--taxonomycache", type="int", dest="taxonomyCache", help=SUPPRESS_HELP)
+    parser.add_option("--discoveryWorkers", type="int", dest="discoveryWorkers",
+                      help=_("Specify number of threads retrieving and parsing the documents of a DTS ahead of its discovery, "
+                             "for faster loading of taxonomies with many documents not yet (or not locally) cached."))
+    parser.add_option("--discoveryworkers", type="int", dest="discoveryWorkers", help=SUPPRESS_HELP)
+    parser.add_option("--factStore", action="store_true", dest="factStore",
+                      help=_("Keep the facts of instances loaded from OIM (JSON, CSV or Excel) or by streaming in compact columns "
+                             "instead of fact elements, to reduce the memory used by very large instances."))
+    parser.add_option("--factstore", action="store_true", dest="factStore", help=SUPPRESS_HELP)
     parser.add_option("--logFile", action="store", dest="logFile",
                       help=_("Write log messages into file, otherwise they go to standard output.  " 
                              "If file ends in .xml it is xml-formatted, otherwise it is text. "))
@@ -268,6 +314,10 @@ def parseAndRun(args):
     parser.add_option("--testcaseresultscapturewarnings", action="store_true", dest="testcaseResultsCaptureWarnings", help=SUPPRESS_HELP)
     parser.add_option("--formulaRunIDs", action="store", dest="formulaRunIDs", help=_("Specify formula/assertion IDs to run, separated by a '|' character."))
     parser.add_option("--formularunids", action="store", dest="formulaRunIDs", help=SUPPRESS_HELP)
+    parser.add_option("--formulaParallel", type="int", dest="formulaParallel", 
+                      help=_("Specify number of worker processes to evaluate independent value and existence assertions in parallel "
+                             "(on platforms supporting fork, default is sequential evaluation)."))
+    parser.add_option("--formulaparallel", type="int", dest="formulaParallel", help=SUPPRESS_HELP)
     parser.add_option("--formulaCompileOnly", action="store_true", dest="formulaCompileOnly", help=_("Specify formula are to be compiled but not executed."))
     parser.add_option("--formulacompileonly", action="store_true", dest="formulaCompileOnly", help=SUPPRESS_HELP)
     parser.add_option("--uiLang", action="store", dest="uiLang",
@@ -291,6 +341,17 @@ def parseAndRun(args):
     parser.add_option("--internetLogDownloads", action="store_true", dest="internetLogDownloads", 
                       help=_("Log info message for downloads to web cache."))
     parser.add_option("--internetlogdownloads", action="store_true", dest="internetLogDownloads", help=SUPPRESS_HELP)
+    parser.add_option("--internetConnections", type="int", dest="internetConnections", 
+                      help=_("Specify number of concurrent (kept alive) connections retrieving web files into the cache (default 8, 1 retrieves files one at a time)."))
+    parser.add_option("--internetconnections", type="int", dest="internetConnections", help=SUPPRESS_HELP)
+    parser.add_option("--warmCache", dest="warmCache", 
+                      help=_("Retrieve into the web cache the DTS closure of the entry points listed (one per line) in the specified file, "
+                             "and write the cache manifest of sha256, size and last-modified of each cached url, "
+                             "whose cached files are then used without checking or rechecking."))
+    parser.add_option("--warmcache", dest="warmCache", help=SUPPRESS_HELP)
+    parser.add_option("--verifyCache", action="store_true", dest="verifyCache", 
+                      help=_("Verify the cached files of the web cache manifest against their sha256 and size."))
+    parser.add_option("--verifycache", action="store_true", dest="verifyCache", help=SUPPRESS_HELP)
     parser.add_option("--noCertificateCheck", action="store_true", dest="noCertificateCheck", 
                       help=_("Specify no checking of internet secure connection certificate"))
     parser.add_option("--nocertificatecheck", action="store_true", dest="noCertificateCheck", help=SUPPRESS_HELP)
@@ -328,6 +389,36 @@ def parseAndRun(args):
                           help=_("start web server on host:port[:server] for REST and web access, e.g., --webserver locahost:8080, "
                                  "or specify nondefault a server name, such as cherrypy, --webserver locahost:8080:cherrypy. "
                                  "(It is possible to specify options to be defaults for the web server, such as disclosureSystem and validations, but not including file names.) "))
+        parser.add_option("--workers", type="int", dest="webserverWorkers",
+                          help=_("Number of worker processes of the web server, each processing one request at a time with its own controller "
+                                 "(and taxonomy cache, if --taxonomyCache is specified), for concurrent requests (e.g., behind a load balancer).  "
+                                 "Requires a platform which can fork processes and the default web server."))
+        parser.add_option("--webserverQueueLimit", type="int", dest="webserverQueueLimit",
+                          help=_("Maximum number of connections waiting for a web server worker process (default 64), further connections are refused."))
+        parser.add_option("--webserverqueuelimit", type="int", dest="webserverQueueLimit", help=SUPPRESS_HELP)
+        parser.add_option("--webserverRequestTimeout", type="int", dest="webserverRequestTimeout",
+                          help=_("Maximum seconds for a web server worker process to process a request, after which an error is returned "
+                                 "and the worker process is replaced."))
+        parser.add_option("--webserverrequesttimeout", type="int", dest="webserverRequestTimeout", help=SUPPRESS_HELP)
+        parser.add_option("--webserverWarmTaxonomies", action="store", dest="webserverWarmTaxonomies",
+                          help=_("Taxonomies loaded into the taxonomy cache (of --taxonomyCache) before the web server forks its "
+                                 "worker and job worker processes, so every worker starts with them, sharing their memory.  "
+                                 "Taxonomies are separated by '|', each given by the entry points which filing documents reference "
+                                 "together, separated by spaces, in the order referenced (e.g., the schemaRef of an instance, "
+                                 "or the taxonomy imports of an extension schema)."))
+        parser.add_option("--webserverwarmtaxonomies", action="store", dest="webserverWarmTaxonomies", help=SUPPRESS_HELP)
+        parser.add_option("--webserverJobWorkers", type="int", dest="webserverJobWorkers",
+                          help=_("Number of job worker processes performing validation and view requests submitted as jobs "
+                                 "(to /rest/job/..., such as /rest/job/xbrl/validation?file=...), whose status and result are "
+                                 "retrieved from /rest/jobs/{jobId} and /rest/jobs/{jobId}/result.  Requires a platform which can fork processes."))
+        parser.add_option("--webserverjobworkers", type="int", dest="webserverJobWorkers", help=SUPPRESS_HELP)
+        parser.add_option("--webserverJobTTL", type="int", dest="webserverJobTTL",
+                          help=_("Seconds that results of finished jobs are kept (default 3600)."))
+        parser.add_option("--webserverjobttl", type="int", dest="webserverJobTTL", help=SUPPRESS_HELP)
+        parser.add_option("--webserverJobTimeout", type="int", dest="webserverJobTimeout",
+                          help=_("Maximum seconds for a job worker process to process a job (default 3600), after which the job fails "
+                                 "and the job worker process is replaced."))
+        parser.add_option("--webserverjobtimeout", type="int", dest="webserverJobTimeout", help=SUPPRESS_HELP)
     pluginOptionsIndex = len(parser.option_list)
 
     # install any dynamic plugins so their command line options can be parsed if present
@@ -415,8 +506,11 @@ def parseAndRun(args):
             print(text.encode("ascii", "replace").decode("ascii"))
     elif len(leftoverArgs) != 0 and (not hasWebServer or options.webserver is None):
         parser.error(_("unrecognized arguments: {}".format(', '.join(leftoverArgs))))
-    elif (options.entrypointFile is None and 
+    elif options.rssBackfill and not options.rssWatch:
+        parser.error(_("--rssBackfill requires the ledger FILE of --rssWatch, please try\n  python CntlrCmdLine.py --help"))
+    elif (options.entrypointFile is None and
           ((not options.proxy) and (not options.plugins) and
+           (not options.warmCache) and (not options.verifyCache) and (not options.rssBackfill) and
            (not any(pluginOption for pluginOption in parser.option_list[pluginOptionsIndex:pluginLastOptionIndex])) and
            (not hasWebServer or options.webserver is None))):
         parser.error(_("incorrect arguments, please try\n  python CntlrCmdLine.py --help"))
@@ -428,6 +522,8 @@ def parseAndRun(args):
                 options.roleTypesFile, options.arcroleTypesFile
                 )):
             parser.error(_("incorrect arguments with --webserver, please try\n  python CntlrCmdLine.py --help"))
+        elif options.webserverWarmTaxonomies and not options.taxonomyCache:
+            parser.error(_("--webserverWarmTaxonomies requires --taxonomyCache, please try\n  python CntlrCmdLine.py --help"))
         else:
             # note that web server logging does not strip time stamp, use logFormat if that is desired
             cntlr.startLogging(logFileName='logToBuffer',
@@ -693,6 +789,19 @@ class CntlrCmdLine(Cntlr.Cntlr):
         if options.skipLoading: # skip loading matching files (list of unix patterns)
             self.modelManager.skipLoading = re.compile(
                 '|'.join(fnmatch.translate(f) for f in options.skipLoading.split('|')))
+        if options.dtsImages:
+            self.modelManager.dtsImages = True
+        if options.discoveryWorkers:
+            self.modelManager.discoveryWorkers = options.discoveryWorkers
+        if options.factStore:
+            self.modelManager.factStore = True
+        if options.rssWorkers:
+            self.modelManager.rssWorkers = options.rssWorkers
+        if options.testcaseWorkers:
+            self.modelManager.testcaseWorkers = options.testcaseWorkers
+        if options.taxonomyCache and self.modelManager.taxonomyCache is None:
+            from arelle.TaxonomyCache import TaxonomyCache
+            self.modelManager.taxonomyCache = TaxonomyCache(self.modelManager, options.taxonomyCache * 1024 * 1024)
             
         # disclosure system sets logging filters, override disclosure filters, if specified by command line
         if options.logLevelFilter:
@@ -728,6 +837,8 @@ class CntlrCmdLine(Cntlr.Cntlr):
             self.webCache.timeout = (options.internetTimeout or None)  # use None if zero specified to disable timeout
         if options.internetLogDownloads:
             self.webCache.logDownloads = True
+        if options.internetConnections:
+            self.webCache.maxConnections = options.internetConnections
         fo = FormulaOptions()
         if options.parameters:
             parameterSeparator = (options.parameterSeparator or ',')
@@ -784,6 +895,8 @@ class CntlrCmdLine(Cntlr.Cntlr):
             fo.runIDs = options.formulaRunIDs   
         if options.formulaCompileOnly:
             fo.compileOnly = True
+        if options.formulaParallel:
+            fo.parallelWorkers = options.formulaParallel
         self.modelManager.formulaOptions = fo
         
         # run utility command line options that don't depend on entrypoint Files
@@ -795,8 +908,20 @@ class CntlrCmdLine(Cntlr.Cntlr):
             except SystemExit: # terminate operation, plug in has terminated all processing
                 return True # success
             
+        if options.warmCache or options.verifyCache:
+            from arelle import WebCacheManifest
+            if options.warmCache:
+                WebCacheManifest.warmCache(self, options.warmCache)
+            if options.verifyCache:
+                WebCacheManifest.verifyCache(self)
+            
+        if options.rssWatch:
+            from arelle import WatchRssDaemon
+            WatchRssDaemon.runWatchRssDaemon(self, options)
+            return True
+            
         # if no entrypointFile is applicable, quit now
-        if options.proxy or options.plugins or hasUtilityPlugin:
+        if options.proxy or options.plugins or hasUtilityPlugin or options.warmCache or options.verifyCache:
             if not (options.entrypointFile or sourceZipStream):
                 return True # success
 
@@ -9,10 +9,17 @@ Use this module to start Arelle in web server mode
 '''
 from arelle.webserver.bottle import Bottle, request, response, static_file
 from arelle.Cntlr import LogFormatter
-import os, io, sys, time, threading, uuid, zipfile
+import os, io, sys, time, threading, uuid, zipfile, signal, json, gc, logging
 from arelle import Version
 from arelle.FileSource import FileNamedStringIO
 _os_pid = os.getpid()
+requestTimeout = None # seconds, for requests processed by worker processes
+jobQueue = None # WebJobQueue.JobQueue of asynchronous requests, if job workers are started
+jobWorkerPids = set() # job worker processes forked by this (web server) process
+workerExitRequested = False # worker exits after the current request (which timed out)
+
+class RequestTimeout(BaseException): # not an Exception, so it is not caught and logged within cntlr.run
+    pass
 
 def startWebserver(_cntlr, options):
     """Called once from main program in CmtlrCmdLine to initiate web server on specified local port.
@@ -21,7 +28,7 @@ def startWebserver(_cntlr, options):
     :param options: OptionParser options from parse_args of main argv arguments (the argument *webserver* provides hostname and port), port being used to startup the webserver on localhost.
     :type options: optparse.Values
     """
-    global imagesDir, cntlr, optionsPrototype
+    global imagesDir, cntlr, optionsPrototype, jobQueue, jobWorkerPids, app
     cntlr = _cntlr
     imagesDir = cntlr.imagesDir
     optionValuesTypes = _STR_NUM_TYPES + (type(None),)
@@ -63,6 +70,9 @@ def startWebserver(_cntlr, options):
     app.route('/rest/xbrl/view', GETorPOST, validation)
     app.route('/rest/xbrl/open', GETorPOST, validation)
     app.route('/rest/xbrl/close', GETorPOST, validation)
+    app.route('/rest/job/<requestPath:path>', GETorPOST, jobSubmit)
+    app.route('/rest/jobs/<jobId>', GET, jobStatus)
+    app.route('/rest/jobs/<jobId>/result', GET, jobResult)
     app.route('/images/<imgFile>', GET, image)
     app.route('/rest/xbrl/diff', GET, diff)
     app.route('/rest/configure', GET, configure)
@@ -82,6 +92,13 @@ def startWebserver(_cntlr, options):
     if server == "cgi":
         # catch a non-REST interface by cgi Interface (may be a cgi app exe module, etc)
         app.route('<cgiAppPath:path>', GETorPOST, cgiInterface)
+    if getattr(options, "webserverWarmTaxonomies", None):
+        warmTaxonomyCache(options)
+    if getattr(options, "webserverJobWorkers", None) and server not in ("wsgi", "cgi") and hasattr(os, "fork"):
+        from arelle.WebJobQueue import JobQueue, startJobWorkers
+        jobQueue = JobQueue(os.path.join(cntlr.userAppDir, "jobs"), getattr(options, "webserverJobTTL", None) or 3600,
+                            getattr(options, "webserverJobTimeout", None) or 3600)
+        jobWorkerPids = startJobWorkers(cntlr, app, jobQueue, options.webserverJobWorkers)
     if server == "wsgi":
         return app
     elif server == "cgi":
@@ -90,9 +107,117 @@ def startWebserver(_cntlr, options):
         app.run(server=server)
         sys.exit(0)
     elif server:
+        if jobWorkerPids: # no runWorkers process to replace job workers which exit
+            threading.Thread(target=watchJobWorkers, name="watchJobWorkers", daemon=True).start()
         app.run(host=host, port=port or 80, server=server)
+    elif ((getattr(options, "webserverWorkers", None) or 0) > 1 or jobWorkerPids) and hasattr(os, "fork"):
+        # job workers are monitored by the web server process, replacing them if they exit, even with one web worker
+        runWorkers(app, host, int(port or 80), getattr(options, "webserverWorkers", None) or 1,
+                   getattr(options, "webserverQueueLimit", None), getattr(options, "webserverRequestTimeout", None))
     else:
         app.run(host=host, port=port or 80)
+
+def warmTaxonomyCache(options):
+    """Loads the taxonomies of --webserverWarmTaxonomies into the taxonomy cache, before any worker processes
+    are forked, so every worker (and job worker) starts with them, sharing their memory pages copy-on-write.
+    Requests run with the same --taxonomyCache option, so they use this cache instead of creating their own.
+    """
+    from arelle.TaxonomyCache import TaxonomyCache
+    modelManager = cntlr.modelManager
+    if modelManager.taxonomyCache is None:
+        modelManager.taxonomyCache = TaxonomyCache(modelManager, options.taxonomyCache * 1024 * 1024)
+    for entryPoints in options.webserverWarmTaxonomies.split("|"):
+        if entryPoints.strip():
+            startedAt = time.time()
+            if modelManager.taxonomyCache.preload(entryPoints.split()):
+                cntlr.addToLog(_("Taxonomy loaded into taxonomy cache in %(time)s secs: %(entryPoints)s"),
+                               messageCode="info", messageArgs={"time": format(time.time() - startedAt, ".2f"),
+                                                                "entryPoints": entryPoints.strip()})
+            else:
+                cntlr.addToLog(_("Taxonomy not kept by taxonomy cache (it has warnings, errors, formulae or tables, "
+                                 "or exceeds the cache size): %(entryPoints)s"),
+                               messageCode="arelle:taxonomyNotCached", messageArgs={"entryPoints": entryPoints.strip()},
+                               level=logging.WARNING)
+    if hasattr(gc, "freeze"): # cached objects are not written by collections in the workers, keeping pages shared
+        gc.freeze()
+
+def runWorkers(app, host, port, numWorkers, queueLimit=None, timeout=None):
+    """Runs the web server as a pool of pre-forked worker processes accepting requests from one listening socket.
+    Each worker has its own copy of the controller (and its model manager, log handler and taxonomy cache) and
+    processes one request at a time.  Connections waiting for a worker are limited by queueLimit (the listen
+    backlog).  A request exceeding timeout seconds is answered with an error, and its worker is replaced by a new one.
+    Job workers (previously forked by startWebserver) which exit are also replaced, and all workers are terminated
+    when the web server process is terminated.
+    
+    :param app: Bottle application
+    :param numWorkers: Number of worker processes
+    :param queueLimit: Maximum number of connections waiting to be accepted by a worker (default 64)
+    :param timeout: Maximum seconds for processing of a validation or view request, or None if unlimited
+    """
+    global requestTimeout
+    from wsgiref.simple_server import make_server, WSGIServer
+    serverClass = type("WorkersWSGIServer", (WSGIServer,), {"request_queue_size": queueLimit or 64})
+    httpd = make_server(host, port, app, server_class=serverClass)
+    requestTimeout = timeout
+    # initialize formula grammar once, before forking, so every worker starts warm
+    from arelle import XPathParser
+    XPathParser.initializeParser(cntlr.modelManager)
+    workerPids = set()
+    def startWorker():
+        pid = os.fork()
+        if pid == 0: # worker process
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            try:
+                while not workerExitRequested:
+                    httpd.handle_request()
+            finally:
+                os._exit(0)
+        workerPids.add(pid)
+    def stopWorkers(signum, frame):
+        for pid in workerPids | jobWorkerPids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except OSError:
+                pass
+        sys.exit(0)
+    signal.signal(signal.SIGTERM, stopWorkers)
+    signal.signal(signal.SIGINT, stopWorkers)
+    for i in range(numWorkers):
+        startWorker()
+    while True: # replace workers which exit, such as after a timed out request
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        if pid in workerPids:
+            workerPids.discard(pid)
+            startWorker()
+        elif pid in jobWorkerPids:
+            replaceJobWorker(pid)
+
+def replaceJobWorker(pid):
+    # job worker exited after a timed out job or failure, such as being killed
+    from arelle.WebJobQueue import startJobWorker
+    jobWorkerPids.discard(pid)
+    jobQueue.failRunning(pid)
+    jobWorkerPids.add(startJobWorker(cntlr, app, jobQueue))
+
+def watchJobWorkers(interval=1.0):
+    """Replaces job workers which exit, when the web server is run by a named server (in its own threads)
+    instead of runWorkers.  Only the job worker pids are waited for, so other child processes are unaffected."""
+    while True:
+        for pid in list(jobWorkerPids):
+            try:
+                exitedPid, status = os.waitpid(pid, os.WNOHANG)
+            except ChildProcessError: # already reaped
+                exitedPid = pid
+            if exitedPid == pid:
+                replaceJobWorker(pid)
+        time.sleep(interval)
+
+def requestTimedOut(signum, frame):
+    raise RequestTimeout()
         
 def cgiInterface(cgiAppPath):
     # route request according to content
@@ -314,7 +439,21 @@ def runOptionsAndGetResult(options, media, viewFile, sourceZipStream=None):
             setattr(options, "plugins", "|".join(p for p in plugins if p) or None) # ignore empty string plugin names
     else:
         responseZipStream = None
-    successful = cntlr.run(options, sourceZipStream, responseZipStream)
+    global workerExitRequested
+    cntlr.logHandler.clearLogBuffer() # log of this request only
+    if requestTimeout:
+        signal.signal(signal.SIGALRM, requestTimedOut)
+        signal.alarm(requestTimeout)
+    try:
+        successful = cntlr.run(options, sourceZipStream, responseZipStream)
+    except RequestTimeout:
+        workerExitRequested = True # models of the interrupted request may remain loaded
+        cntlr.logHandler.clearLogBuffer()
+        return errorReport([_("Request processing exceeded {0} seconds.").format(requestTimeout)],
+                           "text" if media == "text" else "html")
+    finally:
+        if requestTimeout:
+            signal.alarm(0)
     if media == "xml":
         response.content_type = 'text/xml; charset=UTF-8'
     elif media == "csv":
@@ -358,6 +497,67 @@ def runOptionsAndGetResult(options, media, viewFile, sourceZipStream=None):
         result = htmlBody(tableRows(cntlr.logHandler.getLines(), header=_("Messages")))
     return result
 
+def jobSubmit(requestPath):
+    """Submit a validation or view request as a job, by *get* or *post* to */rest/job/* followed by the path of the
+    request (such as */rest/job/xbrl/validation?file=...&media=json*), with the same parameters and posted file as
+    the request itself.  Job worker processes perform the request when the web server runs with job workers.
+    
+    :returns: json -- job id and URLs of the job status and result
+    """
+    response.content_type = 'application/json; charset=UTF-8'
+    path = "/rest/" + requestPath
+    errors = []
+    if jobQueue is None:
+        errors.append(_("Jobs are not enabled, please start the web server with job workers (--webserverJobWorkers)"))
+    else:
+        try:
+            route, args = app.match({"PATH_INFO": path, "REQUEST_METHOD": request.method})
+            if route.callback is not validation:
+                errors.append(_("Only validation and view requests can be submitted as jobs: {0}").format(path))
+        except Exception:
+            errors.append(_("Request not recognized: {0}").format(path))
+    if errors:
+        response.status = 400
+        return json.dumps({"errors": errors})
+    jobQueue.expire()
+    jobId = jobQueue.submit(request.method, path, request.query_string, request.get_header("Content-Type"),
+                            request.body.read() if request.method == 'POST' else None)
+    response.status = 202
+    return json.dumps({"jobId": jobId,
+                       "status": "/rest/jobs/{0}".format(jobId),
+                       "result": "/rest/jobs/{0}/result".format(jobId)})
+
+def jobStatus(jobId):
+    """Status of a job, by *get* to */rest/jobs/<jobId>*, with state (queued, running, done or failed), queue position,
+    progress and timing.  The parameter *wait=seconds* waits up to that time (at most 300) for the job to finish.
+    
+    :returns: json -- job status
+    """
+    response.content_type = 'application/json; charset=UTF-8'
+    status = jobQueue.status(jobId) if jobQueue is not None else None
+    try:
+        waitUntil = time.time() + min(float(request.query.wait or 0), 300)
+    except ValueError:
+        waitUntil = 0
+    while status is not None and status["state"] in ("queued", "running") and time.time() < waitUntil:
+        time.sleep(0.5)
+        status = jobQueue.status(jobId)
+    if status is None:
+        response.status = 404
+        return json.dumps({"errors": [_("Job {0} not found (its result may have expired)").format(jobId)]})
+    return json.dumps(status)
+
+def jobResult(jobId):
+    """Result of a finished job, by *get* to */rest/jobs/<jobId>/result*, in the media type of the submitted request.
+    
+    :returns: result of request, or json status if the job has not finished
+    """
+    result = jobQueue.result(jobId) if jobQueue is not None else None
+    if result is None:
+        return jobStatus(jobId) # not found or not yet finished
+    response.content_type, body = result
+    return body
+
 def diff():
     """Execute versioning diff request for *get* request to */rest/xbrl/diff*.
     
@@ -404,7 +604,7 @@ def stopWebServer():
         time.sleep(delaySeconds)
         import signal
         os.kill(_os_pid, signal.SIGTERM)
-    threading.Thread(target=stopSoon, ags=(2.5,), daemon=True).start()
+    threading.Thread(target=stopSoon, args=(2.5,), daemon=True).start()
     response.content_type = 'text/html; charset=UTF-8'
     return htmlBody(tableRows((time.strftime("Received at %Y-%m-%d %H:%M:%S"),
                                "Good bye...",), 
@@ -0,0 +1,153 @@
+'''
+Created on Oct 18, 2026
+
+Prefetches (retrieves into the web cache, reads and parses) the documents referenced by a DTS
+on a pool of threads, ahead of the DTS discovery which then loads them.
+
+Each parsed document is scanned for its import, include, schemaRef, linkbaseRef, roleRef,
+arcroleRef and loc references, which are in turn queued for prefetching, so that the documents
+of a cold taxonomy load are retrieved and parsed concurrently (lxml parsing releases the GIL).
+Discovery itself, which creates the model objects of each document, remains serial and in the
+original order, and takes the prefetched parsed document of a url when it loads it, so model
+objects and messages are the same as without prefetching.  Documents of archives, and documents
+whose parsing reports errors, are loaded by discovery as usual.
+
+@author: Mark V Systems Limited
+(c) Copyright 2026 Mark V Systems Limited, All rights reserved.
+'''
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from lxml import etree
+from arelle import PackageManager
+from arelle.ModelObjectFactory import parser
+from arelle.PluginManager import pluginClassMethods
+
+REFERENCE_ELEMENTS = {
+    "{http://www.w3.org/2001/XMLSchema}import": "schemaLocation",
+    "{http://www.w3.org/2001/XMLSchema}include": "schemaLocation",
+    "{http://www.w3.org/2001/XMLSchema}redefine": "schemaLocation",
+    "{http://www.xbrl.org/2003/linkbase}schemaRef": "{http://www.w3.org/1999/xlink}href",
+    "{http://www.xbrl.org/2003/linkbase}linkbaseRef": "{http://www.w3.org/1999/xlink}href",
+    "{http://www.xbrl.org/2003/linkbase}roleRef": "{http://www.w3.org/1999/xlink}href",
+    "{http://www.xbrl.org/2003/linkbase}arcroleRef": "{http://www.w3.org/1999/xlink}href",
+    "{http://www.xbrl.org/2003/linkbase}loc": "{http://www.w3.org/1999/xlink}href"}
+defaultClassLookup = etree.ElementDefaultClassLookup()
+
+def referencedUrls(xmlDocument, lookup, url, normalizeUrl):
+    ''' returns normalized urls of the documents referenced by xmlDocument, whose parser's element class lookup is lookup '''
+    hrefs = {} # distinct, in document order (locs mostly reference a few documents)
+    _parser = xmlDocument.parser
+    # scan with plain lxml elements, model objects are only created by discovery
+    _parser.set_element_class_lookup(defaultClassLookup)
+    elt = None
+    try:
+        for elt in xmlDocument.iter(*REFERENCE_ELEMENTS.keys()):
+            href = elt.get(REFERENCE_ELEMENTS[elt.tag])
+            if href:
+                href = href.partition("#")[0]
+                if href:
+                    hrefs[href] = None
+    finally:
+        elt = None # proxies of scanned elements must not survive the lookup change
+        _parser.set_element_class_lookup(lookup)
+    return [normalizeUrl(href, url) for href in hrefs]
+
+def loadableUrl(modelXbrl, url):
+    ''' returns the mapped url which ModelDocument.load would retrieve for normalized url, or None if load would
+        not retrieve it (not loadable, skipped, disallowed by the disclosure system, or in an archive) '''
+    modelManager = modelXbrl.modelManager
+    if url in modelXbrl.urlDocs or url in modelXbrl.urlUnloadableDocs:
+        return None
+    if (modelManager.validateDisclosureSystem and not url.startswith(modelXbrl.uriDir) and
+        not modelManager.disclosureSystem.hrefValid(url)):
+        return None # blocked or reported by discovery
+    if modelManager.skipLoading and modelManager.skipLoading.match(url):
+        return None
+    if modelXbrl.fileSource.isMappedUrl(url):
+        mappedUrl = modelXbrl.fileSource.mappedUrl(url)
+    elif PackageManager.isMappedUrl(url):
+        mappedUrl = PackageManager.mappedUrl(url)
+    else:
+        mappedUrl = modelManager.disclosureSystem.mappedUrl(url)
+    if modelXbrl.fileSource.isInArchive(mappedUrl):
+        return None # archives are read by discovery
+    return mappedUrl
+
+class PrefetchedDocument:
+    __slots__ = ("filepath", "xmlDocument", "parser", "parserLookupName", "parserLookupClass", "encoding")
+    def __init__(self, filepath, xmlDocument=None, parser=None, parserLookupName=None, parserLookupClass=None, encoding=None):
+        self.filepath = filepath
+        self.xmlDocument = xmlDocument # None if only retrieved (into the web cache), to be parsed by discovery
+        self.parser = parser
+        self.parserLookupName = parserLookupName
+        self.parserLookupClass = parserLookupClass
+        self.encoding = encoding
+
+def isApplicable(modelXbrl):
+    # documents loaded by plug-ins can't be parsed ahead of discovery
+    return not (modelXbrl.skipDTS or
+                any(True for pluginClass in ("ModelDocument.PullLoader", "ModelDocument.CustomLoader", "ModelDocument.IsPullLoadable",
+                                             "ModelDocument.InstanceSchemaRefRewriter")
+                    for pluginMethod in pluginClassMethods(pluginClass)))
+
+class DocumentPrefetcher:
+    def __init__(self, modelXbrl, numWorkers):
+        self.modelXbrl = modelXbrl
+        self.executor = ThreadPoolExecutor(max_workers=numWorkers)
+        self.futures = {} # by normalized url
+        self.lock = threading.Lock()
+        self.isClosed = False
+
+    def scan(self, xmlDocument, lookup, url):
+        ''' queues prefetching of the documents referenced by xmlDocument, whose parser's element class lookup is lookup '''
+        for referencedUrl in referencedUrls(xmlDocument, lookup, url, self.modelXbrl.modelManager.cntlr.webCache.normalizeUrl):
+            self.prefetch(referencedUrl)
+
+    def prefetch(self, url):
+        modelXbrl = self.modelXbrl
+        with self.lock:
+            if self.isClosed or url in self.futures:
+                return
+            mappedUrl = loadableUrl(modelXbrl, url)
+            if mappedUrl is None:
+                return
+            self.futures[url] = self.executor.submit(self.fetchAndParse, url, mappedUrl)
+
+    def fetchAndParse(self, url, mappedUrl):
+        modelXbrl = self.modelXbrl
+        modelManager = modelXbrl.modelManager
+        try:
+            filepath = modelManager.cntlr.webCache.getfilename(mappedUrl) # per-url locked, as load without reloadCache or checkModifiedTime
+            if not filepath or self.isClosed:
+                return PrefetchedDocument(filepath)
+            file, _encoding = modelXbrl.fileSource.file(filepath, stripDeclaration=True)
+            try:
+                _parser, _parserLookupName, _parserLookupClass = parser(modelXbrl, filepath)
+                xmlDocument = etree.parse(file, parser=_parser, base_url=filepath)
+            finally:
+                file.close()
+            self.scan(xmlDocument, _parserLookupName, url)
+            if (len(_parser.error_log) or
+                (modelManager.validateDisclosureSystem and modelManager.disclosureSystem.validateFileText and
+                 url not in modelManager.disclosureSystem.standardTaxonomiesDict)):
+                return PrefetchedDocument(filepath) # discovery parses it to report its errors
+            return PrefetchedDocument(filepath, xmlDocument, _parser, _parserLookupName, _parserLookupClass, _encoding)
+        except Exception:
+            return None # discovery loads it and reports any error
+
+    def take(self, url):
+        ''' returns PrefetchedDocument of url (waiting for it if in progress), or None if not prefetched '''
+        with self.lock:
+            future = self.futures.pop(url, None)
+        if future is None:
+            return None
+        return future.result()
+
+    def close(self):
+        with self.lock:
+            self.isClosed = True
+            futures = list(self.futures.values())
+            self.futures.clear()
+        for future in futures:
+            future.cancel()
+        self.executor.shutdown(wait=True)
@@ -0,0 +1,236 @@
+'''
+Created on Oct 18, 2026
+
+DTS images save the schema validation (PSVI) results of the schema and linkbase documents
+of a discovered taxonomy, so that later loads of the same taxonomy, such as by each of a
+batch of filings referencing it, restore them instead of validating every element again.
+
+An image is saved when a taxonomy (schema or linkbase) entry point is closed after loading
+(and validating) without errors, and is keyed by the entry point URL.  When an instance (or
+inline) entry point which loaded without errors is closed, an image is saved for each taxonomy
+document outside the filing's directory which the filing's documents reference (such as the
+schemaRef'd taxonomy entry point, or the taxonomy schemas imported by an extension schema), of
+the documents discovered from it outside the filing's directory, unless an element is invalid;
+filing documents, which differ for each filing, are not saved.  An image is used when any
+document loaded into a DTS is the entry point of an image, and then applies to each document
+of that image as it is loaded, provided its file modification time and size are unchanged.
+Model objects are lxml elements, so documents are still parsed and discovered from XML;
+the image holds, for each document, the xValid, xValue, sValue and xAttributes of each
+validated element by its document order position, pickled separately so that only the
+records of documents actually loaded are read from the memory mapped image file.
+
+@author: Mark V Systems Limited
+(c) Copyright 2026 Mark V Systems Limited, All rights reserved.
+'''
+import os, mmap, pickle, hashlib, struct, logging
+from arelle import Version
+from arelle.ModelObject import ModelObject, ModelAttribute
+from arelle.XmlValidate import UNVALIDATED, INVALID, xAttributesSharedEmptyDict
+
+IMAGE_FORMAT = 1
+IMAGE_MAGIC = b"arelleDtsImage\r\n"
+IMAGE_HEADER = struct.Struct("<16sIQ") # magic, format, index length
+
+def imageFilename(modelManager, entryUrl):
+    return os.path.join(modelManager.cntlr.webCache.cacheDir, "dtsImage",
+                        "{}_{}_{}.dtsimage".format(hashlib.sha256(entryUrl.encode("utf-8")).hexdigest(),
+                                                   IMAGE_FORMAT, Version.__version__))
+
+def fileSignature(filepath):
+    try:
+        fileStat = os.stat(filepath)
+        return (fileStat.st_mtime_ns, fileStat.st_size)
+    except EnvironmentError:
+        return None
+
+class DtsImage:
+    def __init__(self, filename):
+        self.filename = filename
+        self.entryUrl = None
+        self.docs = {} # url: (filepath, file signature, records offset, records length)
+        self.recordsOffset = 0 # records offsets are relative to end of index
+        self.mmap = None
+
+    def open(self):
+        ''' returns True if image file is present, readable and all of its documents are unchanged '''
+        try:
+            with open(self.filename, "rb") as fh:
+                self.mmap = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, imageFormat, indexLength = IMAGE_HEADER.unpack_from(self.mmap, 0)
+            if magic != IMAGE_MAGIC or imageFormat != IMAGE_FORMAT:
+                self.close()
+                return False
+            self.recordsOffset = IMAGE_HEADER.size + indexLength
+            self.entryUrl, self.docs = pickle.loads(self.mmap[IMAGE_HEADER.size:self.recordsOffset])
+        except Exception: # missing, partially written or corrupt image
+            self.close()
+            return False
+        if any(fileSignature(filepath) != signature
+               for filepath, signature, offset, length in self.docs.values()):
+            self.close() # a document has changed since the image was saved
+            return False
+        return True
+
+    def close(self):
+        if self.mmap is not None:
+            self.mmap.close()
+            self.mmap = None
+        self.docs = {}
+
+    def records(self, url, filepath):
+        try:
+            docFilepath, signature, offset, length = self.docs[url]
+            if docFilepath != filepath or self.mmap is None:
+                return None
+            offset += self.recordsOffset
+            return pickle.loads(self.mmap[offset:offset + length])
+        except Exception: # unknown document or classes changed without a version change
+            return None
+
+def openImage(modelXbrl, url):
+    ''' opens the image, if any, of which the document at url is the entry point, before its discovery '''
+    if url not in modelXbrl.dtsImages:
+        image = DtsImage(imageFilename(modelXbrl.modelManager, url))
+        if image.open():
+            modelXbrl.dtsImages[url] = image
+            for docUrl in image.docs.keys():
+                modelXbrl.dtsImageDocs.setdefault(docUrl, image)
+        else:
+            modelXbrl.dtsImages[url] = None
+
+def restoreDocument(modelDocument):
+    ''' sets PSVI of modelDocument elements from an image, if any, after discovery (which determines element classes and qnames) '''
+    modelXbrl = modelDocument.modelXbrl
+    url = modelDocument.uri
+    image = modelXbrl.dtsImageDocs.get(url)
+    if image is None:
+        return
+    records = image.records(url, modelDocument.filepath)
+    if not records:
+        return
+    records = iter(records)
+    eltIndex, xValid, xValue, sValue, attrs = next(records)
+    for i, elt in enumerate(modelDocument.xmlRootElement.iter()):
+        if i == eltIndex:
+            if isinstance(elt, ModelObject) and getattr(elt, "xValid", UNVALIDATED) == UNVALIDATED:
+                elt.xValid = xValid
+                elt.xValue = xValue
+                elt.sValue = sValue
+                if attrs is None:
+                    elt.xAttributes = xAttributesSharedEmptyDict
+                else:
+                    elt.xAttributes = {attrTag: ModelAttribute(elt, attrTag, attrValid, attrXValue, attrSValue, text)
+                                       for attrTag, (attrValid, attrXValue, attrSValue, text) in attrs}
+            try:
+                eltIndex, xValid, xValue, sValue, attrs = next(records)
+            except StopIteration:
+                break
+
+def documentRecords(modelDocument):
+    records = []
+    for i, elt in enumerate(modelDocument.xmlRootElement.iter()):
+        if isinstance(elt, ModelObject) and getattr(elt, "xValid", UNVALIDATED) != UNVALIDATED:
+            xAttributes = getattr(elt, "xAttributes", xAttributesSharedEmptyDict)
+            records.append((i, elt.xValid, elt.xValue, elt.sValue,
+                            None if xAttributes is xAttributesSharedEmptyDict else
+                            tuple((attrTag, (attr.xValid, attr.xValue, attr.sValue, attr.text))
+                                  for attrTag, attr in xAttributes.items())))
+    return records
+
+def entryLoaded(modelXbrl):
+    ''' called when the entry point and its DTS have been loaded, before validation (whose errors of
+        instance facts don't affect taxonomy documents) '''
+    modelXbrl.dtsImageLoadedWithoutErrors = not (modelXbrl.errors or
+                                                 any(level > logging.INFO for level in modelXbrl.logCount.keys()))
+
+def discoveredDocuments(entryDocument, uriDir):
+    ''' returns the schema and linkbase documents discovered from entryDocument, other than those in uriDir '''
+    from arelle.ModelDocument import Type
+    documents = [entryDocument]
+    for modelDocument in documents: # list is extended as documents are discovered
+        for referencedDocument in modelDocument.referencesDocument.keys():
+            if (referencedDocument.type in (Type.SCHEMA, Type.LINKBASE) and referencedDocument not in documents and
+                not referencedDocument.uri.startswith(uriDir)):
+                documents.append(referencedDocument)
+    return documents
+
+def imageEntries(modelXbrl):
+    ''' returns [(entry document, [its documents])] of the images to save of modelXbrl's DTS '''
+    from arelle.ModelDocument import Type
+    entryDocument = getattr(modelXbrl, "modelDocument", None)
+    if entryDocument is None:
+        return []
+    if entryDocument.type in (Type.SCHEMA, Type.LINKBASE): # taxonomy entry point, loaded and validated without errors
+        if modelXbrl.errors or any(level > logging.INFO for level in modelXbrl.logCount.keys()):
+            return []
+        return [(entryDocument, [modelDocument for url, modelDocument in modelXbrl.urlDocs.items()
+                                 if url == modelDocument.uri])]
+    if (entryDocument.type not in (Type.INSTANCE, Type.INLINEXBRL) or
+        modelXbrl.taxonomyCacheGroup or # taxonomy documents were loaded (and are saved) by the taxonomy cache
+        not modelXbrl.dtsImageLoadedWithoutErrors):
+        return []
+    # filing documents are in uriDir, images are keyed by the documents outside the filing which they reference,
+    # such as the schemaRef'd taxonomy entry point, or the taxonomy entry points imported by an extension schema
+    uriDir = modelXbrl.uriDir
+    entryDocuments = []
+    for url, modelDocument in modelXbrl.urlDocs.items():
+        if url == modelDocument.uri and url.startswith(uriDir):
+            for referencedDocument in modelDocument.referencesDocument.keys():
+                if (referencedDocument.type in (Type.SCHEMA, Type.LINKBASE) and referencedDocument not in entryDocuments and
+                    not referencedDocument.uri.startswith(uriDir)):
+                    entryDocuments.append(referencedDocument)
+    return [(entryDocument, discoveredDocuments(entryDocument, uriDir)) for entryDocument in entryDocuments]
+
+def save(modelXbrl):
+    ''' saves images of a taxonomy entry point's DTS, or of the taxonomies referenced by an instance's DTS, if they
+        loaded without errors and have no current image '''
+    for entryDocument, modelDocuments in imageEntries(modelXbrl):
+        if modelXbrl.dtsImages.get(entryDocument.uri) is None: # no unchanged image
+            saveImage(modelXbrl, entryDocument, modelDocuments)
+
+def saveImage(modelXbrl, entryDocument, modelDocuments):
+    from arelle.ModelDocument import Type
+    docs = {}
+    pickledRecords = []
+    offset = 0
+    try:
+        for modelDocument in modelDocuments:
+            if (modelDocument.type not in (Type.SCHEMA, Type.LINKBASE) or
+                modelDocument.xmlRootElement is None or modelXbrl.fileSource.isInArchive(modelDocument.filepath)):
+                continue
+            signature = fileSignature(modelDocument.filepath)
+            if signature is None:
+                continue
+            records = documentRecords(modelDocument)
+            if any(record[1] == INVALID for record in records):
+                return # invalid elements must be validated again, to report their errors
+            pickled = pickle.dumps(records, pickle.HIGHEST_PROTOCOL)
+            docs[modelDocument.uri] = (modelDocument.filepath, signature, offset, len(pickled))
+            pickledRecords.append(pickled)
+            offset += len(pickled)
+        index = pickle.dumps((entryDocument.uri, docs), pickle.HIGHEST_PROTOCOL)
+    except Exception: # PSVI values which can't be pickled, image isn't saved
+        return
+    filename = imageFilename(modelXbrl.modelManager, entryDocument.uri)
+    try:
+        imageDir = os.path.dirname(filename)
+        if not os.path.exists(imageDir):
+            os.makedirs(imageDir)
+        tempFile = "{}.{}.tmp".format(filename, os.getpid())
+        with open(tempFile, "wb") as fh:
+            fh.write(IMAGE_HEADER.pack(IMAGE_MAGIC, IMAGE_FORMAT, len(index)))
+            fh.write(index)
+            for pickled in pickledRecords:
+                fh.write(pickled)
+        os.replace(tempFile, filename) # atomic, concurrent readers see old or new image
+        modelXbrl.info("info", _("DTS image saved for %(entryPoint)s, %(count)s documents"),
+                       modelObject=modelXbrl, entryPoint=entryDocument.uri, count=len(docs))
+    except EnvironmentError:
+        pass # cache directory not writable, image is not saved
+
+def close(modelXbrl):
+    for image in modelXbrl.dtsImages.values():
+        if image is not None:
+            image.close()
+    modelXbrl.dtsImages.clear()
+    modelXbrl.dtsImageDocs.clear()
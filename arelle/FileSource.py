@@ -4,12 +4,13 @@ Created on Oct 20, 2010
 @author: Mark V Systems Limited
 (c) Copyright 2010 Mark V Systems Limited, All rights reserved.
 '''
-import zipfile, tarfile, os, io, errno, base64, gzip, zlib, re, struct, random, time
+import zipfile, tarfile, os, io, errno, base64, gzip, zlib, re, struct, random, time, mmap
 from lxml import etree
 from arelle import XmlUtil
 from arelle import PackageManager
 from arelle.UrlUtil import isHttpUrl
 from operator import indexOf
+from collections import OrderedDict
 pluginClassMethods = None # dynamic import
 
 archivePathSeparators = (".zip" + os.sep, ".tar.gz" + os.sep, ".eis" + os.sep, ".xml" + os.sep, ".xfd" + os.sep, ".frm" + os.sep, '.taxonomyPackage.xml' + os.sep) + \
@@ -21,6 +22,8 @@ SERVER_WEB_CACHE = os.sep + "_HTTP_CACHE"
 XMLdeclaration = re.compile(r"<\?xml[^><\?]*\?>", re.DOTALL)
 
 TAXONOMY_PACKAGE_FILE_NAMES = ('.taxonomyPackage.xml', 'catalog.xml') # pre-PWD packages
+ZIP_MEMBER_BUFFER_SIZE = 1 << 18 # bytes of zip archive member read (or decompressed) at a time
+ARCHIVE_MEMBER_CACHE_SIZE = 1 << 25 # bytes of decoded EIS and XFD archive members kept for reuse
 
 def openFileSource(filename, cntlr=None, sourceZipStream=None, checkIfXmlIsEis=False, reloadCache=False):
     if sourceZipStream:
@@ -87,6 +90,93 @@ class FileNamedBytesIO(io.BytesIO):  # provide Bytes IO in memory but behave as
     def __str__(self):
         return self.fileName
     
+class ZipMemberIO(io.RawIOBase):
+    # unbuffered reader of a zip archive member, without copying the whole member into memory:
+    # a stored member is read from a view of the memory mapped archive, others are decompressed as read
+    def __init__(self, fileName, view=None, member=None):
+        super(ZipMemberIO, self).__init__()
+        self.fileName = fileName
+        self.view = view
+        self.member = member
+        self.position = 0
+        self.prefix = b"" # bytes peeked from member
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        if self.view is not None:
+            n = min(len(b), len(self.view) - self.position)
+            b[0:n] = self.view[self.position:self.position + n]
+            self.position += n
+            return n
+        if self.prefix:
+            n = min(len(b), len(self.prefix))
+            b[0:n] = self.prefix[0:n]
+            self.prefix = self.prefix[n:]
+            return n
+        return self.member.readinto(b)
+
+    def readall(self):
+        if self.view is not None:
+            b = self.view[self.position:].tobytes()
+            self.position = len(self.view)
+            return b
+        b = self.prefix + self.member.read()
+        self.prefix = b""
+        return b
+
+    def seekable(self):
+        return self.view is not None or self.member.seekable()
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if self.view is not None:
+            if whence == io.SEEK_CUR:
+                offset += self.position
+            elif whence == io.SEEK_END:
+                offset += len(self.view)
+            self.position = max(0, min(offset, len(self.view)))
+            return self.position
+        if whence == io.SEEK_CUR:
+            offset -= len(self.prefix)
+        self.prefix = b""
+        return self.member.seek(offset, whence)
+
+    def tell(self):
+        if self.view is not None:
+            return self.position
+        return self.member.tell() - len(self.prefix)
+
+    def peek(self, size):
+        ''' returns up to size bytes to be read next, without consuming them '''
+        if self.view is not None:
+            return self.view[self.position:self.position + size].tobytes()
+        while len(self.prefix) < size:
+            b = self.member.read(size - len(self.prefix))
+            if not b:
+                break
+            self.prefix += b
+        return self.prefix[0:size]
+
+    def skip(self, size):
+        if self.view is not None:
+            self.position = min(self.position + size, len(self.view))
+        else:
+            self.peek(size)
+            self.prefix = self.prefix[size:]
+
+    def close(self):
+        if self.view is not None:
+            self.view.release()
+            self.view = None
+        if self.member is not None:
+            self.member.close()
+            self.member = None
+        super(ZipMemberIO, self).close()
+
+    def __str__(self):
+        return self.fileName
+
 class ArchiveFileIOError(IOError):
     def __init__(self, fileSource, errno, fileName):
         super(ArchiveFileIOError, self).__init__(errno,
@@ -115,6 +205,12 @@ class FileSource:
         self.isInstalledTaxonomyPackage = False
         self.isOpen = False
         self.fs = None
+        self.zipMemoryMap = self.zipMemoryView = None # memory map of local zip archive file
+        self.zipMembers = None # ZipInfo of zip archive members by / separated name
+        self.archiveMembers = None # EIS and XFD base64 contents elements by member name
+        self.archiveMemberNames = None # EIS and XFD member names in submission order
+        self.archiveMemberCache = OrderedDict() # decoded EIS and XFD members by name, least recently used first
+        self.archiveMemberCacheSize = 0
         self.selection = None
         self.filesDir = None
         self.referencedFileSources = {}  # archive file name, fileSource object
@@ -152,7 +248,9 @@ class FileSource:
                 return  # an error should have been logged
             if self.isZip:
                 try:
-                    self.fs = zipfile.ZipFile(openFileStream(self.cntlr, self.basefile, 'rb'), mode="r")
+                    zipStream = openFileStream(self.cntlr, self.basefile, 'rb')
+                    self.fs = zipfile.ZipFile(zipStream, mode="r")
+                    self.mapZipStream(zipStream)
                     self.isOpen = True
                 except EnvironmentError as err:
                     self.logError(err)
@@ -200,6 +298,9 @@ class FileSource:
                         parser = etree.XMLParser(recover=True, huge_tree=True)
                         self.eisDocument = etree.parse(file, parser=parser)
                         file.close()
+                        self.indexArchiveMembers(self.eisDocument, "{http://www.sec.gov/edgar/common}document",
+                                                 "{http://www.sec.gov/edgar/common}conformedName",
+                                                 "{http://www.sec.gov/edgar/common}contents")
                         self.isOpen = True
                     except EnvironmentError as err:
                         self.logError(err)
@@ -253,6 +354,7 @@ class FileSource:
                 try:
                     self.xfdDocument = etree.parse(file)
                     file.close()
+                    self.indexArchiveMembers(self.xfdDocument, "data", "filename", "mimedata")
                     self.isOpen = True
                 except EnvironmentError as err:
                     self.logError(err)
@@ -277,6 +379,41 @@ class FileSource:
                 # load mappings
                 self.loadTaxonomyPackageMappings()
                 
+    def indexArchiveMembers(self, document, memberTag, nameTag, contentsTag):
+        # one pass over the submission document, members are decoded when first opened
+        self.archiveMembers = {}
+        self.archiveMemberNames = []
+        for memberElt in document.iter(tag=memberTag):
+            name = memberElt.findtext(nameTag)
+            if name:
+                if name not in self.archiveMembers:
+                    self.archiveMemberNames.append(name)
+                    self.archiveMembers[name] = None
+                if self.archiveMembers[name] is None:
+                    contentsElt = memberElt.find(contentsTag)
+                    if contentsElt is not None and contentsElt.text:
+                        self.archiveMembers[name] = contentsElt
+
+    def archiveMemberBytes(self, archiveFileName):
+        ''' returns decoded contents of EIS or XFD archive member, or None if not in archive '''
+        cache = self.archiveMemberCache
+        if archiveFileName in cache:
+            cache.move_to_end(archiveFileName)
+            return cache[archiveFileName]
+        contentsElt = (self.archiveMembers or {}).get(archiveFileName)
+        if contentsElt is None:
+            return None
+        b = base64.b64decode(contentsElt.text.encode("latin-1"))
+        # remove BOM codes if present
+        if len(b) > 3 and b[0] == 239 and b[1] == 187 and b[2] == 191:
+            b = b[3:]
+        cache[archiveFileName] = b
+        self.archiveMemberCacheSize += len(b)
+        while self.archiveMemberCacheSize > ARCHIVE_MEMBER_CACHE_SIZE and len(cache) > 1:
+            _name, evicted = cache.popitem(last=False)
+            self.archiveMemberCacheSize -= len(evicted)
+        return b
+
     def loadTaxonomyPackageMappings(self):
         if not self.mappedPaths and self.taxonomyPackageMetadataFiles:
             metadata = self.baseurl + os.sep + self.taxonomyPackageMetadataFiles[0]
@@ -289,7 +426,16 @@ class FileSource:
             self.basefile = self.url
             self.baseurl = self.url # url gets changed by selection
             self.fs = zipfile.ZipFile(sourceZipStream, mode="r")
-            self.isOpen = True    
+            self.mapZipStream(sourceZipStream)
+            self.isOpen = True
+
+    def mapZipStream(self, zipStream):
+        # memory map zip archive in a file (not in a memory stream), for reading stored members in place
+        try:
+            self.zipMemoryMap = mmap.mmap(zipStream.fileno(), 0, access=mmap.ACCESS_READ)
+            self.zipMemoryView = memoryview(self.zipMemoryMap)
+        except (AttributeError, io.UnsupportedOperation, ValueError, EnvironmentError):
+            self.zipMemoryMap = self.zipMemoryView = None
             
     def close(self):
         if self.referencedFileSources:
@@ -297,6 +443,13 @@ class FileSource:
                 referencedFileSource.close()
         self.referencedFileSources.clear()
         if self.isZip and self.isOpen:
+            if self.zipMemoryMap is not None:
+                self.zipMemoryView.release()
+                try:
+                    self.zipMemoryMap.close()
+                except BufferError: # a member is still open, the map is closed when no longer referenced
+                    pass
+                self.zipMemoryMap = self.zipMemoryView = None
             self.fs.close()
             self.fs = None
             self.isOpen = False
@@ -314,6 +467,9 @@ class FileSource:
             self.xfdDocument.getroot().clear() # unlink nodes
             self.xfdDocument = None
             self.isXfd = False
+        self.archiveMembers = None
+        self.archiveMemberCache.clear()
+        self.archiveMemberCacheSize = 0
         if self.isRss and self.isOpen:
             self.rssDocument.getroot().clear() # unlink nodes
             self.rssDocument = None
@@ -322,7 +478,8 @@ class FileSource:
             self.isInstalledTaxonomyPackage = False
             self.isOpen = False
         self.filesDir = None
-        
+        self.zipMembers = None
+
     @property
     def isArchive(self):
         return self.isZip or self.isTarGz or self.isEis or self.isXfd or self.isInstalledTaxonomyPackage
@@ -344,7 +501,7 @@ class FileSource:
             return False
         if checkExistence:
             archiveFileName = filepath[len(archiveFileSource.basefile) + 1:].replace("\\", "/") # must be / file separators
-            return archiveFileName in archiveFileSource.dir
+            return archiveFileSource.hasArchiveFile(archiveFileName)
         return True # True only means that the filepath maps into the archive, not that the file is really there
     
     def isMappedUrl(self, url):
@@ -401,21 +558,18 @@ class FileSource:
                 archiveFileName = filepath[len(archiveFileSource.baseurl) + 1:]
             if archiveFileSource.isZip:
                 try:
-                    if archiveFileSource.isZipBackslashed:
-                        f = archiveFileName.replace("/", "\\")
-                    else:
-                        f = archiveFileName.replace("\\","/")
-                    b = archiveFileSource.fs.read(f)
-                    if binary:
-                        return (io.BytesIO(b), )
-                    if encoding is None:
-                        encoding = XmlUtil.encoding(b)
-                    if stripDeclaration:
-                        b = stripDeclarationBytes(b)
-                    return (FileNamedTextIOWrapper(filepath, io.BytesIO(b), encoding=encoding), 
-                            encoding)
+                    zipMember = archiveFileSource.openZipMember(archiveFileName, filepath)
                 except KeyError:
                     raise ArchiveFileIOError(self, errno.ENOENT, archiveFileName)
+                if binary:
+                    return (io.BufferedReader(zipMember, ZIP_MEMBER_BUFFER_SIZE), )
+                hdrBytes = zipMember.peek(512)
+                if encoding is None:
+                    encoding = XmlUtil.encoding(hdrBytes)
+                if stripDeclaration:
+                    zipMember.skip(len(hdrBytes) - len(stripDeclarationBytes(hdrBytes)))
+                return (FileNamedTextIOWrapper(filepath, io.BufferedReader(zipMember, ZIP_MEMBER_BUFFER_SIZE), encoding=encoding),
+                        encoding)
             elif archiveFileSource.isTarGz:
                 try:
                     fh = archiveFileSource.fs.extractfile(archiveFileName)
@@ -431,50 +585,16 @@ class FileSource:
                             encoding)
                 except KeyError:
                     raise ArchiveFileIOError(self, archiveFileName)
-            elif archiveFileSource.isEis:
-                for docElt in self.eisDocument.iter(tag="{http://www.sec.gov/edgar/common}document"):
-                    outfn = docElt.findtext("{http://www.sec.gov/edgar/common}conformedName")
-                    if outfn == archiveFileName:
-                        b64data = docElt.findtext("{http://www.sec.gov/edgar/common}contents")
-                        if b64data:
-                            b = base64.b64decode(b64data.encode("latin-1"))
-                            # remove BOM codes if present
-                            if len(b) > 3 and b[0] == 239 and b[1] == 187 and b[2] == 191:
-                                start = 3;
-                                length = len(b) - 3;
-                                b = b[start:start + length]
-                            else:
-                                start = 0;
-                                length = len(b);
-                            if binary:
-                                return (io.BytesIO(b), )
-                            if encoding is None:
-                                encoding = XmlUtil.encoding(b, default="latin-1")
-                            return (io.TextIOWrapper(io.BytesIO(b), encoding=encoding), 
-                                    encoding)
-                raise ArchiveFileIOError(self, errno.ENOENT, archiveFileName)
-            elif archiveFileSource.isXfd:
-                for data in archiveFileSource.xfdDocument.iter(tag="data"):
-                    outfn = data.findtext("filename")
-                    if outfn == archiveFileName:
-                        b64data = data.findtext("mimedata")
-                        if b64data:
-                            b = base64.b64decode(b64data.encode("latin-1"))
-                            # remove BOM codes if present
-                            if len(b) > 3 and b[0] == 239 and b[1] == 187 and b[2] == 191:
-                                start = 3;
-                                length = len(b) - 3;
-                                b = b[start:start + length]
-                            else:
-                                start = 0;
-                                length = len(b);
-                            if binary:
-                                return (io.BytesIO(b), )
-                            if encoding is None:
-                                encoding = XmlUtil.encoding(b, default="latin-1")
-                            return (io.TextIOWrapper(io.BytesIO(b), encoding=encoding), 
-                                    encoding)
-                raise ArchiveFileIOError(self, errno.ENOENT, archiveFileName)
+            elif archiveFileSource.isEis or archiveFileSource.isXfd:
+                b = archiveFileSource.archiveMemberBytes(archiveFileName)
+                if b is None:
+                    raise ArchiveFileIOError(self, errno.ENOENT, archiveFileName)
+                if binary:
+                    return (io.BytesIO(b), )
+                if encoding is None:
+                    encoding = XmlUtil.encoding(b, default="latin-1")
+                return (io.TextIOWrapper(io.BytesIO(b), encoding=encoding),
+                        encoding)
             elif archiveFileSource.isInstalledTaxonomyPackage:
                 # remove TAXONOMY_PACKAGE_FILE_NAME from file path
                 if filepath.startswith(archiveFileSource.basefile):
@@ -502,7 +622,7 @@ class FileSource:
             if (archiveFileSource.isZip or archiveFileSource.isTarGz or 
                 archiveFileSource.isEis or archiveFileSource.isXfd or
                 archiveFileSource.isRss or self.isInstalledTaxonomyPackage):
-                return archiveFileName.replace("\\","/") in archiveFileSource.dir
+                return archiveFileSource.hasArchiveFile(archiveFileName.replace("\\","/"))
         for pluginMethod in pluginClassMethods("FileSource.Exists"): #custom overrides for decription, etc
             existsResult = pluginMethod(self.cntlr, filepath)
             if existsResult is not None:
@@ -510,6 +630,31 @@ class FileSource:
         # assume it may be a plain ordinary file path
         return os.path.exists(filepath)
     
+    def hasArchiveFile(self, archiveFileName):
+        ''' archiveFileName must have / file separators '''
+        if self.isZip:
+            return self.dir is not None and archiveFileName in self.zipMembers
+        if self.isEis or self.isXfd:
+            return self.dir is not None and archiveFileName in self.archiveMembers
+        return archiveFileName in (self.dir or ())
+
+    def openZipMember(self, archiveFileName, fileName=None):
+        ''' returns ZipMemberIO of archive member, raises KeyError if not in archive '''
+        if self.dir is None:
+            raise KeyError(archiveFileName)
+        zipinfo = self.zipMembers[archiveFileName.replace("\\", "/")]
+        if (self.zipMemoryMap is not None and zipinfo.compress_type == zipfile.ZIP_STORED and
+            not zipinfo.flag_bits & 0x1): # not encrypted
+            # member data follows its local file header, which has variable length name and extra fields
+            offset = zipinfo.header_offset
+            localHeader = self.zipMemoryMap[offset:offset + 30]
+            if len(localHeader) == 30 and localHeader[0:4] == b"PK\x03\x04":
+                nameLength, extraLength = struct.unpack("<HH", localHeader[26:30])
+                start = offset + 30 + nameLength + extraLength
+                if start + zipinfo.file_size <= len(self.zipMemoryMap):
+                    return ZipMemberIO(fileName or archiveFileName, view=self.zipMemoryView[start:start + zipinfo.file_size])
+        return ZipMemberIO(fileName or archiveFileName, member=self.fs.open(zipinfo))
+
     @property
     def dir(self):
         self.open()
@@ -519,32 +664,23 @@ class FileSource:
             return self.filesDir
         elif self.isZip:
             files = []
+            self.zipMembers = {}
             for zipinfo in self.fs.infolist():
                 f = zipinfo.filename
                 if '\\' in f:
                     self.isZipBackslashed = True
                     f = f.replace("\\", "/")
                 files.append(f)
+                self.zipMembers[f] = zipinfo
             self.filesDir = files
         elif self.isTarGz:
             self.filesDir = self.fs.getnames()
         elif self.isEis:
-            files = []
-            for docElt in self.eisDocument.iter(tag="{http://www.sec.gov/edgar/common}document"):
-                outfn = docElt.findtext("{http://www.sec.gov/edgar/common}conformedName")
-                if outfn:
-                    files.append(outfn);
-            self.filesDir = files
+            self.filesDir = self.archiveMemberNames
         elif self.isXfd:
-            files = []
-            for data in self.xfdDocument.iter(tag="data"):
-                outfn = data.findtext("filename")
-                if outfn:
-                    if len(outfn) > 2 and outfn[0].isalpha() and \
-                        outfn[1] == ':' and outfn[2] == '\\':
-                        continue
-                    files.append(outfn);
-            self.filesDir = files
+            self.filesDir = [outfn for outfn in self.archiveMemberNames
+                             if not (len(outfn) > 2 and outfn[0].isalpha() and
+                                     outfn[1] == ':' and outfn[2] == '\\')]
         elif self.isRss:
             files = []  # return title, descr, pubdate, linst doc
             edgr = "http://www.sec.gov/Archives/edgar"
@@ -25,6 +25,9 @@ ModelFact = None
 
 expressionVariablesPattern = re.compile(r"([^$]*)([$]\w[\w:.-]*)([^$]*)")
 EMPTYSET = set()
+NONINDEXEDASPECT = object()
+TUPLEASPECTKEY = object()
+TYPEDDIMASPECTKEY = object()
 
 def init():
     global ModelDimensionValue, ModelFact # initialize objects that would cause recursive import
@@ -655,15 +658,89 @@ def implicitFilter(xpCtx, vb, facts, uncoveredAspectFacts):
         #                       for aspect, fact in uncoveredAspectFacts.items()
         #                       if not vb.hasAspectValueCovered(aspect)]
         if testableAspectFacts:
-            # not tracing, do bulk aspect filtering
-            _facts = [fact
-                      for fact in facts
-                      if all(aspectMatches(xpCtx, uncoveredAspectFact, fact, aspect)
-                             for (aspect, uncoveredAspectFact) in testableAspectFacts)]
+            # not tracing, do bulk aspect filtering, from aspect hash index buckets where possible
+            _facts = indexedImplicitFilter(xpCtx, vb, facts, testableAspectFacts)
+            if _facts is None: # no hash indexable aspect, test each fact
+                _facts = [fact
+                          for fact in facts
+                          if all(aspectMatches(xpCtx, uncoveredAspectFact, fact, aspect)
+                                 for (aspect, uncoveredAspectFact) in testableAspectFacts)]
         else:
             _facts = facts
             
     return _facts
+
+def indexedImplicitFilter(xpCtx, vb, facts, testableAspectFacts):
+    # returns None if no testable aspect can be matched by aspect hash key buckets
+    if any(uncoveredAspectFact is None for aspect, uncoveredAspectFact in testableAspectFacts):
+        return [] # fallback (atomic) never matches any aspect
+    if len(vb.instances) != 1:
+        return None # multi-instance aspect matching rules aren't hash indexed
+    modelXbrl = vb.instances[0]
+    if any(getattr(uncoveredAspectFact, "modelXbrl", None) is not modelXbrl
+           for aspect, uncoveredAspectFact in testableAspectFacts):
+        return None
+    candidates = None
+    for aspect, uncoveredAspectFact in testableAspectFacts:
+        aspectHashKey = factAspectHashKey(uncoveredAspectFact, aspect)
+        if aspectHashKey is not NONINDEXEDASPECT:
+            aspectFacts = factsByAspectHashKey(modelXbrl, aspect).get(aspectHashKey, EMPTYSET)
+            if candidates is None:
+                candidates = aspectFacts
+            else:
+                candidates = candidates & aspectFacts
+            if not candidates:
+                return []
+    if candidates is None:
+        return None
+    # in the order of facts (even if a set), as the unindexed implicit filter would return them
+    candidates = [fact for fact in facts if fact in candidates]
+    # confirm hash key collisions and aspects that aren't hash indexed
+    return [fact
+            for fact in candidates
+            if all(aspectMatches(xpCtx, uncoveredAspectFact, fact, aspect)
+                   for (aspect, uncoveredAspectFact) in testableAspectFacts)]
+
+def factAspectHashKey(fact, aspect):
+    # hashable key of fact's aspect value, equal for any two facts of one instance whose aspect matches
+    # (may also be equal for facts whose aspects don't match, aspectMatches must confirm)
+    if aspect == 2: # Aspect.CONCEPT
+        return fact.qname
+    if aspect not in (3, 4, 5) and not isinstance(aspect, QName):
+        return NONINDEXEDASPECT # location and segment/scenario aspects are not hash indexed
+    if fact.isTuple:
+        return TUPLEASPECTKEY # tuples only match tuples
+    if aspect == 5: # Aspect.UNIT
+        u = fact.unit
+        return u.hash if u is not None else None
+    c = fact.context
+    if c is None:
+        return None
+    if aspect == 4: # Aspect.PERIOD
+        return c.periodHash
+    if aspect == 3: # Aspect.ENTITY_IDENTIFIER
+        return c.entityIdentifierHash
+    dimValue = c.dimValue(aspect)
+    if isinstance(dimValue, QName): # default value of an explicit dim
+        return dimValue
+    if dimValue is None:
+        return None
+    if dimValue.isExplicit:
+        return dimValue.memberQname
+    return TYPEDDIMASPECTKEY # typed dimension values are confirmed by aspectMatches
+
+def factsByAspectHashKey(modelXbrl, aspect):
+    # facts in instance indexed by aspect hash key, cached as aspects are requested
+    try:
+        return modelXbrl._factsByAspectHashKey[aspect]
+    except AttributeError:
+        modelXbrl._factsByAspectHashKey = {}
+        return factsByAspectHashKey(modelXbrl, aspect)
+    except KeyError:
+        modelXbrl._factsByAspectHashKey[aspect] = fbahk = defaultdict(set)
+        for fact in modelXbrl.factsInInstance:
+            fbahk[factAspectHashKey(fact, aspect)].add(fact)
+        return fbahk
     
 def aspectsMatch(xpCtx, fact1, fact2, aspects):
     return all(aspectMatches(xpCtx, fact1, fact2, aspect) for aspect in aspects)
@@ -785,17 +862,40 @@ def aspectMatches(xpCtx, fact1, fact2, aspect):
 
 def factsPartitions(xpCtx, facts, aspects):
     factsPartitions = []
+    # only partitions whose first fact has the same aspect hash keys can match (within one instance)
+    partitionsByAspectHashKeys = defaultdict(list) if isSingleInstanceFacts(facts) else None
     for fact in facts:
+        if partitionsByAspectHashKeys is not None:
+            keyedPartitions = partitionsByAspectHashKeys[factAspectsHashKey(fact, aspects)]
+        else:
+            keyedPartitions = factsPartitions
         matched = False
-        for partition in factsPartitions:
+        for partition in keyedPartitions:
             if aspectsMatch(xpCtx, fact, partition[0], aspects):
                 partition.append(fact)
                 matched = True
                 break
         if not matched:
-            factsPartitions.append([fact,])
+            partition = [fact,]
+            factsPartitions.append(partition)
+            if partitionsByAspectHashKeys is not None:
+                keyedPartitions.append(partition)
     return factsPartitions
 
+def factAspectsHashKey(fact, aspects):
+    # aspects must be iterated in the same order for each fact being keyed
+    return tuple(factAspectHashKey(fact, aspect) for aspect in aspects)
+
+def isSingleInstanceFacts(facts):
+    # aspect hash keys are only comparable for facts of the same instance
+    modelXbrl = None
+    for fact in facts:
+        if modelXbrl is None:
+            modelXbrl = fact.modelXbrl
+        elif fact.modelXbrl is not modelXbrl:
+            return False
+    return True
+
 def evaluationIsUnnecessary(thisEval, xpCtx):
     otherEvals = xpCtx.evaluations
     if otherEvals:
@@ -1270,14 +1370,22 @@ class VariableBinding:
         subpartition0 = []
         subpartitions = [subpartition0]
         matches = defaultdict(list) # position: [matching facts]
+        # positions of subpartition0 facts by aspect hash keys (only these can match within one instance)
+        positionsByAspectHashKeys = defaultdict(list) if isSingleInstanceFacts(partition) else None
         for fact in partition:
+            if positionsByAspectHashKeys is not None:
+                keyedPositions = positionsByAspectHashKeys[factAspectsHashKey(fact, aspects)]
+            else:
+                keyedPositions = range(len(subpartition0))
             matched = False
-            for i, fact2 in enumerate(subpartition0):
-                if aspectsMatch(self.xpCtx, fact, fact2, aspects):
+            for i in keyedPositions:
+                if aspectsMatch(self.xpCtx, fact, subpartition0[i], aspects):
                     matches[i].append(fact)
                     matched = True
                     break
             if not matched:
+                if positionsByAspectHashKeys is not None:
+                    keyedPositions.append(len(subpartition0))
                 subpartition0.append(fact)
         if matches:
             matchIndices = sorted(matches.keys())
@@ -0,0 +1,100 @@
+'''
+Created on Oct 18, 2026
+
+Evaluates independent assertions of a formula linkbase in forked worker processes.
+
+Workers are forked after formula compilation and setup, so each inherits the loaded
+DTS, instance and compiled XPath programs without reloading or pickling model objects.
+An assertion is evaluated in a worker when it produces no output instance, reads only
+the standard input instance and takes part in no variables-scope relationship.  Log
+records, assertion counts and profile stats of each worker evaluation are returned to
+the parent and merged in the order the assertions would have been evaluated sequentially.
+Other side effects of a worker evaluation (such as by plug-ins) are not returned.  An
+assertion whose worker process exits during its evaluation is reported and left with no
+evaluations counted, and the assertions after it proceed.
+
+@author: Mark V Systems Limited
+(c) Copyright 2026 Mark V Systems Limited, All rights reserved.
+'''
+import multiprocessing
+from arelle import XbrlConst
+from arelle.ModelFormulaObject import ModelValueAssertion, ModelExistenceAssertion
+from arelle.ParallelWorkers import (parallelTasks, closeParallelTasks, captureWorkerLog, workerLogMark, workerLogSince,
+                                    mergeWorkerLog)
+
+_workerState = None # (evaluateVariableSet function, val, xpathContext, variableSets) inherited by forked workers
+
+def isParallelizable(modelXbrl, modelVariableSet):
+    if not isinstance(modelVariableSet, (ModelValueAssertion, ModelExistenceAssertion)):
+        return False # formulas produce output instance facts, consistency assertions are by formula
+    varsScopeRelSet = modelXbrl.relationshipSet(XbrlConst.variablesScope)
+    if varsScopeRelSet.fromModelObject(modelVariableSet) or varsScopeRelSet.toModelObject(modelVariableSet):
+        return False
+    return all(getattr(modelRel.toModelObject, "fromInstanceQnames", None) is None # standard input instance only
+               for modelRel in modelXbrl.relationshipSet(XbrlConst.variableSet).fromModelObject(modelVariableSet))
+
+def parallelEvaluations(val, xpathContext, modelVariableSets, evaluateVariableSet):
+    ''' returns (pool, parallelVariableSets, iterator of evaluation results in parallelVariableSets order)
+        or (None, empty set, None) if parallel evaluation does not apply '''
+    global _workerState
+    numWorkers = getattr(val.modelXbrl.modelManager.formulaOptions, "parallelWorkers", 0) or 0
+    if numWorkers < 2 or "fork" not in multiprocessing.get_all_start_methods():
+        return None, set(), None
+    variableSets = [modelVariableSet
+                    for modelVariableSet in modelVariableSets
+                    if isParallelizable(val.modelXbrl, modelVariableSet)]
+    if len(variableSets) < 2:
+        return None, set(), None
+    val.modelXbrl.info("formula:trace",
+                       _("Evaluating %(count)s independent assertions in %(workers)s worker processes"),
+                       modelXbrl=val.modelXbrl, count=len(variableSets), workers=numWorkers)
+    # a worker replacing one which exited is forked later, so state is kept until pool is closed
+    _workerState = (evaluateVariableSet, val, xpathContext, variableSets)
+    pool, evaluationResults = parallelTasks(multiprocessing.get_context("fork"), min(numWorkers, len(variableSets)),
+                                            workerEvaluate, len(variableSets), initializer=initWorker,
+                                            lostTask=lostEvaluation)
+    # results are yielded in variableSets order, so merging is deterministic
+    return pool, set(variableSets), evaluationResults
+
+def closeParallelEvaluations(pool):
+    global _workerState
+    closeParallelTasks(pool)
+    _workerState = None
+
+def initWorker():
+    # redirect worker's log messages to a capture handler
+    evaluateVariableSet, val, xpathContext, variableSets = _workerState
+    captureWorkerLog(val.modelXbrl)
+
+def workerEvaluate(i):
+    evaluateVariableSet, val, xpathContext, variableSets = _workerState
+    modelXbrl = val.modelXbrl
+    modelVariableSet = variableSets[i]
+    logMark = workerLogMark(modelXbrl)
+    priorProfileStats = modelXbrl.profileStats.copy()
+    modelXbrl.profileStat() # time stats from this evaluation, not from when the worker was forked
+    evaluateVariableSet(val, xpathContext, modelVariableSet)
+    return (modelVariableSet.countSatisfied,
+            modelVariableSet.countNotSatisfied,
+            workerLogSince(modelXbrl, logMark),
+            dict((name, stat[1] - priorProfileStats.get(name, (0,0,0))[1])
+                 for name, stat in modelXbrl.profileStats.items()
+                 if stat != priorProfileStats.get(name)))
+
+def lostEvaluation(i):
+    evaluateVariableSet, val, xpathContext, variableSets = _workerState
+    modelVariableSet = variableSets[i]
+    val.modelXbrl.error("arelle:workerProcessExited",
+        _("Assertion evaluation worker process exited, assertion: %(assertion)s"),
+        modelObject=modelVariableSet, assertion=modelVariableSet.id or modelVariableSet.xlinkLabel)
+
+def mergeEvaluation(val, modelVariableSet, evaluationResult):
+    if evaluationResult is None: # worker process exited during evaluation, reported by lostEvaluation
+        return # no evaluations counted
+    countSatisfied, countNotSatisfied, workerLog, profileStatIncrements = evaluationResult
+    modelXbrl = val.modelXbrl
+    modelVariableSet.countSatisfied = countSatisfied
+    modelVariableSet.countNotSatisfied = countNotSatisfied
+    for name, statTime in profileStatIncrements.items():
+        modelXbrl.profileStat(name, statTime)
+    mergeWorkerLog(modelXbrl, workerLog)
@@ -12,6 +12,7 @@ from arelle.FunctionUtil import anytypeArg, stringArg, numericArg, qnameArg, nod
 from arelle.ModelXbrl import ModelXbrl
 from arelle.ModelDtsObject import anonymousTypeSuffix, ModelConcept
 from arelle.ModelInstanceObject import ModelDimensionValue, ModelFact, ModelInlineFact
+from arelle.ModelFactStore import StoredFact
 from arelle.ModelFormulaObject import ModelFormulaResource
 from arelle.PythonUtil import flattenSequence
 from arelle.XmlValidate import UNKNOWN, VALID, validate as xmlValidate, NCNamePattern
@@ -57,7 +58,7 @@ def xbrlTuple(xc, args, i=0):
     # can't name this just tuple because then it hides tuple() constructor of Python
     if len(args[i]) != 1: raise XPathContext.FunctionArgType(i+1,"xbrl:tuple")
     modelTuple = args[i][0]
-    if isinstance(modelTuple, (ModelFact, ModelInlineFact)) and modelTuple.isTuple:
+    if isinstance(modelTuple, (ModelFact, ModelInlineFact, StoredFact)) and modelTuple.isTuple:
         return modelTuple
     raise XPathContext.FunctionArgType(i,"xbrl:tuple")
 
@@ -386,9 +387,9 @@ def nodesEqual(xc, args, test, mustBeItems=False, nonItemErrCode=None):
             if not isinstance(node2, (ModelObject,ModelAttribute)): 
                 raise XPathContext.FunctionArgType(2,"node()*")
             if mustBeItems:
-                if not isinstance(node1, (ModelFact, ModelInlineFact)) or not node1.isItem: 
+                if not isinstance(node1, (ModelFact, ModelInlineFact, StoredFact)) or not node1.isItem: 
                     raise XPathContext.FunctionArgType(1,"xbrl:item*", errCode=nonItemErrCode)
-                if not isinstance(node2, (ModelFact, ModelInlineFact)) or not node2.isItem: 
+                if not isinstance(node2, (ModelFact, ModelInlineFact, StoredFact)) or not node2.isItem: 
                     raise XPathContext.FunctionArgType(2,"xbrl:item*", errCode=nonItemErrCode)
             if not test(node1, node2):
                 return False
@@ -403,12 +404,12 @@ def setsEqual(xc, args, test, mustBeItems=False):
     for node1 in seq1:
         if not isinstance(node1, ModelObject): 
             raise XPathContext.FunctionArgType(1,"node()*")
-        if mustBeItems and (not isinstance(node1, (ModelFact, ModelInlineFact)) or not node1.isItem): 
+        if mustBeItems and (not isinstance(node1, (ModelFact, ModelInlineFact, StoredFact)) or not node1.isItem): 
             raise XPathContext.FunctionArgType(1,"xbrl:item*", errCode="xfie:NodeIsNotXbrlItem")
     for node2 in seq2:
         if not isinstance(node2, ModelObject): 
             raise XPathContext.FunctionArgType(2,"node()*")
-        if mustBeItems and (not isinstance(node2, (ModelFact, ModelInlineFact)) or not node2.isItem): 
+        if mustBeItems and (not isinstance(node2, (ModelFact, ModelInlineFact, StoredFact)) or not node2.isItem): 
             raise XPathContext.FunctionArgType(2,"xbrl:item*", errCode="xfie:NodeIsNotXbrlItem")
     if len(set(seq1)) != len(set(seq2)): # sequences can have nondistinct duplicates, just same set lengths needed
         return False
@@ -427,8 +428,8 @@ def s_equal(xc, p, args):
     return nodesEqual(xc, args, s_equal_test)
 
 def s_equal_test(node1, node2):
-    if (isinstance(node1, (ModelFact, ModelInlineFact)) and node1.isItem and
-        isinstance(node2, (ModelFact, ModelInlineFact)) and node2.isItem):
+    if (isinstance(node1, (ModelFact, ModelInlineFact, StoredFact)) and node1.isItem and
+        isinstance(node2, (ModelFact, ModelInlineFact, StoredFact)) and node2.isItem):
         return (c_equal_test(node1, node2) and u_equal_test(node1, node2) and
                 XbrlUtil.xEqual(node1, node2) and 
                 # must be validated (by xEqual) before precision tests to assure xAttributes is set
@@ -523,9 +524,9 @@ def p_equal(xc, p, args):
     return nodesEqual(xc, args, p_equal_test)
 
 def p_equal_test(node1, node2):
-    if not isinstance(node1, (ModelFact, ModelInlineFact)) or not (node1.isItem or node1.isTuple): 
+    if not isinstance(node1, (ModelFact, ModelInlineFact, StoredFact)) or not (node1.isItem or node1.isTuple): 
         raise XPathContext.FunctionArgType(1,"xbrli:item or xbrli:tuple", errCode="xfie:ElementIsNotXbrlConcept")
-    if not isinstance(node2, (ModelFact, ModelInlineFact)) or not (node1.isItem or node1.isTuple): 
+    if not isinstance(node2, (ModelFact, ModelInlineFact, StoredFact)) or not (node1.isItem or node1.isTuple): 
         raise XPathContext.FunctionArgType(2,"xbrli:item or xbrli:tuple", errCode="xfie:ElementIsNotXbrlConcept")
     return node1.parentElement == node2.parentElement
 
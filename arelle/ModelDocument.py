@@ -10,7 +10,7 @@ from decimal import Decimal
 from lxml import etree
 from xml.sax import SAXParseException
 from arelle import (PackageManager, XbrlConst, XmlUtil, UrlUtil, ValidateFilingText, 
-                    XhtmlValidate, XmlValidateSchema)
+                    XhtmlValidate, XmlValidateSchema, DtsImage)
 from arelle.ModelObject import ModelObject, ModelComment
 from arelle.ModelValue import qname
 from arelle.ModelDtsObject import ModelLink, ModelResource, ModelRelationship
@@ -50,6 +50,9 @@ def load(modelXbrl, uri, base=None, referringElement=None, isEntry=False, isDisc
     if referringElement is None: # used for error messages
         referringElement = modelXbrl
     normalizedUri = modelXbrl.modelManager.cntlr.webCache.normalizeUrl(uri, base)
+    if (modelXbrl.modelManager.taxonomyCache is not None and modelXbrl.taxonomyCacheGroup is None and
+        isDiscovered and not isEntry and normalizedUri not in modelXbrl.urlDocs):
+        modelXbrl.modelManager.taxonomyCache.attach(modelXbrl, normalizedUri, referringElement)
     modelDocument = modelXbrl.urlDocs.get(normalizedUri)
     if modelDocument:
         return modelDocument
@@ -95,8 +98,17 @@ def load(modelXbrl, uri, base=None, referringElement=None, isEntry=False, isDisc
         
     # don't try reloading if not loadable
     
+    prefetched = None
+    if modelXbrl.documentPrefetcher is not None and not isEntry:
+        prefetched = modelXbrl.documentPrefetcher.take(normalizedUri)
+        if prefetched is not None and (reloadCache or kwargs.get("checkModifiedTime",False)):
+            prefetched = None # prefetched from the cache as is, retrieve again as requested
     if modelXbrl.fileSource.isInArchive(mappedUri):
         filepath = mappedUri
+    elif prefetched is not None: # retrieved by prefetcher
+        filepath = prefetched.filepath
+        if filepath:
+            uri = modelXbrl.modelManager.cntlr.webCache.normalizeUrl(filepath)
     else:
         filepath = modelXbrl.modelManager.cntlr.webCache.getfilename(mappedUri, reload=reloadCache, checkModifiedTime=kwargs.get("checkModifiedTime",False))
         if filepath:
@@ -140,27 +152,45 @@ def load(modelXbrl, uri, base=None, referringElement=None, isEntry=False, isDisc
                 return None
             if modelDocument is not None:
                 return modelDocument
-        if (modelXbrl.modelManager.validateDisclosureSystem and 
-            modelXbrl.modelManager.disclosureSystem.validateFileText and
-            not normalizedUri in modelXbrl.modelManager.disclosureSystem.standardTaxonomiesDict):
-            file, _encoding = ValidateFilingText.checkfile(modelXbrl,filepath)
+        if prefetched is not None and prefetched.xmlDocument is not None: # parsed by prefetcher
+            xmlDocument = prefetched.xmlDocument
+            _parser = prefetched.parser
+            _parserLookupName = prefetched.parserLookupName
+            _parserLookupClass = prefetched.parserLookupClass
+            _encoding = prefetched.encoding
         else:
-            file, _encoding = modelXbrl.fileSource.file(filepath, stripDeclaration=True)
-        xmlDocument = None
-        isPluginParserDocument = False
-        for pluginMethod in pluginClassMethods("ModelDocument.CustomLoader"):
-            modelDocument = pluginMethod(modelXbrl, file, mappedUri, filepath)
-            if modelDocument is not None:
-                file.close()
-                return modelDocument
-        _parser, _parserLookupName, _parserLookupClass = parser(modelXbrl,filepath)
-        xmlDocument = etree.parse(file,parser=_parser,base_url=filepath)
-        for error in _parser.error_log:
-            modelXbrl.error("xmlSchema:syntax",
-                    _("%(error)s, %(fileName)s, line %(line)s, column %(column)s, %(sourceAction)s source element"),
-                    modelObject=referringElement, fileName=os.path.basename(uri), 
-                    error=error.message, line=error.line, column=error.column, sourceAction=("including" if isIncluded else "importing"))
-        file.close()
+            if (modelXbrl.modelManager.validateDisclosureSystem and 
+                modelXbrl.modelManager.disclosureSystem.validateFileText and
+                not normalizedUri in modelXbrl.modelManager.disclosureSystem.standardTaxonomiesDict):
+                file, _encoding = ValidateFilingText.checkfile(modelXbrl,filepath)
+            else:
+                file, _encoding = modelXbrl.fileSource.file(filepath, stripDeclaration=True)
+            xmlDocument = None
+            isPluginParserDocument = False
+            for pluginMethod in pluginClassMethods("ModelDocument.CustomLoader"):
+                modelDocument = pluginMethod(modelXbrl, file, mappedUri, filepath)
+                if modelDocument is not None:
+                    file.close()
+                    return modelDocument
+            _parser, _parserLookupName, _parserLookupClass = parser(modelXbrl,filepath)
+            xmlDocument = etree.parse(file,parser=_parser,base_url=filepath)
+            for error in _parser.error_log:
+                modelXbrl.error("xmlSchema:syntax",
+                        _("%(error)s, %(fileName)s, line %(line)s, column %(column)s, %(sourceAction)s source element"),
+                        modelObject=referringElement, fileName=os.path.basename(uri), 
+                        error=error.message, line=error.line, column=error.column, sourceAction=("including" if isIncluded else "importing"))
+            file.close()
+            if modelXbrl.documentPrefetcher is not None: # prefetch documents this one references
+                modelXbrl.documentPrefetcher.scan(xmlDocument, _parserLookupName, normalizedUri)
+            elif UrlUtil.isHttpUrl(normalizedUri):
+                webCache = modelXbrl.modelManager.cntlr.webCache
+                if not webCache.workOffline and webCache.maxConnections > 1: # retrieve referenced web documents concurrently
+                    from arelle.DocumentPrefetcher import referencedUrls, loadableUrl
+                    # only the (mapped) urls which load would retrieve, not skipped or disallowed ones
+                    webCache.prefetch(mappedUrl
+                                      for mappedUrl in (loadableUrl(modelXbrl, referencedUrl)
+                                                        for referencedUrl in referencedUrls(xmlDocument, _parserLookupName, normalizedUri, webCache.normalizeUrl))
+                                      if mappedUrl)
     except (EnvironmentError, KeyError) as err:  # missing zip file raises KeyError
         if file:
             file.close()
@@ -304,6 +334,9 @@ def load(modelXbrl, uri, base=None, referringElement=None, isEntry=False, isDisc
         if isEntry or isDiscovered:
             modelDocument.inDTS = True
         
+        if modelXbrl.modelManager.dtsImages and _type in (Type.SCHEMA, Type.LINKBASE):
+            DtsImage.openImage(modelXbrl, normalizedUri) # if this document is the entry point of a DTS image
+        
         # discovery (parsing)
         if any(pluginMethod(modelDocument)
                for pluginMethod in pluginClassMethods("ModelDocument.Discover")):
@@ -331,6 +364,9 @@ def load(modelXbrl, uri, base=None, referringElement=None, isEntry=False, isDisc
         elif _type == Type.RSSFEED:
             modelDocument.rssFeedDiscover(rootNode)
             
+        if modelXbrl.modelManager.dtsImages and _type in (Type.SCHEMA, Type.LINKBASE):
+            DtsImage.restoreDocument(modelDocument) # PSVI of previously validated taxonomy elements
+            
         if isEntry or _type == Type.INLINEXBRL: # inline doc set members may not be entry but may have processing instructions
             for pi in modelDocument.processingInstructions:
                 if pi.target == "arelle-unit-test":
@@ -341,6 +377,8 @@ def load(modelXbrl, uri, base=None, referringElement=None, isEntry=False, isDisc
                 XmlValidateSchema.validate(doc, doc.xmlRootElement, doc.targetNamespace) # validate schema elements
             if hasattr(modelXbrl, "ixdsHtmlElements"):
                 inlineIxdsDiscover(modelXbrl, modelDocument) # compile cross-document IXDS references
+            if modelXbrl.modelManager.dtsImages:
+                DtsImage.entryLoaded(modelXbrl) # whether images of the DTS's taxonomies may be saved
                 
         if isEntry or kwargs.get("isSupplemental", False):  
             # re-order base set keys for entry point or supplemental linkbase addition
@@ -750,9 +788,11 @@ class ModelDocument:
             urlDocs.pop(self.uri,None)
             xmlDocument = self.xmlDocument
             dummyRootElement = self.parser.makeelement("{http://dummy}dummy") # may fail for streaming
-            for modelObject in self.xmlRootElement.iter():
+            modelObjects = list(self.xmlRootElement.iter())
+            for modelObject in modelObjects:
                 modelObject.__dict__.clear() # clear python variables of modelObjects (not lxml)
-            self.xmlRootElement.clear() # clear entire lxml subtree
+            for modelObject in reversed(modelObjects): # clear entire lxml subtree, leaves first
+                modelObject.clear() # (lxml is very slow clearing subtrees with many proxied elements)
             self.parserLookupName.__dict__.clear()
             self.parserLookupClass.__dict__.clear()
             self.__dict__.clear() # dereference everything before clearing xml tree
@@ -1041,6 +1081,7 @@ class ModelDocument:
                             for baseSetKey in baseSetKeys:
                                 self.modelXbrl.baseSets[baseSetKey].append(lbElement)
                         linkElementSequence = 0
+                        lbElement.arcIndex = arcIndex = [] # arcs pre-parsed for ModelRelationshipSet
                         for linkElement in lbElement.iterchildren():
                             if isinstance(linkElement,ModelObject):
                                 linkElementSequence += 1
@@ -1067,6 +1108,9 @@ class ModelDocument:
                                 elif xlinkType == "arc":
                                     arcQn = qname(linkElement)
                                     arcrole = linkElement.get("{http://www.w3.org/1999/xlink}arcrole")
+                                    arcIndex.append((linkElement, arcrole, arcQn,
+                                                     linkElement.get("{http://www.w3.org/1999/xlink}from"),
+                                                     linkElement.get("{http://www.w3.org/1999/xlink}to")))
                                     if arcrole not in arcrolesFound:
                                         if linkrole == "":
                                             linkrole = XbrlConst.defaultLinkRole
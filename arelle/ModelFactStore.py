@@ -0,0 +1,458 @@
+'''
+Created on Oct 18, 2026
+
+Compact columnar store of the facts of large instances, an opt-in alternative to retaining an lxml
+ModelFact element (with its python property caches) for each fact.
+
+Top-level item facts are absorbed into the store after they have been XML validated and discovered,
+and their elements are removed from the instance document.  The store keeps, for each fact, array
+columns of ids of its interned QName, context, unit and attribute values (decimals, precision, id, xml:lang
+and xsi:nil, in a string pool), of its value string (in the string pool) and of its typed value, which
+for numeric facts is in int, float or Decimal columns.  Contexts and units, which are few relative to facts,
+remain ModelContext and ModelUnit objects, interned by position in the store's tables.
+
+StoredFact proxies implement the ModelFact attribute surface used by instance, dimensional, calculation
+and formula validation and by the views and exports.  Tuples, fractions, facts with child elements,
+attributes other than those above or their own namespace declarations remain ModelFact elements.
+
+@author: Mark V Systems Limited
+(c) Copyright 2026 Mark V Systems Limited, All rights reserved.
+'''
+from array import array
+from arelle import XbrlConst
+from arelle.HashUtil import md5hash
+from arelle.ModelInstanceObject import ModelFact
+from arelle.XmlValidate import VALID
+
+XMLLANG = "{http://www.w3.org/XML/1998/namespace}lang"
+XSINIL = "{http://www.w3.org/2001/XMLSchema-instance}nil"
+# attributes of stored facts by column of their string pool ids
+STORED_ATTRIBUTES = {"decimals": "decimalsIds", "precision": "precisionIds", "id": "idIds",
+                     XMLLANG: "langIds", XSINIL: "nilIds"}
+STORABLE_ATTRIBUTES = {"contextRef", "unitRef"} | set(STORED_ATTRIBUTES.keys())
+INT_MIN = -(1 << 63)
+INT_MAX = (1 << 63) - 1
+NO_TUPLE_FACTS = ()
+
+class FactStore:
+    """
+    .. class:: FactStore(modelXbrl)
+
+    Columns of the facts stored for a modelXbrl (see module docstring), indexed by StoredFact row.
+    """
+    def __init__(self, modelXbrl):
+        self.modelXbrl = modelXbrl
+        self.modelDocument = None
+        self.qnames = []
+        self.qnameIndex = {}
+        self.concepts = []
+        self.contexts = []
+        self.contextIndex = {}
+        self.units = []
+        self.unitIndex = {}
+        self.strings = []
+        self.stringIndex = {}
+        self.qnameIds = array('i')
+        self.contextIds = array('i')
+        self.unitIds = array('i') # -1 if not numeric
+        self.decimalsIds = array('i') # string pool ids of attribute values, -1 if absent
+        self.precisionIds = array('i')
+        self.idIds = array('i')
+        self.langIds = array('i')
+        self.nilIds = array('i')
+        self.valueIds = array('i') # string pool id of text value
+        self.xValids = array('b')
+        self.numKinds = array('b') # 0 not numeric, 1 int, 2 float, 3 Decimal (or int beyond 64 bits)
+        self.numSlots = array('i') # position in numeric column of numKind
+        self.ints = array('q')
+        self.floats = array('d')
+        self.decimals = []
+        self.xValues = {} # typed values of non-numeric facts, by row, where not the value string
+        self.sValues = {} # normalized values, by row, where not the value string
+        self.objectIndices = array('i')
+        self.sourcelines = array('i') # 0 if none
+        self.storedFacts = []
+
+    def __len__(self):
+        return len(self.storedFacts)
+
+    def __iter__(self):
+        return iter(self.storedFacts)
+
+    def internedId(self, table, index, value):
+        try:
+            return index[value]
+        except KeyError:
+            index[value] = i = len(table)
+            table.append(value)
+            return i
+
+    def stringId(self, value, intern=True):
+        if value is None:
+            return -1
+        if not intern: # e.g., fact ids, which are not repeated
+            self.strings.append(value)
+            return len(self.strings) - 1
+        return self.internedId(self.strings, self.stringIndex, value)
+
+    def string(self, stringId):
+        if stringId < 0:
+            return None
+        return self.strings[stringId]
+
+    def isStorable(self, fact):
+        concept = fact.concept
+        if concept is None or not concept.isItem or concept.isFraction or len(fact):
+            return False
+        parent = fact.getparent()
+        if parent is None or parent.qname != XbrlConst.qnXbrliXbrl:
+            return False
+        if not all(attrTag in STORABLE_ATTRIBUTES for attrTag in fact.keys()):
+            return False
+        if fact.context is None or (fact.unitID is not None and fact.unit is None):
+            return False # reference errors remain reported on the element
+        if not concept.isNumeric and fact.nsmap != parent.nsmap:
+            return False # value may depend on fact's own namespace declarations
+        return True
+
+    def storeFact(self, fact):
+        ''' absorbs a validated and discovered top-level fact element into the store, replacing it in the
+        modelXbrl's facts, returns the StoredFact, or the element if it is not storable '''
+        if not self.isStorable(fact):
+            return fact
+        modelXbrl = self.modelXbrl
+        modelDocument = fact.modelDocument
+        if self.modelDocument is None:
+            self.modelDocument = modelDocument
+        row = len(self.storedFacts)
+        qname = fact.qname
+        qnameId = self.qnameIndex.get(qname)
+        if qnameId is None:
+            qnameId = self.internedId(self.qnames, self.qnameIndex, qname)
+            self.concepts.append(fact.concept)
+        self.qnameIds.append(qnameId)
+        self.contextIds.append(self.internedId(self.contexts, self.contextIndex, fact.context))
+        unit = fact.unit
+        self.unitIds.append(-1 if unit is None else self.internedId(self.units, self.unitIndex, unit))
+        get = fact.get
+        self.decimalsIds.append(self.stringId(get("decimals")))
+        self.precisionIds.append(self.stringId(get("precision")))
+        self.idIds.append(self.stringId(get("id"), intern=False))
+        self.langIds.append(self.stringId(get(XMLLANG)))
+        self.nilIds.append(self.stringId(get(XSINIL)))
+        text = fact.textValue
+        self.valueIds.append(self.stringId(text))
+        xValid = getattr(fact, "xValid", 0)
+        xValue = getattr(fact, "xValue", None)
+        sValue = getattr(fact, "sValue", None)
+        self.xValids.append(xValid)
+        numKind = 0
+        if xValid >= VALID and fact.concept.isNumeric and xValue is not None:
+            if isinstance(xValue, int) and not isinstance(xValue, bool) and INT_MIN <= xValue <= INT_MAX:
+                numKind = 1
+                self.numSlots.append(len(self.ints))
+                self.ints.append(xValue)
+            elif isinstance(xValue, float):
+                numKind = 2
+                self.numSlots.append(len(self.floats))
+                self.floats.append(xValue)
+            else:
+                numKind = 3
+                self.numSlots.append(len(self.decimals))
+                self.decimals.append(xValue)
+        else:
+            self.numSlots.append(-1)
+            if not (isinstance(xValue, str) and xValue == sValue):
+                self.xValues[row] = xValue
+        self.numKinds.append(numKind)
+        if sValue != text:
+            self.sValues[row] = sValue
+        self.objectIndices.append(fact.objectIndex)
+        self.sourcelines.append(fact.sourceline or 0)
+        storedFact = StoredFact(self, row)
+        self.storedFacts.append(storedFact)
+        # replace fact element by stored fact
+        facts = modelXbrl.facts
+        for i in range(len(facts) - 1, -1, -1): # just discovered, or in a batch of streamed facts, at the end
+            if facts[i] is fact:
+                facts[i] = storedFact
+                break
+        modelXbrl.factsInInstance.discard(fact)
+        modelXbrl.factsInInstance.add(storedFact)
+        modelXbrl.modelObjects[fact.objectIndex] = storedFact
+        id = storedFact.id
+        if id and modelDocument.idObjects.get(id) is fact:
+            modelDocument.idObjects[id] = storedFact
+        fact.getparent().remove(fact)
+        return storedFact
+
+    def close(self):
+        self.__dict__.clear() # dereference
+
+class StoredFact:
+    """
+    .. class:: StoredFact(factStore, row)
+
+    Proxy of a fact in a FactStore with the ModelFact attribute surface (other than lxml element
+    navigation, a stored fact being a top-level item without child elements).
+    """
+    __slots__ = ("factStore", "row")
+
+    def __init__(self, factStore, row):
+        self.factStore = factStore
+        self.row = row
+
+    @property
+    def modelXbrl(self):
+        return self.factStore.modelXbrl
+
+    @property
+    def modelDocument(self):
+        return self.factStore.modelDocument
+
+    @property
+    def qname(self):
+        return self.factStore.qnames[self.factStore.qnameIds[self.row]]
+
+    elementQname = qname
+
+    @property
+    def concept(self):
+        return self.factStore.concepts[self.factStore.qnameIds[self.row]]
+
+    def elementDeclaration(self, validationModelXbrl=None):
+        return self.concept
+
+    viewConcept = concept
+
+    @property
+    def localName(self):
+        return self.qname.localName
+
+    @property
+    def namespaceURI(self):
+        return self.qname.namespaceURI
+
+    @property
+    def prefixedName(self):
+        qname = self.qname
+        if qname.prefix:
+            return qname.prefix + ":" + qname.localName
+        return qname.localName
+
+    @property
+    def id(self):
+        return self.factStore.string(self.factStore.idIds[self.row])
+
+    @property
+    def objectIndex(self):
+        return self.factStore.objectIndices[self.row]
+
+    def objectId(self, refId=""):
+        return "_{0}_{1}".format(refId, self.objectIndex)
+
+    @property
+    def sourceline(self):
+        return self.factStore.sourcelines[self.row] or None
+
+    @property
+    def context(self):
+        return self.factStore.contexts[self.factStore.contextIds[self.row]]
+
+    @property
+    def contextID(self):
+        return self.context.id
+
+    @property
+    def unit(self):
+        unitId = self.factStore.unitIds[self.row]
+        if unitId < 0:
+            return None
+        return self.factStore.units[unitId]
+
+    @property
+    def unitID(self):
+        unit = self.unit
+        if unit is None:
+            return None
+        return unit.id
+
+    def get(self, attrTag, default=None):
+        ''' attribute value, as of the element which was stored '''
+        if attrTag == "contextRef":
+            return self.contextID
+        if attrTag == "unitRef":
+            return self.unitID if self.unit is not None else default
+        if attrTag in STORED_ATTRIBUTES:
+            value = self.factStore.string(getattr(self.factStore, STORED_ATTRIBUTES[attrTag])[self.row])
+            if value is not None:
+                return value
+        return default
+
+    def getStripped(self, attrName):
+        attrValue = self.get(attrName)
+        if attrValue is not None:
+            return attrValue.strip()
+        return attrValue
+
+    def keys(self):
+        return [attrTag for attrTag in ("contextRef", "unitRef", "decimals", "precision", "id", XMLLANG, XSINIL)
+                if self.get(attrTag) is not None]
+
+    def items(self):
+        return [(attrTag, self.get(attrTag)) for attrTag in self.keys()]
+
+    @property
+    def parentElement(self):
+        return self.factStore.modelDocument.xmlRootElement
+
+    def getparent(self):
+        return self.parentElement
+
+    @property
+    def ancestorQnames(self):
+        return {XbrlConst.qnXbrliXbrl}
+
+    @property
+    def nsmap(self):
+        return self.parentElement.nsmap
+
+    def iterchildren(self, *args, **kwargs):
+        return iter(NO_TUPLE_FACTS)
+
+    def __len__(self):
+        return 0
+
+    @property
+    def modelTupleFacts(self):
+        return NO_TUPLE_FACTS
+
+    @property
+    def isItem(self):
+        return True
+
+    @property
+    def isTuple(self):
+        return False
+
+    @property
+    def isFraction(self):
+        return False
+
+    @property
+    def isNumeric(self):
+        return self.concept.isNumeric
+
+    @property
+    def isInteger(self):
+        return self.concept.isInteger
+
+    @property
+    def decimals(self):
+        decimals = self.get("decimals")
+        if decimals:
+            return decimals
+        type = self.concept.type
+        return type.fixedOrDefaultAttrValue("decimals") if type is not None else None
+
+    @property
+    def precision(self):
+        precision = self.get("precision")
+        if precision:
+            return precision
+        type = self.concept.type
+        return type.fixedOrDefaultAttrValue("precision") if type is not None else None
+
+    @property
+    def xmlLang(self):
+        lang = self.get(XMLLANG)
+        if lang is None:
+            lang = self.parentElement.get(XMLLANG)
+        if lang is None and self.modelXbrl.modelManager.validateDisclosureSystem:
+            if not self.concept.isNumeric:
+                lang = self.modelXbrl.modelManager.disclosureSystem.defaultXmlLang
+        return lang
+
+    @property
+    def xsiNil(self):
+        return self.get(XSINIL, "false")
+
+    @property
+    def isNil(self):
+        return self.xsiNil in ("true","1")
+
+    @property
+    def textValue(self):
+        return self.factStore.strings[self.factStore.valueIds[self.row]]
+
+    stringValue = text = textValue
+
+    @property
+    def xValid(self):
+        return self.factStore.xValids[self.row]
+
+    @property
+    def xValue(self):
+        factStore = self.factStore
+        row = self.row
+        numKind = factStore.numKinds[row]
+        if numKind == 1:
+            return factStore.ints[factStore.numSlots[row]]
+        if numKind == 2:
+            return factStore.floats[factStore.numSlots[row]]
+        if numKind == 3:
+            return factStore.decimals[factStore.numSlots[row]]
+        try:
+            return factStore.xValues[row]
+        except KeyError:
+            return self.sValue
+
+    @property
+    def sValue(self):
+        try:
+            return self.factStore.sValues[self.row]
+        except KeyError:
+            return self.textValue
+
+    @property
+    def conceptContextUnitLangHash(self):
+        context = self.context
+        unit = self.unit
+        return hash(
+            (self.qname,
+             context.contextDimAwareHash if context is not None else None,
+             unit.hash if unit is not None else None,
+             self.xmlLang) )
+
+    @property
+    def md5sum(self):
+        _toHash = [self.qname]
+        _lang = self.get(XMLLANG) or self.parentElement.get(XMLLANG)
+        if _lang:
+            _toHash.append(XbrlConst.qnXmlLang)
+            _toHash.append(_lang)
+        if self.isNil:
+            _toHash.append(XbrlConst.qnXsiNil)
+            _toHash.append("true")
+        elif self.value:
+            _toHash.append(self.value)
+        _toHash.append(self.context.md5sum)
+        if self.unit is not None:
+            _toHash.append(self.unit.md5sum)
+        return md5hash(_toHash)
+
+    # ModelFact properties and methods which only use the attribute surface above
+    utrEntries = ModelFact.utrEntries
+    unitSymbol = ModelFact.unitSymbol
+    isMultiLanguage = ModelFact.isMultiLanguage
+    value = ModelFact.value
+    effectiveValue = ModelFact.effectiveValue
+    vEqValue = ModelFact.vEqValue
+    isVEqualTo = ModelFact.isVEqualTo
+    isDuplicateOf = ModelFact.isDuplicateOf
+    propertyView = ModelFact.propertyView
+
+    def __repr__(self):
+        return ("storedFact[{0}, qname: {1}, contextRef: {2}, unitRef: {3}, value: {4}, {5}, line {6}]"
+                .format(self.objectIndex, self.qname, self.contextID, self.unitID,
+                        self.effectiveValue.strip(), self.modelDocument.basename, self.sourceline))
@@ -11,6 +11,7 @@ from arelle.ModelValue import qname, QName
 from arelle.ModelObject import ModelObject
 from arelle.ModelDtsObject import ModelResource
 from arelle.ModelInstanceObject import ModelFact
+from arelle.ModelFactStore import StoredFact
 from arelle.XbrlUtil import typedValue
 
 class Aspect:
@@ -151,6 +152,7 @@ class FormulaOptions():
         self.traceVariableExpressionEvaluation = False
         self.traceVariableExpressionResult = False
         self.testcaseResultsCaptureWarnings = False
+        self.parallelWorkers = 0 # worker processes for independent assertions, 0 or 1 evaluates sequentially
         if isinstance(savedValues, dict):
             self.__dict__.update(savedValues)
             
@@ -1787,7 +1789,7 @@ class ModelMatchFilter(ModelFilter):
             firstFact = None
             hasNonFact = False
             for fact in otherFact:
-                if not isinstance(fact,ModelFact):
+                if not isinstance(fact,(ModelFact,StoredFact)):
                     hasNonFact = True
                 elif firstFact is None:
                     firstFact = fact
@@ -1801,7 +1803,7 @@ class ModelMatchFilter(ModelFilter):
                 return set()
             if matchAll: # otherFact has the aspect value that the whole sequence has
                 otherFact = firstFact
-        if not isinstance(otherFact,(ModelFact,tuple,list)):
+        if not isinstance(otherFact,(ModelFact,StoredFact,tuple,list)):
             return set()
         if matchAll:
             return set(fact for fact in facts 
@@ -1953,7 +1955,7 @@ class ModelInstantDuration(ModelFilter):
     
     def filter(self, xpCtx, varBinding, facts, cmplmt):
         otherFact = xpCtx.inScopeVars.get(self.variable)
-        if (otherFact is not None and isinstance(otherFact,ModelFact) and otherFact.isItem and 
+        if (otherFact is not None and isinstance(otherFact,(ModelFact,StoredFact)) and otherFact.isItem and 
             otherFact.context is not None and otherFact.context.isStartEndPeriod):
             if self.boundary == 'start':
                 otherDatetime = otherFact.context.startDatetime
@@ -2104,7 +2106,7 @@ class ModelExplicitDimension(ModelFilter):
                                 elif memberModel.variable:
                                     otherFact = xpCtx.inScopeVars.get(memberModel.variable)
                                     # BUG: could be bound to a sequence!!!
-                                    if otherFact is not None and isinstance(otherFact,ModelFact) and otherFact.isItem:
+                                    if otherFact is not None and isinstance(otherFact,(ModelFact,StoredFact)) and otherFact.isItem:
                                         matchMemQname = otherFact.context.dimMemberQname(dimQname)
                                 elif memberModel.qnameExprProg:
                                     matchMemQname = xpCtx.evaluateAtomicValue(memberModel.qnameExprProg, 'xs:QName', fact)
@@ -2470,10 +2472,10 @@ class ModelLocationFilter(ModelFilter):
     
     def filter(self, xpCtx, varBinding, facts, cmplmt):
         varFacts = xpCtx.inScopeVars.get(self.variable,[])
-        if isinstance(varFacts,ModelFact):
+        if isinstance(varFacts,(ModelFact,StoredFact)):
             candidateElts = {varFacts}
         elif isinstance(varFacts,(list,tuple)):
-            candidateElts = set(f for f in varFacts if isinstance(f,ModelFact)) 
+            candidateElts = set(f for f in varFacts if isinstance(f,(ModelFact,StoredFact))) 
         return set(fact for fact in facts 
                    if cmplmt ^ ( len(candidateElts & self.evalLocation(xpCtx,fact) ) > 0 ))
    
@@ -2511,7 +2513,7 @@ class ModelSiblingFilter(ModelFilter):
         otherFact = xpCtx.inScopeVars.get(self.variable)
         while isinstance(otherFact,(list,tuple)) and len(otherFact) > 0:
             otherFact = otherFact[0]  # dereference if in a list
-        if isinstance(otherFact,ModelFact):
+        if isinstance(otherFact,(ModelFact,StoredFact)):
             otherFactParent = otherFact.parentElement
         else:
             otherFactParent = None
@@ -1044,6 +1044,20 @@ class ModelContext(ModelObject):
             self._dimsHash = hash( frozenset(self.qnameDims.values()) )
             return self._dimsHash
     
+    @property
+    def dimsValiditySignature(self):
+        """(tuple) -- Of segment and scenario, the dimension members (None for typed dimensions) and whether there
+        are non-XDT contents, on which the dimensional validity of facts of this context depends."""
+        try:
+            return self._dimsValiditySignature
+        except AttributeError:
+            self._dimsValiditySignature = tuple(
+                (frozenset((dimConcept, modelDimValue.member if modelDimValue.isExplicit else None)
+                           for dimConcept, modelDimValue in self.dimValues(contextElement).items()),
+                 len(self.nonDimValues(contextElement)) > 0)
+                for contextElement in ("segment", "scenario"))
+            return self._dimsValiditySignature
+    
     def nonDimValues(self, contextElement):
         """([ModelObject]) -- ContextElement is either string or Aspect code for segment or scenario, returns nonXDT ModelObject children of context element.
         
@@ -25,6 +25,30 @@ class ModelManager:
     
         True if disclosure system is to be validated (e.g., EFM)
         
+        .. attribute:: dtsImages
+        
+        True to save and use DTS images of taxonomy entry points (see DtsImage.py)
+        
+        .. attribute:: taxonomyCache
+        
+        TaxonomyCache of taxonomies shared by successively loaded filings, if enabled (see TaxonomyCache.py)
+        
+        .. attribute:: discoveryWorkers
+        
+        Number of threads prefetching DTS documents during loading, if more than one (see DocumentPrefetcher.py)
+        
+        .. attribute:: factStore
+        
+        True to keep the facts of instances loaded by OIM or streaming in a columnar FactStore (see ModelFactStore.py)
+        
+        .. attribute:: rssWorkers
+        
+        Number of worker processes validating the filings of RSS feed items, if more than one (see ValidateRssParallel.py)
+        
+        .. attribute:: testcaseWorkers
+        
+        Number of worker processes validating the variations of testcases, if more than one (see ValidateTestcaseParallel.py)
+        
         .. attribute:: disclosureSystem
         
         Disclosure system object.  To select the disclosure system, e.g., 'gfm', moduleManager.disclosureSystem.select('gfm').
@@ -61,6 +85,12 @@ class ModelManager:
         self.validateUtr = False
         self.skipDTS = False
         self.skipLoading = None
+        self.dtsImages = False
+        self.taxonomyCache = None
+        self.discoveryWorkers = 0
+        self.factStore = False
+        self.rssWorkers = 0
+        self.testcaseWorkers = 0
         self.abortOnMajorError = False
         self.collectProfileStats = False
         self.loadedModelXbrls = []
@@ -20,19 +20,28 @@ NoneType = type(None)
 def create(modelXbrl, arcrole, linkrole=None, linkqname=None, arcqname=None, includeProhibits=False):
     return ModelRelationshipSet(modelXbrl, arcrole, linkrole, linkqname, arcqname, includeProhibits)
 
+def linkArcIndex(modelLink):
+    # returns list of (arcElement, arcrole, arc qname, from label, to label) of the link's arcs, in document order
+    try:
+        return modelLink.arcIndex # built by ModelDocument.linkbaseDiscover
+    except AttributeError: # links not discovered from a linkbase, such as inline XBRL link prototypes
+        modelLink.arcIndex = arcIndex = [
+            (linkChild, linkChild.get("{http://www.w3.org/1999/xlink}arcrole"), linkChild.qname,
+             linkChild.get("{http://www.w3.org/1999/xlink}from"), linkChild.get("{http://www.w3.org/1999/xlink}to"))
+            for linkChild in modelLink
+            if isinstance(linkChild,(ModelObject,PrototypeObject)) and
+               linkChild.get("{http://www.w3.org/1999/xlink}type") == "arc"]
+        return arcIndex
+
 def ineffectiveArcs(baseSetModelLinks, arcrole, arcqname=None):
     hashEquivalentRels = defaultdict(list)
     for modelLink in baseSetModelLinks:
-        for linkChild in modelLink:
-            if (isinstance(linkChild,(ModelObject,PrototypeObject)) and 
-                linkChild.get("{http://www.w3.org/1999/xlink}type") == "arc" and 
-                arcrole == linkChild.get("{http://www.w3.org/1999/xlink}arcrole") and
-                (arcqname is None or arcqname == linkChild)):
-                fromLabel = linkChild.get("{http://www.w3.org/1999/xlink}from")
-                toLabel = linkChild.get("{http://www.w3.org/1999/xlink}to")
+        for arcElement, linkChildArcrole, arcQn, fromLabel, toLabel in linkArcIndex(modelLink):
+            if (arcrole == linkChildArcrole and
+                (arcqname is None or arcqname == arcElement)):
                 for fromResource in modelLink.labeledResources[fromLabel]:
                     for toResource in modelLink.labeledResources[toLabel]:
-                        modelRel = ModelDtsObject.ModelRelationship(modelLink.modelDocument, linkChild, fromResource.dereference(), toResource.dereference())
+                        modelRel = ModelDtsObject.ModelRelationship(modelLink.modelDocument, arcElement, fromResource.dereference(), toResource.dereference())
                         hashEquivalentRels[modelRel.equivalenceHash].append(modelRel)
     # determine ineffective relationships
     ineffectives = []
@@ -120,9 +129,13 @@ class ModelRelationshipSet:
             modelLinks = self.modelXbrl.baseSets.get((arcrole, linkrole, linkqname, arcqname), [])
         else: # arcrole is a set of arcroles
             modelLinks = []
+            modelLinksFound = set() # a link with arcs of several of the arcroles is only gathered once
             for ar in (arcrole,) if isinstance(arcrole, (str, NoneType)) else arcrole:
                 for lr in (linkrole,) if isinstance(linkrole, (str, NoneType)) else linkrole:
-                    modelLinks.extend(self.modelXbrl.baseSets.get((ar, lr, linkqname, arcqname), []))
+                    for modelLink in self.modelXbrl.baseSets.get((ar, lr, linkqname, arcqname), ()):
+                        if modelLink not in modelLinksFound:
+                            modelLinksFound.add(modelLink)
+                            modelLinks.append(modelLink)
             
         # gather arcs
         relationships = {}
@@ -136,29 +149,27 @@ class ModelRelationshipSet:
         for modelLink in modelLinks:
             arcs = []
             linkEltQname = modelLink.qname
-            for linkChild in modelLink:
-                linkChildArcrole = linkChild.get("{http://www.w3.org/1999/xlink}arcrole")
-                if linkChild.get("{http://www.w3.org/1999/xlink}type") == "arc" and linkChildArcrole:
+            for arc in linkArcIndex(modelLink):
+                linkChildArcrole = arc[1]
+                if linkChildArcrole:
                     if isFootnoteRel: # arcrole is fact-footnote or other custom footnote relationship
-                        arcs.append(linkChild)
+                        arcs.append(arc)
                     elif isDimensionRel: 
                         if XbrlConst.isDimensionArcrole(linkChildArcrole):
-                            arcs.append(linkChild)
+                            arcs.append(arc)
                     elif isFormulaRel:
                         if XbrlConst.isFormulaArcrole(linkChildArcrole):
-                            arcs.append(linkChild)
+                            arcs.append(arc)
                     elif isTableRenderingRel:
                         if XbrlConst.isTableRenderingArcrole(linkChildArcrole):
-                            arcs.append(linkChild)
+                            arcs.append(arc)
                     elif (linkChildArcrole in arcrole and 
-                          (arcqname is None or arcqname == linkChild.qname) and 
+                          (arcqname is None or arcqname == arc[2]) and 
                           (linkqname is None or linkqname == linkEltQname)):
-                        arcs.append(linkChild)
+                        arcs.append(arc)
                         
             # build network
-            for arcElement in arcs:
-                fromLabel = arcElement.get("{http://www.w3.org/1999/xlink}from")
-                toLabel = arcElement.get("{http://www.w3.org/1999/xlink}to")
+            for arcElement, linkChildArcrole, arcQn, fromLabel, toLabel in arcs:
                 for fromResource in modelLink.labeledResources[fromLabel]:
                     for toResource in modelLink.labeledResources[toLabel]:
                         if isinstance(fromResource,(ModelResource,LocPrototype)) and isinstance(toResource,(ModelResource,LocPrototype)):
@@ -192,6 +192,11 @@ class QName:
     def __bool__(self):
         # QName object bool is false if there is no local name (even if there is a namespace URI).
         return bool(self.localName)
+    def __getstate__(self):
+        # string hashes differ between processes, qnameValueHash is recomputed when unpickled
+        return (self.prefix, self.namespaceURI, self.localName)
+    def __setstate__(self, state):
+        QName.__init__(self, *state)
 
 from arelle.ModelObject import ModelObject
     
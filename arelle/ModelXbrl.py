@@ -64,12 +64,21 @@ def load(modelManager, url, nextaction=None, base=None, useFileSource=None, erro
     else:
         modelXbrl.fileSource = FileSource.FileSource(url, modelManager.cntlr)
         modelXbrl.closeFileSource= True
-    modelXbrl.modelDocument = ModelDocument.load(modelXbrl, url, base, isEntry=True, **kwargs)
-    if supplementalUrls:
-        for url in supplementalUrls:
-            ModelDocument.load(modelXbrl, url, base, isEntry=False, isDiscovered=True, **kwargs)
-    del modelXbrl.entryLoadingUrl
-    loadSchemalocatedSchemas(modelXbrl)
+    if modelManager.discoveryWorkers > 1:
+        from arelle import DocumentPrefetcher
+        if DocumentPrefetcher.isApplicable(modelXbrl):
+            modelXbrl.documentPrefetcher = DocumentPrefetcher.DocumentPrefetcher(modelXbrl, modelManager.discoveryWorkers)
+    try:
+        modelXbrl.modelDocument = ModelDocument.load(modelXbrl, url, base, isEntry=True, **kwargs)
+        if supplementalUrls:
+            for url in supplementalUrls:
+                ModelDocument.load(modelXbrl, url, base, isEntry=False, isDiscovered=True, **kwargs)
+        del modelXbrl.entryLoadingUrl
+        loadSchemalocatedSchemas(modelXbrl)
+    finally:
+        if modelXbrl.documentPrefetcher is not None:
+            modelXbrl.documentPrefetcher.close() # documents prefetched but not discovered are discarded
+            modelXbrl.documentPrefetcher = None
     
     #from arelle import XmlValidate
     #uncomment for trial use of lxml xml schema validation of entry document
@@ -176,6 +185,10 @@ class ModelXbrl:
 
         List of all facts in instance (including nested in tuples), document order
 
+        .. attribute:: factStore
+
+        FactStore of the instance's top-level item facts, if modelManager.factStore and the instance is loaded by OIM or streaming (see ModelFactStore.py), else None
+
         .. attribute:: contexts
 
         Dict of contexts by id
@@ -270,9 +283,14 @@ class ModelXbrl:
         self.baseSets = defaultdict(list) # contains ModelLinks for keys arcrole, arcrole#linkrole
         self.relationshipSets = {} # contains ModelRelationshipSets by bas set keys
         self.qnameDimensionDefaults = {} # contains qname of dimension (index) and default member(value)
+        self.priItemElrHcRels = {} # has-hypercube relationships by ELR, by (primary item, ELR)
+        self.dimensionMembersUsable = {} # usable members by (dimension, domain ELR)
+        self.dimensionalValidity = {} # fact dimensional validity by (primary item, context dimsValiditySignature)
+        self.dimensionalValidityCacheHits = 0
         self.facts = []
         self.factsInInstance = set()
         self.undefinedFacts = [] # elements presumed to be facts but not defined
+        self.factStore = None
         self.contexts = {}
         self.units = {}
         self.modelObjects = []
@@ -297,6 +315,11 @@ class ModelXbrl:
         self.logRefHasPluginProperties = any(True for m in pluginClassMethods("Logging.Ref.Properties"))
         self.profileStats = {}
         self.schemaDocsToValidate = set()
+        self.dtsImages = {} # by entry url of DTS images opened (or None if not available)
+        self.dtsImageDocs = {} # by document url of DTS image restoring its PSVI
+        self.dtsImageLoadedWithoutErrors = False # entry point and DTS loaded without errors or warnings
+        self.taxonomyCacheGroup = None # taxonomy attached from modelManager.taxonomyCache, False if none
+        self.documentPrefetcher = None # prefetches DTS documents during loading, if modelManager.discoveryWorkers > 1
         self.modelXbrl = self # for consistency in addressing modelXbrl
         self.arelleUnitTests = {} # unit test entries (usually from processing instructions
         for pluginXbrlMethod in pluginClassMethods("ModelXbrl.Init"):
@@ -308,8 +331,16 @@ class ModelXbrl:
         """
         if not self.isClosed:
             self.closeViews()
+            if self.modelManager.dtsImages:
+                from arelle import DtsImage
+                DtsImage.save(self)
+                DtsImage.close(self)
+            if self.taxonomyCacheGroup:
+                self.modelManager.taxonomyCache.detach(self) # taxonomy documents are not closed with this DTS
             if self.formulaOutputInstance:
                 self.formulaOutputInstance.close()
+            if self.factStore is not None:
+                self.factStore.close()
             if hasattr(self,"fileSource") and self.closeFileSource:
                 self.fileSource.close()
             modelDocument = getattr(self,"modelDocument",None)
@@ -891,6 +922,8 @@ class ModelXbrl:
                 self._factsByPeriodType[newFact.concept.periodType].add(newFact)
             if hasattr(self, "_factsByDimQname"):
                 del self._factsByDimQname
+        if hasattr(self, "_factsByAspectHashKey"):
+            del self._factsByAspectHashKey # formula implicit filtering index
         self.setIsModified()
         return newFact    
         
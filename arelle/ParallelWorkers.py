@@ -0,0 +1,131 @@
+'''
+Created on Oct 18, 2026
+
+Performs the tasks of a parallel validation in forked worker processes of a multiprocessing Pool,
+returning their results in task order.
+
+A Pool replaces a worker process which exits (or is killed) while performing a task, but neither
+performs that task again nor reports it, so its result would be awaited forever.  Each task records
+the pid of the worker performing it, and while its result is awaited the worker is checked to still
+be alive; a task lost with its worker is reported to the caller (lostTask), and its result is None.
+A worker may exit after taking a task but before recording its pid, so a task whose pid remains
+unrecorded after the pool's worker processes have changed since dispatch is also lost (tasks are
+taken in order, so an awaited task, whose predecessors are done, is not waiting behind others).
+
+A worker's log messages are captured (captureWorkerLog) rather than output, and returned with its
+log count increments and errors (workerLogSince) to be merged into the parent's ModelXbrl
+(mergeWorkerLog), in task order, so logs are as if the tasks had been performed sequentially.
+
+@author: Mark V Systems Limited
+(c) Copyright 2026 Mark V Systems Limited, All rights reserved.
+'''
+import os, logging
+
+WORKER_CHECK_INTERVAL = 1.0 # seconds between checks of the worker performing an awaited task
+
+_tasks = None # (task, pid of worker performing each task) inherited by forked workers
+
+class LogCaptureHandler(logging.Handler):
+    def __init__(self):
+        super(LogCaptureHandler, self).__init__()
+        self.records = []
+
+    def emit(self, logRecord):
+        if logRecord.exc_info and not logRecord.exc_text: # tracebacks aren't picklable, keep their text
+            logRecord.exc_text = logging.Formatter().formatException(logRecord.exc_info)
+        logRecord.exc_info = None
+        self.records.append(logRecord)
+
+def parallelTasks(context, numWorkers, task, numTasks, initializer=None, maxtasksperchild=None, lostTask=None):
+    ''' returns (pool, iterator of task(i) results, for i in range(numTasks), in task order);
+        a task lost with its worker process is not performed again, lostTask(i) is called and its result is None '''
+    global _tasks
+    _tasks = (task, context.RawArray("i", numTasks))
+    pool = context.Pool(numWorkers, initializer=initializer, maxtasksperchild=maxtasksperchild)
+    pool.lostTasks = []
+    pool.dispatchWorkerPids = workerPids(pool)
+    pool.taskResults = orderedResults(pool, [pool.apply_async(performTask, (i,)) for i in range(numTasks)],
+                                      _tasks[1], lostTask)
+    return pool, pool.taskResults
+
+def closeParallelTasks(pool):
+    global _tasks
+    for result in pool.taskResults: # awaits tasks whose results were not taken
+        pass
+    pool.close()
+    if pool.lostTasks: # results of lost tasks remain pending, so the pool would not finish its workers
+        pool.terminate()
+    pool.join()
+    _tasks = None
+
+def performTask(i):
+    task, taskWorkerPids = _tasks
+    taskWorkerPids[i] = os.getpid()
+    return task(i)
+
+def workerPids(pool):
+    return frozenset(process.pid for process in getattr(pool, "_pool", ()))
+
+def isProcessAlive(pid):
+    # pool reaps exited workers, so a pid which can't be signalled is of an exited worker
+    try:
+        os.kill(pid, 0)
+        return True
+    except OSError:
+        return False
+
+def isTaskWorkerExited(pool, taskWorkerPid):
+    if taskWorkerPid > 0:
+        return not isProcessAlive(taskWorkerPid)
+    # pid not recorded: the worker taking the task may have exited before recording it
+    return workerPids(pool) != pool.dispatchWorkerPids
+
+def orderedResults(pool, asyncResults, taskWorkerPids, lostTask):
+    for i, asyncResult in enumerate(asyncResults):
+        workerExited = False
+        while not asyncResult.ready():
+            asyncResult.wait(WORKER_CHECK_INTERVAL)
+            if asyncResult.ready():
+                break
+            if workerExited and isTaskWorkerExited(pool, taskWorkerPids[i]):
+                break # result not returned in the interval after its worker exited
+            workerExited = isTaskWorkerExited(pool, taskWorkerPids[i])
+        if asyncResult.ready():
+            yield asyncResult.get()
+        else:
+            pool.lostTasks.append(i)
+            if lostTask is not None:
+                lostTask(i)
+            yield None
+
+def captureWorkerLog(modelXbrl):
+    # redirect worker's log messages (of modelXbrl and ModelXbrls sharing its logger) to a capture handler
+    logger = modelXbrl.logger
+    logger.handlers = [LogCaptureHandler()]
+    logger.propagate = False
+
+def workerLogMark(modelXbrl):
+    return (modelXbrl.logCount.copy(), len(modelXbrl.errors))
+
+def workerLogSince(modelXbrl, mark):
+    ''' returns (log records, log count increments, errors) of modelXbrl since workerLogMark, releasing the records '''
+    priorLogCount, priorErrorsLen = mark
+    captureHandler = modelXbrl.logger.handlers[0]
+    records = captureHandler.records
+    captureHandler.records = []
+    return (records,
+            dict((level, count - priorLogCount.get(level, 0))
+                 for level, count in modelXbrl.logCount.items()
+                 if count != priorLogCount.get(level, 0)),
+            modelXbrl.errors[priorErrorsLen:])
+
+def mergeLogCounts(modelXbrl, logCountIncrements, errors):
+    for level, count in logCountIncrements.items():
+        modelXbrl.logCount[level] = modelXbrl.logCount.get(level, 0) + count
+    modelXbrl.errors.extend(errors)
+
+def mergeWorkerLog(modelXbrl, workerLog):
+    records, logCountIncrements, errors = workerLog
+    mergeLogCounts(modelXbrl, logCountIncrements, errors)
+    for record in records: # already filtered and counted by worker's ModelXbrl.log
+        modelXbrl.logger.handle(record)
@@ -0,0 +1,224 @@
+'''
+Created on Oct 18, 2026
+
+In-process cache of the taxonomies discovered by filings, so that filings loaded one after
+another by a process (entry point lists, the web server, RSS feed validation) attach the
+already discovered taxonomy documents instead of each discovering them again.
+
+When a document of a filing (in the directory of its entry point) discovers its first document
+outside the filing, the outside documents which that filing document references by import,
+schemaRef, linkbaseRef and loc are loaded as a group into a taxonomy ModelXbrl of the cache, or found
+there from an earlier filing.  The group's documents and DTS indices (concepts, types, role
+and arcrole types, base sets and so on) are then attached to the filing's ModelXbrl, and
+relationship sets are resolved by the filing from the combined base sets as usual.
+
+Taxonomy model objects reach their DTS by modelDocument.modelXbrl (such as for labels of
+standard concepts, which filings may extend), so while attached the group's documents are
+pointed at the filing's ModelXbrl, and a group is leased to one ModelXbrl at a time; a filing
+loaded while the group it needs is leased to another loads the taxonomy itself.  Groups which
+load with warnings or errors, or have formula or table linkbases (whose compiled expressions
+are kept on their model objects), are attached to the filing that loaded them but not kept.
+Idle groups are closed, least recently used first, when the estimated memory of the cache
+exceeds its budget.  A group may also be preloaded, by the entry points its filings reference (such
+as by the web server before forking its worker processes, which then share the preloaded taxonomies).
+
+@author: Mark V Systems Limited
+(c) Copyright 2026 Mark V Systems Limited, All rights reserved.
+'''
+import logging, threading
+from collections import OrderedDict
+from arelle import XbrlConst, XmlValidateSchema
+from arelle.DtsImage import fileSignature
+from arelle.ModelObject import ModelObject
+from arelle.ParallelWorkers import mergeLogCounts
+from arelle.PluginManager import pluginClassMethods
+
+ESTIMATED_BYTES_PER_OBJECT = 2000 # lxml node, proxy and python attributes of a typical taxonomy model object
+DTS_DICTS = ("urlDocs", "qnameConcepts", "qnameAttributes", "qnameAttributeGroups", "qnameGroupDefinitions",
+             "qnameTypes", "qnameParameters", "modelCustomFunctionSignatures")
+DTS_DICTS_OF_LISTS = ("namespaceDocs", "arcroleTypes", "roleTypes", "nameConcepts", "baseSets")
+DTS_SETS = ("modelVariableSets", "modelCustomFunctionImplementations", "modelRenderingTables", "langs", "labelroles")
+DTS_FLAGS = ("hasXDT", "hasTableRendering", "hasTableIndexing", "hasFormulae")
+
+class TaxonomyGroup:
+    def __init__(self, key, modelXbrl, isRetained):
+        self.key = key
+        self.modelXbrl = modelXbrl
+        self.isRetained = isRetained
+        self.lessee = None
+        self.modelDocuments = []
+        for modelDocument in modelXbrl.urlDocs.values():
+            if modelDocument not in self.modelDocuments: # a document may be under more than one url
+                self.modelDocuments.append(modelDocument)
+        self.fileSignatures = dict((modelDocument.filepath, fileSignature(modelDocument.filepath))
+                                   for modelDocument in self.modelDocuments)
+        self.estimatedBytes = len(modelXbrl.modelObjects) * ESTIMATED_BYTES_PER_OBJECT
+
+    def isUnchanged(self):
+        return all(fileSignature(filepath) == signature
+                   for filepath, signature in self.fileSignatures.items())
+
+    def close(self):
+        self.modelXbrl.close()
+        self.modelDocuments = []
+
+class TaxonomyCache:
+    def __init__(self, modelManager, maxBytes):
+        self.modelManager = modelManager
+        self.maxBytes = maxBytes
+        self.groups = OrderedDict() # by key of referenced urls, least recently used first
+        self.lock = threading.Lock()
+
+    def externalReferences(self, modelDocument, uriDir):
+        ''' returns (referring element, url, base, namespace) of each document outside uriDir referenced by modelDocument '''
+        normalizeUrl = self.modelManager.cntlr.webCache.normalizeUrl
+        references = []
+        for elt in modelDocument.xmlRootElement.iter(tag=("{http://www.w3.org/2001/XMLSchema}import",
+                                                         "{http://www.xbrl.org/2003/linkbase}schemaRef",
+                                                         "{http://www.xbrl.org/2003/linkbase}linkbaseRef",
+                                                         "{http://www.xbrl.org/2003/linkbase}loc")):
+            if not isinstance(elt, ModelObject):
+                continue
+            if elt.namespaceURI == XbrlConst.xsd:
+                url = elt.get("schemaLocation")
+                namespace = elt.get("namespace")
+                if not namespace:
+                    continue
+            else:
+                url = (elt.get("{http://www.w3.org/1999/xlink}href") or "").partition("#")[0]
+                namespace = None
+            if url:
+                base = modelDocument.baseForElement(elt)
+                normalizedUrl = normalizeUrl(url, base)
+                if not normalizedUrl.startswith(uriDir) and all(normalizedUrl != r[1] for r in references):
+                    references.append((elt, normalizedUrl, base, namespace))
+        return references
+
+    def attach(self, modelXbrl, url, referringElement):
+        ''' called by ModelDocument.load when url is discovered before any other document outside the filing '''
+        uriDir = getattr(modelXbrl, "uriDir", None)
+        referringDocument = getattr(referringElement, "modelDocument", None)
+        if (uriDir is None or referringDocument is None or url.startswith(uriDir) or
+            not referringDocument.uri.startswith(uriDir)):
+            return # not a filing document discovering a taxonomy
+        references = self.externalReferences(referringDocument, uriDir)
+        key = tuple(r[1] for r in references)
+        if url not in key:
+            return # not discovered by reference from the filing document itself
+        modelXbrl.taxonomyCacheGroup = False # only the first taxonomy discovery is attached
+        if modelXbrl.skipDTS or any(True for pluginMethod in pluginClassMethods("ModelDocument.InstanceSchemaRefRewriter")):
+            return # discovered urls may be different than referenced urls
+        with self.lock:
+            group = self.groups.get(key)
+            if group is not None:
+                if group.lessee is not None:
+                    return # in use by another ModelXbrl, this one loads its own
+                if not group.isUnchanged():
+                    del self.groups[key]
+                    group.close()
+                    group = None
+            if group is None:
+                group = self.loadGroup(modelXbrl, key, references)
+                if group.isRetained:
+                    self.groups[key] = group
+            if any(modelDocument.uri in modelXbrl.urlDocs for modelDocument in group.modelDocuments):
+                self.release(group) # already has some of these documents, don't mix them
+                return
+            group.lessee = modelXbrl
+            self.evict()
+        modelXbrl.taxonomyCacheGroup = group
+        taxonomyXbrl = group.modelXbrl
+        for modelDocument in group.modelDocuments:
+            modelDocument.modelXbrl = modelXbrl
+        for name in DTS_DICTS:
+            getattr(modelXbrl, name).update(getattr(taxonomyXbrl, name))
+        for name in DTS_DICTS_OF_LISTS:
+            dictOfLists = getattr(modelXbrl, name)
+            for dictKey, values in getattr(taxonomyXbrl, name).items():
+                dictOfLists[dictKey].extend(values)
+        for name in DTS_SETS:
+            getattr(modelXbrl, name).update(getattr(taxonomyXbrl, name))
+        for name in DTS_FLAGS:
+            if getattr(taxonomyXbrl, name):
+                setattr(modelXbrl, name, True)
+        # object indices of filing objects follow those of the taxonomy objects
+        filingObjects = modelXbrl.modelObjects
+        modelXbrl.modelObjects = taxonomyXbrl.modelObjects[:]
+        for modelObject in filingObjects:
+            modelObject.objectIndex = len(modelXbrl.modelObjects)
+            modelXbrl.modelObjects.append(modelObject)
+
+    def preload(self, urls):
+        ''' loads the taxonomy of entry point urls (which filing documents reference together) into the cache
+            before filings are loaded, such as before forking web server worker processes which then share it,
+            returns True if the taxonomy is retained by the cache '''
+        normalizeUrl = self.modelManager.cntlr.webCache.normalizeUrl
+        key = tuple(normalizeUrl(url) for url in urls)
+        with self.lock:
+            if key not in self.groups:
+                group = self.loadGroup(None, key, [(None, url, None, None) for url in key])
+                if not group.isRetained:
+                    group.close()
+                    return False
+                self.groups[key] = group
+                self.evict()
+            return key in self.groups
+
+    def loadGroup(self, modelXbrl, key, references):
+        ''' loads the group of referenced taxonomy urls for modelXbrl, or for preload if modelXbrl is None '''
+        from arelle import ModelXbrl, ModelDocument, FileSource
+        taxonomyXbrl = ModelXbrl.create(self.modelManager, errorCaptureLevel=getattr(modelXbrl, "errorCaptureLevel", None))
+        taxonomyXbrl.fileSource = FileSource.FileSource(key[0], self.modelManager.cntlr)
+        taxonomyXbrl.closeFileSource = True
+        taxonomyXbrl.taxonomyCacheGroup = False # its documents aren't attached from the cache
+        taxonomyXbrl.uriDir = getattr(modelXbrl, "uriDir", "") # preloaded documents are all outside of any filing
+        taxonomyXbrl.entryLoadingUrl = getattr(modelXbrl, "entryLoadingUrl", key[0]) # messages are relative to filing
+        for referringElement, url, base, namespace in references:
+            ModelDocument.load(taxonomyXbrl, url, base=base, isDiscovered=True, namespace=namespace,
+                               referringElement=referringElement)
+        taxonomyXbrl.modelDocument = taxonomyXbrl.urlDocs.get(key[0]) # for schemaLocated schemas and closing
+        ModelXbrl.loadSchemalocatedSchemas(taxonomyXbrl)
+        while taxonomyXbrl.schemaDocsToValidate:
+            doc = taxonomyXbrl.schemaDocsToValidate.pop()
+            XmlValidateSchema.validate(doc, doc.xmlRootElement, doc.targetNamespace)
+        del taxonomyXbrl.entryLoadingUrl
+        isRetained = not (taxonomyXbrl.errors or
+                          any(level > logging.INFO for level in taxonomyXbrl.logCount.keys()) or
+                          taxonomyXbrl.hasFormulae or taxonomyXbrl.hasTableRendering)
+        if modelXbrl is not None: # loading messages are the filing's
+            mergeLogCounts(modelXbrl, taxonomyXbrl.logCount, taxonomyXbrl.errors)
+        return TaxonomyGroup(key, taxonomyXbrl, isRetained)
+
+    def detach(self, modelXbrl):
+        ''' called by ModelXbrl.close before closing the filing's own documents '''
+        group = modelXbrl.taxonomyCacheGroup
+        modelXbrl.taxonomyCacheGroup = None
+        sharedDocuments = set(group.modelDocuments)
+        for modelDocument in group.modelDocuments:
+            modelDocument.modelXbrl = group.modelXbrl
+        for url, modelDocument in list(modelXbrl.urlDocs.items()):
+            if modelDocument in sharedDocuments:
+                del modelXbrl.urlDocs[url]
+            else:
+                for referencedDocument in sharedDocuments.intersection(modelDocument.referencesDocument.keys()):
+                    del modelDocument.referencesDocument[referencedDocument]
+        with self.lock:
+            group.lessee = None
+            self.release(group)
+
+    def release(self, group):
+        if self.groups.get(group.key) is group:
+            self.groups.move_to_end(group.key) # most recently used
+        else:
+            group.close()
+        self.evict()
+
+    def evict(self):
+        totalBytes = sum(group.estimatedBytes for group in self.groups.values())
+        for key, group in list(self.groups.items()):
+            if totalBytes <= self.maxBytes:
+                break
+            if group.lessee is None:
+                del self.groups[key]
+                totalBytes -= group.estimatedBytes
+                group.close()
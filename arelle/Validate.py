@@ -66,6 +66,9 @@ class Validate:
                 _("Validation skipped, document not successfully loaded: %(file)s"),
                 modelXbrl=self.modelXbrl, file=self.modelXbrl.modelDocument.basename)
         elif self.modelXbrl.modelDocument.type in (Type.TESTCASESINDEX, Type.REGISTRY, Type.TESTCASE, Type.REGISTRYTESTCASE):
+            from arelle.ValidateTestcaseParallel import (parallelTestcaseVariationValidations,
+                                                         closeParallelTestcaseVariationValidations)
+            pool = None
             try:
                 _disclosureSystem = self.modelXbrl.modelManager.disclosureSystem
                 if _disclosureSystem.name:
@@ -80,14 +83,16 @@ class Validate:
                                 _name = testcasesElement.get("name")
                             break
                     self.modelXbrl.info("info", _("Testcases - %(name)s"), modelXbrl=self.modelXbrl.modelDocument, name=_name)
+                pool, testcaseVariationValidations = parallelTestcaseVariationValidations(self, self.modelXbrl.modelDocument)
+                if self.modelXbrl.modelDocument.type in (Type.TESTCASESINDEX, Type.REGISTRY):
                     _statusCounts = OrderedDict((("pass",0),("fail",0)))
                     for doc in sorted(self.modelXbrl.modelDocument.referencesDocument.keys(), key=lambda doc: doc.uri):
-                        self.validateTestcase(doc)  # testcases doc's are sorted by their uri (file names), e.g., for formula
+                        self.validateTestcase(doc, testcaseVariationValidations)  # testcases doc's are sorted by their uri (file names), e.g., for formula
                         for tv in getattr(doc, "testcaseVariations", ()):
                             _statusCounts[tv.status] = _statusCounts.get(tv.status, 0) + 1
                     self.modelXbrl.info("arelle:testSuiteResults", ", ".join("{}={}".format(k,c) for k, c in _statusCounts.items() if k))
                 elif self.modelXbrl.modelDocument.type in (Type.TESTCASE, Type.REGISTRYTESTCASE):
-                    self.validateTestcase(self.modelXbrl.modelDocument)
+                    self.validateTestcase(self.modelXbrl.modelDocument, testcaseVariationValidations)
             except Exception as err:
                 self.modelXbrl.error("exception:" + type(err).__name__,
                     _("Testcase validation exception: %(error)s, testcase: %(testcase)s"),
@@ -95,6 +100,9 @@ class Validate:
                     testcase=self.modelXbrl.modelDocument.basename, error=err,
                     #traceback=traceback.format_tb(sys.exc_info()[2]),
                     exc_info=True)
+            finally:
+                if pool is not None:
+                    closeParallelTestcaseVariationValidations(pool)
         elif self.modelXbrl.modelDocument.type == Type.VERSIONINGREPORT:
             try:
                 ValidateVersReport.ValidateVersReport(self.modelXbrl).validate(self.modelXbrl)
@@ -120,367 +128,86 @@ class Validate:
                     exc_info=(type(err) is not AssertionError))
         self.close()
         
-    def validateRssFeed(self):
+    def validateRssFeed(self, rssItems=None):
+        # rssItems, if specified, are the items of the feed to validate, such as new items of a watched feed
         self.modelXbrl.info("info", "RSS Feed", modelDocument=self.modelXbrl)
+        from arelle.ValidateRssParallel import (parallelRssItemValidations, mergeRssItemValidation,
+                                                closeParallelRssItemValidations)
+        if rssItems is None:
+            rssItems = self.modelXbrl.modelDocument.rssItems
+        try:
+            pool, rssItemValidations = parallelRssItemValidations(self, rssItems)
+            try:
+                for rssItem in rssItems:
+                    if getattr(rssItem, "skipRssItem", False):
+                        self.modelXbrl.info("info", _("skipping RSS Item %(accessionNumber)s %(formType)s %(companyName)s %(period)s"),
+                            modelObject=rssItem, accessionNumber=rssItem.accessionNumber, formType=rssItem.formType, companyName=rssItem.companyName, period=rssItem.period)
+                        continue
+                    self.modelXbrl.info("info", _("RSS Item %(accessionNumber)s %(formType)s %(companyName)s %(period)s"),
+                        modelObject=rssItem, accessionNumber=rssItem.accessionNumber, formType=rssItem.formType, companyName=rssItem.companyName, period=rssItem.period)
+                    if pool is not None:
+                        mergeRssItemValidation(self, rssItem, next(rssItemValidations))
+                    else:
+                        self.validateRssItem(rssItem)
+            finally:
+                if pool is not None:
+                    closeParallelRssItemValidations(pool)
+        finally: # even if validation is interrupted, e.g., to commit filings already stored in batches
+            for pluginXbrlMethod in pluginClassMethods("Validate.RssFeed.Finally"):
+                pluginXbrlMethod(self, rssItems) # e.g., commit filings stored in batches
+
+    def validateRssItem(self, rssItem, beforeRssItemHooks=None):
+        # beforeRssItemHooks is called by a parallel worker to await its turn to set results and call hooks
         from arelle.FileSource import openFileSource
         reloadCache = getattr(self.modelXbrl, "reloadCache", False)
-        for rssItem in self.modelXbrl.modelDocument.rssItems:
-            if getattr(rssItem, "skipRssItem", False):
-                self.modelXbrl.info("info", _("skipping RSS Item %(accessionNumber)s %(formType)s %(companyName)s %(period)s"),
-                    modelObject=rssItem, accessionNumber=rssItem.accessionNumber, formType=rssItem.formType, companyName=rssItem.companyName, period=rssItem.period)
-                continue
-            self.modelXbrl.info("info", _("RSS Item %(accessionNumber)s %(formType)s %(companyName)s %(period)s"),
-                modelObject=rssItem, accessionNumber=rssItem.accessionNumber, formType=rssItem.formType, companyName=rssItem.companyName, period=rssItem.period)
-            modelXbrl = None
+        modelXbrl = None
+        try:
+            modelXbrl = ModelXbrl.load(self.modelXbrl.modelManager, 
+                                       openFileSource(rssItem.zippedUrl, self.modelXbrl.modelManager.cntlr, reloadCache=reloadCache),
+                                       _("validating"), rssItem=rssItem)
+            for pluginXbrlMethod in pluginClassMethods("RssItem.Xbrl.Loaded"):  
+                pluginXbrlMethod(modelXbrl, {}, rssItem)      
+            if getattr(rssItem, "doNotProcessRSSitem", False) or modelXbrl.modelDocument is None:
+                modelXbrl.close()
+                return # skip entry based on processing criteria
+            self.instValidator.validate(modelXbrl, self.modelXbrl.modelManager.formulaOptions.typedParameters(self.modelXbrl.prefixedNamespaces))
+            self.instValidator.close()
+            if beforeRssItemHooks is not None:
+                beforeRssItemHooks()
+            rssItem.setResults(modelXbrl)
+            if beforeRssItemHooks is None: # parallel validation views rssItem when merging its results
+                self.modelXbrl.modelManager.viewModelObject(self.modelXbrl, rssItem.objectId())
+            for pluginXbrlMethod in pluginClassMethods("Validate.RssItem"):
+                pluginXbrlMethod(self, modelXbrl, rssItem)
+            modelXbrl.close()
+        except Exception as err:
+            self.modelXbrl.error("exception:" + type(err).__name__,
+                _("RSS item validation exception: %(error)s, instance: %(instance)s"),
+                modelXbrl=(self.modelXbrl, modelXbrl),
+                instance=rssItem.zippedUrl, error=err,
+                exc_info=True)
             try:
-                modelXbrl = ModelXbrl.load(self.modelXbrl.modelManager, 
-                                           openFileSource(rssItem.zippedUrl, self.modelXbrl.modelManager.cntlr, reloadCache=reloadCache),
-                                           _("validating"), rssItem=rssItem)
-                for pluginXbrlMethod in pluginClassMethods("RssItem.Xbrl.Loaded"):  
-                    pluginXbrlMethod(modelXbrl, {}, rssItem)      
-                if getattr(rssItem, "doNotProcessRSSitem", False) or modelXbrl.modelDocument is None:
-                    modelXbrl.close()
-                    continue # skip entry based on processing criteria
-                self.instValidator.validate(modelXbrl, self.modelXbrl.modelManager.formulaOptions.typedParameters(self.modelXbrl.prefixedNamespaces))
                 self.instValidator.close()
-                rssItem.setResults(modelXbrl)
-                self.modelXbrl.modelManager.viewModelObject(self.modelXbrl, rssItem.objectId())
-                for pluginXbrlMethod in pluginClassMethods("Validate.RssItem"):
-                    pluginXbrlMethod(self, modelXbrl, rssItem)
-                modelXbrl.close()
+                if modelXbrl is not None:
+                    modelXbrl.close()
             except Exception as err:
-                self.modelXbrl.error("exception:" + type(err).__name__,
-                    _("RSS item validation exception: %(error)s, instance: %(instance)s"),
-                    modelXbrl=(self.modelXbrl, modelXbrl),
-                    instance=rssItem.zippedUrl, error=err,
-                    exc_info=True)
-                try:
-                    self.instValidator.close()
-                    if modelXbrl is not None:
-                        modelXbrl.close()
-                except Exception as err:
-                    pass
-            del modelXbrl  # completely dereference
+                pass
+        del modelXbrl  # completely dereference
    
-    def validateTestcase(self, testcase):
+    def validateTestcase(self, testcase, testcaseVariationValidations=None):
+        # testcaseVariationValidations, if specified, iterates parallel validation results of testcase's variations
+        from arelle.ValidateTestcaseParallel import mergeTestcaseVariationValidation
         self.modelXbrl.info("info", "Testcase", modelDocument=testcase)
         self.modelXbrl.viewModelObject(testcase.objectId())
         if testcase.type in (Type.TESTCASESINDEX, Type.REGISTRY):
             for doc in sorted(testcase.referencesDocument.keys(), key=lambda doc: doc.uri):
-                self.validateTestcase(doc)  # testcases doc's are sorted by their uri (file names), e.g., for formula
+                self.validateTestcase(doc, testcaseVariationValidations)  # testcases doc's are sorted by their uri (file names), e.g., for formula
         elif hasattr(testcase, "testcaseVariations"):
             for modelTestcaseVariation in testcase.testcaseVariations:
-                # update ui thread via modelManager (running in background here)
-                self.modelXbrl.modelManager.viewModelObject(self.modelXbrl, modelTestcaseVariation.objectId())
-                # is this a versioning report?
-                resultIsVersioningReport = modelTestcaseVariation.resultIsVersioningReport
-                resultIsXbrlInstance = modelTestcaseVariation.resultIsXbrlInstance
-                resultIsTaxonomyPackage = modelTestcaseVariation.resultIsTaxonomyPackage
-                formulaOutputInstance = None
-                inputDTSes = defaultdict(list)
-                baseForElement = testcase.baseForElement(modelTestcaseVariation)
-                # try to load instance document
-                self.modelXbrl.info("info", _("Variation %(id)s %(name)s: %(expected)s - %(description)s"),
-                                    modelObject=modelTestcaseVariation, 
-                                    id=modelTestcaseVariation.id, 
-                                    name=modelTestcaseVariation.name, 
-                                    expected=modelTestcaseVariation.expected, 
-                                    description=modelTestcaseVariation.description)
-                if self.modelXbrl.modelManager.formulaOptions.testcaseResultsCaptureWarnings:
-                    errorCaptureLevel = logging._checkLevel("WARNING")
+                if testcaseVariationValidations is not None:
+                    mergeTestcaseVariationValidation(self, modelTestcaseVariation, next(testcaseVariationValidations))
                 else:
-                    errorCaptureLevel = modelTestcaseVariation.severityLevel # default is INCONSISTENCY
-                parameters = modelTestcaseVariation.parameters.copy()
-                for readMeFirstUri in modelTestcaseVariation.readMeFirstUris:
-                    if isinstance(readMeFirstUri,tuple):
-                        # dtsName is for formula instances, but is from/to dts if versioning
-                        dtsName, readMeFirstUri = readMeFirstUri
-                    elif resultIsVersioningReport:
-                        if inputDTSes: dtsName = "to"
-                        else: dtsName = "from"
-                    else:
-                        dtsName = None
-                    if resultIsVersioningReport and dtsName: # build multi-schemaRef containing document
-                        if dtsName in inputDTSes:
-                            dtsName = inputDTSes[dtsName]
-                        else:
-                            modelXbrl = ModelXbrl.create(self.modelXbrl.modelManager, 
-                                         Type.DTSENTRIES,
-                                         self.modelXbrl.modelManager.cntlr.webCache.normalizeUrl(readMeFirstUri[:-4] + ".dts", baseForElement),
-                                         isEntry=True,
-                                         errorCaptureLevel=errorCaptureLevel)
-                        DTSdoc = modelXbrl.modelDocument
-                        DTSdoc.inDTS = True
-                        doc = modelDocumentLoad(modelXbrl, readMeFirstUri, base=baseForElement)
-                        if doc is not None:
-                            DTSdoc.referencesDocument[doc] = ModelDocumentReference("import", DTSdoc.xmlRootElement)  #fake import
-                            doc.inDTS = True
-                    elif resultIsTaxonomyPackage:
-                        from arelle import PackageManager, PrototypeInstanceObject
-                        dtsName = readMeFirstUri
-                        modelXbrl = PrototypeInstanceObject.XbrlPrototype(self.modelXbrl.modelManager, readMeFirstUri)
-                        PackageManager.packageInfo(self.modelXbrl.modelManager.cntlr, readMeFirstUri, reload=True, errors=modelXbrl.errors)
-                    else: # not a multi-schemaRef versioning report
-                        if self.useFileSource.isArchive:
-                            modelXbrl = ModelXbrl.load(self.modelXbrl.modelManager, 
-                                                       readMeFirstUri,
-                                                       _("validating"), 
-                                                       base=baseForElement,
-                                                       useFileSource=self.useFileSource,
-                                                       errorCaptureLevel=errorCaptureLevel)
-                        else: # need own file source, may need instance discovery
-                            filesource = FileSource.FileSource(readMeFirstUri, self.modelXbrl.modelManager.cntlr)
-                            if filesource and not filesource.selection and filesource.isArchive:
-                                for _archiveFile in filesource.dir or (): # find instance document in archive
-                                    filesource.select(_archiveFile)
-                                    if ModelDocument.Type.identify(filesource, filesource.url) in (ModelDocument.Type.INSTANCE, ModelDocument.Type.INLINEXBRL):
-                                        break # use this selection
-                            modelXbrl = ModelXbrl.load(self.modelXbrl.modelManager, 
-                                                       filesource,
-                                                       _("validating"), 
-                                                       base=baseForElement,
-                                                       errorCaptureLevel=errorCaptureLevel)
-                        modelXbrl.isTestcaseVariation = True
-                    if modelXbrl.modelDocument is None:
-                        modelXbrl.error("arelle:notLoaded",
-                             _("Variation %(id)s %(name)s readMeFirst document not loaded: %(file)s"),
-                             modelXbrl=testcase, id=modelTestcaseVariation.id, name=modelTestcaseVariation.name, file=os.path.basename(readMeFirstUri))
-                        self.determineNotLoadedTestStatus(modelTestcaseVariation, modelXbrl.errors)
-                        modelXbrl.close()
-                    elif resultIsVersioningReport or resultIsTaxonomyPackage:
-                        inputDTSes[dtsName] = modelXbrl
-                    elif modelXbrl.modelDocument.type == Type.VERSIONINGREPORT:
-                        ValidateVersReport.ValidateVersReport(self.modelXbrl).validate(modelXbrl)
-                        self.determineTestStatus(modelTestcaseVariation, modelXbrl.errors)
-                        modelXbrl.close()
-                    elif testcase.type == Type.REGISTRYTESTCASE:
-                        self.instValidator.validate(modelXbrl)  # required to set up dimensions, etc
-                        self.instValidator.executeCallTest(modelXbrl, modelTestcaseVariation.id, 
-                                   modelTestcaseVariation.cfcnCall, modelTestcaseVariation.cfcnTest)
-                        self.determineTestStatus(modelTestcaseVariation, modelXbrl.errors)
-                        self.instValidator.close()
-                        modelXbrl.close()
-                    else:
-                        inputDTSes[dtsName].append(modelXbrl)
-                        # validate except for formulas
-                        _hasFormulae = modelXbrl.hasFormulae
-                        modelXbrl.hasFormulae = False
-                        try:
-                            for pluginXbrlMethod in pluginClassMethods("TestcaseVariation.Xbrl.Loaded"):
-                                pluginXbrlMethod(self.modelXbrl, modelXbrl, modelTestcaseVariation)
-                            self.instValidator.validate(modelXbrl, parameters)
-                            for pluginXbrlMethod in pluginClassMethods("TestcaseVariation.Xbrl.Validated"):
-                                pluginXbrlMethod(self.modelXbrl, modelXbrl)
-                        except Exception as err:
-                            modelXbrl.error("exception:" + type(err).__name__,
-                                _("Testcase variation validation exception: %(error)s, instance: %(instance)s"),
-                                modelXbrl=modelXbrl, instance=modelXbrl.modelDocument.basename, error=err, exc_info=(type(err) is not AssertionError))
-                        modelXbrl.hasFormulae = _hasFormulae
-                if resultIsVersioningReport and modelXbrl.modelDocument:
-                    versReportFile = modelXbrl.modelManager.cntlr.webCache.normalizeUrl(
-                        modelTestcaseVariation.versioningReportUri, baseForElement)
-                    if os.path.exists(versReportFile): #validate existing
-                        modelVersReport = ModelXbrl.load(self.modelXbrl.modelManager, versReportFile, _("validating existing version report"))
-                        if modelVersReport and modelVersReport.modelDocument and modelVersReport.modelDocument.type == Type.VERSIONINGREPORT:
-                            ValidateVersReport.ValidateVersReport(self.modelXbrl).validate(modelVersReport)
-                            self.determineTestStatus(modelTestcaseVariation, modelVersReport.errors)
-                            modelVersReport.close()
-                    elif len(inputDTSes) == 2:
-                        ModelVersReport.ModelVersReport(self.modelXbrl).diffDTSes(
-                              versReportFile, inputDTSes["from"], inputDTSes["to"])
-                        modelTestcaseVariation.status = "generated"
-                    else:
-                        modelXbrl.error("arelle:notLoaded",
-                             _("Variation %(id)s %(name)s input DTSes not loaded, unable to generate versioning report: %(file)s"),
-                             modelXbrl=testcase, id=modelTestcaseVariation.id, name=modelTestcaseVariation.name, file=os.path.basename(readMeFirstUri))
-                        modelTestcaseVariation.status = "failed"
-                    for inputDTS in inputDTSes.values():
-                        inputDTS.close()
-                    del inputDTSes # dereference
-                elif resultIsTaxonomyPackage:
-                    self.determineTestStatus(modelTestcaseVariation, modelXbrl.errors)
-                    modelXbrl.close()
-                elif inputDTSes:
-                    # validate schema, linkbase, or instance
-                    modelXbrl = inputDTSes[None][0]
-                    expectedDataFiles = set(modelXbrl.modelManager.cntlr.webCache.normalizeUrl(uri, baseForElement)
-                                            for d in modelTestcaseVariation.dataUris.values() for uri in d
-                                            if not UrlUtil.isAbsolute(uri))
-                    foundDataFiles = set()
-                    variationBase = os.path.dirname(baseForElement)
-                    for dtsName, inputDTS in inputDTSes.items():  # input instances are also parameters
-                        if dtsName: # named instance
-                            parameters[dtsName] = (None, inputDTS) #inputDTS is a list of modelXbrl's (instance DTSes)
-                        elif len(inputDTS) > 1: # standard-input-instance with multiple instance documents
-                            parameters[XbrlConst.qnStandardInputInstance] = (None, inputDTS) # allow error detection in validateFormula
-                        for _inputDTS in inputDTS:
-                            for docUrl, doc in _inputDTS.urlDocs.items():
-                                if docUrl.startswith(variationBase) and not doc.type == Type.INLINEXBRLDOCUMENTSET:
-                                    if getattr(doc,"loadedFromXbrlFormula", False): # may have been sourced from xf file
-                                        if docUrl.replace("-formula.xml", ".xf") in expectedDataFiles:
-                                            docUrl = docUrl.replace("-formula.xml", ".xf")
-                                    foundDataFiles.add(docUrl)
-                    if expectedDataFiles - foundDataFiles:
-                        modelXbrl.info("arelle:testcaseDataNotUsed",
-                            _("Variation %(id)s %(name)s data files not used: %(missingDataFiles)s"),
-                            modelObject=modelTestcaseVariation, name=modelTestcaseVariation.name, id=modelTestcaseVariation.id, 
-                            missingDataFiles=", ".join(sorted(os.path.basename(f) for f in expectedDataFiles - foundDataFiles)))
-                    if foundDataFiles - expectedDataFiles:
-                        modelXbrl.info("arelle:testcaseDataUnexpected",
-                            _("Variation %(id)s %(name)s files not in variation data: %(unexpectedDataFiles)s"),
-                            modelObject=modelTestcaseVariation, name=modelTestcaseVariation.name, id=modelTestcaseVariation.id,
-                            unexpectedDataFiles=", ".join(sorted(os.path.basename(f) for f in foundDataFiles - expectedDataFiles)))
-                    if modelXbrl.hasTableRendering or modelTestcaseVariation.resultIsTable:
-                        try:
-                            RenderingEvaluator.init(modelXbrl)
-                        except Exception as err:
-                            modelXbrl.error("exception:" + type(err).__name__,
-                                _("Testcase RenderingEvaluator.init exception: %(error)s, instance: %(instance)s"),
-                                modelXbrl=modelXbrl, instance=modelXbrl.modelDocument.basename, error=err, exc_info=True)
-                    modelXbrlHasFormulae = modelXbrl.hasFormulae
-                    if modelXbrlHasFormulae:
-                        try:
-                            # validate only formulae
-                            self.instValidator.parameters = parameters
-                            ValidateFormula.validate(self.instValidator)
-                        except Exception as err:
-                            modelXbrl.error("exception:" + type(err).__name__,
-                                _("Testcase formula variation validation exception: %(error)s, instance: %(instance)s"),
-                                modelXbrl=modelXbrl, instance=modelXbrl.modelDocument.basename, error=err, exc_info=(type(err) is not AssertionError))
-                    if modelTestcaseVariation.resultIsInfoset and self.modelXbrl.modelManager.validateInfoset:
-                        for pluginXbrlMethod in pluginClassMethods("Validate.Infoset"):
-                            pluginXbrlMethod(modelXbrl, modelTestcaseVariation.resultInfosetUri)
-                        infoset = ModelXbrl.load(self.modelXbrl.modelManager, 
-                                                 modelTestcaseVariation.resultInfosetUri,
-                                                   _("loading result infoset"), 
-                                                   base=baseForElement,
-                                                   useFileSource=self.useFileSource,
-                                                   errorCaptureLevel=errorCaptureLevel)
-                        if infoset.modelDocument is None:
-                            modelXbrl.error("arelle:notLoaded",
-                                _("Variation %(id)s %(name)s result infoset not loaded: %(file)s"),
-                                modelXbrl=testcase, id=modelTestcaseVariation.id, name=modelTestcaseVariation.name, 
-                                file=os.path.basename(modelTestcaseVariation.resultXbrlInstance))
-                            modelTestcaseVariation.status = "result infoset not loadable"
-                        else:   # check infoset
-                            ValidateInfoset.validate(self.instValidator, modelXbrl, infoset)
-                        infoset.close()
-                    if modelXbrl.hasTableRendering or modelTestcaseVariation.resultIsTable: # and self.modelXbrl.modelManager.validateInfoset:
-                        # diff (or generate) table infoset
-                        resultTableUri = modelXbrl.modelManager.cntlr.webCache.normalizeUrl(modelTestcaseVariation.resultTableUri, baseForElement)
-                        if not any(alternativeValidation(modelXbrl, resultTableUri)
-                                   for alternativeValidation in pluginClassMethods("Validate.TableInfoset")):
-                            try:
-                                ViewFileRenderedGrid.viewRenderedGrid(modelXbrl, resultTableUri, diffToFile=True)  # false to save infoset files
-                            except Exception as err:
-                                modelXbrl.error("exception:" + type(err).__name__,
-                                    _("Testcase table linkbase validation exception: %(error)s, instance: %(instance)s"),
-                                    modelXbrl=modelXbrl, instance=modelXbrl.modelDocument.basename, error=err, exc_info=True)
-                    self.instValidator.close()
-                    extraErrors = []
-                    for pluginXbrlMethod in pluginClassMethods("TestcaseVariation.Validated"):
-                        pluginXbrlMethod(self.modelXbrl, modelXbrl, extraErrors)
-                    self.determineTestStatus(modelTestcaseVariation, [e for inputDTSlist in inputDTSes.values() for inputDTS in inputDTSlist for e in inputDTS.errors] + extraErrors) # include infoset errors in status
-                    if modelXbrl.formulaOutputInstance and self.noErrorCodes(modelTestcaseVariation.actual): 
-                        # if an output instance is created, and no string error codes, ignoring dict of assertion results, validate it
-                        modelXbrl.formulaOutputInstance.hasFormulae = False #  block formulae on output instance (so assertion of input is not lost)
-                        self.instValidator.validate(modelXbrl.formulaOutputInstance, modelTestcaseVariation.parameters)
-                        self.determineTestStatus(modelTestcaseVariation, modelXbrl.formulaOutputInstance.errors)
-                        if self.noErrorCodes(modelTestcaseVariation.actual): # if still 'clean' pass it forward for comparison to expected result instance
-                            formulaOutputInstance = modelXbrl.formulaOutputInstance
-                            modelXbrl.formulaOutputInstance = None # prevent it from being closed now
-                        self.instValidator.close()
-                    compareIxResultInstance = (modelXbrl.modelDocument.type in (Type.INLINEXBRL, Type.INLINEXBRLDOCUMENTSET) and 
-                                               modelTestcaseVariation.resultXbrlInstanceUri is not None)
-                    if compareIxResultInstance:
-                        formulaOutputInstance = modelXbrl # compare modelXbrl to generated output instance
-                        errMsgPrefix = "ix"
-                    else: # delete input instances before formula output comparision
-                        for inputDTSlist in inputDTSes.values():
-                            for inputDTS in inputDTSlist:
-                                inputDTS.close()
-                        del inputDTSes # dereference
-                        errMsgPrefix = "formula"
-                    if resultIsXbrlInstance and formulaOutputInstance and formulaOutputInstance.modelDocument:
-                        _matchExpectedResultIDs = not modelXbrlHasFormulae # formula restuls have inconsistent IDs
-                        expectedInstance = ModelXbrl.load(self.modelXbrl.modelManager, 
-                                                   modelTestcaseVariation.resultXbrlInstanceUri,
-                                                   _("loading expected result XBRL instance"), 
-                                                   base=baseForElement,
-                                                   useFileSource=self.useFileSource,
-                                                   errorCaptureLevel=errorCaptureLevel)
-                        if expectedInstance.modelDocument is None:
-                            self.modelXbrl.error("{}:expectedResultNotLoaded".format(errMsgPrefix),
-                                _("Testcase \"%(name)s\" %(id)s expected result instance not loaded: %(file)s"),
-                                modelXbrl=testcase, id=modelTestcaseVariation.id, name=modelTestcaseVariation.name, 
-                                file=os.path.basename(modelTestcaseVariation.resultXbrlInstanceUri),
-                                messageCodes=("formula:expectedResultNotLoaded","ix:expectedResultNotLoaded"))
-                            modelTestcaseVariation.status = "result not loadable"
-                        else:   # compare facts
-                            if len(expectedInstance.facts) != len(formulaOutputInstance.facts):
-                                formulaOutputInstance.error("{}:resultFactCounts".format(errMsgPrefix),
-                                    _("Formula output %(countFacts)s facts, expected %(expectedFacts)s facts"),
-                                    modelXbrl=modelXbrl, countFacts=len(formulaOutputInstance.facts),
-                                    expectedFacts=len(expectedInstance.facts),
-                                    messageCodes=("formula:resultFactCounts","ix:resultFactCounts"))
-                            else:
-                                formulaOutputFootnotesRelSet = ModelRelationshipSet(formulaOutputInstance, "XBRL-footnotes")
-                                expectedFootnotesRelSet = ModelRelationshipSet(expectedInstance, "XBRL-footnotes")
-                                def factFootnotes(fact, footnotesRelSet):
-                                    footnotes = {}
-                                    footnoteRels = footnotesRelSet.fromModelObject(fact)
-                                    if footnoteRels:
-                                        # most process rels in same order between two instances, use labels to sort
-                                        for i, footnoteRel in enumerate(sorted(footnoteRels,
-                                                                               key=lambda r: (r.fromLabel,r.toLabel))):
-                                            modelObject = footnoteRel.toModelObject
-                                            if isinstance(modelObject, ModelResource):
-                                                xml = modelObject.viewText().strip()
-                                                footnotes["Footnote {}".format(i+1)] = xml #re.sub(r'\s+', ' ', collapseWhitespace(modelObject.stringValue))
-                                            elif isinstance(modelObject, ModelFact):
-                                                footnotes["Footnoted fact {}".format(i+1)] = \
-                                                    "{} context: {} value: {}".format(
-                                                    modelObject.qname,
-                                                    modelObject.contextID,
-                                                    collapseWhitespace(modelObject.value))
-                                    return footnotes
-                                for expectedInstanceFact in expectedInstance.facts:
-                                    unmatchedFactsStack = []
-                                    formulaOutputFact = formulaOutputInstance.matchFact(expectedInstanceFact, unmatchedFactsStack, deemP0inf=True, matchId=_matchExpectedResultIDs, matchLang=False)
-                                    #formulaOutputFact = formulaOutputInstance.matchFact(expectedInstanceFact, unmatchedFactsStack, deemP0inf=True, matchId=True, matchLang=True)
-                                    if formulaOutputFact is None:
-                                        if unmatchedFactsStack: # get missing nested tuple fact, if possible
-                                            missingFact = unmatchedFactsStack[-1]
-                                        else:
-                                            missingFact = expectedInstanceFact
-                                        formulaOutputInstance.error("{}:expectedFactMissing".format(errMsgPrefix),
-                                            _("Output missing expected fact %(fact)s"),
-                                            modelXbrl=missingFact, fact=missingFact.qname,
-                                            messageCodes=("formula:expectedFactMissing","ix:expectedFactMissing"))
-                                    else: # compare footnotes
-                                        expectedInstanceFactFootnotes = factFootnotes(expectedInstanceFact, expectedFootnotesRelSet)
-                                        formulaOutputFactFootnotes = factFootnotes(formulaOutputFact, formulaOutputFootnotesRelSet)
-                                        if (len(expectedInstanceFactFootnotes) != len(formulaOutputFactFootnotes) or
-                                            set(expectedInstanceFactFootnotes.values()) != set(formulaOutputFactFootnotes.values())):
-                                            formulaOutputInstance.error("{}:expectedFactFootnoteDifference".format(errMsgPrefix),
-                                                _("Output expected fact %(fact)s expected footnotes %(footnotes1)s produced footnotes %(footnotes2)s"),
-                                                modelXbrl=(formulaOutputFact,expectedInstanceFact), fact=expectedInstanceFact.qname, footnotes1=sorted(expectedInstanceFactFootnotes.items()), footnotes2=sorted(formulaOutputFactFootnotes.items()),
-                                                messageCodes=("formula:expectedFactFootnoteDifference","ix:expectedFactFootnoteDifference"))
-
-                            # for debugging uncomment next line to save generated instance document
-                            # formulaOutputInstance.saveInstance(r"c:\temp\test-out-inst.xml")
-                        expectedInstance.close()
-                        del expectedInstance # dereference
-                        self.determineTestStatus(modelTestcaseVariation, formulaOutputInstance.errors)
-                        formulaOutputInstance.close()
-                        del formulaOutputInstance
-                    if compareIxResultInstance:
-                        for inputDTSlist in inputDTSes.values():
-                            for inputDTS in inputDTSlist:
-                                inputDTS.close()
-                        del inputDTSes # dereference
-                # update ui thread via modelManager (running in background here)
-                self.modelXbrl.modelManager.viewModelObject(self.modelXbrl, modelTestcaseVariation.objectId())
+                    self.validateTestcaseVariation(testcase, modelTestcaseVariation)
                     
             _statusCounts = OrderedDict((("pass",0),("fail",0)))
             for tv in getattr(testcase, "testcaseVariations", ()):
@@ -489,6 +216,319 @@ class Validate:
             
             self.modelXbrl.modelManager.showStatus(_("ready"), 2000)
             
+    def validateTestcaseVariation(self, testcase, modelTestcaseVariation):
+        # update ui thread via modelManager (running in background here)
+        self.modelXbrl.modelManager.viewModelObject(self.modelXbrl, modelTestcaseVariation.objectId())
+        # is this a versioning report?
+        resultIsVersioningReport = modelTestcaseVariation.resultIsVersioningReport
+        resultIsXbrlInstance = modelTestcaseVariation.resultIsXbrlInstance
+        resultIsTaxonomyPackage = modelTestcaseVariation.resultIsTaxonomyPackage
+        formulaOutputInstance = None
+        inputDTSes = defaultdict(list)
+        baseForElement = testcase.baseForElement(modelTestcaseVariation)
+        # try to load instance document
+        self.modelXbrl.info("info", _("Variation %(id)s %(name)s: %(expected)s - %(description)s"),
+                            modelObject=modelTestcaseVariation, 
+                            id=modelTestcaseVariation.id, 
+                            name=modelTestcaseVariation.name, 
+                            expected=modelTestcaseVariation.expected, 
+                            description=modelTestcaseVariation.description)
+        if self.modelXbrl.modelManager.formulaOptions.testcaseResultsCaptureWarnings:
+            errorCaptureLevel = logging._checkLevel("WARNING")
+        else:
+            errorCaptureLevel = modelTestcaseVariation.severityLevel # default is INCONSISTENCY
+        parameters = modelTestcaseVariation.parameters.copy()
+        for readMeFirstUri in modelTestcaseVariation.readMeFirstUris:
+            if isinstance(readMeFirstUri,tuple):
+                # dtsName is for formula instances, but is from/to dts if versioning
+                dtsName, readMeFirstUri = readMeFirstUri
+            elif resultIsVersioningReport:
+                if inputDTSes: dtsName = "to"
+                else: dtsName = "from"
+            else:
+                dtsName = None
+            if resultIsVersioningReport and dtsName: # build multi-schemaRef containing document
+                if dtsName in inputDTSes:
+                    dtsName = inputDTSes[dtsName]
+                else:
+                    modelXbrl = ModelXbrl.create(self.modelXbrl.modelManager, 
+                                 Type.DTSENTRIES,
+                                 self.modelXbrl.modelManager.cntlr.webCache.normalizeUrl(readMeFirstUri[:-4] + ".dts", baseForElement),
+                                 isEntry=True,
+                                 errorCaptureLevel=errorCaptureLevel)
+                DTSdoc = modelXbrl.modelDocument
+                DTSdoc.inDTS = True
+                doc = modelDocumentLoad(modelXbrl, readMeFirstUri, base=baseForElement)
+                if doc is not None:
+                    DTSdoc.referencesDocument[doc] = ModelDocumentReference("import", DTSdoc.xmlRootElement)  #fake import
+                    doc.inDTS = True
+            elif resultIsTaxonomyPackage:
+                from arelle import PackageManager, PrototypeInstanceObject
+                dtsName = readMeFirstUri
+                modelXbrl = PrototypeInstanceObject.XbrlPrototype(self.modelXbrl.modelManager, readMeFirstUri)
+                PackageManager.packageInfo(self.modelXbrl.modelManager.cntlr, readMeFirstUri, reload=True, errors=modelXbrl.errors)
+            else: # not a multi-schemaRef versioning report
+                if self.useFileSource.isArchive:
+                    modelXbrl = ModelXbrl.load(self.modelXbrl.modelManager, 
+                                               readMeFirstUri,
+                                               _("validating"), 
+                                               base=baseForElement,
+                                               useFileSource=self.useFileSource,
+                                               errorCaptureLevel=errorCaptureLevel)
+                else: # need own file source, may need instance discovery
+                    filesource = FileSource.FileSource(readMeFirstUri, self.modelXbrl.modelManager.cntlr)
+                    if filesource and not filesource.selection and filesource.isArchive:
+                        for _archiveFile in filesource.dir or (): # find instance document in archive
+                            filesource.select(_archiveFile)
+                            if ModelDocument.Type.identify(filesource, filesource.url) in (ModelDocument.Type.INSTANCE, ModelDocument.Type.INLINEXBRL):
+                                break # use this selection
+                    modelXbrl = ModelXbrl.load(self.modelXbrl.modelManager, 
+                                               filesource,
+                                               _("validating"), 
+                                               base=baseForElement,
+                                               errorCaptureLevel=errorCaptureLevel)
+                modelXbrl.isTestcaseVariation = True
+            if modelXbrl.modelDocument is None:
+                modelXbrl.error("arelle:notLoaded",
+                     _("Variation %(id)s %(name)s readMeFirst document not loaded: %(file)s"),
+                     modelXbrl=testcase, id=modelTestcaseVariation.id, name=modelTestcaseVariation.name, file=os.path.basename(readMeFirstUri))
+                self.determineNotLoadedTestStatus(modelTestcaseVariation, modelXbrl.errors)
+                modelXbrl.close()
+            elif resultIsVersioningReport or resultIsTaxonomyPackage:
+                inputDTSes[dtsName] = modelXbrl
+            elif modelXbrl.modelDocument.type == Type.VERSIONINGREPORT:
+                ValidateVersReport.ValidateVersReport(self.modelXbrl).validate(modelXbrl)
+                self.determineTestStatus(modelTestcaseVariation, modelXbrl.errors)
+                modelXbrl.close()
+            elif testcase.type == Type.REGISTRYTESTCASE:
+                self.instValidator.validate(modelXbrl)  # required to set up dimensions, etc
+                self.instValidator.executeCallTest(modelXbrl, modelTestcaseVariation.id, 
+                           modelTestcaseVariation.cfcnCall, modelTestcaseVariation.cfcnTest)
+                self.determineTestStatus(modelTestcaseVariation, modelXbrl.errors)
+                self.instValidator.close()
+                modelXbrl.close()
+            else:
+                inputDTSes[dtsName].append(modelXbrl)
+                # validate except for formulas
+                _hasFormulae = modelXbrl.hasFormulae
+                modelXbrl.hasFormulae = False
+                try:
+                    for pluginXbrlMethod in pluginClassMethods("TestcaseVariation.Xbrl.Loaded"):
+                        pluginXbrlMethod(self.modelXbrl, modelXbrl, modelTestcaseVariation)
+                    self.instValidator.validate(modelXbrl, parameters)
+                    for pluginXbrlMethod in pluginClassMethods("TestcaseVariation.Xbrl.Validated"):
+                        pluginXbrlMethod(self.modelXbrl, modelXbrl)
+                except Exception as err:
+                    modelXbrl.error("exception:" + type(err).__name__,
+                        _("Testcase variation validation exception: %(error)s, instance: %(instance)s"),
+                        modelXbrl=modelXbrl, instance=modelXbrl.modelDocument.basename, error=err, exc_info=(type(err) is not AssertionError))
+                modelXbrl.hasFormulae = _hasFormulae
+        if resultIsVersioningReport and modelXbrl.modelDocument:
+            versReportFile = modelXbrl.modelManager.cntlr.webCache.normalizeUrl(
+                modelTestcaseVariation.versioningReportUri, baseForElement)
+            if os.path.exists(versReportFile): #validate existing
+                modelVersReport = ModelXbrl.load(self.modelXbrl.modelManager, versReportFile, _("validating existing version report"))
+                if modelVersReport and modelVersReport.modelDocument and modelVersReport.modelDocument.type == Type.VERSIONINGREPORT:
+                    ValidateVersReport.ValidateVersReport(self.modelXbrl).validate(modelVersReport)
+                    self.determineTestStatus(modelTestcaseVariation, modelVersReport.errors)
+                    modelVersReport.close()
+            elif len(inputDTSes) == 2:
+                ModelVersReport.ModelVersReport(self.modelXbrl).diffDTSes(
+                      versReportFile, inputDTSes["from"], inputDTSes["to"])
+                modelTestcaseVariation.status = "generated"
+            else:
+                modelXbrl.error("arelle:notLoaded",
+                     _("Variation %(id)s %(name)s input DTSes not loaded, unable to generate versioning report: %(file)s"),
+                     modelXbrl=testcase, id=modelTestcaseVariation.id, name=modelTestcaseVariation.name, file=os.path.basename(readMeFirstUri))
+                modelTestcaseVariation.status = "failed"
+            for inputDTS in inputDTSes.values():
+                inputDTS.close()
+            del inputDTSes # dereference
+        elif resultIsTaxonomyPackage:
+            self.determineTestStatus(modelTestcaseVariation, modelXbrl.errors)
+            modelXbrl.close()
+        elif inputDTSes:
+            # validate schema, linkbase, or instance
+            modelXbrl = inputDTSes[None][0]
+            expectedDataFiles = set(modelXbrl.modelManager.cntlr.webCache.normalizeUrl(uri, baseForElement)
+                                    for d in modelTestcaseVariation.dataUris.values() for uri in d
+                                    if not UrlUtil.isAbsolute(uri))
+            foundDataFiles = set()
+            variationBase = os.path.dirname(baseForElement)
+            for dtsName, inputDTS in inputDTSes.items():  # input instances are also parameters
+                if dtsName: # named instance
+                    parameters[dtsName] = (None, inputDTS) #inputDTS is a list of modelXbrl's (instance DTSes)
+                elif len(inputDTS) > 1: # standard-input-instance with multiple instance documents
+                    parameters[XbrlConst.qnStandardInputInstance] = (None, inputDTS) # allow error detection in validateFormula
+                for _inputDTS in inputDTS:
+                    for docUrl, doc in _inputDTS.urlDocs.items():
+                        if docUrl.startswith(variationBase) and not doc.type == Type.INLINEXBRLDOCUMENTSET:
+                            if getattr(doc,"loadedFromXbrlFormula", False): # may have been sourced from xf file
+                                if docUrl.replace("-formula.xml", ".xf") in expectedDataFiles:
+                                    docUrl = docUrl.replace("-formula.xml", ".xf")
+                            foundDataFiles.add(docUrl)
+            if expectedDataFiles - foundDataFiles:
+                modelXbrl.info("arelle:testcaseDataNotUsed",
+                    _("Variation %(id)s %(name)s data files not used: %(missingDataFiles)s"),
+                    modelObject=modelTestcaseVariation, name=modelTestcaseVariation.name, id=modelTestcaseVariation.id, 
+                    missingDataFiles=", ".join(sorted(os.path.basename(f) for f in expectedDataFiles - foundDataFiles)))
+            if foundDataFiles - expectedDataFiles:
+                modelXbrl.info("arelle:testcaseDataUnexpected",
+                    _("Variation %(id)s %(name)s files not in variation data: %(unexpectedDataFiles)s"),
+                    modelObject=modelTestcaseVariation, name=modelTestcaseVariation.name, id=modelTestcaseVariation.id,
+                    unexpectedDataFiles=", ".join(sorted(os.path.basename(f) for f in foundDataFiles - expectedDataFiles)))
+            if modelXbrl.hasTableRendering or modelTestcaseVariation.resultIsTable:
+                try:
+                    RenderingEvaluator.init(modelXbrl)
+                except Exception as err:
+                    modelXbrl.error("exception:" + type(err).__name__,
+                        _("Testcase RenderingEvaluator.init exception: %(error)s, instance: %(instance)s"),
+                        modelXbrl=modelXbrl, instance=modelXbrl.modelDocument.basename, error=err, exc_info=True)
+            modelXbrlHasFormulae = modelXbrl.hasFormulae
+            if modelXbrlHasFormulae:
+                try:
+                    # validate only formulae
+                    self.instValidator.parameters = parameters
+                    ValidateFormula.validate(self.instValidator)
+                except Exception as err:
+                    modelXbrl.error("exception:" + type(err).__name__,
+                        _("Testcase formula variation validation exception: %(error)s, instance: %(instance)s"),
+                        modelXbrl=modelXbrl, instance=modelXbrl.modelDocument.basename, error=err, exc_info=(type(err) is not AssertionError))
+            if modelTestcaseVariation.resultIsInfoset and self.modelXbrl.modelManager.validateInfoset:
+                for pluginXbrlMethod in pluginClassMethods("Validate.Infoset"):
+                    pluginXbrlMethod(modelXbrl, modelTestcaseVariation.resultInfosetUri)
+                infoset = ModelXbrl.load(self.modelXbrl.modelManager, 
+                                         modelTestcaseVariation.resultInfosetUri,
+                                           _("loading result infoset"), 
+                                           base=baseForElement,
+                                           useFileSource=self.useFileSource,
+                                           errorCaptureLevel=errorCaptureLevel)
+                if infoset.modelDocument is None:
+                    modelXbrl.error("arelle:notLoaded",
+                        _("Variation %(id)s %(name)s result infoset not loaded: %(file)s"),
+                        modelXbrl=testcase, id=modelTestcaseVariation.id, name=modelTestcaseVariation.name, 
+                        file=os.path.basename(modelTestcaseVariation.resultXbrlInstance))
+                    modelTestcaseVariation.status = "result infoset not loadable"
+                else:   # check infoset
+                    ValidateInfoset.validate(self.instValidator, modelXbrl, infoset)
+                infoset.close()
+            if modelXbrl.hasTableRendering or modelTestcaseVariation.resultIsTable: # and self.modelXbrl.modelManager.validateInfoset:
+                # diff (or generate) table infoset
+                resultTableUri = modelXbrl.modelManager.cntlr.webCache.normalizeUrl(modelTestcaseVariation.resultTableUri, baseForElement)
+                if not any(alternativeValidation(modelXbrl, resultTableUri)
+                           for alternativeValidation in pluginClassMethods("Validate.TableInfoset")):
+                    try:
+                        ViewFileRenderedGrid.viewRenderedGrid(modelXbrl, resultTableUri, diffToFile=True)  # false to save infoset files
+                    except Exception as err:
+                        modelXbrl.error("exception:" + type(err).__name__,
+                            _("Testcase table linkbase validation exception: %(error)s, instance: %(instance)s"),
+                            modelXbrl=modelXbrl, instance=modelXbrl.modelDocument.basename, error=err, exc_info=True)
+            self.instValidator.close()
+            extraErrors = []
+            for pluginXbrlMethod in pluginClassMethods("TestcaseVariation.Validated"):
+                pluginXbrlMethod(self.modelXbrl, modelXbrl, extraErrors)
+            self.determineTestStatus(modelTestcaseVariation, [e for inputDTSlist in inputDTSes.values() for inputDTS in inputDTSlist for e in inputDTS.errors] + extraErrors) # include infoset errors in status
+            if modelXbrl.formulaOutputInstance and self.noErrorCodes(modelTestcaseVariation.actual): 
+                # if an output instance is created, and no string error codes, ignoring dict of assertion results, validate it
+                modelXbrl.formulaOutputInstance.hasFormulae = False #  block formulae on output instance (so assertion of input is not lost)
+                self.instValidator.validate(modelXbrl.formulaOutputInstance, modelTestcaseVariation.parameters)
+                self.determineTestStatus(modelTestcaseVariation, modelXbrl.formulaOutputInstance.errors)
+                if self.noErrorCodes(modelTestcaseVariation.actual): # if still 'clean' pass it forward for comparison to expected result instance
+                    formulaOutputInstance = modelXbrl.formulaOutputInstance
+                    modelXbrl.formulaOutputInstance = None # prevent it from being closed now
+                self.instValidator.close()
+            compareIxResultInstance = (modelXbrl.modelDocument.type in (Type.INLINEXBRL, Type.INLINEXBRLDOCUMENTSET) and 
+                                       modelTestcaseVariation.resultXbrlInstanceUri is not None)
+            if compareIxResultInstance:
+                formulaOutputInstance = modelXbrl # compare modelXbrl to generated output instance
+                errMsgPrefix = "ix"
+            else: # delete input instances before formula output comparision
+                for inputDTSlist in inputDTSes.values():
+                    for inputDTS in inputDTSlist:
+                        inputDTS.close()
+                del inputDTSes # dereference
+                errMsgPrefix = "formula"
+            if resultIsXbrlInstance and formulaOutputInstance and formulaOutputInstance.modelDocument:
+                _matchExpectedResultIDs = not modelXbrlHasFormulae # formula restuls have inconsistent IDs
+                expectedInstance = ModelXbrl.load(self.modelXbrl.modelManager, 
+                                           modelTestcaseVariation.resultXbrlInstanceUri,
+                                           _("loading expected result XBRL instance"), 
+                                           base=baseForElement,
+                                           useFileSource=self.useFileSource,
+                                           errorCaptureLevel=errorCaptureLevel)
+                if expectedInstance.modelDocument is None:
+                    self.modelXbrl.error("{}:expectedResultNotLoaded".format(errMsgPrefix),
+                        _("Testcase \"%(name)s\" %(id)s expected result instance not loaded: %(file)s"),
+                        modelXbrl=testcase, id=modelTestcaseVariation.id, name=modelTestcaseVariation.name, 
+                        file=os.path.basename(modelTestcaseVariation.resultXbrlInstanceUri),
+                        messageCodes=("formula:expectedResultNotLoaded","ix:expectedResultNotLoaded"))
+                    modelTestcaseVariation.status = "result not loadable"
+                else:   # compare facts
+                    if len(expectedInstance.facts) != len(formulaOutputInstance.facts):
+                        formulaOutputInstance.error("{}:resultFactCounts".format(errMsgPrefix),
+                            _("Formula output %(countFacts)s facts, expected %(expectedFacts)s facts"),
+                            modelXbrl=modelXbrl, countFacts=len(formulaOutputInstance.facts),
+                            expectedFacts=len(expectedInstance.facts),
+                            messageCodes=("formula:resultFactCounts","ix:resultFactCounts"))
+                    else:
+                        formulaOutputFootnotesRelSet = ModelRelationshipSet(formulaOutputInstance, "XBRL-footnotes")
+                        expectedFootnotesRelSet = ModelRelationshipSet(expectedInstance, "XBRL-footnotes")
+                        def factFootnotes(fact, footnotesRelSet):
+                            footnotes = {}
+                            footnoteRels = footnotesRelSet.fromModelObject(fact)
+                            if footnoteRels:
+                                # most process rels in same order between two instances, use labels to sort
+                                for i, footnoteRel in enumerate(sorted(footnoteRels,
+                                                                       key=lambda r: (r.fromLabel,r.toLabel))):
+                                    modelObject = footnoteRel.toModelObject
+                                    if isinstance(modelObject, ModelResource):
+                                        xml = modelObject.viewText().strip()
+                                        footnotes["Footnote {}".format(i+1)] = xml #re.sub(r'\s+', ' ', collapseWhitespace(modelObject.stringValue))
+                                    elif isinstance(modelObject, ModelFact):
+                                        footnotes["Footnoted fact {}".format(i+1)] = \
+                                            "{} context: {} value: {}".format(
+                                            modelObject.qname,
+                                            modelObject.contextID,
+                                            collapseWhitespace(modelObject.value))
+                            return footnotes
+                        for expectedInstanceFact in expectedInstance.facts:
+                            unmatchedFactsStack = []
+                            formulaOutputFact = formulaOutputInstance.matchFact(expectedInstanceFact, unmatchedFactsStack, deemP0inf=True, matchId=_matchExpectedResultIDs, matchLang=False)
+                            #formulaOutputFact = formulaOutputInstance.matchFact(expectedInstanceFact, unmatchedFactsStack, deemP0inf=True, matchId=True, matchLang=True)
+                            if formulaOutputFact is None:
+                                if unmatchedFactsStack: # get missing nested tuple fact, if possible
+                                    missingFact = unmatchedFactsStack[-1]
+                                else:
+                                    missingFact = expectedInstanceFact
+                                formulaOutputInstance.error("{}:expectedFactMissing".format(errMsgPrefix),
+                                    _("Output missing expected fact %(fact)s"),
+                                    modelXbrl=missingFact, fact=missingFact.qname,
+                                    messageCodes=("formula:expectedFactMissing","ix:expectedFactMissing"))
+                            else: # compare footnotes
+                                expectedInstanceFactFootnotes = factFootnotes(expectedInstanceFact, expectedFootnotesRelSet)
+                                formulaOutputFactFootnotes = factFootnotes(formulaOutputFact, formulaOutputFootnotesRelSet)
+                                if (len(expectedInstanceFactFootnotes) != len(formulaOutputFactFootnotes) or
+                                    set(expectedInstanceFactFootnotes.values()) != set(formulaOutputFactFootnotes.values())):
+                                    formulaOutputInstance.error("{}:expectedFactFootnoteDifference".format(errMsgPrefix),
+                                        _("Output expected fact %(fact)s expected footnotes %(footnotes1)s produced footnotes %(footnotes2)s"),
+                                        modelXbrl=(formulaOutputFact,expectedInstanceFact), fact=expectedInstanceFact.qname, footnotes1=sorted(expectedInstanceFactFootnotes.items()), footnotes2=sorted(formulaOutputFactFootnotes.items()),
+                                        messageCodes=("formula:expectedFactFootnoteDifference","ix:expectedFactFootnoteDifference"))
+
+                    # for debugging uncomment next line to save generated instance document
+                    # formulaOutputInstance.saveInstance(r"c:\temp\test-out-inst.xml")
+                expectedInstance.close()
+                del expectedInstance # dereference
+                self.determineTestStatus(modelTestcaseVariation, formulaOutputInstance.errors)
+                formulaOutputInstance.close()
+                del formulaOutputInstance
+            if compareIxResultInstance:
+                for inputDTSlist in inputDTSes.values():
+                    for inputDTS in inputDTSlist:
+                        inputDTS.close()
+                del inputDTSes # dereference
+        # update ui thread via modelManager (running in background here)
+        self.modelXbrl.modelManager.viewModelObject(self.modelXbrl, modelTestcaseVariation.objectId())
+
     def noErrorCodes(self, modelTestcaseVariation):
         return not any(not isinstance(actual,dict) for actual in modelTestcaseVariation)
                 
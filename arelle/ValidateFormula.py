@@ -470,6 +470,7 @@ def validate(val, xpathContext=None, parametersOnly=False, statusMsg='', compile
 
     for modelVariableSet in val.modelXbrl.modelVariableSets:
         modelVariableSet.compile()
+    XPathParser.saveParsedProgCache()
     val.modelXbrl.profileStat(_("formulaCompilation"))
 
     produceOutputXbrlInstance = False
@@ -883,30 +884,37 @@ def validate(val, xpathContext=None, parametersOnly=False, statusMsg='', compile
         else:
             maxFormulaRunTimeTimer = None
         # evaluate variable sets not in consistency assertions
-        from arelle.FormulaEvaluator import init as formulaEvaluatorInit, evaluate
+        from arelle.FormulaEvaluator import init as formulaEvaluatorInit
         formulaEvaluatorInit() # one-time module initialization
         val.modelXbrl.profileActivity("... evaluations", minTimeToShow=1.0)
-        for instanceQname in orderedInstancesList:
-            for modelVariableSet in instanceProducingVariableSets[instanceQname]:
-                # produce variable evaluations if no dependent variables-scope relationships
-                if not val.modelXbrl.relationshipSet(XbrlConst.variablesScope).toModelObject(modelVariableSet):
-                    if (not runIDs or 
-                        modelVariableSet.id in runIDs or
-                        (modelVariableSet.hasConsistencyAssertion and 
-                         any(modelRel.fromModelObject.id in runIDs
-                             for modelRel in val.modelXbrl.relationshipSet(XbrlConst.consistencyAssertionFormula).toModelObject(modelVariableSet)
-                             if isinstance(modelRel.fromModelObject, ModelConsistencyAssertion)))):
-                        try:
-                            varSetId = (modelVariableSet.id or modelVariableSet.xlinkLabel)
-                            val.modelXbrl.profileActivity("... evaluating " + varSetId, minTimeToShow=10.0)
-                            val.modelXbrl.modelManager.showStatus(_("evaluating {0}").format(varSetId))
-                            val.modelXbrl.profileActivity("... evaluating " + varSetId, minTimeToShow=1.0)
-                            evaluate(xpathContext, modelVariableSet)
-                            val.modelXbrl.profileStat(modelVariableSet.localName + "_" + varSetId)
-                        except XPathContext.XPathException as err:
-                            val.modelXbrl.error(err.code,
-                                _("Variable set \n%(variableSet)s \nException: \n%(error)s"), 
-                                modelObject=modelVariableSet, variableSet=str(modelVariableSet), error=err.message)
+        evaluationVariableSets = [
+            modelVariableSet
+            for instanceQname in orderedInstancesList
+            for modelVariableSet in instanceProducingVariableSets[instanceQname]
+            # produce variable evaluations if no dependent variables-scope relationships
+            if not val.modelXbrl.relationshipSet(XbrlConst.variablesScope).toModelObject(modelVariableSet)
+            if (not runIDs or 
+                modelVariableSet.id in runIDs or
+                (modelVariableSet.hasConsistencyAssertion and 
+                 any(modelRel.fromModelObject.id in runIDs
+                     for modelRel in val.modelXbrl.relationshipSet(XbrlConst.consistencyAssertionFormula).toModelObject(modelVariableSet)
+                     if isinstance(modelRel.fromModelObject, ModelConsistencyAssertion))))]
+        if maxFormulaRunTimeTimer is None and formulaOptions.parallelWorkers > 1:
+            from arelle.FormulaParallelEvaluator import parallelEvaluations, mergeEvaluation, closeParallelEvaluations
+            parallelPool, parallelVariableSets, parallelResults = parallelEvaluations(
+                val, xpathContext, evaluationVariableSets, evaluateVariableSet)
+        else:
+            parallelPool = None
+            parallelVariableSets = set()
+        try:
+            for modelVariableSet in evaluationVariableSets:
+                if modelVariableSet in parallelVariableSets:
+                    mergeEvaluation(val, modelVariableSet, next(parallelResults))
+                else:
+                    evaluateVariableSet(val, xpathContext, modelVariableSet)
+        finally:
+            if parallelPool is not None:
+                closeParallelEvaluations(parallelPool)
         if maxFormulaRunTimeTimer:
             maxFormulaRunTimeTimer.cancel()
     except XPathContext.RunTimeExceededException:
@@ -962,6 +970,20 @@ def validate(val, xpathContext=None, parametersOnly=False, statusMsg='', compile
     xpathContext.close()  # dereference everything
     val.modelXbrl.profileStat(_("formulaExecutionTotal"), time.time() - timeFormulasStarted)
 
+def evaluateVariableSet(val, xpathContext, modelVariableSet):
+    from arelle.FormulaEvaluator import evaluate
+    try:
+        varSetId = (modelVariableSet.id or modelVariableSet.xlinkLabel)
+        val.modelXbrl.profileActivity("... evaluating " + varSetId, minTimeToShow=10.0)
+        val.modelXbrl.modelManager.showStatus(_("evaluating {0}").format(varSetId))
+        val.modelXbrl.profileActivity("... evaluating " + varSetId, minTimeToShow=1.0)
+        evaluate(xpathContext, modelVariableSet)
+        val.modelXbrl.profileStat(modelVariableSet.localName + "_" + varSetId)
+    except XPathContext.XPathException as err:
+        val.modelXbrl.error(err.code,
+            _("Variable set \n%(variableSet)s \nException: \n%(error)s"), 
+            modelObject=modelVariableSet, variableSet=str(modelVariableSet), error=err.message)
+
 def checkVariablesScopeVisibleQnames(val, nameVariables, definedNamesSet, modelVariableSet):
     for visibleVarSetRel in val.modelXbrl.relationshipSet(XbrlConst.variablesScope).toModelObject(modelVariableSet):
         varqname = visibleVarSetRel.variableQname # name (if any) of the formula result
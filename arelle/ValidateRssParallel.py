@@ -0,0 +1,107 @@
+'''
+Created on Oct 18, 2026
+
+Validates the filings of RSS feed items in forked worker processes.
+
+Workers are forked after the RSS feed has been loaded, so each inherits the feed, validator, plug-ins
+and taxonomy cache without pickling model objects, and they share the web cache on disk.  Each worker
+loads, validates and closes one filing at a time, so memory is bounded by one filing per worker, and
+workers are replaced after RSS_ITEMS_PER_WORKER items.  Results are set and the Validate.RssItem
+hooks are called by the worker holding the filing's ModelXbrl, in turn, in the order the items would
+have been validated sequentially.  Log records, log counts and result status of each item are
+returned to the parent and merged in the same order.  An item whose worker process exits during its
+validation fails, and the items after it proceed.
+
+@author: Mark V Systems Limited
+(c) Copyright 2026 Mark V Systems Limited, All rights reserved.
+'''
+import multiprocessing
+from arelle.ParallelWorkers import (parallelTasks, closeParallelTasks, captureWorkerLog, workerLogMark, workerLogSince,
+                                    mergeWorkerLog)
+
+RSS_ITEMS_PER_WORKER = 50 # worker processes are replaced after this many filings, releasing their memory
+
+_workerState = None # (val, rssItems, rssItemTurnstile) inherited by forked workers
+
+class RssItemTurnstile:
+    ''' admits worker processes to set results and call Validate.RssItem hooks of items in rssItems order '''
+    def __init__(self, context):
+        self.condition = context.Condition()
+        self.nextItem = context.RawValue("i", 0)
+
+    def wait(self, i):
+        with self.condition:
+            while self.nextItem.value != i:
+                self.condition.wait()
+
+    def passed(self, i):
+        # also called by the parent for an item lost with its worker, which may have passed already
+        with self.condition:
+            if self.nextItem.value <= i:
+                self.nextItem.value = i + 1
+                self.condition.notify_all()
+
+def parallelRssItemValidations(val, rssItems):
+    ''' returns (pool, iterator of validation results of rssItems not skipped, in their order)
+        or (None, None) if parallel validation does not apply '''
+    global _workerState
+    numWorkers = getattr(val.modelXbrl.modelManager, "rssWorkers", 0) or 0
+    if numWorkers < 2 or "fork" not in multiprocessing.get_all_start_methods():
+        return None, None
+    rssItems = [rssItem
+                for rssItem in rssItems
+                if not getattr(rssItem, "skipRssItem", False)]
+    if len(rssItems) < 2:
+        return None, None
+    val.modelXbrl.info("info",
+                       _("Validating %(count)s RSS items in %(workers)s worker processes"),
+                       modelXbrl=val.modelXbrl, count=len(rssItems), workers=numWorkers)
+    context = multiprocessing.get_context("fork")
+    # workers replaced after RSS_ITEMS_PER_WORKER items are forked later, so state is kept until pool is closed
+    rssItemTurnstile = RssItemTurnstile(context)
+    _workerState = (val, rssItems, rssItemTurnstile)
+    # results are yielded in rssItems order, so merging is deterministic
+    return parallelTasks(context, min(numWorkers, len(rssItems)), workerValidateRssItem, len(rssItems),
+                         initializer=initWorker, maxtasksperchild=RSS_ITEMS_PER_WORKER,
+                         lostTask=rssItemTurnstile.passed) # items after a lost one proceed
+
+def closeParallelRssItemValidations(pool):
+    global _workerState
+    closeParallelTasks(pool)
+    _workerState = None
+
+def initWorker():
+    # redirect worker's log messages (of the feed and its items' ModelXbrls) to a capture handler
+    val, rssItems, rssItemTurnstile = _workerState
+    captureWorkerLog(val.modelXbrl)
+
+def workerValidateRssItem(i):
+    val, rssItems, rssItemTurnstile = _workerState
+    modelXbrl = val.modelXbrl
+    rssItem = rssItems[i]
+    logMark = workerLogMark(modelXbrl)
+    try:
+        val.validateRssItem(rssItem, beforeRssItemHooks=lambda: rssItemTurnstile.wait(i))
+    finally:
+        rssItemTurnstile.wait(i) # if not reached in validateRssItem
+        rssItemTurnstile.passed(i)
+    return (dict((name, getattr(rssItem, name))
+                 for name in ("status", "results", "assertions", "assertionUnsuccessful", "doNotProcessRSSitem")
+                 if hasattr(rssItem, name)),
+            workerLogSince(modelXbrl, logMark))
+
+def mergeRssItemValidation(val, rssItem, validationResult):
+    modelXbrl = val.modelXbrl
+    if validationResult is None: # worker process exited during validation of the item
+        modelXbrl.error("arelle:workerProcessExited",
+            _("RSS item validation worker process exited, instance: %(instance)s"),
+            modelXbrl=modelXbrl, instance=rssItem.zippedUrl)
+        rssItem.status = "fail"
+        rssItem.results = ["arelle:workerProcessExited"]
+        modelXbrl.modelManager.viewModelObject(modelXbrl, rssItem.objectId())
+        return
+    rssItemResults, workerLog = validationResult
+    for name, value in rssItemResults.items():
+        setattr(rssItem, name, value)
+    mergeWorkerLog(modelXbrl, workerLog)
+    modelXbrl.modelManager.viewModelObject(modelXbrl, rssItem.objectId())
@@ -0,0 +1,106 @@
+'''
+Created on Oct 18, 2026
+
+Validates the variations of a conformance suite (testcases index, registry or testcase) in forked
+worker processes.
+
+Workers are forked after the testcases have been loaded, so each inherits the loaded testcases,
+validator, plug-ins, disclosure system and taxonomy cache without pickling model objects, and they
+share the web cache and any DTS images on disk.  Each task validates all the variations of one
+testcase, which usually share their taxonomies, so they are validated by the same worker, reusing
+its taxonomy cache and DTS images; workers are replaced after TESTCASES_PER_WORKER testcases.  A
+conformance suite of a single testcase is validated sequentially.  The status, actual error codes
+and assertion results of each variation are returned to the parent with its log records and log
+counts, and merged into the ModelTestcaseObject in the order the variations would have been
+validated sequentially, so test reports and logs are in original order.  The variations of a
+testcase whose worker process exits during its validation fail, and the testcases after it proceed.
+
+@author: Mark V Systems Limited
+(c) Copyright 2026 Mark V Systems Limited, All rights reserved.
+'''
+import multiprocessing
+from arelle.ModelDocument import Type
+from arelle.ParallelWorkers import (parallelTasks, closeParallelTasks, captureWorkerLog, workerLogMark, workerLogSince,
+                                    mergeWorkerLog)
+
+TESTCASES_PER_WORKER = 20 # worker processes are replaced after this many testcases, releasing their memory
+
+_workerState = None # (val, [(testcase, [modelTestcaseVariation...])...]) inherited by forked workers
+
+def testcases(testcase):
+    ''' yields (testcase, its modelTestcaseVariations) in the order of Validate.validateTestcase '''
+    if testcase.type in (Type.TESTCASESINDEX, Type.REGISTRY):
+        for doc in sorted(testcase.referencesDocument.keys(), key=lambda doc: doc.uri):
+            for testcaseVariations in testcases(doc):
+                yield testcaseVariations
+    elif getattr(testcase, "testcaseVariations", None):
+        yield (testcase, testcase.testcaseVariations)
+
+def parallelTestcaseVariationValidations(val, testcase):
+    ''' returns (pool, iterator of validation results of testcase's variations, in their order)
+        or (None, None) if parallel validation does not apply '''
+    global _workerState
+    numWorkers = getattr(val.modelXbrl.modelManager, "testcaseWorkers", 0) or 0
+    if numWorkers < 2 or "fork" not in multiprocessing.get_all_start_methods():
+        return None, None
+    testcaseVariations = list(testcases(testcase))
+    if len(testcaseVariations) < 2:
+        return None, None
+    val.modelXbrl.info("info",
+                       _("Validating %(count)s testcase variations in %(workers)s worker processes"),
+                       modelXbrl=val.modelXbrl, count=sum(len(variations) for testcase, variations in testcaseVariations),
+                       workers=numWorkers)
+    context = multiprocessing.get_context("fork")
+    # workers replaced after TESTCASES_PER_WORKER testcases are forked later, so state is kept until pool is closed
+    _workerState = (val, testcaseVariations)
+    pool, testcaseResults = parallelTasks(context, min(numWorkers, len(testcaseVariations)), workerValidateTestcase,
+                                          len(testcaseVariations), initializer=initWorker,
+                                          maxtasksperchild=TESTCASES_PER_WORKER)
+    # results are yielded in testcases order, so merging is deterministic
+    return pool, variationResults(testcaseVariations, testcaseResults)
+
+def variationResults(testcaseVariations, testcaseResults):
+    for (testcase, variations), results in zip(testcaseVariations, testcaseResults):
+        if results is None: # worker process exited during validation of the testcase
+            results = [None] * len(variations)
+        for result in results:
+            yield result
+
+def closeParallelTestcaseVariationValidations(pool):
+    global _workerState
+    closeParallelTasks(pool)
+    _workerState = None
+
+def initWorker():
+    # redirect worker's log messages (of the testcases and variations' ModelXbrls) to a capture handler
+    val, testcaseVariations = _workerState
+    captureWorkerLog(val.modelXbrl)
+
+def workerValidateTestcase(i):
+    val, testcaseVariations = _workerState
+    modelXbrl = val.modelXbrl
+    testcase, variations = testcaseVariations[i]
+    results = []
+    for modelTestcaseVariation in variations:
+        logMark = workerLogMark(modelXbrl)
+        val.validateTestcaseVariation(testcase, modelTestcaseVariation)
+        results.append((dict((name, getattr(modelTestcaseVariation, name))
+                             for name in ("status", "actual", "assertions")),
+                        workerLogSince(modelXbrl, logMark)))
+    return results
+
+def mergeTestcaseVariationValidation(val, modelTestcaseVariation, validationResult):
+    modelXbrl = val.modelXbrl
+    modelXbrl.modelManager.viewModelObject(modelXbrl, modelTestcaseVariation.objectId())
+    if validationResult is None: # worker process exited during validation of the variation's testcase
+        modelXbrl.error("arelle:workerProcessExited",
+            _("Testcase variation validation worker process exited, variation: %(variation)s"),
+            modelXbrl=modelXbrl, variation=modelTestcaseVariation.id)
+        modelTestcaseVariation.status = "fail"
+        modelTestcaseVariation.actual = ["arelle:workerProcessExited"]
+    else:
+        variationResults, workerLog = validationResult
+        for name, value in variationResults.items():
+            setattr(modelTestcaseVariation, name, value)
+        mergeWorkerLog(modelXbrl, workerLog)
+    modelXbrl.modelManager.viewModelObject(modelXbrl, modelTestcaseVariation.objectId())
@@ -77,15 +77,15 @@ def loadUtr(modelXbrl): # Build a dictionary of item types that are constrained
                                     modelObject=modelXbrl, id=u.id, unitId=u.unitId, nsUnit=u.nsUnit, status=u.status)
     except (EnvironmentError,
             etree.LxmlError) as err:
-        modelManager.modelXbrl.error("arelleUtrLoader:error",
-                                     "Unit Type Registry Import error: %(error)s",
-                                     modelObject=modelXbrl, error=err)
+        modelXbrl.error("arelleUtrLoader:error",
+                        "Unit Type Registry Import error: %(error)s",
+                        modelObject=modelXbrl, error=err)
         etree.clear_error_log()
     if file:
         file.close()
   
-def validateFacts(modelXbrl):
-    ValidateUtr(modelXbrl).validateFacts()
+def validateFacts(modelXbrl, facts=None):
+    ValidateUtr(modelXbrl).validateFacts(facts)
     
 def utrEntries(modelType, modelUnit):
     return ValidateUtr(modelType.modelXbrl).utrEntries(modelType, modelUnit)
@@ -102,12 +102,14 @@ class ValidateUtr:
             loadUtr(modelXbrl)
         self.utrItemTypeEntries = modelXbrl.modelManager.disclosureSystem.utrItemTypeEntries
         
-    def validateFacts(self):
+    def validateFacts(self, facts=None): # facts is a streamed batch, else all facts of modelXbrl
         modelXbrl = self.modelXbrl
         if modelXbrl.modelDocument.type in (ModelDocument.Type.INSTANCE, ModelDocument.Type.INLINEXBRL):
-            modelXbrl.modelManager.cntlr.showStatus(_("Validating for Unit Type Registry").format())     
+            if facts is None:
+                modelXbrl.modelManager.cntlr.showStatus(_("Validating for Unit Type Registry").format())     
+                facts = modelXbrl.facts
             utrInvalidFacts = []
-            for f in modelXbrl.facts:
+            for f in facts:
                 concept = f.concept
                 if concept is not None and concept.isNumeric:
                     unit = f.unit
@@ -99,6 +99,8 @@ class ValidateXbrl:
         modelXbrl.dimensionDefaultConcepts = {}
         modelXbrl.qnameDimensionDefaults = {}
         modelXbrl.qnameDimensionContextElement = {}
+        modelXbrl.dimensionalValidity.clear() # depends on dimension defaults
+        modelXbrl.dimensionalValidityCacheHits = 0
         # check base set cycles, dimensions
         modelXbrl.modelManager.showStatus(_("validating relationship sets"))
         for baseSetKey in modelXbrl.baseSets.keys():
@@ -249,6 +251,9 @@ class ValidateXbrl:
                 self.checkFactsDimensions(modelXbrl.facts) # check fact dimensions in document order
                 self.checkContextsDimensions(modelXbrl.contexts.values())
                 modelXbrl.profileStat(_("validateDimensions"))
+                # facts sharing primary item and context dimensions are validated once
+                modelXbrl.profileStat(_("validateDimensionsCacheHits"), modelXbrl.dimensionalValidityCacheHits)
+                modelXbrl.profileStat(_("validateDimensionsCacheMisses"), len(modelXbrl.dimensionalValidity))
                     
         # dimensional validity
         #concepts checks
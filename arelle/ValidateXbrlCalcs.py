@@ -47,6 +47,12 @@ class ValidateXbrlCalcs:
         self.conceptsInEssencesAlias = set()
         self.requiresElementFacts = defaultdict(list)
         self.conceptsInRequiresElement = set()
+        # rounded values as scaled integers, computed once per binding key (items) or fact (sums) for all ELRs
+        self.itemKeyValues = {} # by item calcKey, (integer, exponent) of rounded item facts sum, or None
+        self.itemKeysDuplicated = set() # item calcKeys having a duplicated fact
+        self.sumFactValues = {} # by sum fact, (integer, exponent) of its value if rounding doesn't change it, or None
+        self.decimalLimit = 10 ** decimal.getcontext().prec # scaled integers beyond which decimal sums would round
+        self.inconsistentBoundSumKeys = {} # by (sumConcept, weighted item concepts) of summations repeated in ELRs
         
     def validate(self):
         if not self.modelXbrl.contexts and not self.modelXbrl.facts:
@@ -80,6 +86,61 @@ class ValidateXbrlCalcs:
         del uniqueUnitHashes
         self.modelXbrl.profileActivity("... identify equal units", minTimeToShow=1.0)
                     
+        self.identifyConcepts()
+        self.modelXbrl.profileActivity("... identify requires-element and esseance-aliased concepts", minTimeToShow=1.0)
+
+        self.bindFacts(self.modelXbrl.facts,[self.modelXbrl.modelDocument.xmlRootElement])
+        self.modelXbrl.profileActivity("... bind facts", minTimeToShow=1.0)
+        
+        self.checkBaseSets()
+        self.modelXbrl.profileActivity("... find inconsistencies", minTimeToShow=1.0)
+        self.modelXbrl.profileActivity() # reset
+        
+    def startStreaming(self):
+        ''' prepares for facts bound by bindStreamingFacts as they are streamed (contexts and units are not
+            known in advance, equal contexts and units are identified by their s-equal hash and measures) '''
+        if not self.inferDecimals: # infering precision is now contrary to XBRL REC section 5.2.5.2
+            self.modelXbrl.info("xbrl.5.2.5.2:inferringPrecision","Validating calculations inferring precision.")
+        self.identifyConcepts()
+        self.conceptsInCalculations = set()
+        for baseSetKey in self.modelXbrl.baseSets.keys():
+            arcrole, ELR, linkqname, arcqname = baseSetKey
+            if arcrole == XbrlConst.summationItem and ELR and linkqname and arcqname:
+                for modelRel in self.modelXbrl.relationshipSet(arcrole,ELR,linkqname,arcqname).modelRelationships:
+                    for concept in (modelRel.fromModelObject, modelRel.toModelObject):
+                        if concept is not None and concept.qname is not None:
+                            self.conceptsInCalculations.add(concept)
+        self.streamingRoot = self.modelXbrl.modelDocument.xmlRootElement
+        
+    def bindStreamingFacts(self, facts):
+        ''' binds the facts of a streamed batch which participate in calculation, essence-alias or requires-element
+            relationships, retaining only their CalcFact values so the facts themselves may be dropped '''
+        calcFacts = [calcFact
+                     for calcFact in (self.calcFact(f) for f in facts)
+                     if calcFact is not None]
+        if calcFacts:
+            self.bindFacts(calcFacts, [self.streamingRoot])
+            
+    def calcFact(self, f):
+        concept = f.concept
+        if concept is None:
+            return None
+        if concept.isTuple:
+            tupleFacts = [calcFact
+                          for calcFact in (self.calcFact(tf) for tf in f.modelTupleFacts)
+                          if calcFact is not None]
+            if tupleFacts:
+                return CalcFact(f, tupleFacts)
+        elif ((concept.isNumeric and concept in self.conceptsInCalculations) or
+              concept in self.conceptsInEssencesAlias or concept in self.conceptsInRequiresElement):
+            return CalcFact(f)
+        return None
+        
+    def finishStreaming(self):
+        self.checkBaseSets()
+        self.modelXbrl.profileActivity("... find inconsistencies", minTimeToShow=1.0)
+        
+    def identifyConcepts(self):
         # identify concepts participating in essence-alias relationships
         # identify calcluation & essence-alias base sets (by key)
         for baseSetKey in self.modelXbrl.baseSets.keys():
@@ -92,11 +153,8 @@ class ValidateXbrlCalcs:
                         for concept in (modelRel.fromModelObject, modelRel.toModelObject):
                             if concept is not None and concept.qname is not None:
                                 conceptsSet.add(concept)
-        self.modelXbrl.profileActivity("... identify requires-element and esseance-aliased concepts", minTimeToShow=1.0)
-
-        self.bindFacts(self.modelXbrl.facts,[self.modelXbrl.modelDocument.xmlRootElement])
-        self.modelXbrl.profileActivity("... bind facts", minTimeToShow=1.0)
-        
+                                
+    def checkBaseSets(self):
         # identify calcluation & essence-alias base sets (by key)
         for baseSetKey in self.modelXbrl.baseSets.keys():
             arcrole, ELR, linkqname, arcqname = baseSetKey
@@ -107,7 +165,6 @@ class ValidateXbrlCalcs:
                         fromRelationships = relsSet.fromModelObjects()
                         for sumConcept, modelRels in fromRelationships.items():
                             sumBindingKeys = self.sumConceptBindKeys[sumConcept]
-                            dupBindingKeys = set()
                             boundSumKeys = set()
                             # determine boundSums
                             for modelRel in modelRels:
@@ -115,56 +172,22 @@ class ValidateXbrlCalcs:
                                 if itemConcept is not None and itemConcept.qname is not None:
                                     itemBindingKeys = self.itemConceptBindKeys[itemConcept]
                                     boundSumKeys |= sumBindingKeys & itemBindingKeys
-                            # add up rounded items
-                            boundSums = defaultdict(decimal.Decimal) # sum of facts meeting factKey
-                            boundSummationItems = defaultdict(list) # corresponding fact refs for messages
-                            for modelRel in modelRels:
-                                weight = modelRel.weightDecimal
-                                itemConcept = modelRel.toModelObject
-                                if itemConcept is not None:
-                                    for itemBindKey in boundSumKeys:
-                                        ancestor, contextHash, unit = itemBindKey
-                                        factKey = (itemConcept, ancestor, contextHash, unit)
-                                        if factKey in self.itemFacts:
-                                            for fact in self.itemFacts[factKey]:
-                                                if fact in self.duplicatedFacts:
-                                                    dupBindingKeys.add(itemBindKey)
-                                                elif fact not in self.consistentDupFacts:
-                                                    roundedValue = roundFact(fact, self.inferDecimals)
-                                                    boundSums[itemBindKey] += roundedValue * weight
-                                                    boundSummationItems[itemBindKey].append(wrappedFactWithWeight(fact,weight,roundedValue))
+                            weightedItemConcepts = tuple((scaledWeight(modelRel.weightDecimal), modelRel.toModelObject)
+                                                         for modelRel in modelRels
+                                                         if modelRel.toModelObject is not None)
+                            # same summation in another ELR has the same bound sums
+                            summation = (sumConcept, weightedItemConcepts)
+                            inconsistentKeys = self.inconsistentBoundSumKeys.get(summation)
+                            if inconsistentKeys is None:
+                                inconsistentKeys = self.inconsistentBoundSumKeys[summation] = set(
+                                    sumBindKey
+                                    for sumBindKey in boundSumKeys
+                                    if (((sumConcept,) + sumBindKey) in self.sumFacts and
+                                        not self.isBoundSumConsistent(sumConcept, sumBindKey, weightedItemConcepts)))
                             for sumBindKey in boundSumKeys:
-                                ancestor, contextHash, unit = sumBindKey
-                                factKey = (sumConcept, ancestor, contextHash, unit)
-                                if factKey in self.sumFacts:
-                                    sumFacts = self.sumFacts[factKey]
-                                    for fact in sumFacts:
-                                        if fact in self.duplicatedFacts:
-                                            dupBindingKeys.add(sumBindKey)
-                                        elif sumBindKey not in dupBindingKeys and fact not in self.consistentDupFacts:
-                                            roundedSum = roundFact(fact, self.inferDecimals)
-                                            roundedItemsSum = roundFact(fact, self.inferDecimals, vDecimal=boundSums[sumBindKey])
-                                            if roundedItemsSum  != roundFact(fact, self.inferDecimals):
-                                                d = inferredDecimals(fact)
-                                                if isnan(d) or isinf(d): d = 4
-                                                _boundSummationItems = boundSummationItems[sumBindKey]
-                                                unreportedContribingItemQnames = [] # list the missing/unreported contributors in relationship order
-                                                for modelRel in modelRels:
-                                                    itemConcept = modelRel.toModelObject
-                                                    if (itemConcept is not None and 
-                                                        (itemConcept, ancestor, contextHash, unit) not in self.itemFacts):
-                                                        unreportedContribingItemQnames.append(str(itemConcept.qname))
-                                                self.modelXbrl.log('INCONSISTENCY', "xbrl.5.2.5.2:calcInconsistency",
-                                                    _("Calculation inconsistent from %(concept)s in link role %(linkrole)s reported sum %(reportedSum)s computed sum %(computedSum)s context %(contextID)s unit %(unitID)s unreportedContributingItems %(unreportedContributors)s"),
-                                                    modelObject=wrappedSummationAndItems(fact, roundedSum, _boundSummationItems),
-                                                    concept=sumConcept.qname, linkrole=ELR, 
-                                                    linkroleDefinition=self.modelXbrl.roleTypeDefinition(ELR),
-                                                    reportedSum=Locale.format_decimal(self.modelXbrl.locale, roundedSum, 1, max(d,0)),
-                                                    computedSum=Locale.format_decimal(self.modelXbrl.locale, roundedItemsSum, 1, max(d,0)), 
-                                                    contextID=fact.context.id, unitID=fact.unit.id,
-                                                    unreportedContributors=", ".join(unreportedContribingItemQnames) or "none")
-                                                del unreportedContribingItemQnames[:]
-                            boundSummationItems.clear() # dereference facts in list
+                                if sumBindKey in inconsistentKeys:
+                                    # report with decimal rounding of bound items and sum
+                                    self.checkBoundSum(ELR, sumConcept, modelRels, sumBindKey)
                     elif arcrole == XbrlConst.essenceAlias:
                         for modelRel in relsSet.modelRelationships:
                             essenceConcept = modelRel.fromModelObject
@@ -178,8 +201,8 @@ class ValidateXbrlCalcs:
                                 if essenceFactsKey in self.esAlFacts and aliasFactsKey in self.esAlFacts:
                                     for eF in self.esAlFacts[essenceFactsKey]:
                                         for aF in self.esAlFacts[aliasFactsKey]:
-                                            essenceUnit = self.mapUnit.get(eF.unit,eF.unit)
-                                            aliasUnit = self.mapUnit.get(aF.unit,aF.unit)
+                                            essenceUnit = self.factUnit(eF)
+                                            aliasUnit = self.factUnit(aF)
                                             if essenceUnit != aliasUnit:
                                                 self.modelXbrl.log('INCONSISTENCY', "xbrl.5.2.6.2.2:essenceAliasUnitsInconsistency",
                                                     _("Essence-Alias inconsistent units from %(essenceConcept)s to %(aliasConcept)s in link role %(linkrole)s context %(contextID)s"),
@@ -187,7 +210,7 @@ class ValidateXbrlCalcs:
                                                     essenceConcept=essenceConcept.qname, aliasConcept=aliasConcept.qname, 
                                                     linkrole=ELR, 
                                                     linkroleDefinition=self.modelXbrl.roleTypeDefinition(ELR),
-                                                    contextID=eF.context.id)
+                                                    contextID=eF.contextID)
                                             if not XbrlUtil.vEqual(eF, aF):
                                                 self.modelXbrl.log('INCONSISTENCY', "xbrl.5.2.6.2.2:essenceAliasUnitsInconsistency",
                                                     _("Essence-Alias inconsistent value from %(essenceConcept)s to %(aliasConcept)s in link role %(linkrole)s context %(contextID)s"),
@@ -195,7 +218,7 @@ class ValidateXbrlCalcs:
                                                     essenceConcept=essenceConcept.qname, aliasConcept=aliasConcept.qname, 
                                                     linkrole=ELR,
                                                     linkroleDefinition=self.modelXbrl.roleTypeDefinition(ELR),
-                                                    contextID=eF.context.id)
+                                                    contextID=eF.contextID)
                     elif arcrole == XbrlConst.requiresElement:
                         for modelRel in relsSet.modelRelationships:
                             sourceConcept = modelRel.fromModelObject
@@ -208,8 +231,111 @@ class ValidateXbrlCalcs:
                                         requiringConcept=sourceConcept.qname, requiredConcept=requiredConcept.qname, 
                                         linkrole=ELR,
                                         linkroleDefinition=self.modelXbrl.roleTypeDefinition(ELR))
-        self.modelXbrl.profileActivity("... find inconsistencies", minTimeToShow=1.0)
-        self.modelXbrl.profileActivity() # reset
+    
+    def itemKeyValue(self, itemKey):
+        ''' returns scaled integer (integer, exponent) of the sum of rounded item facts of itemKey, or None if
+            not exactly summable; rounds each item fact once for all base sets in which it is bound '''
+        try:
+            return self.itemKeyValues[itemKey]
+        except KeyError:
+            pass
+        value = (0, 0)
+        for fact in self.itemFacts[itemKey]:
+            if fact in self.duplicatedFacts:
+                self.itemKeysDuplicated.add(itemKey)
+            elif fact not in self.consistentDupFacts and value is not None:
+                value = addScaledIntegers(value, scaledInteger(roundFact(fact, self.inferDecimals)), self.decimalLimit)
+        self.itemKeyValues[itemKey] = value
+        return value
+
+    def sumFactValue(self, fact):
+        ''' returns scaled integer (integer, exponent) of sum fact's value when its rounding is that value
+            (so a bound sum equal to it is consistent), otherwise None '''
+        try:
+            return self.sumFactValues[fact]
+        except KeyError:
+            pass
+        value = None
+        vStr = fact.value
+        try:
+            vDecimal = decimal.Decimal(vStr)
+            if str(vDecimal) == vStr and not roundFact(fact, self.inferDecimals).is_nan():
+                value = scaledInteger(vDecimal)
+        except (decimal.InvalidOperation, ValueError, TypeError):
+            pass
+        self.sumFactValues[fact] = value
+        return value
+
+    def isBoundSumConsistent(self, sumConcept, sumBindKey, weightedItemConcepts):
+        ''' True if there is no inconsistency to report for sumBindKey, because each sum fact is the exact weighted sum
+            of its rounded bound item facts (or facts are duplicated), otherwise (or if not exactly determinable)
+            checkBoundSum decides by decimal rounding '''
+        boundSum = (0, 0)
+        for weight, itemConcept in weightedItemConcepts:
+            itemKey = (itemConcept,) + sumBindKey
+            if itemKey in self.itemFacts:
+                itemValue = self.itemKeyValue(itemKey)
+                if itemKey in self.itemKeysDuplicated:
+                    return True # sum facts are not checked
+                if itemValue is None or weight is None:
+                    return False
+                boundSum = addScaledIntegers(boundSum, (itemValue[0] * weight[0], itemValue[1] + weight[1]), self.decimalLimit)
+                if boundSum is None:
+                    return False
+        for fact in self.sumFacts[(sumConcept,) + sumBindKey]:
+            if fact in self.duplicatedFacts:
+                return True # subsequent sum facts are not checked
+            if fact not in self.consistentDupFacts:
+                sumValue = self.sumFactValue(fact)
+                if sumValue is None or not equalScaledIntegers(sumValue, boundSum):
+                    return False
+        return True
+
+    def checkBoundSum(self, ELR, sumConcept, modelRels, sumBindKey):
+        # add up rounded items
+        boundSum = decimal.Decimal() # sum of facts meeting factKey
+        boundSummationItems = [] # corresponding fact refs for messages
+        isDuplicated = False
+        ancestor, contextHash, unit = sumBindKey
+        for modelRel in modelRels:
+            weight = modelRel.weightDecimal
+            itemConcept = modelRel.toModelObject
+            if itemConcept is not None:
+                factKey = (itemConcept, ancestor, contextHash, unit)
+                if factKey in self.itemFacts:
+                    for fact in self.itemFacts[factKey]:
+                        if fact in self.duplicatedFacts:
+                            isDuplicated = True
+                        elif fact not in self.consistentDupFacts:
+                            roundedValue = roundFact(fact, self.inferDecimals)
+                            boundSum += roundedValue * weight
+                            boundSummationItems.append(wrappedFactWithWeight(fact,weight,roundedValue))
+        for fact in self.sumFacts[(sumConcept, ancestor, contextHash, unit)]:
+            if fact in self.duplicatedFacts:
+                isDuplicated = True
+            elif not isDuplicated and fact not in self.consistentDupFacts:
+                roundedSum = roundFact(fact, self.inferDecimals)
+                roundedItemsSum = roundFact(fact, self.inferDecimals, vDecimal=boundSum)
+                if roundedItemsSum  != roundFact(fact, self.inferDecimals):
+                    d = inferredDecimals(fact)
+                    if isnan(d) or isinf(d): d = 4
+                    unreportedContribingItemQnames = [] # list the missing/unreported contributors in relationship order
+                    for modelRel in modelRels:
+                        itemConcept = modelRel.toModelObject
+                        if (itemConcept is not None and 
+                            (itemConcept, ancestor, contextHash, unit) not in self.itemFacts):
+                            unreportedContribingItemQnames.append(str(itemConcept.qname))
+                    self.modelXbrl.log('INCONSISTENCY', "xbrl.5.2.5.2:calcInconsistency",
+                        _("Calculation inconsistent from %(concept)s in link role %(linkrole)s reported sum %(reportedSum)s computed sum %(computedSum)s context %(contextID)s unit %(unitID)s unreportedContributingItems %(unreportedContributors)s"),
+                        modelObject=wrappedSummationAndItems(fact, roundedSum, boundSummationItems),
+                        concept=sumConcept.qname, linkrole=ELR, 
+                        linkroleDefinition=self.modelXbrl.roleTypeDefinition(ELR),
+                        reportedSum=Locale.format_decimal(self.modelXbrl.locale, roundedSum, 1, max(d,0)),
+                        computedSum=Locale.format_decimal(self.modelXbrl.locale, roundedItemsSum, 1, max(d,0)), 
+                        contextID=fact.contextID, unitID=fact.unitID,
+                        unreportedContributors=", ".join(unreportedContribingItemQnames) or "none")
+                    del unreportedContribingItemQnames[:]
+        del boundSummationItems[:] # dereference facts in list
     
     def bindFacts(self, facts, ancestors):
         for f in facts:
@@ -217,12 +343,9 @@ class ValidateXbrlCalcs:
             if concept is not None:
                 # index facts by their calc relationship set
                 if concept.isNumeric:
+                    contextHash = self.factContextHash(f)
+                    unit = self.factUnit(f)
                     for ancestor in ancestors:
-                        # tbd: uniqify context and unit
-                        context = self.mapContext.get(f.context,f.context)
-                        # must use nonDimAwareHash to achieve s-equal comparison of contexts
-                        contextHash = context.contextNonDimAwareHash if context is not None else hash(None)
-                        unit = self.mapUnit.get(f.unit,f.unit)
                         calcKey = (concept, ancestor, contextHash, unit)
                         if not f.isNil:
                             self.itemFacts[calcKey].append(f)
@@ -268,8 +391,7 @@ class ValidateXbrlCalcs:
                 # index facts by their essence alias relationship set
                 if concept in self.conceptsInEssencesAlias and not f.isNil:
                     ancestor = ancestors[-1]    # only care about direct parent
-                    context = self.mapContext.get(f.context,f.context)
-                    contextHash = context.contextNonDimAwareHash if context is not None else hash(None)
+                    contextHash = self.factContextHash(f)
                     esAlKey = (concept, ancestor, contextHash)
                     self.esAlFacts[esAlKey].append(f)
                     bindKey = (ancestor, contextHash)
@@ -278,6 +400,75 @@ class ValidateXbrlCalcs:
                 if concept in self.conceptsInRequiresElement:
                     self.requiresElementFacts[concept].append(f)
 
+    def factContextHash(self, f):
+        if isinstance(f, CalcFact):
+            return f.contextHash
+        # tbd: uniqify context and unit
+        context = self.mapContext.get(f.context,f.context)
+        # must use nonDimAwareHash to achieve s-equal comparison of contexts
+        return context.contextNonDimAwareHash if context is not None else hash(None)
+    
+    def factUnit(self, f):
+        if isinstance(f, CalcFact):
+            return f.unitMeasures
+        return self.mapUnit.get(f.unit,f.unit)
+
+class CalcFact(): # use slotted class for execution efficiency
+    ''' values of a streamed fact needed for calculation validation and its messages, retained after the fact is dropped '''
+    __slots__ = ("modelXbrl", "modelDocument", "qname", "concept", "id", "sourceline", "contextID", "unitID",
+                 "contextHash", "unitMeasures", "value", "decimals", "precision", "isNil", "xValid", "sValue",
+                 "modelTupleFacts")
+    
+    def __init__(self, fact, tupleFacts=()):
+        self.modelXbrl = fact.modelXbrl
+        self.modelDocument = fact.modelDocument
+        self.qname = fact.qname
+        self.concept = fact.concept
+        self.id = fact.id
+        self.sourceline = fact.sourceline
+        self.contextID = fact.contextID
+        context = fact.context
+        self.contextHash = context.contextNonDimAwareHash if context is not None else hash(None)
+        self.modelTupleFacts = tupleFacts
+        if self.concept.isTuple:
+            self.unitID = self.unitMeasures = self.value = self.decimals = self.precision = None
+            self.isNil = False
+            self.xValid = UNVALIDATED
+            self.sValue = None
+        else:
+            self.unitID = fact.unitID
+            unit = fact.unit
+            self.unitMeasures = unit.measures if unit is not None else None
+            self.value = fact.value
+            self.decimals = fact.decimals
+            self.precision = fact.precision
+            self.isNil = fact.isNil
+            self.xValid = getattr(fact, "xValid", UNVALIDATED)
+            self.sValue = getattr(fact, "sValue", None)
+            
+    def getparent(self):
+        return None
+    
+    def objectId(self, refId=""):
+        return "_{}_{}".format(refId, self.sourceline)
+            
+    @property
+    def propertyView(self):
+        return (("label", self.concept.label(lang=self.modelXbrl.modelManager.defaultLang)),
+                ("namespace", self.qname.namespaceURI),
+                ("name", self.qname.localName),
+                ("QName", self.qname),
+                ("contextRef", self.contextID),
+                ("unitRef", self.unitID),
+                ("decimals", self.decimals),
+                ("precision", self.precision),
+                ("value", self.value))
+    
+    def __repr__(self):
+        return "calcFact[{}, qname: {}, contextRef: {}, unitRef: {}, value: {}, {}, line {}]".format(
+                self.id, self.qname, self.contextID, self.unitID, self.value,
+                self.modelDocument.basename, self.sourceline)
+
 def roundFact(fact, inferDecimals=False, vDecimal=None):
     if vDecimal is None:
         vStr = fact.value
@@ -355,6 +546,44 @@ def roundFact(fact, inferDecimals=False, vDecimal=None):
             vRounded = vDecimal
     return vRounded
     
+def scaledInteger(x):
+    ''' returns (integer, exponent) of finite decimal x, or None if x is None, infinite or NaN '''
+    if x is None or not x.is_finite():
+        return None
+    sign, digits, exponent = x.as_tuple()
+    i = int("".join(str(digit) for digit in digits))
+    return (-i if sign else i, exponent)
+
+def scaledWeight(weight):
+    ''' returns (integer, exponent) of calculation weight without trailing zeros, or None if not finite '''
+    if weight is None or not weight.is_finite():
+        return None
+    return scaledInteger(weight.normalize())
+
+def addScaledIntegers(x, y, limit):
+    ''' returns sum of scaled integers, or None if either is None or either addend or the sum exceed limit
+        (beyond which decimal arithmetic would round) '''
+    if x is None or y is None:
+        return None
+    (i, e), (j, f) = x, y
+    if e > f:
+        i *= 10 ** (e - f)
+        e = f
+    elif f > e:
+        j *= 10 ** (f - e)
+    sum = i + j
+    if -limit < sum < limit and -limit < j < limit:
+        return (sum, e)
+    return None
+
+def equalScaledIntegers(x, y):
+    (i, e), (j, f) = x, y
+    if e > f:
+        i *= 10 ** (e - f)
+    elif f > e:
+        j *= 10 ** (f - e)
+    return i == j
+
 def decimalRound(x, d, rounding):
     if x.is_normal() and -28 <= d <= 28: # prevent exception with excessive quantization digits
         if d >= 0:
@@ -18,6 +18,10 @@ def loadDimensionDefaults(val):
     val.modelXbrl.dimensionDefaultConcepts = {}
     val.modelXbrl.qnameDimensionDefaults = {}
     val.modelXbrl.qnameDimensionContextElement = {}
+    # dimensional relationship caches depend on the (reloaded) relationships and dimension defaults
+    val.modelXbrl.priItemElrHcRels.clear()
+    val.modelXbrl.dimensionMembersUsable.clear()
+    val.modelXbrl.dimensionalValidity.clear()
     for baseSetKey in val.modelXbrl.baseSets.keys():
         arcrole, ELR, linkqname, arcqname = baseSetKey
         if ELR and linkqname and arcqname and arcrole in (XbrlConst.all, XbrlConst.dimensionDefault):
@@ -347,6 +351,20 @@ def checkFact(val, f, otherFacts=None):
             modelObject=f, fact=f.qname, contextID=f.context.id)
 
 def isFactDimensionallyValid(val, f, setPrototypeContextElements=False, otherFacts=None):
+    context = f.context
+    if context is None or isinstance(context, ContextPrototype):
+        return findFactDimensionalValidity(val, f, setPrototypeContextElements, otherFacts)
+    # facts of the same primary item and context dimensions have the same validity
+    modelXbrl = val.modelXbrl
+    key = (f.concept, context.dimsValiditySignature)
+    try:
+        isValid = modelXbrl.dimensionalValidity[key]
+        modelXbrl.dimensionalValidityCacheHits += 1
+    except KeyError:
+        isValid = modelXbrl.dimensionalValidity[key] = findFactDimensionalValidity(val, f)
+    return isValid
+
+def findFactDimensionalValidity(val, f, setPrototypeContextElements=False, otherFacts=None):
     hasElrHc = False
     for ELR, hcRels in priItemElrHcRels(val, f.concept).items():
         hasElrHc = True
@@ -372,10 +390,7 @@ def isFactDimensionallyValid(val, f, setPrototypeContextElements=False, otherFac
     
 def priItemElrHcRels(val, priItem, ELR=None):
     key = (priItem, ELR)
-    try:
-        priItemElrHcRels = val.priItemElrHcRels
-    except AttributeError:
-        priItemElrHcRels = val.priItemElrHcRels = {}
+    priItemElrHcRels = val.modelXbrl.priItemElrHcRels # kept until loadDimensionDefaults
     try:
         return priItemElrHcRels[key]
     except KeyError:
@@ -475,10 +490,7 @@ def checkFactElrHcs(val, f, ELR, hcRels, setPrototypeContextElements=False):
     return elrValid
                             
 def dimensionMemberUsable(val, dimConcept, memConcept, domELR):
-    try:
-        dimensionMembersUsable = val.dimensionMembersUsable
-    except AttributeError:
-        dimensionMembersUsable = val.dimensionMembersUsable = {}
+    dimensionMembersUsable = val.modelXbrl.dimensionMembersUsable # kept until loadDimensionDefaults
     key = (dimConcept, domELR)
     try:
         return memConcept in dimensionMembersUsable[key]
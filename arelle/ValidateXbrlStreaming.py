@@ -0,0 +1,84 @@
+'''
+Created on Oct 18, 2026
+
+Streaming validation of an instance whose contexts, units, footnote links and facts are validated while it is
+parsed, so that they can be dropped once validated.  Memory is bounded by the contexts, units and footnote links
+which the loader buffers, the batch of facts being validated (with their tuple contents) and, for calculation
+validation, the CalcFact values of facts of concepts in summation-item, essence-alias or requires-element
+relationships.
+
+The DTS is validated when it has been discovered, before the first context, unit or fact.  Each batch of facts
+then has the XBRL 2.1 fact checks, dimensional validity, Unit Type Registry checks and calculation binding.
+Calculation inconsistencies are reported when the whole instance has been streamed.
+
+@author: Mark V Systems Limited
+(c) Copyright 2026 Mark V Systems Limited, All rights reserved.
+'''
+from arelle.Validate import Validate
+from arelle.ValidateUtr import ValidateUtr
+from arelle.ValidateXbrlCalcs import ValidateXbrlCalcs
+
+FACTS_BATCH_SIZE = 1000 # facts validated together, the loader buffers contexts and units referenced by the batch
+
+class ValidateXbrlStreaming:
+    """
+    .. class:: ValidateXbrlStreaming(modelXbrl)
+
+    Incremental validation of a streamed instance (see module docstring).  The loader calls start when the DTS has
+    been discovered, validateContexts, validateUnits, validateFootnoteLinks and validateFacts as these are parsed,
+    and finish at the end of the instance.
+    """
+    def __init__(self, modelXbrl):
+        self.modelXbrl = modelXbrl
+        self.validator = Validate(modelXbrl)
+        self.instValidator = self.validator.instValidator
+        self.calcValidator = None
+        self.utrValidator = None
+        self.numFacts = 0
+
+    def start(self):
+        modelXbrl = self.modelXbrl
+        instValidator = self.instValidator
+        # DTS validation, instance checks find no contexts, units or facts yet
+        instValidator.validate(modelXbrl, modelXbrl.modelManager.formulaOptions.typedParameters(modelXbrl.prefixedNamespaces))
+        if instValidator.validateCalcLB:
+            self.calcValidator = ValidateXbrlCalcs(modelXbrl,
+                                                   inferDecimals=instValidator.validateInferDecimals,
+                                                   deDuplicate=instValidator.validateDedupCalcs)
+            self.calcValidator.startStreaming()
+        if instValidator.validateUTR:
+            self.utrValidator = ValidateUtr(modelXbrl)
+
+    def validateContexts(self, contexts):
+        self.instValidator.checkContexts(contexts)
+        if self.modelXbrl.hasXDT:
+            self.instValidator.checkContextsDimensions(contexts)
+
+    def validateUnits(self, units):
+        self.instValidator.checkUnits(units)
+
+    def validateFootnoteLinks(self, footnoteLinks):
+        self.instValidator.checkLinks(footnoteLinks)
+
+    def validateFacts(self, facts):
+        ''' validates a batch of top-level facts, whose contexts and units must not yet have been dropped '''
+        self.instValidator.checkFacts(facts)
+        if self.modelXbrl.hasXDT:
+            self.instValidator.checkFactsDimensions(facts)
+        if self.utrValidator is not None:
+            self.utrValidator.validateFacts(facts)
+        if self.calcValidator is not None:
+            self.calcValidator.bindStreamingFacts(facts)
+        self.numFacts += len(facts)
+
+    def finish(self):
+        modelXbrl = self.modelXbrl
+        if self.calcValidator is not None:
+            modelXbrl.modelManager.showStatus(_("Validating instance calculations"))
+            self.calcValidator.finishStreaming()
+            modelXbrl.profileStat(_("validateCalculations"))
+        modelXbrl.profileStat(_("validateStreamedFacts"), self.numFacts)
+
+    def close(self):
+        self.validator.close()
+        self.__dict__.clear()   # dereference variables
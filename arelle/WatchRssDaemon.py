@@ -0,0 +1,246 @@
+'''
+Created on Oct 18, 2026
+
+Watches an RSS feed of filings continuously, or backfills archived monthly EDGAR feeds, validating each
+filing once (with any Validate.RssItem plug-in actions, such as storing into a database).
+
+Filings are recorded by accession number in a SQLite ledger, which persists across restarts, so only
+filings not yet in the ledger, or whose retry is due, are validated (in parallel if rssWorkers is set).
+The feed is rechecked each cycle by a conditional retrieval (If-None-Match, If-Modified-Since) into the
+web cache, and isn't reloaded when not modified unless a retry is due.  A filing which could not be
+loaded or validated is retried after RETRY_BACKOFF_SECONDS, doubled for each attempt, until RETRY_LIMIT
+attempts.  Throughput and progress metrics are written to a json file after each feed is processed.
+
+@author: Mark V Systems Limited
+(c) Copyright 2026 Mark V Systems Limited, All rights reserved.
+'''
+import os, time, json, sqlite3, logging, signal
+from arelle import ModelXbrl, Validate
+from arelle.ModelDocument import Type
+from arelle.UrlUtil import isHttpUrl
+
+EDGAR_MONTHLY_FEED_URL = "https://www.sec.gov/Archives/edgar/monthly/xbrlrss-{0:04}-{1:02}.xml"
+RETRY_LIMIT = 5 # attempts to load and validate a filing before it is recorded as failed
+RETRY_BACKOFF_SECONDS = 300 # delay before the first retry, doubled for each further attempt
+
+def rssItemKey(rssItem):
+    return rssItem.accessionNumber or rssItem.zippedUrl # feeds without accession numbers are keyed by filing url
+
+def backfillMonths(months):
+    ''' returns (year, month) of each month of "YYYY-MM" or "YYYY-MM:YYYY-MM" (inclusive) '''
+    fromMonth, sep, toMonth = months.partition(":")
+    year, month = (int(n) for n in fromMonth.split("-"))
+    toYear, toMonth = (int(n) for n in (toMonth or fromMonth).split("-"))
+    yearMonths = []
+    while (year, month) <= (toYear, toMonth):
+        yearMonths.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return yearMonths
+
+class WatchRssLedger:
+    ''' SQLite ledger of the rss items (filings) which have been processed or are awaiting retry '''
+    def __init__(self, ledgerFile):
+        self.conn = sqlite3.connect(ledgerFile)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS rss_item ("
+                          "accession_number TEXT PRIMARY KEY, "
+                          "feed_url TEXT, "
+                          "pub_date TEXT, "
+                          "company_name TEXT, "
+                          "form_type TEXT, "
+                          "status TEXT NOT NULL, " # pass, fail, unsuccessful, skipped, retry or failed
+                          "attempts INTEGER NOT NULL, "
+                          "next_attempt REAL, " # time of retry if status is retry
+                          "processed REAL NOT NULL)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS rss_item_retry ON rss_item (status, next_attempt)")
+        self.conn.commit()
+
+    def attempts(self, key, now):
+        ''' returns number of prior attempts if key's item is due for processing, else None '''
+        row = self.conn.execute("SELECT status, attempts, next_attempt FROM rss_item WHERE accession_number = ?",
+                                (key,)).fetchone()
+        if row is None:
+            return 0
+        status, attempts, nextAttempt = row
+        if status == "retry" and nextAttempt <= now:
+            return attempts
+        return None
+
+    def record(self, rssItem, feedUrl, status, attempts, nextAttempt, now):
+        self.conn.execute("INSERT OR REPLACE INTO rss_item VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                          (rssItemKey(rssItem), feedUrl, str(rssItem.pubDate), rssItem.companyName, rssItem.formType,
+                           status, attempts, nextAttempt, now))
+
+    def commit(self):
+        self.conn.commit()
+
+    def nextRetry(self, feedUrl=None):
+        ''' returns time of the earliest retry (of feedUrl's items if specified), or None '''
+        if feedUrl is None:
+            row = self.conn.execute("SELECT MIN(next_attempt) FROM rss_item WHERE status = 'retry'").fetchone()
+        else:
+            row = self.conn.execute("SELECT MIN(next_attempt) FROM rss_item WHERE status = 'retry' AND feed_url = ?",
+                                    (feedUrl,)).fetchone()
+        return row[0]
+
+    def statusCounts(self):
+        return dict(self.conn.execute("SELECT status, COUNT(*) FROM rss_item GROUP BY status"))
+
+    def close(self):
+        self.conn.close()
+
+class WatchRssDaemon:
+    def __init__(self, cntlr, ledgerFile, metricsFile=None, interval=600):
+        self.cntlr = cntlr
+        self.modelManager = cntlr.modelManager
+        self.ledger = WatchRssLedger(ledgerFile)
+        self.metricsFile = metricsFile
+        self.interval = interval
+        self.stopRequested = False
+        self.feedStamps = {} # (mtime, size) of each feed's file when last processed
+        self.startedAt = time.time()
+        self.metrics = {"feedChecks": 0, "feedsNotModified": 0, "itemsAttempted": 0, "itemsProcessed": 0,
+                        "itemsRetried": 0, "itemsFailed": 0, "lastFeed": None, "lastFeedSeconds": None}
+
+    def requestStop(self, *args):
+        self.stopRequested = True
+
+    def sleep(self, seconds):
+        endAt = time.time() + seconds
+        while not self.stopRequested and time.time() < endAt:
+            time.sleep(min(1.0, max(0.0, endAt - time.time())))
+
+    def watch(self, feedUrl):
+        while not self.stopRequested:
+            self.processFeed(feedUrl)
+            self.sleep(self.interval)
+
+    def backfill(self, months):
+        for year, month in backfillMonths(months):
+            feedUrl = EDGAR_MONTHLY_FEED_URL.format(year, month)
+            self.processFeed(feedUrl)
+            # archived feeds don't change, retry their filings until none is awaiting retry
+            nextRetry = self.ledger.nextRetry(feedUrl)
+            while nextRetry is not None and not self.stopRequested:
+                self.sleep(nextRetry - time.time())
+                self.processFeed(feedUrl)
+                nextRetry = self.ledger.nextRetry(feedUrl)
+            if self.stopRequested:
+                break
+
+    def processFeed(self, feedUrl):
+        startedAt = time.time()
+        webCache = self.cntlr.webCache
+        self.metrics["feedChecks"] += 1
+        self.metrics["lastFeed"] = feedUrl
+        if isHttpUrl(feedUrl) and not webCache.workOffline:
+            filepath = webCache.getfilename(feedUrl, checkModifiedTime=True) # conditional retrieval
+        else:
+            filepath = webCache.getfilename(feedUrl)
+        try:
+            feedStamp = (os.path.getmtime(filepath), os.path.getsize(filepath))
+        except (TypeError, EnvironmentError): # not retrieved, error has been logged
+            feedStamp = None
+        nextRetry = self.ledger.nextRetry(feedUrl)
+        if (feedStamp is not None and feedStamp == self.feedStamps.get(feedUrl) and
+            (nextRetry is None or nextRetry > startedAt)):
+            self.metrics["feedsNotModified"] += 1
+            self.cntlr.addToLog(_("RSS feed not modified"),
+                                messageCode="rssWatch:feedNotModified", file=feedUrl, level=logging.INFO)
+            self.writeMetrics()
+            return
+        rssModelXbrl = ModelXbrl.load(self.modelManager, feedUrl, _("checking RSS items"))
+        if rssModelXbrl.modelDocument is None or rssModelXbrl.modelDocument.type != Type.RSSFEED:
+            self.cntlr.addToLog(_("RSS feed could not be loaded"),
+                                messageCode="rssWatch:feedNotLoaded", file=feedUrl, level=logging.ERROR)
+            rssModelXbrl.close()
+            self.writeMetrics()
+            return
+        self.feedStamps[feedUrl] = feedStamp
+        now = time.time()
+        dueRssItems = []
+        attempts = {}
+        for rssItem in rssModelXbrl.modelDocument.rssItems:
+            key = rssItemKey(rssItem)
+            priorAttempts = self.ledger.attempts(key, now)
+            if priorAttempts is not None and key not in attempts: # feed may repeat an item
+                attempts[key] = priorAttempts
+                dueRssItems.append(rssItem)
+        self.cntlr.addToLog(_("RSS feed has %(numItems)s items, %(numDue)s new or due for retry"),
+                            messageCode="rssWatch:feedItems",
+                            messageArgs={"numItems": len(rssModelXbrl.modelDocument.rssItems), "numDue": len(dueRssItems)},
+                            file=feedUrl, level=logging.INFO)
+        if dueRssItems:
+            val = Validate.Validate(rssModelXbrl)
+            val.validateRssFeed(dueRssItems)
+            val.close()
+            now = time.time()
+            for rssItem in dueRssItems:
+                key = rssItemKey(rssItem)
+                itemAttempts = attempts[key] + 1
+                nextAttempt = None
+                if rssItem.results is not None: # results were set, filing has been validated
+                    status = rssItem.status
+                elif getattr(rssItem, "doNotProcessRSSitem", False) or getattr(rssItem, "skipRssItem", False):
+                    status = "skipped" # by plug-in processing criteria (e.g., xbrlDB skipLoadedFilings)
+                elif itemAttempts < RETRY_LIMIT:
+                    status = "retry"
+                    nextAttempt = now + RETRY_BACKOFF_SECONDS * 2 ** (itemAttempts - 1)
+                    self.metrics["itemsRetried"] += 1
+                    self.cntlr.addToLog(_("RSS item %(key)s could not be processed, attempt %(attempts)s, will be retried"),
+                                        messageCode="rssWatch:itemRetry",
+                                        messageArgs={"key": key, "attempts": itemAttempts},
+                                        file=feedUrl, level=logging.WARNING)
+                else:
+                    status = "failed"
+                    self.metrics["itemsFailed"] += 1
+                    self.cntlr.addToLog(_("RSS item %(key)s could not be processed in %(attempts)s attempts"),
+                                        messageCode="rssWatch:itemFailed",
+                                        messageArgs={"key": key, "attempts": itemAttempts},
+                                        file=feedUrl, level=logging.ERROR)
+                if status not in ("retry", "failed"):
+                    self.metrics["itemsProcessed"] += 1
+                self.metrics["itemsAttempted"] += 1
+                self.ledger.record(rssItem, feedUrl, status, itemAttempts, nextAttempt, now)
+            self.ledger.commit()
+        rssModelXbrl.close()
+        self.metrics["lastFeedSeconds"] = round(time.time() - startedAt, 3)
+        self.writeMetrics()
+
+    def writeMetrics(self):
+        if not self.metricsFile:
+            return
+        elapsedHours = (time.time() - self.startedAt) / 3600.0
+        metrics = dict(self.metrics)
+        metrics["started"] = time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.startedAt))
+        metrics["updated"] = time.strftime('%Y-%m-%dT%H:%M:%S')
+        metrics["itemsProcessedPerHour"] = round(self.metrics["itemsProcessed"] / elapsedHours, 1) if elapsedHours else None
+        metrics["ledgerStatusCounts"] = self.ledger.statusCounts()
+        nextRetry = self.ledger.nextRetry()
+        metrics["nextRetry"] = time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(nextRetry)) if nextRetry else None
+        tempFile = "{}.{}.tmp".format(self.metricsFile, os.getpid())
+        with open(tempFile, "w", encoding="utf-8") as fh:
+            json.dump(metrics, fh, indent=1)
+        os.replace(tempFile, self.metricsFile) # readers never see a partially written file
+
+    def close(self):
+        self.ledger.close()
+
+def runWatchRssDaemon(cntlr, options):
+    ''' watches the feed of the entry point, or backfills archived monthly feeds, until done or stopped '''
+    daemon = WatchRssDaemon(cntlr, options.rssWatch, options.rssWatchMetrics, options.rssWatchInterval or 600)
+    try:
+        signal.signal(signal.SIGTERM, daemon.requestStop)
+    except ValueError: # not the main thread, stopped only by keyboard interrupt
+        pass
+    try:
+        if options.rssBackfill:
+            daemon.backfill(options.rssBackfill)
+        elif options.entrypointFile:
+            daemon.watch(options.entrypointFile)
+        else:
+            cntlr.addToLog(_("RSS watch requires the feed to watch (-f) or months to backfill (--rssBackfill)"),
+                           messageCode="rssWatch:noFeed", level=logging.ERROR)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.close()
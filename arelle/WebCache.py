@@ -4,17 +4,21 @@ Created on Oct 5, 2010
 @author: Mark V Systems Limited
 (c) Copyright 2010 Mark V Systems Limited, All rights reserved.
 '''
-import os, posixpath, sys, re, shutil, time, calendar, io, json, logging, shutil, cgi
+import os, posixpath, sys, re, shutil, time, calendar, io, json, logging, shutil, cgi, threading
+from collections import defaultdict
+from email.utils import formatdate
 if sys.version[0] >= '3':
     from urllib.parse import quote, unquote
     from urllib.error import URLError, HTTPError, ContentTooShortError
     from http.client import IncompleteRead
+    from http import client as httpclient
     from urllib import request
     from urllib import request as proxyhandlers
 else: # python 2.7.2
     from urllib import quote, unquote
     from urllib import ContentTooShortError
     from httplib import IncompleteRead
+    import httplib as httpclient
     from urllib2 import URLError, HTTPError
     import urllib2 as proxyhandlers
 try:
@@ -24,6 +28,10 @@ except ImportError:
 from arelle.FileSource import SERVER_WEB_CACHE
 from arelle.PluginManager import pluginClassMethods
 from arelle.UrlUtil import isHttpUrl
+try:
+    from concurrent.futures import wait as waitForFutures
+except ImportError: # python 2.7 has no prefetching
+    waitForFutures = None
 addServerWebCache = None
     
 DIRECTORY_INDEX_FILE = "!~DirectoryIndex~!"
@@ -82,6 +90,13 @@ class WebCache:
         self._timeout = None        
         
         self._noCertificateCheck = False
+        self.maxConnections = 8 # concurrent connections (per host) retrieving into the cache
+        self.connectionPool = ConnectionPool(self)
+        self.prefetchExecutor = None
+        self.prefetchFutures = {} # by url being prefetched
+        self.urlLocks = {} # by url being retrieved: [lock, number of threads retrieving or waiting]
+        # guards url check times, validators, prefetch futures and url locks, which other threads also update
+        self.lock = threading.RLock()
         self.resetProxies(httpProxyTuple)
         
         #self.opener.addheaders = [('User-agent', 'Mozilla/5.0')]
@@ -112,9 +127,26 @@ class WebCache:
                     self.cachedUrlCheckTimes = json.load(f)
             except Exception:
                 self.cachedUrlCheckTimes = {}
+            # ETag and Last-Modified response headers of cached urls, for conditional retrieval when rechecking
+            self.urlValidatorsJsonFile = cntlr.userAppDir + os.sep + "cachedUrlValidators.json"
+            try:
+                with io.open(self.urlValidatorsJsonFile, 'rt', encoding='utf-8') as f:
+                    self.cachedUrlValidators = json.load(f)
+            except Exception:
+                self.cachedUrlValidators = {}
         else:
             self.cachedUrlCheckTimes = {}
+            self.cachedUrlValidators = {}
         self.cachedUrlCheckTimesModified = False
+        # sha256, size and last-modified of cached urls known good (warmed), which are not checked or rechecked
+        self.cacheManifestJsonFile = self.cacheDir + os.sep + "cacheManifest.json"
+        self.cacheManifest = {}
+        if cntlr.hasFileSystem and self.cacheDir != SERVER_WEB_CACHE:
+            try:
+                with io.open(self.cacheManifestJsonFile, 'rt', encoding='utf-8') as f:
+                    self.cacheManifest = json.load(f)
+            except Exception:
+                self.cacheManifest = {}
             
     @property
     def timeout(self):
@@ -152,11 +184,23 @@ class WebCache:
         self._logDownloads = _logDownloads
 
     def saveUrlCheckTimes(self):
-        if self.cachedUrlCheckTimesModified:
-            with io.open(self.urlCheckJsonFile, 'wt', encoding='utf-8') as f:
-                jsonStr = _STR_UNICODE(json.dumps(self.cachedUrlCheckTimes, ensure_ascii=False, indent=0)) # might not be unicode in 2.7
-                f.write(jsonStr)  # 2.7 gets unicode this way
-        self.cachedUrlCheckTimesModified = False
+        self.cancelPrefetches() # prefetches must not update check times while they are saved
+        with self.lock:
+            if self.cachedUrlCheckTimesModified:
+                with io.open(self.urlCheckJsonFile, 'wt', encoding='utf-8') as f:
+                    jsonStr = _STR_UNICODE(json.dumps(self.cachedUrlCheckTimes, ensure_ascii=False, indent=0)) # might not be unicode in 2.7
+                    f.write(jsonStr)  # 2.7 gets unicode this way
+                with io.open(self.urlValidatorsJsonFile, 'wt', encoding='utf-8') as f:
+                    jsonStr = _STR_UNICODE(json.dumps(self.cachedUrlValidators, ensure_ascii=False, indent=0))
+                    f.write(jsonStr)
+            self.cachedUrlCheckTimesModified = False
+        
+    def saveCacheManifest(self):
+        if not os.path.exists(self.cacheDir):
+            os.makedirs(self.cacheDir)
+        with io.open(self.cacheManifestJsonFile, 'wt', encoding='utf-8') as f:
+            jsonStr = _STR_UNICODE(json.dumps(self.cacheManifest, ensure_ascii=False, indent=0, sort_keys=True))
+            f.write(jsonStr)
         
     @property
     def noCertificateCheck(self):
@@ -201,11 +245,16 @@ class WebCache:
             self.proxy_auth_handler = proxyhandlers.ProxyBasicAuthHandler()
             self.http_auth_handler = proxyhandlers.HTTPBasicAuthHandler()
             proxyHandlers = [self.proxy_handler, self.proxy_auth_handler, self.http_auth_handler]
+        # keep-alive handlers reuse connections of the pool, replacing the default http and https handlers
+        self.connectionPool.clear()
+        proxyHandlers.append(KeepAliveHTTPHandler(self.connectionPool))
         if ssl and self.noCertificateCheck:
             context = ssl.create_default_context()
             context.check_hostname = False
             context.verify_mode = ssl.CERT_NONE
-            proxyHandlers.append(proxyhandlers.HTTPSHandler(context=context))
+            proxyHandlers.append(KeepAliveHTTPSHandler(self.connectionPool, context=context))
+        elif ssl:
+            proxyHandlers.append(KeepAliveHTTPSHandler(self.connectionPool))
         self.opener = proxyhandlers.build_opener(*proxyHandlers)
 
         #self.opener.close()
@@ -292,6 +341,25 @@ class WebCache:
             return url
         if base is not None or normalize:
             url = self.normalizeUrl(url, base)
+        if filenameOnly or self.workOffline or not isHttpUrl(url):
+            return self._getfilename(url, reload, checkModifiedTime, filenameOnly)
+        # threads (such as of the document prefetcher) retrieving the same url wait for each other,
+        # so the url is retrieved once into the cache and not replaced while another thread opens it
+        with self.lock:
+            urlLock = self.urlLocks.get(url)
+            if urlLock is None:
+                urlLock = self.urlLocks[url] = [threading.Lock(), 0]
+            urlLock[1] += 1
+        try:
+            with urlLock[0]:
+                return self._getfilename(url, reload, checkModifiedTime, filenameOnly)
+        finally:
+            with self.lock:
+                urlLock[1] -= 1
+                if urlLock[1] == 0:
+                    del self.urlLocks[url]
+
+    def _getfilename(self, url, reload, checkModifiedTime, filenameOnly):
         urlScheme, schemeSep, urlSchemeSpecificPart = url.partition("://")
         if schemeSep and urlScheme in ("http", "https"):
             # form cache file name (substituting _ for any illegal file characters)
@@ -308,30 +376,28 @@ class WebCache:
                 filepath = filepath.replace('/', '\\')
             if self.workOffline or filenameOnly:
                 return filepath
-            filepathtmp = filepath + ".tmp"
+            if url in self.cacheManifest and not reload:
+                return filepath # warmed, known good
+            with self.lock:
+                prefetchFuture = self.prefetchFutures.get(url)
+            if prefetchFuture is not None:
+                waitForFutures((prefetchFuture,)) # wait for url being prefetched (or its cancellation)
+            filepathtmp = "{}.{}.tmp".format(filepath, os.getpid()) # processes may share the cache
             fileExt = os.path.splitext(filepath)[1]
             timeNow = time.time()
             timeNowStr = time.strftime('%Y-%m-%dT%H:%M:%S UTC', time.gmtime(timeNow))
             retrievingDueToRecheckInterval = False
+            requestHeaders = None
             if not reload and os.path.exists(filepath):
-                if url in self.cachedUrlCheckTimes and not checkModifiedTime:
-                    cachedTime = calendar.timegm(time.strptime(self.cachedUrlCheckTimes[url], '%Y-%m-%dT%H:%M:%S UTC'))
+                with self.lock:
+                    checkTime = self.cachedUrlCheckTimes.get(url)
+                if checkTime and not checkModifiedTime:
+                    cachedTime = calendar.timegm(time.strptime(checkTime, '%Y-%m-%dT%H:%M:%S UTC'))
                 else:
                     cachedTime = 0
                 if timeNow - cachedTime > self.maxAgeSeconds:
-                    # weekly check if newer file exists
-                    newerOnWeb = False
-                    try: # no provision here for proxy authentication!!!
-                        remoteFileTime = lastModifiedTime( self.getheaders(quotedUrl) )
-                        if remoteFileTime and remoteFileTime > os.path.getmtime(filepath):
-                            newerOnWeb = True
-                    except:
-                        pass # for now, forget about authentication here
-                    if not newerOnWeb:
-                        # update ctime by copying file and return old file
-                        self.cachedUrlCheckTimes[url] = timeNowStr
-                        self.cachedUrlCheckTimesModified = True
-                        return filepath
+                    # weekly check if newer file exists, by conditional retrieval, not modified (304) response if not
+                    requestHeaders = self.conditionalRequestHeaders(url, filepath)
                     retrievingDueToRecheckInterval = True
                 else:
                     return filepath
@@ -345,12 +411,13 @@ class WebCache:
             retryCount = 5
             while retryCount > 0:
                 try:
-                    self.progressUrl = url
                     savedfile, headers, initialBytes = self.retrieve(
                     #savedfile, headers = self.opener.retrieve(
                                       quotedUrl,
                                       filename=filepathtmp,
-                                      reporthook=self.reportProgress)
+                                      reporthook=lambda blockCount, blockSize, totalSize, url=url:
+                                                    self.reportProgress(url, blockCount, blockSize, totalSize),
+                                      requestHeaders=requestHeaders)
                     
                     # check if this is a real file or a wifi or web logon screen
                     if fileExt in {".xsd", ".xml", ".xbrl"}:
@@ -395,6 +462,13 @@ class WebCache:
                     return None
                     # handle file is bad
                 except (HTTPError, URLError) as err:
+                    if retrievingDueToRecheckInterval and isinstance(err, HTTPError) and err.code == 304:
+                        # not modified, keep cached file
+                        err.close()
+                        if os.path.exists(filepathtmp):
+                            os.remove(filepathtmp)
+                        self.setUrlCheckTime(url, timeNowStr)
+                        return filepath
                     try:
                         tryWebAuthentication = False
                         if isinstance(err, HTTPError) and err.code == 401:
@@ -516,8 +590,7 @@ class WebCache:
                 webFileTime = lastModifiedTime(headers)
                 if webFileTime: # set mtime to web mtime
                     os.utime(filepath,(webFileTime,webFileTime))
-                self.cachedUrlCheckTimes[url] = timeNowStr
-                self.cachedUrlCheckTimesModified = True
+                self.setUrlCheckTime(url, timeNowStr, headers)
                 return filepath
         
         if url.startswith("file://"): url = url[7:]
@@ -526,25 +599,133 @@ class WebCache:
             url = url.replace('/', '\\')
         return url
     
+    def conditionalRequestHeaders(self, url, filepath):
+        with self.lock:
+            validators = self.cachedUrlValidators.get(url, {})
+        requestHeaders = {"If-Modified-Since": validators.get("lastModified") or
+                                               formatdate(os.path.getmtime(filepath), usegmt=True)}
+        if validators.get("etag"):
+            requestHeaders["If-None-Match"] = validators["etag"]
+        return requestHeaders
+
+    def setUrlCheckTime(self, url, timeStr, headers=None):
+        # records check time of url, and validators of its retrieval response headers if it was retrieved
+        with self.lock:
+            self.cachedUrlCheckTimes[url] = timeStr
+            if headers is not None:
+                self.setUrlValidators(url, headers)
+            self.cachedUrlCheckTimesModified = True
+
+    def setUrlValidators(self, url, headers):
+        validators = {}
+        if headers:
+            if headers["etag"]:
+                validators["etag"] = headers["etag"]
+            if headers["last-modified"]:
+                validators["lastModified"] = headers["last-modified"]
+        with self.lock:
+            if validators:
+                self.cachedUrlValidators[url] = validators
+            else:
+                self.cachedUrlValidators.pop(url, None)
+
+    def prefetch(self, urls):
+        ''' starts concurrently retrieving into the cache those http urls which are not yet cached, or are due
+            for rechecking, and returns without waiting; getfilename of a url being prefetched waits for its retrieval.
+            Retrieval errors are not reported here, but by getfilename when it retrieves the url again. '''
+        if self.workOffline or self.cacheDir == SERVER_WEB_CACHE or self.maxConnections <= 1:
+            return
+        timeNow = time.time()
+        for url in urls:
+            if isHttpUrl(url) and url not in self.cacheManifest:
+                filepath = self.getfilename(url, filenameOnly=True)
+                if not filepath or filepath.endswith(DIRECTORY_INDEX_FILE):
+                    continue
+                with self.lock:
+                    if url in self.prefetchFutures:
+                        continue
+                    if os.path.exists(filepath):
+                        checkTime = self.cachedUrlCheckTimes.get(url)
+                        if checkTime and timeNow - calendar.timegm(time.strptime(checkTime, '%Y-%m-%dT%H:%M:%S UTC')) <= self.maxAgeSeconds:
+                            continue # not due for rechecking
+                    if self.prefetchExecutor is None:
+                        from concurrent.futures import ThreadPoolExecutor
+                        self.prefetchExecutor = ThreadPoolExecutor(max_workers=self.maxConnections)
+                    future = self.prefetchExecutor.submit(self.prefetchUrl, url, filepath)
+                    self.prefetchFutures[url] = future
+                future.add_done_callback(self.prefetchDone)
+
+    def prefetchDone(self, future):
+        # done callback of prefetch futures (on a prefetch thread, or on the thread cancelling it)
+        with self.lock:
+            for url, prefetchFuture in self.prefetchFutures.items():
+                if prefetchFuture is future:
+                    del self.prefetchFutures[url]
+                    break
+
+    def cancelPrefetches(self):
+        ''' cancels prefetches not yet started and waits for those in progress '''
+        with self.lock:
+            futures = list(self.prefetchFutures.values())
+        if futures:
+            for future in futures:
+                future.cancel()
+            waitForFutures(futures)
+
+    def prefetchUrl(self, url, filepath):
+        urlScheme, schemeSep, urlSchemeSpecificPart = url.partition("://")
+        quotedUrl = urlScheme + schemeSep + quote(urlSchemeSpecificPart, '/?=&')
+        filepathtmp = "{}.{}.prefetch.tmp".format(filepath, os.getpid()) # getfilename may be retrieving the same url
+        try:
+            filedir = os.path.dirname(filepath)
+            if not os.path.exists(filedir):
+                os.makedirs(filedir, exist_ok=True)
+            requestHeaders = None
+            if os.path.exists(filepath): # recheck
+                requestHeaders = self.conditionalRequestHeaders(url, filepath)
+            try:
+                savedfile, headers, initialBytes = self.retrieve(quotedUrl, filename=filepathtmp, requestHeaders=requestHeaders)
+            except HTTPError as err:
+                if requestHeaders and err.code == 304: # not modified
+                    err.close()
+                    self.setUrlCheckTime(url, time.strftime('%Y-%m-%dT%H:%M:%S UTC', time.gmtime()))
+                    return
+                raise
+            if os.path.splitext(filepath)[1] in {".xsd", ".xml", ".xbrl"} and b"<html" in initialBytes:
+                os.remove(filepathtmp) # possible logon request, left for getfilename
+                return
+            os.replace(filepathtmp, filepath)
+            webFileTime = lastModifiedTime(headers)
+            if webFileTime: # set mtime to web mtime
+                os.utime(filepath,(webFileTime,webFileTime))
+            self.setUrlCheckTime(url, time.strftime('%Y-%m-%dT%H:%M:%S UTC', time.gmtime()), headers)
+            if self._logDownloads:
+                self.cntlr.addToLog(_("Downloaded %(URL)s"),
+                                    messageCode="webCache:download",
+                                    messageArgs={"URL": url, "filepath": filepath},
+                                    level=logging.INFO)
+        except Exception:
+            if os.path.exists(filepathtmp):
+                os.remove(filepathtmp)
+
     def internetRecheckFailedRecovery(self, filepath, url, err, timeNowStr):
         self.cntlr.addToLog(_("During refresh of web file ignoring error: %(error)s for %(URL)s"),
                             messageCode="webCache:unableToRefreshFile",
                             messageArgs={"URL": url, "error": err},
                             level=logging.INFO)
         # skip this checking cycle, act as if retrieval was ok
-        self.cachedUrlCheckTimes[url] = timeNowStr
-        self.cachedUrlCheckTimesModified = True
+        self.setUrlCheckTime(url, timeNowStr)
         return filepath
     
-    def reportProgress(self, blockCount, blockSize, totalSize):
+    def reportProgress(self, url, blockCount, blockSize, totalSize):
         if totalSize > 0:
             self.cntlr.showStatus(_("web caching {0}: {1:.0f} of {2:.0f} KB").format(
-                    self.progressUrl,
+                    url,
                     blockCount * blockSize / 1024,
                     totalSize / 1024))
         else:
             self.cntlr.showStatus(_("web caching {0}: {1:.0f} KB").format(
-                    self.progressUrl,
+                    url,
                     blockCount * blockSize / 1024))
 
     def clear(self):
@@ -552,6 +733,10 @@ class WebCache:
             cachedProtocolDir = os.path.join(self.cacheDir, cachedProtocol)
             if os.path.exists(cachedProtocolDir):
                 shutil.rmtree(cachedProtocolDir, True)
+        if self.cacheManifest:
+            self.cacheManifest.clear()
+            if os.path.exists(self.cacheManifestJsonFile):
+                os.remove(self.cacheManifestJsonFile)
         
     def getheaders(self, url):
         if url and isHttpUrl(url):
@@ -584,10 +769,12 @@ class WebCache:
                 pass
         return None
         
-    def retrieve(self, url, filename=None, filestream=None, reporthook=None, data=None):
+    def retrieve(self, url, filename=None, filestream=None, reporthook=None, data=None, requestHeaders=None):
         # return filename, headers (in dict), initial file bytes (to detect logon requests)
         headers = None
         initialBytes = b''
+        if requestHeaders:
+            url = proxyhandlers.Request(url, data, requestHeaders)
         fp = self.opener.open(url, data, timeout=self.timeout)
         try:
             headers = fp.info()
@@ -632,6 +819,107 @@ class WebCache:
             tfp.seek(0)
         return filename, headers, initialBytes
 
+class ConnectionPool:
+    # idle keep-alive connections by scheme, host and proxy tunnel
+    def __init__(self, webCache):
+        self.webCache = webCache
+        self.idleConnections = defaultdict(list)
+        self.lock = threading.Lock()
+
+    def acquire(self, key):
+        with self.lock:
+            if self.idleConnections[key]:
+                return self.idleConnections[key].pop()
+        return None
+
+    def release(self, key, connection):
+        with self.lock:
+            if len(self.idleConnections[key]) < self.webCache.maxConnections:
+                self.idleConnections[key].append(connection)
+                return
+        connection.close()
+
+    def clear(self):
+        with self.lock:
+            connections = [connection for connections in self.idleConnections.values() for connection in connections]
+            self.idleConnections.clear()
+        for connection in connections:
+            connection.close()
+
+class PooledHTTPResponse(httpclient.HTTPResponse):
+    # returns its connection to the pool when closed after reading its entire body
+    pooledConnection = connectionPool = poolKey = None
+
+    def close(self):
+        isReusable = not self.will_close and (self.fp is None or (not self.chunked and self.length == 0))
+        super(PooledHTTPResponse, self).close()
+        connection, self.pooledConnection = self.pooledConnection, None
+        if connection is not None:
+            if isReusable:
+                self.connectionPool.release(self.poolKey, connection)
+            else:
+                connection.close()
+
+def keepAliveOpen(handler, connectionClass, req, **kwargs):
+    # as urllib's AbstractHTTPHandler.do_open, but on a pooled connection which is kept alive
+    host = req.host
+    if not host:
+        raise URLError('no host given')
+    headers = dict(req.unredirected_hdrs)
+    headers.update((k, v) for k, v in req.headers.items() if k not in headers)
+    headers = dict((name.title(), val) for name, val in headers.items())
+    headers["Connection"] = "keep-alive"
+    tunnelHeaders = {}
+    if req._tunnel_host and "Proxy-Authorization" in headers:
+        tunnelHeaders["Proxy-Authorization"] = headers.pop("Proxy-Authorization")
+    key = (connectionClass, host, req._tunnel_host)
+    while True:
+        connection = handler.connectionPool.acquire(key)
+        isReused = connection is not None
+        if not isReused:
+            connection = connectionClass(host, timeout=req.timeout, **kwargs)
+            if req._tunnel_host:
+                connection.set_tunnel(req._tunnel_host, headers=tunnelHeaders)
+            connection.response_class = PooledHTTPResponse
+        elif connection.sock is not None:
+            connection.sock.settimeout(req.timeout)
+        try:
+            connection.request(req.get_method(), req.selector, req.data, headers)
+            response = connection.getresponse()
+        except (ConnectionError, httpclient.BadStatusLine) as err:
+            connection.close()
+            if isReused: # idle connection was closed by server, retry on a new connection
+                continue
+            if isinstance(err, OSError):
+                raise URLError(err)
+            raise
+        except OSError as err:
+            connection.close()
+            raise URLError(err)
+        break
+    response.pooledConnection = connection
+    response.connectionPool = handler.connectionPool
+    response.poolKey = key
+    response.url = req.get_full_url()
+    response.msg = response.reason
+    return response
+
+class KeepAliveHTTPHandler(proxyhandlers.HTTPHandler):
+    def __init__(self, connectionPool):
+        proxyhandlers.HTTPHandler.__init__(self)
+        self.connectionPool = connectionPool
+
+    def http_open(self, req):
+        return keepAliveOpen(self, httpclient.HTTPConnection, req)
+
+class KeepAliveHTTPSHandler(proxyhandlers.HTTPSHandler):
+    def __init__(self, connectionPool, context=None):
+        proxyhandlers.HTTPSHandler.__init__(self, context=context)
+        self.connectionPool = connectionPool
+
+    def https_open(self, req):
+        return keepAliveOpen(self, httpclient.HTTPSConnection, req, context=self._context)
+
 '''
 class WebCacheUrlOpener(request.FancyURLopener):
     def __init__(self, cntlr, proxies=None):
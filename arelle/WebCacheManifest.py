@@ -0,0 +1,138 @@
+'''
+Created on Oct 18, 2026
+
+Warms the web cache for a list of entry points, for use by validation nodes without internet access,
+and writes the cache manifest (sha256, size and last-modified of each cached url's file).
+
+The DTS closure of each entry point is walked by the same references which discovery follows
+(import, include, schemaRef, linkbaseRef, roleRef, arcroleRef and loc), on documents parsed
+without model objects, and each http(s) document is retrieved into the web cache as by discovery.
+Urls in the manifest are then taken from the cache by getfilename without checking for their file
+or rechecking them, and verifyCache checks the cached files against the manifest.
+
+@author: Mark V Systems Limited
+(c) Copyright 2026 Mark V Systems Limited, All rights reserved.
+'''
+import os, io, hashlib, logging
+from email.utils import formatdate
+from lxml import etree
+from arelle import PackageManager
+from arelle.DocumentPrefetcher import referencedUrls
+from arelle.UrlUtil import isHttpUrl
+
+def fileDigest(filepath):
+    ''' returns (sha256 hex digest, size) of file contents '''
+    sha256 = hashlib.sha256()
+    size = 0
+    with io.open(filepath, "rb") as f:
+        while True:
+            b = f.read(1 << 20)
+            if not b:
+                break
+            sha256.update(b)
+            size += len(b)
+    return sha256.hexdigest(), size
+
+def entryPointUrls(entrypointsFile):
+    ''' returns entry points of file, one per line, ignoring blank and # comment lines '''
+    with io.open(entrypointsFile, "rt", encoding="utf-8") as f:
+        return [line.strip() for line in f
+                if line.strip() and not line.strip().startswith("#")]
+
+def warmCache(cntlr, entrypointsFile):
+    webCache = cntlr.webCache
+    if webCache.workOffline:
+        cntlr.addToLog(_("Web cache can not be warmed when working offline"),
+                       messageCode="webCache:warmCacheOffline", file=entrypointsFile, level=logging.ERROR)
+        return False
+    normalizeUrl = webCache.normalizeUrl
+    mapUrl = cntlr.modelManager.disclosureSystem.mappedUrl
+    xmlParser = etree.XMLParser(recover=True, huge_tree=True, resolve_entities=False, no_network=True)
+    visited = set()
+    level = []
+    for entryPoint in entryPointUrls(entrypointsFile):
+        url = mapUrl(normalizeUrl(entryPoint, None))
+        if url not in visited:
+            visited.add(url)
+            level.append(url)
+    numCached = numErrors = 0
+    while level:
+        # retrieve each level of the DTS closure concurrently, then parse it for the next level;
+        # level urls are mapped by the disclosure system, as retrieved by discovery
+        webCache.prefetch(url for url in level if url not in webCache.cacheManifest)
+        nextLevel = []
+        for mappedUrl in level:
+            isHttp = isHttpUrl(mappedUrl)
+            if isHttp:
+                webCache.cacheManifest.pop(mappedUrl, None) # retrieve or recheck as usual
+                filepath = webCache.getfilename(mappedUrl)
+            else:
+                filepath = mappedUrl
+            if not filepath or not os.path.exists(filepath):
+                cntlr.addToLog(_("Unable to retrieve %(URL)s into the web cache"),
+                               messageCode="webCache:warmCacheRetrievalError",
+                               messageArgs={"URL": mappedUrl}, file=mappedUrl, level=logging.ERROR)
+                numErrors += 1
+                continue
+            if isHttp:
+                sha256, size = fileDigest(filepath)
+                validators = webCache.cachedUrlValidators.get(mappedUrl, {})
+                webCache.cacheManifest[mappedUrl] = {
+                    "sha256": sha256,
+                    "size": size,
+                    "lastModified": validators.get("lastModified") or
+                                    formatdate(os.path.getmtime(filepath), usegmt=True)}
+                numCached += 1
+            if os.path.splitext(filepath)[1] not in (".xsd", ".xml", ".xbrl"):
+                continue
+            try:
+                xmlDocument = etree.parse(filepath, parser=xmlParser)
+            except (etree.LxmlError, EnvironmentError) as err:
+                cntlr.addToLog(_("Unable to parse %(URL)s: %(error)s"),
+                               messageCode="webCache:warmCacheParseError",
+                               messageArgs={"URL": mappedUrl, "error": err}, file=mappedUrl, level=logging.ERROR)
+                numErrors += 1
+                continue
+            for refUrl in referencedUrls(xmlDocument, None, mappedUrl, normalizeUrl):
+                if PackageManager.isMappedUrl(refUrl): # taxonomy packages are already local
+                    continue
+                refUrl = mapUrl(refUrl)
+                if refUrl not in visited:
+                    visited.add(refUrl)
+                    nextLevel.append(refUrl)
+            xmlDocument = None
+        level = nextLevel
+    webCache.saveCacheManifest()
+    webCache.saveUrlCheckTimes()
+    cntlr.addToLog(_("Web cache warmed: %(numCached)s cached files in manifest, %(numErrors)s errors"),
+                   messageCode="webCache:warmCache",
+                   messageArgs={"numCached": numCached, "numErrors": numErrors},
+                   file=entrypointsFile, level=logging.INFO)
+    return numErrors == 0
+
+def verifyCache(cntlr):
+    ''' checks size and sha256 of cached files of the manifest, removing entries whose file is missing or altered '''
+    webCache = cntlr.webCache
+    numVerified = numErrors = 0
+    for url, entry in sorted(webCache.cacheManifest.items()):
+        filepath = webCache.getfilename(url, filenameOnly=True)
+        try:
+            sha256, size = fileDigest(filepath)
+            if size == entry.get("size") and sha256 == entry.get("sha256"):
+                numVerified += 1
+                continue
+            error = _("size or sha256 differs from manifest")
+        except EnvironmentError as err:
+            error = err
+        cntlr.addToLog(_("Cached file of %(URL)s fails verification: %(error)s"),
+                       messageCode="webCache:verifyCacheError",
+                       messageArgs={"URL": url, "error": error}, file=filepath, level=logging.ERROR)
+        del webCache.cacheManifest[url]
+        numErrors += 1
+    if numErrors:
+        webCache.saveCacheManifest()
+    cntlr.addToLog(_("Web cache verified: %(numVerified)s cached files match manifest, %(numErrors)s errors"),
+                   messageCode="webCache:verifyCache",
+                   messageArgs={"numVerified": numVerified, "numErrors": numErrors},
+                   level=logging.INFO)
+    return numErrors == 0
@@ -0,0 +1,252 @@
+'''
+Created on Oct 18, 2026
+
+Job queue of the web server for long running validation and view requests.
+
+A request submitted as a job is saved (path, query, method and any posted body) in a SQLite
+database of the user application directory, and answered with its job id.  Job worker
+processes, forked by the web server, claim queued jobs, replay each saved request through the
+web application's route (so every media type of the synchronous request is available), and
+save its result file, content type, progress status and any profile statistics.  Results are
+kept for the configured time to live after the job finishes.  A job exceeding the configured
+timeout fails, and its worker exits, to be replaced by the web server process, as models of the
+interrupted job may remain loaded.  Running jobs of a job worker which exits fail.
+
+@author: Mark V Systems Limited
+(c) Copyright 2026 Mark V Systems Limited, All rights reserved.
+'''
+import os, io, sys, time, json, uuid, sqlite3, signal, logging
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+PROGRESS_INTERVAL = 1.0 # seconds between progress updates saved to the queue
+POLL_INTERVAL = 0.5 # seconds between checks of the queue by an idle job worker
+
+class JobTimeout(BaseException): # not an Exception, so it is not caught and logged within cntlr.run
+    pass
+
+class JobQueue:
+    def __init__(self, jobsDir, ttl=3600, timeout=None):
+        self.jobsDir = jobsDir
+        self.dbFile = os.path.join(jobsDir, "jobs.db")
+        self.ttl = ttl # seconds finished job results are kept
+        self.timeout = timeout # seconds a job may run, or None if unlimited
+        if not os.path.exists(jobsDir):
+            os.makedirs(jobsDir)
+        with self.connection() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS jobs ("
+                         "id TEXT PRIMARY KEY, state TEXT, submitted REAL, started REAL, finished REAL, "
+                         "method TEXT, path TEXT, query TEXT, contentType TEXT, "
+                         "progress TEXT, profileStats TEXT, resultContentType TEXT, workerPid INTEGER)")
+            conn.execute("CREATE INDEX IF NOT EXISTS jobsState ON jobs (state, submitted)")
+
+    def connection(self):
+        # connections are opened per operation so each forked process has its own
+        conn = sqlite3.connect(self.dbFile, timeout=60, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return _Connection(conn)
+
+    def bodyFile(self, jobId):
+        return os.path.join(self.jobsDir, jobId + ".request")
+
+    def resultFile(self, jobId):
+        return os.path.join(self.jobsDir, jobId + ".result")
+
+    def submit(self, method, path, query, contentType, body):
+        jobId = uuid.uuid4().hex
+        if body:
+            with open(self.bodyFile(jobId), "wb") as fh:
+                fh.write(body)
+        with self.connection() as conn:
+            conn.execute("INSERT INTO jobs (id, state, submitted, method, path, query, contentType) VALUES (?,?,?,?,?,?,?)",
+                         (jobId, QUEUED, time.time(), method, path, query, contentType))
+        return jobId
+
+    def claim(self):
+        ''' returns the oldest queued job (as a row) after marking it running by this process, or None '''
+        with self.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE") # only one worker claims a job
+            try:
+                job = conn.execute("SELECT * FROM jobs WHERE state = ? ORDER BY submitted LIMIT 1", (QUEUED,)).fetchone()
+                if job is not None:
+                    conn.execute("UPDATE jobs SET state = ?, started = ?, workerPid = ? WHERE id = ?",
+                                 (RUNNING, time.time(), os.getpid(), job["id"]))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return job
+
+    def setProgress(self, jobId, progress):
+        with self.connection() as conn:
+            conn.execute("UPDATE jobs SET progress = ? WHERE id = ?", (progress, jobId))
+
+    def finish(self, jobId, state, result, resultContentType, profileStats):
+        if isinstance(result, str):
+            result = result.encode("utf-8")
+        with open(self.resultFile(jobId), "wb") as fh:
+            fh.write(result or b"")
+        with self.connection() as conn:
+            conn.execute("UPDATE jobs SET state = ?, finished = ?, resultContentType = ?, profileStats = ? WHERE id = ?",
+                         (state, time.time(), resultContentType, json.dumps(profileStats) if profileStats else None, jobId))
+        if os.path.exists(self.bodyFile(jobId)):
+            os.remove(self.bodyFile(jobId))
+
+    def status(self, jobId):
+        ''' returns dict of job status, or None if no such job (or its result has expired) '''
+        with self.connection() as conn:
+            job = conn.execute("SELECT * FROM jobs WHERE id = ?", (jobId,)).fetchone()
+        if job is None:
+            return None
+        status = {"jobId": jobId, "state": job["state"], "progress": job["progress"],
+                  "submitted": job["submitted"], "started": job["started"], "finished": job["finished"]}
+        if job["state"] == QUEUED:
+            with self.connection() as conn:
+                status["queuePosition"] = conn.execute("SELECT COUNT(*) FROM jobs WHERE state = ? AND submitted <= ?",
+                                                       (QUEUED, job["submitted"])).fetchone()[0]
+        if job["profileStats"]:
+            status["profileStats"] = json.loads(job["profileStats"])
+        if job["state"] in (DONE, FAILED):
+            status["resultContentType"] = job["resultContentType"]
+            status["expires"] = job["finished"] + self.ttl
+        return status
+
+    def result(self, jobId):
+        ''' returns (content type, result bytes) of a finished job, or None '''
+        status = self.status(jobId)
+        if status is None or status["state"] not in (DONE, FAILED):
+            return None
+        with open(self.resultFile(jobId), "rb") as fh:
+            return status["resultContentType"], fh.read()
+
+    def expire(self):
+        ''' removes finished jobs older than ttl, and their results '''
+        with self.connection() as conn:
+            expiredIds = [row[0] for row in conn.execute("SELECT id FROM jobs WHERE state IN (?,?) AND finished < ?",
+                                                         (DONE, FAILED, time.time() - self.ttl))]
+            for jobId in expiredIds:
+                conn.execute("DELETE FROM jobs WHERE id = ?", (jobId,))
+        for jobId in expiredIds:
+            for filename in (self.resultFile(jobId), self.bodyFile(jobId)):
+                if os.path.exists(filename):
+                    os.remove(filename)
+
+    def requeueRunning(self):
+        ''' jobs left running by workers of a prior server process are queued again '''
+        with self.connection() as conn:
+            conn.execute("UPDATE jobs SET state = ?, started = NULL, workerPid = NULL WHERE state = ?", (QUEUED, RUNNING))
+
+    def failRunning(self, workerPid):
+        ''' jobs left running by a job worker which exited fail '''
+        with self.connection() as conn:
+            jobIds = [row[0] for row in conn.execute("SELECT id FROM jobs WHERE state = ? AND workerPid = ?",
+                                                     (RUNNING, workerPid))]
+        for jobId in jobIds:
+            self.finish(jobId, FAILED, _("Job failed: job worker process exited"), 'text/plain; charset=UTF-8', None)
+
+class _Connection:
+    # closes the sqlite3 connection on exit (the sqlite3 connection context manager only ends transactions)
+    def __init__(self, conn):
+        self.conn = conn
+    def __enter__(self):
+        return self.conn
+    def __exit__(self, *args):
+        self.conn.close()
+
+def startJobWorkers(cntlr, app, jobQueue, numWorkers):
+    ''' forks job worker processes, returns set of their pids '''
+    jobQueue.requeueRunning()
+    return set(startJobWorker(cntlr, app, jobQueue) for i in range(numWorkers))
+
+def startJobWorker(cntlr, app, jobQueue):
+    ''' forks a job worker process, which exits when the web server process exits or a job times out, returns its pid '''
+    serverPid = os.getpid()
+    pid = os.fork()
+    if pid == 0: # job worker process
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        try:
+            while os.getppid() == serverPid:
+                job = jobQueue.claim()
+                if job is None:
+                    jobQueue.expire()
+                    time.sleep(POLL_INTERVAL)
+                elif not runJob(cntlr, app, jobQueue, job):
+                    break # timed out, models of the interrupted job may remain loaded
+        finally:
+            os._exit(0)
+    return pid
+
+def jobTimedOut(signum, frame):
+    raise JobTimeout()
+
+def runJob(cntlr, app, jobQueue, job):
+    ''' runs job, returns False if it timed out '''
+    from arelle.webserver.bottle import request, response
+    jobId = job["id"]
+    bodyFile = jobQueue.bodyFile(jobId)
+    if os.path.exists(bodyFile):
+        with open(bodyFile, "rb") as fh:
+            body = fh.read()
+    else:
+        body = b""
+    environ = {"REQUEST_METHOD": job["method"], "SCRIPT_NAME": "", "PATH_INFO": job["path"], "QUERY_STRING": job["query"] or "",
+               "SERVER_NAME": "localhost", "SERVER_PORT": "80", "SERVER_PROTOCOL": "HTTP/1.1", "wsgi.url_scheme": "http",
+               "CONTENT_LENGTH": str(len(body)), "wsgi.input": io.BytesIO(body), "wsgi.errors": sys.stderr}
+    if job["contentType"]:
+        environ["CONTENT_TYPE"] = job["contentType"]
+    lastProgressTime = [0]
+    def showStatus(message, clearAfter=None):
+        if message and time.time() - lastProgressTime[0] >= PROGRESS_INTERVAL:
+            lastProgressTime[0] = time.time()
+            jobQueue.setProgress(jobId, message)
+    cntlr.showStatus = showStatus
+    state = DONE
+    timedOut = False
+    profileStatsHandler = ProfileStatsHandler()
+    cntlr.logger.addHandler(profileStatsHandler)
+    if jobQueue.timeout:
+        signal.signal(signal.SIGALRM, jobTimedOut)
+        signal.alarm(jobQueue.timeout)
+    try:
+        request.bind(environ)
+        response.bind()
+        route, args = app.match(environ)
+        result = route.call(**args)
+        if isinstance(result, (list, tuple)): # e.g., multipart response parts, which may be bytes (such as zip)
+            if any(isinstance(part, bytes) for part in result):
+                result = b"".join(part if isinstance(part, bytes) else part.encode("utf-8") for part in result)
+            else:
+                result = "".join(result)
+    except JobTimeout:
+        state = FAILED
+        timedOut = True
+        result = _("Job processing exceeded {0} seconds.").format(jobQueue.timeout)
+        response.content_type = 'text/plain; charset=UTF-8'
+    except Exception as ex:
+        state = FAILED
+        result = _("Job failed: {0}").format(ex)
+        response.content_type = 'text/plain; charset=UTF-8'
+    finally:
+        if jobQueue.timeout:
+            signal.alarm(0)
+        cntlr.logger.removeHandler(profileStatsHandler)
+    jobQueue.finish(jobId, state, result, response.content_type, profileStatsHandler.profileStats)
+    return not timedOut
+
+class ProfileStatsHandler(logging.Handler):
+    # captures profile statistics (seconds by activity) logged by a job with collectProfileStats
+    def __init__(self):
+        super(ProfileStatsHandler, self).__init__()
+        self.profileStats = None
+
+    def emit(self, logRec):
+        if getattr(logRec, "messageCode", None) == "info:profileStats" and isinstance(logRec.args, dict):
+            self.profileStats = {}
+            for name, stat in logRec.args.get("profileStats", {}).items():
+                try: # logged stats are strings of (sequence, seconds, memory) tuples
+                    self.profileStats[name] = float(stat.strip("()").split(",")[1])
+                except (AttributeError, IndexError, ValueError):
+                    pass
@@ -10,6 +10,7 @@ from arelle.XPathParser import (VariableRef, QNameDef, OperationDef, RangeDecl,
 from arelle import (ModelXbrl, XbrlConst, XmlUtil)
 from arelle.ModelObject import ModelObject, ModelAttribute
 from arelle.ModelInstanceObject import ModelFact, ModelInlineFact
+from arelle.ModelFactStore import StoredFact
 from arelle.ModelValue import (qname,QName,dateTime, DateTime, DATEUNION, DATE, DATETIME, anyURI, AnyURI)
 from arelle.XmlValidate import UNKNOWN, VALID, VALID_NO_CONTENT, validate as xmlValidate
 from arelle.PluginManager import pluginClassMethods
@@ -148,6 +149,8 @@ class XPathContext:
     def evaluate(self, exprStack, contextItem=None, resultStack=None, parentOp=None):
         if resultStack is None: resultStack =  []
         if contextItem is None: contextItem = self.contextItem
+        if exprStack and isinstance(exprStack[0], ProgHeader) and exprStack[0].compiledProg is not None:
+            return exprStack[0].compiledProg(self, contextItem, resultStack, parentOp)
         setProgHeader = False
         for p in exprStack:
             result = None
@@ -644,14 +647,14 @@ class XPathContext:
             return x
         baseXsdType = None
         e = None
-        if isinstance(x, ModelFact):
+        if isinstance(x, (ModelFact, StoredFact)):
             if x.isTuple:
                 raise XPathException(p, 'err:FOTY0012', _('Atomizing tuple {0} that does not have a typed value').format(x))
             if x.isNil:
                 return []
             baseXsdType = x.concept.baseXsdType
             v = x.value # resolves default value
-            e = x
+            e = x if isinstance(x, ModelFact) else x.getparent() # stored fact has namespaces of its parent
         elif isinstance(x, ModelAttribute): # ModelAttribute is a tuple (below), check this first!
             return x.xValue
         else:
@@ -721,7 +724,7 @@ class XPathContext:
             varQname = qname(elt,varname[1:])
             if varQname in self.inScopeVars:
                 varValue = self.inScopeVars[varQname]
-                if isinstance(varValue, ModelFact):
+                if isinstance(varValue, (ModelFact, StoredFact)):
                     return varValue.effectiveValue
                 else:
                     return str(varValue)
@@ -768,7 +771,7 @@ class XPathContext:
     def documentOrderedNodes(self, x):
         l = set()  # must have unique nodes only
         for e in x:
-            if isinstance(e,ModelObject):
+            if isinstance(e,(ModelObject, StoredFact)):
                 h = e.sourceline
             elif isinstance(e,ModelAttribute):
                 h = e.modelElement.sourceline
@@ -778,7 +781,7 @@ class XPathContext:
         return [e for h,e in sorted(l, key=lambda h: h[0] or 0)]  # or 0 in case sourceline is None
     
     def modelItem(self, x):
-        if isinstance(x, (ModelFact, ModelInlineFact)) and x.isItem:
+        if isinstance(x, (ModelFact, ModelInlineFact, StoredFact)) and x.isItem:
             return x
         return None
 
@@ -26,6 +26,8 @@ import time, xml.dom, traceback
 from decimal import Decimal
 from arelle import (XmlUtil, ModelValue, XbrlConst)
 FunctionIxt = None
+# deferred imports of evaluation modules used by compiled expressions
+XPathContext = FunctionFn = FunctionXfi = FunctionXs = FunctionCustom = None
 
 
 # Debugging flag can be set to either "debug_flag=True" or "debug_flag=False"
@@ -36,6 +38,8 @@ xmlElement = None
 modelXbrl = None
 xbrlResource = None
 pluginCustomFunctions = None
+isCacheableParse = True
+parsedProgCache = None
 
 class ProgHeader:
     def __init__(self, modelObject, name, element, sourceStr, traceType):
@@ -44,9 +48,15 @@ class ProgHeader:
         self.element = element
         self.sourceStr = sourceStr
         self.traceType = traceType
+        self.compiledProg = None # closure compiled from the exprStack this header heads
     def __repr__(self):
         return ("ProgHeader({0},{1})".format(self.name,self.modelObject))
 
+def uncacheableParse():
+    # expression is parsed again (reporting its errors) each time it is used
+    global isCacheableParse
+    isCacheableParse = False
+
 def exprStackToksRIndex( toks ):
     toksList = toks.asList()
     lenToks = len(toksList)
@@ -101,6 +111,11 @@ class QNameDef(ModelValue.QName):
         return self.qnameValueHash
     def __repr__(self):
         return ("{0}QName({1})".format('@' if self.isAttribute else '',str(self)))
+    def __getstate__(self):
+        return (super(QNameDef, self).__getstate__(), self.__dict__)
+    def __setstate__(self, state):
+        super(QNameDef, self).__setstate__(state[0])
+        self.__dict__.update(state[1])
     def __eq__(self,other):
         if isinstance(other,QNameDef):
             return other.loc == self.loc and super(QNameDef, self).__eq__(other) and other.axis == self.axis 
@@ -122,6 +137,7 @@ def pushQName( sourceStr, loc, toks ):
     step = toks[0]
     axis, sep, qname = step.rpartition("::") # axes are not splitting correctly
     if axis not in axesSupported:
+        uncacheableParse()
         modelXbrl.error("err:XPST0010",
             _("Axis %(axis)s is not supported in %(step)s"),
             modelObject=xmlElement,
@@ -139,6 +155,7 @@ def pushQName( sourceStr, loc, toks ):
                     if len(exprStack) == 0 or exprStack[-1] != q:
                         exprStack.append( q )
                     return q
+                uncacheableParse()
                 modelXbrl.error("err:XPST0081",
                     _("QName prefix not defined for %(name)s"),
                     modelObject=xmlElement,
@@ -147,6 +164,7 @@ def pushQName( sourceStr, loc, toks ):
             
         if (nsLocalname == (XbrlConst.xff,"uncovered-aspect","xff") and
             xmlElement.localName not in ("formula", "consistencyAssertion", "valueAssertion", "message")):
+                uncacheableParse()
                 modelXbrl.error("xffe:invalidFunctionUse",
                     _("Function %(name)s cannot be used on an XPath expression associated with a %(name2)s"),
                     modelObject=xmlElement,
@@ -207,6 +225,7 @@ class OperationDef:
                     prefix = toks1[:-2]
                     ns = XmlUtil.xmlns(xmlElement, prefix)
                     if ns is None:
+                        uncacheableParse()
                         modelXbrl.error("err:XPST0081",
                             _("wildcard prefix not defined for %(token)s"),
                             modelObject=xmlElement,
@@ -265,11 +284,16 @@ def pushFunction( sourceStr, loc, toks ):
     exprStack[exprStack.index(toks[0]):] = [operation]  # replace tokens with production
     if isinstance(name, QNameDef): # function call
         ns = name.namespaceURI
+        if (not name.unprefixed and 
+            ns not in {XbrlConst.fn, XbrlConst.xfi, XbrlConst.xff, XbrlConst.xsd} and
+            ns not in FunctionIxt.ixtNamespaceFunctions):
+            uncacheableParse() # custom function and transform recognition depends on the DTS and plug-ins
         if (not name.unprefixed and 
             ns not in {XbrlConst.fn, XbrlConst.xfi, XbrlConst.xff, XbrlConst.xsd} and
             ns not in FunctionIxt.ixtNamespaceFunctions and
             name not in modelXbrl.modelManager.customTransforms):
             if name not in modelXbrl.modelCustomFunctionSignatures and name not in pluginCustomFunctions: # indexed by both [qname] and [qname,arity]
+                uncacheableParse()
                 modelXbrl.error("xbrlve:noCustomFunctionSignature",
                     _("No custom function signature for %(custFunction)s in %(resource)s"),
                     modelObject=xmlElement,
@@ -325,6 +349,7 @@ class VariableRef:
 def pushVarRef( sourceStr, loc, toks ):
     qname = ModelValue.qname(xmlElement, toks[0][1:], noPrefixIsNoNamespace=True)
     if qname is None:
+        uncacheableParse()
         modelXbrl.error("err:XPST0081",
             _("QName prefix not defined for variable reference $%(variable)s"),
             modelObject=xmlElement,
@@ -665,21 +690,41 @@ def normalizeExpr(expr):
     return ''.join(result)
 
 isInitialized = False
+isGrammarInitialized = False
 
 def initializeParser(modelManager):
-    global isInitialized, FunctionIxt
+    global isInitialized, FunctionIxt, XPathContext, FunctionFn, FunctionXfi, FunctionXs, FunctionCustom, parsedProgCache
     if not isInitialized:
-        from arelle import FunctionIxt
+        from arelle import FunctionIxt, XPathContext, FunctionFn, FunctionXfi, FunctionXs, FunctionCustom
+        cntlr = modelManager.cntlr
+        if cntlr.hasFileSystem and cntlr.webCache is not None:
+            from arelle.XPathParserCache import XPathParserCache
+            parsedProgCache = XPathParserCache(cntlr.webCache.cacheDir)
+        else: # without a parsed expressions cache every expression is parsed by the grammar
+            initializeGrammar(modelManager)
+        isInitialized = True
+        return True # was initialized on this call
+    return False # had already been initialized
+
+def initializeGrammar(modelManager):
+    # deferred until an expression isn't found in the parsed expressions cache
+    global isGrammarInitialized, exprStack
+    if not isGrammarInitialized:
         modelManager.showStatus(_("initializing formula xpath2 grammar"))
         startedAt = time.time()
+        parsingExprStack = exprStack # may be called when parsing an expression
+        exprStack = []
         xpathExpr.parseString( "0", parseAll=True )
+        exprStack = parsingExprStack
         modelManager.addToLog(format_string(modelManager.locale, 
                                     _("Formula xpath2 grammar initialized in %.2f secs"), 
                                     time.time() - startedAt))
         modelManager.showStatus(None)
-        isInitialized = True
-        return True # was initialized on this call
-    return False # had already been initialized
+        isGrammarInitialized = True
+
+def saveParsedProgCache():
+    if parsedProgCache is not None:
+        parsedProgCache.save()
 
 def exceptionErrorIndication(exception):
     errorAt = exception.column
@@ -713,7 +758,7 @@ def staticExpressionFunctionContext():
     
 def parse(modelObject, xpathExpression, element, name, traceType):
     from arelle.ModelFormulaObject import Trace
-    global modelXbrl, pluginCustomFunctions
+    global modelXbrl, pluginCustomFunctions, isCacheableParse
     modelXbrl = modelObject.modelXbrl
     global exprStack
     exprStack = []
@@ -748,7 +793,18 @@ def parse(modelObject, xpathExpression, element, name, traceType):
                 source=normalizedExpr)
             exprStack.append( ProgHeader(modelObject,name,element,normalizedExpr,traceType) )
 
-            L = xpathExpr.parseString( normalizedExpr, parseAll=True )
+            cacheKey = cachedProg = None
+            if parsedProgCache is not None:
+                cacheKey = parsedProgCache.key(normalizedExpr, element)
+                cachedProg = parsedProgCache.get(cacheKey)
+            if cachedProg is not None:
+                exprStack.extend(cachedProg)
+            else:
+                initializeGrammar(modelXbrl.modelManager)
+                isCacheableParse = True
+                L = xpathExpr.parseString( normalizedExpr, parseAll=True )
+                if cacheKey is not None and isCacheableParse:
+                    parsedProgCache.put(cacheKey, exprStack[1:])
             
             #modelXbrl.error( _("AST {0} {1}").format(name, L),
             #    "info", "formula:trace")
@@ -784,18 +840,8 @@ def parse(modelObject, xpathExpression, element, name, traceType):
                 error=err, 
                 source=normalizedExpr)
             modelXbrl.debug("debug", str(traceback.format_exception(*sys.exc_info())))
-        
-        '''
-        code = []
-        compile(exprStack, code)
-        pyCode = ''.join(code)
-        val.modelXbrl.error(
-            _("PyCode {0} {1}").format(
-                 name,
-                 pyCode),
-            "info", "formula:trace")
-        return pyCode
-        '''
+
+        exprStack[0].compiledProg = compileExprStack(exprStack)
         returnProg = exprStack
     exprStack = [] # dereference
     xmlElement = None
@@ -863,6 +909,7 @@ def clearProg(exprStack):
         for p in exprStack:
             if isinstance(p, ProgHeader):
                 p.element = None
+                p.compiledProg = None
                 break
         del exprStack[:]
     
@@ -873,102 +920,395 @@ def clearNamedProgs(ownerObject, progsListName):
     for prog in ownerObject.getattr(progsListName, []):
         clearProg(prog)
 
-'''
-pyOpForXPathOp = {
-    '+': '+', '-':'-', '*':'*', ',':',',
-    'div': '/', 'idiv': '/', 'mod':'%', 
-    'gt': '>', 'ge': '>=', 'eq':'==', 'ne':'!=', 'lt':'<', 'le':'<=',
-    '>': '>', '>=': '>=', '=':'==', '!=':'!=', '<':'<', '<=':'<=',
-    }
-pyGeneratorExprOp = { 'for':'flatten(tuple(', 'some':'any(', 'every':'all('}
-pyGeneratorExprEnd = { 'for':'))', 'some':')', 'every':')'}
-
-def compile(exprStack, code, inScopeVars=None):
-    if inScopeVars is None: inScopeVars = []
-    codeStartIndex = len(code)
+# compiled evaluation of parsed expression stacks
+# each exprStack element is compiled to a step closure, step(xc, contextItem, resultStack, parentOp),
+# which returns a result to be flattened onto resultStack (or None), same as one pass of the
+# XPathContext.evaluate loop, but with the isinstance dispatch and function resolution done once here.
+# elements the compiler doesn't handle are interpreted by XPathContext.evaluate as a single-element stack.
+
+def compileExprStack(exprStack):
+    ''' returns closure(xc, contextItem, resultStack, parentOp) evaluating exprStack,
+        function dispatch is resolved for the modelXbrl being parsed, except plug-in custom functions,
+        which are those of the XPathContext evaluating it '''
+    return compileSequence(exprStack, modelXbrl)
+
+def compileSequence(exprStack, modelXbrl):
+    steps = []
+    resetsProgHeader = False
     for p in exprStack:
-        if isinstance(p,_STR_BASE):
-            code.append(p.__repr__())
-        elif isinstance(p,_NUM_TYPES):
-            code.append(str(p))
-        elif isinstance(p,VariableRef):
-            code.append((" {0} ","variables.get({0})")[p.name in inScopeVars].format(p.name))
-        elif isinstance(p,QNameDef):
-            code.append(" '{0}' ".format(p.name))
-        elif isinstance(p,OperationDef):
-            op = p.name
-            if isinstance(op, QNameDef):
-                code.append("{0}(".format(op.name))
-                compile(p.args, code)
-                code.append(")")
-            elif op in pyOpForXPathOp:
-                code.append(" {0} ".format(pyOpForXPathOp[p.name]))
-                compile(p.args, code)
-            elif op in ('u+', 'u-'):
-                code.append(" {0}".format(op[1]))
-                compile(p.args, code)
-            elif op == "sequence":
-                code.append('(')
-                compile(p.args, code)
-                code.append(')')
-            elif op == "predicate":
-                code.append('predicate(')
-                compile(p.args, code)
-                code.append(')')
-            elif op == "range":
-                code.insert(codeStartIndex, 'range(')
-                code.append(', ')
-                compile(p.args, code)
-                code.append(' + 1 )')
-            elif op in pyGeneratorExprOp: # for, some, every
-                code.append('{0}'.format(pyGeneratorExprOp[op]))
-                rangeVars = tuple(rv.rangeVar.name for rv in p.args[0:-1])
-                # operation has all in-scope variables
-                for rv in rangeVars: inScopeVars.append(rv)
-                compile(p.args[-1:], code)   # return expression
-                for rv in rangeVars: inScopeVars.remove(rv)
-                # for clauses have prior in-scope variables
-                for i in range(len(p.args) - 1):
-                    if i > 0: inScopeVars.append(rangeVars[i-1])
-                    compile(p.args[i:i+1], code) # for expression
-                for i in range(len(p.args) - 2): inScopeVars.remove(rangeVars[i])
-                code.append(pyGeneratorExprEnd[op])
-            elif op == "pathRoot":
-                code.append(" self.stepAxis(self.inputXbrlInstance.xmlRootElement) ")
-                compile(p.args, code)
-            elif op == "/":
-                code.append(" .stepAxis('child::' ")
-                compile(p.args, code)
-                code.append(" )")
-            elif op == "//":
-                code.append(" .stepAxis('descendant::' ")
-                compile(p.args, code)
-                code.append(" )")
-        elif isinstance(p,OpDef):
-            op = p.name
-            if op in pyOpForXPathOp:
-                code.append("{0}".format(pyOpForXPathOp[p.name]))
-        elif isinstance(p,RangeDecl):
-            code.append(' for {0} in '.format(p.rangeVar.name))
-            compile(p.bindingSeq, code)
-        elif isinstance(p,Expr):
-            if p.name in ("return","satisfies"):
-                compile(p.expr, code)
-'''
-                
-def codeModule(code):
-    return \
-        '''
-        def flatten(x):
-            result = []
-            for el in x:
-                if hasattr(el, "__iter__") and not isinstance(el, basestring):
-                    result.extend(flatten(el))
-                else:
-                    result.append(el)
-            return result
-        ''' + \
-        ''.join(code)
+        if isinstance(p, OpDef):
+            continue # no-op in interpreter
+        if isinstance(p, ProgHeader):
+            resetsProgHeader = True
+        try:
+            steps.append(compileStep(p, modelXbrl))
+        except (AttributeError, IndexError, KeyError, TypeError):
+            steps.append(interpretedStep(p)) # malformed or unexpected structure, interpreter reports it
+    steps = tuple(steps)
+    if len(steps) == 1 and not resetsProgHeader:
+        step = steps[0]
+        def evaluate(xc, contextItem, resultStack, parentOp):
+            result = step(xc, contextItem, resultStack, parentOp)
+            if result is not None:
+                resultStack.append( xc.flattenSequence( result ) )
+            return resultStack
+    else:
+        def evaluate(xc, contextItem, resultStack, parentOp):
+            for step in steps:
+                result = step(xc, contextItem, resultStack, parentOp)
+                if result is not None:   # note: result can be False which gets appended to resultStack
+                    resultStack.append( xc.flattenSequence( result ) )
+            if resetsProgHeader:
+                xc.progHeader = None
+            return resultStack
+    return evaluate
+
+def interpretedStep(p):
+    stack = [p]
+    def step(xc, contextItem, resultStack, parentOp):
+        xc.evaluate(stack, contextItem, resultStack, parentOp)
+        return None
+    return step
+
+def compileStep(p, modelXbrl):
+    if isinstance(p, QNameDef) or p == '*': # path step QName or wildcard depends on parentOp
+        return interpretedStep(p)
+    if isinstance(p, _STR_NUM_TYPES):
+        def step(xc, contextItem, resultStack, parentOp):
+            return p
+        return step
+    if isinstance(p, VariableRef):
+        name = p.name
+        def step(xc, contextItem, resultStack, parentOp):
+            inScopeVars = xc.inScopeVars
+            if name in inScopeVars:
+                result = inScopeVars[name]
+                if result is None: # None atomic result is XPath empty sequence
+                    return []
+                return result
+            return None
+        return step
+    if isinstance(p, ProgHeader):
+        from arelle.ModelFormulaObject import Trace
+        setsTraceType = p.traceType not in (Trace.MESSAGE, Trace.CUSTOM_FUNCTION)
+        traceType = p.traceType
+        def step(xc, contextItem, resultStack, parentOp):
+            xc.progHeader = p
+            if setsTraceType:
+                xc.traceType = traceType
+            return None
+        return step
+    if isinstance(p, OperationDef):
+        op = p.name
+        if isinstance(op, QNameDef):
+            return compileFunctionCall(p, modelXbrl)
+        compileOp = compiledOperations.get(op)
+        if compileOp is not None:
+            return compileOp(p, modelXbrl)
+    return interpretedStep(p)
+
+def compileFunctionCall(p, modelXbrl):
+    op = p.name
+    ns = op.namespaceURI; localname = op.localName
+    argsProg = compileSequence(p.args, modelXbrl)
+    isModelCustomFunction = op in modelXbrl.modelCustomFunctionSignatures
+    if isModelCustomFunction:
+        def function(xc, contextItem, args):
+            return FunctionCustom.call(xc, p, op, contextItem, args)
+    elif op.unprefixed and localname in {'attribute', 'comment', 'document-node', 'element',
+       'item', 'node', 'processing-instruction', 'schema-attribute', 'schema-element', 'text'}:
+        return interpretedStep(p) # step axis operation
+    elif op.unprefixed or ns == XbrlConst.fn:
+        fnFunction = FunctionFn.fnFunctions.get(localname)
+        if fnFunction is None:
+            return interpretedStep(p)
+        def function(xc, contextItem, args):
+            try:
+                return fnFunction(xc, p, contextItem, args)
+            except FunctionFn.fnFunctionNotAvailable:
+                raise XPathContext.FunctionNotAvailable("fn:{0}".format(localname))
+    elif ns == XbrlConst.xfi or ns == XbrlConst.xff:
+        xfiFunction = FunctionXfi.xfiFunctions.get(localname)
+        if xfiFunction is None:
+            return interpretedStep(p)
+        def function(xc, contextItem, args):
+            try:
+                return xfiFunction(xc, p, args)
+            except FunctionXfi.xfiFunctionNotAvailable:
+                raise XPathContext.FunctionNotAvailable("xfi:{0}".format(localname))
+    elif ns == XbrlConst.xsd:
+        xsCall = FunctionXs.call
+        def function(xc, contextItem, args):
+            return xsCall(xc, p, localname, args)
+    elif ns in FunctionIxt.ixtNamespaceFunctions:
+        ixtCall = FunctionIxt.call
+        def function(xc, contextItem, args):
+            return ixtCall(xc, p, op, args)
+    elif op in modelXbrl.modelManager.customTransforms:
+        customTransform = modelXbrl.modelManager.customTransforms[op]
+        def function(xc, contextItem, args):
+            return customTransform(args[0][0])
+    else: # plug-in custom function of the evaluating XPathContext, or not identified
+        def function(xc, contextItem, args):
+            raise XPathContext.XPathException(p, 'err:XPST0017', _('Function call not identified: {0}.').format(op))
+    def step(xc, contextItem, resultStack, parentOp):
+        args = argsProg(xc, contextItem, [], None)
+        try:
+            if not isModelCustomFunction and op in xc.customFunctions: # plug in method custom functions
+                return xc.customFunctions[op](xc, p, contextItem, args)
+            return function(xc, contextItem, args)
+        except XPathContext.FunctionNumArgs as err:
+            raise XPathContext.XPathException(p, err.errCode, "{}: {}".format(err.errText, op))
+        except XPathContext.FunctionArgType as err:
+            raise XPathContext.XPathException(p, err.errCode, _('Argument {0} does not match expected type {1} for {2} {3}.')
+                                     .format(err.argNum, err.expectedType, op, err.foundObject))
+        except XPathContext.FunctionNotAvailable:
+            raise XPathContext.XPathException(p, 'err:XPST0017', _('Function named {0} does not have a custom or built-in implementation.').format(op))
+    return step
+
+valueOperations = {
+    '+': lambda op1, op2: op1 + op2,
+    '-': lambda op1, op2: op1 - op2,
+    '*': lambda op1, op2: op1 * op2,
+    'div': lambda op1, op2: op1 / op2,
+    'idiv': lambda op1, op2: op1 // op2,
+    'mod': lambda op1, op2: op1 % op2,
+    'ge': lambda op1, op2: op1 >= op2,
+    'gt': lambda op1, op2: op1 > op2,
+    'le': lambda op1, op2: op1 <= op2,
+    'lt': lambda op1, op2: op1 < op2,
+    'eq': lambda op1, op2: op1 == op2,
+    'ne': lambda op1, op2: op1 != op2,
+    'to': lambda op1, op2: _RANGE( _INT(op1), _INT(op2) + 1 )}
+
+generalComparisonOperations = {
+    '>=': valueOperations['ge'],
+    '>': valueOperations['gt'],
+    '<=': valueOperations['le'],
+    '<': valueOperations['lt'],
+    '=': valueOperations['eq'],
+    '!=': valueOperations['ne']}
+
+def compileValueOperation(p, modelXbrl):
+    # binary arithmetic operations and value comparisons
+    op = p.name
+    operation = valueOperations[op]
+    isArithmetic = op in ('+', '-', '*', 'div', 'idiv', 'mod')
+    isDivision = op in ('div', 'idiv', 'mod')
+    argsProg = compileSequence(p.args, modelXbrl)
+    def step(xc, contextItem, resultStack, parentOp):
+        s1 = xc.atomize( p, resultStack.pop() ) if len(resultStack) > 0 else []
+        s2 = xc.atomize( p, argsProg(xc, contextItem, [], None) )
+        if len(s1) > 1 or len(s2) > 1:
+            raise XPathContext.XPathException(p, 'err:XPTY0004', _("Value operation '{0}' sequence length error").format(op))
+        if len(s1) == 0 or len(s2) == 0:
+            return []
+        op1 = s1[0]
+        op2 = s2[0]
+        XPathContext.testTypeCompatiblity( xc, p, op, op1, op2 )
+        if isArithmetic and type(op1) != type(op2):
+            # check if type promotion needed (Decimal-float, not needed for integer-Decimal)
+            if isinstance(op1,Decimal) and isinstance(op2,float):
+                op1 = float(op1) # per http://http://www.w3.org/TR/xpath20/#dt-type-promotion 1b
+            elif isinstance(op2,Decimal) and isinstance(op1,float):
+                op2 = float(op2)
+        if isDivision:
+            try:
+                return operation(op1, op2)
+            except ZeroDivisionError:
+                raise XPathContext.XPathException(p, 'err:FOAR0001', _('Attempt to divide by zero: {0} {1} {2}.')
+                                         .format(op1, op, op2))
+        return operation(op1, op2)
+    return step
+
+def compileGeneralComparison(p, modelXbrl):
+    op = p.name
+    operation = generalComparisonOperations[op]
+    argsProg = compileSequence(p.args, modelXbrl)
+    def step(xc, contextItem, resultStack, parentOp):
+        s1 = xc.atomize( p, resultStack.pop() ) if len(resultStack) > 0 else []
+        s2 = xc.atomize( p, argsProg(xc, contextItem, [], None) )
+        result = []
+        for op1 in s1:
+            for op2 in s2:
+                XPathContext.testTypeCompatiblity( xc, p, op, op1, op2 )
+                result = operation(op1, op2)
+                if result:
+                    return result
+        return result
+    return step
+
+def compileLogicalOperation(p, modelXbrl):
+    isOr = p.name == 'or'
+    argsProg = compileSequence(p.args, modelXbrl)
+    def step(xc, contextItem, resultStack, parentOp):
+        if len(resultStack) == 0:
+            return []
+        op1 = xc.effectiveBooleanValue( p, resultStack.pop() )
+        # consider short circuit possibilities
+        if isOr and op1:
+            return True
+        elif not isOr and not op1:
+            return False
+        op2 = xc.effectiveBooleanValue( p, argsProg(xc, contextItem, [], None) )
+        if isOr:
+            return op1 or op2
+        return op1 and op2
+    return step
+
+def compileUnaryOperation(p, modelXbrl):
+    isNegation = p.name == 'u-'
+    argsProg = compileSequence(p.args, modelXbrl)
+    def step(xc, contextItem, resultStack, parentOp):
+        s1 = xc.atomize( p, argsProg(xc, contextItem, [], None) )
+        if len(s1) > 1:
+            raise XPathContext.XPathException(p, 'err:XPTY0004', _('Unary expression sequence length error'))
+        if len(s1) == 0:
+            return []
+        if isNegation:
+            return -s1[0]
+        return s1[0]
+    return step
+
+def compileSequenceOperation(p, modelXbrl):
+    argsProg = compileSequence(p.args, modelXbrl)
+    def step(xc, contextItem, resultStack, parentOp):
+        return argsProg(xc, contextItem, [], None)
+    return step
+
+def compilePredicate(p, modelXbrl):
+    argsProg = compileSequence(p.args, modelXbrl)
+    def step(xc, contextItem, resultStack, parentOp):
+        if len(resultStack) == 0:
+            return []
+        targetSequence = []
+        sourcePosition = 0
+        for item in resultStack.pop():
+            sourcePosition += 1
+            if item is None: item = xc.contextItem
+            predicateResult = argsProg(xc, item, [], None)
+            if len(predicateResult) == 1: predicateResult = predicateResult[0] # first result
+            if len(predicateResult) == 1 and isinstance(predicateResult[0],_NUM_TYPES):
+                result = predicateResult[0]
+                if isinstance(result, bool):  # note that bool is subclass of int
+                    if result:
+                        targetSequence.append(item)
+                elif sourcePosition == result:
+                    targetSequence.append(item)
+            elif xc.effectiveBooleanValue(p, predicateResult):
+                targetSequence.append(item)
+        return targetSequence
+    return step
+
+def compileRangeVars(op, p, args, modelXbrl):
+    ''' returns closure(xc, contextItem, result) as XPathContext.evaluateRangeVars '''
+    if isinstance(p, RangeDecl):
+        bindingProg = compileSequence(p.bindingSeq, modelXbrl)
+        innerProg = compileRangeVars(op, args[0], args[1:], modelXbrl)
+        rvQname = p.rangeVar.name
+        isFor = op == 'for'
+        isEvery = op == 'every'
+        def rangeVars(xc, contextItem, result):
+            r = bindingProg(xc, contextItem, [], None)
+            if len(r) == 1: # should be an expr single
+                r = r[0]
+                if isinstance(r, (tuple,list,set)):
+                    if len(r) == 1 and isinstance(r[0],_RANGE):
+                        r = r[0]
+                    inScopeVars = xc.inScopeVars
+                    hasPrevValue = rvQname in inScopeVars
+                    if hasPrevValue:
+                        prevValue = inScopeVars[rvQname]
+                    for rv in r:
+                        inScopeVars[rvQname] = rv
+                        innerProg(xc, contextItem, result)
+                        if not isFor and len(result) > 0:
+                            break	# short circuit evaluation
+                    if isEvery and len(result) == 0:
+                        result.append( True )   # true if no false result returned during iteration
+                    if hasPrevValue:
+                        inScopeVars[rvQname] = prevValue
+        return rangeVars
+    elif isinstance(p, Expr) and p.name in ('return', 'satisfies'):
+        exprProg = compileSequence(p.expr, modelXbrl)
+        if p.name == 'return':
+            def rangeVars(xc, contextItem, result):
+                result.append( exprProg(xc, contextItem, [], None) )
+        else:
+            isEvery = op == 'every'
+            def rangeVars(xc, contextItem, result):
+                boolresult = xc.effectiveBooleanValue(p, exprProg(xc, contextItem, [], None))
+                if isEvery != boolresult:
+                    # stop short circuit eval
+                    result.append( boolresult )
+        return rangeVars
+    def rangeVars(xc, contextItem, result):
+        pass
+    return rangeVars
+
+def compileForSomeEvery(p, modelXbrl):
+    rangeVarsProg = compileRangeVars(p.name, p.args[0], p.args[1:], modelXbrl)
+    def step(xc, contextItem, resultStack, parentOp):
+        result = []
+        rangeVarsProg(xc, contextItem, result)
+        return result
+    return step
+
+def compileIf(p, modelXbrl):
+    testProg = compileSequence(p.args[0].expr[0], modelXbrl)
+    thenProg = compileSequence(p.args[1].args, modelXbrl)
+    elseProg = compileSequence(p.args[2].args, modelXbrl)
+    def step(xc, contextItem, resultStack, parentOp):
+        if xc.effectiveBooleanValue( p, testProg(xc, contextItem, [], None) ):
+            return thenProg(xc, contextItem, [], None)
+        return elseProg(xc, contextItem, [], None)
+    return step
+
+def compileContextItem(p, modelXbrl):
+    def step(xc, contextItem, resultStack, parentOp):
+        return contextItem
+    return step
+
+def compilePath(p, modelXbrl):
+    op = p.name
+    fromRoot = op in ('rootChild', 'rootDescendant')
+    if fromRoot:
+        op = '/' if op == 'rootChild' else '//'
+    argsProg = compileSequence(p.args, modelXbrl)
+    def step(xc, contextItem, resultStack, parentOp):
+        if fromRoot:
+            # fix up for multi-instance
+            resultStack.append( [xc.inputXbrlInstance.xmlDocument,] )
+        # contains QNameDefs and predicates
+        if len(resultStack) > 0:
+            innerFocusNodes = resultStack.pop()
+        else:
+            innerFocusNodes = contextItem
+        navSequence = []
+        for innerFocusNode in xc.flattenSequence(innerFocusNodes):
+            if innerFocusNode is None: innerFocusNode = xc.contextItem
+            navSequence += argsProg(xc, innerFocusNode, [], op)
+        return xc.documentOrderedNodes(xc.flattenSequence(navSequence))
+    return step
+
+compiledOperations = {
+    'sequence': compileSequenceOperation,
+    'predicate': compilePredicate,
+    'if': compileIf,
+    '.': compileContextItem}
+for _op in ('+', '-', '*', 'div', 'idiv', 'mod', 'to', 'gt', 'ge', 'eq', 'ne', 'lt', 'le'):
+    compiledOperations[_op] = compileValueOperation
+for _op in ('>', '>=', '=', '!=', '<', '<='):
+    compiledOperations[_op] = compileGeneralComparison
+for _op in ('and', 'or'):
+    compiledOperations[_op] = compileLogicalOperation
+for _op in ('u+', 'u-'):
+    compiledOperations[_op] = compileUnaryOperation
+for _op in ('for', 'some', 'every'):
+    compiledOperations[_op] = compileForSomeEvery
+for _op in ('/', '//', 'rootChild', 'rootDescendant'):
+    compiledOperations[_op] = compilePath
+
 
 def parser_unit_test():
     #initialize
@@ -1118,11 +1458,6 @@ def parser_unit_test():
         if len(L)==0 or L[0] != 'Parse Failure':
             if debug_flag: 
                 log.append("exprStack={0}".format(exprStack))
-                '''
-                code = []
-                compile(exprStack, code)
-                print ("code=", ''.join(code))
-                '''
             # calculate result , store a copy in ans , display the result to user
             '''
             result=evaluateStack(exprStack)
@@ -0,0 +1,116 @@
+'''
+Created on Oct 18, 2026
+
+Persistent cache of parsed XPath expression stacks, so that formula linkbases parsed in
+prior runs don't need the pyparsing grammar again.
+
+Entries are keyed by the normalized expression, the in-scope namespace bindings and the
+local name of its element, which is all that the grammar actions depend on for expressions
+parsed without errors and without custom functions.  The cache is one pickle file in the
+xpathParser subdirectory of the web cache directory, named by cache format and Arelle
+version (files of other versions are removed when saving), and least recently used entries
+are evicted when it exceeds the size limit.  ParseResults in expression stacks are pickled by
+their __getstate__ and __setstate__, registered here with copyreg.
+
+@author: Mark V Systems Limited
+(c) Copyright 2026 Mark V Systems Limited, All rights reserved.
+'''
+import os, sys, pickle, copyreg, hashlib, time
+from arelle import Version
+if sys.version[0] >= '3':
+    from arelle.pyparsing.pyparsing_py3 import ParseResults
+else:
+    from arelle.pyparsing.pyparsing_py2 import ParseResults
+
+CACHE_FORMAT = 1
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+ENTRY_OVERHEAD_BYTES = 100 # key and last-used time
+LAST_USED_RESOLUTION = 86400.0 # seconds, a cache hit updates an older last-used time
+
+def newParseResults():
+    return ParseResults.__new__(ParseResults, None) # __new__ requires a token list, contents are set by __setstate__
+
+def reduceParseResults(parseResults):
+    # pickling of ParseResults in expression stacks, without modifying the vendored pyparsing module
+    return newParseResults, (), parseResults.__getstate__()
+
+copyreg.pickle(ParseResults, reduceParseResults)
+
+class XPathParserCache:
+    def __init__(self, cacheDir, maxBytes=MAX_CACHE_BYTES):
+        self.cacheDir = os.path.join(cacheDir, "xpathParser")
+        self.cacheFile = os.path.join(self.cacheDir,
+                                      "parsedProgs_{}_{}.pickle".format(CACHE_FORMAT, Version.__version__))
+        self.maxBytes = maxBytes
+        self.entries = None # key: [lastUsed, pickled exprStack], loaded on first use
+        self.modified = False
+
+    def key(self, normalizedExpr, element):
+        nsmap = sorted((prefix or "", namespaceURI)
+                       for prefix, namespaceURI in getattr(element, "nsmap", {}).items())
+        return hashlib.sha256(repr((normalizedExpr, getattr(element, "localName", None), nsmap)
+                                   ).encode("utf-8")).hexdigest()
+
+    def loadEntries(self):
+        try:
+            with open(self.cacheFile, "rb") as fh:
+                return pickle.load(fh)
+        except Exception: # missing, partially written or corrupt cache file
+            return {}
+
+    def get(self, key):
+        if self.entries is None:
+            self.entries = self.loadEntries()
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        try:
+            exprStack = pickle.loads(entry[1])
+        except Exception: # classes changed without a version change
+            del self.entries[key]
+            self.modified = True
+            return None
+        now = time.time()
+        if now - entry[0] > LAST_USED_RESOLUTION:
+            entry[0] = now
+            self.modified = True
+        return exprStack
+
+    def put(self, key, exprStack):
+        if self.entries is None:
+            self.entries = self.loadEntries()
+        try:
+            pickledExprStack = pickle.dumps(exprStack, pickle.HIGHEST_PROTOCOL)
+        except Exception: # not picklable, expression will be parsed each time
+            return
+        self.entries[key] = [time.time(), pickledExprStack]
+        self.modified = True
+
+    def save(self):
+        if not self.modified:
+            return
+        # merge entries saved by other processes since this cache was loaded
+        for key, entry in self.loadEntries().items():
+            if key not in self.entries or self.entries[key][0] < entry[0]:
+                self.entries[key] = entry
+        totalBytes = sum(len(entry[1]) + ENTRY_OVERHEAD_BYTES for entry in self.entries.values())
+        if totalBytes > self.maxBytes:
+            for key, entry in sorted(self.entries.items(), key=lambda item: item[1][0]):
+                del self.entries[key]
+                totalBytes -= len(entry[1]) + ENTRY_OVERHEAD_BYTES
+                if totalBytes <= self.maxBytes:
+                    break
+        try:
+            if not os.path.exists(self.cacheDir):
+                os.makedirs(self.cacheDir)
+            tempFile = "{}.{}.tmp".format(self.cacheFile, os.getpid())
+            with open(tempFile, "wb") as fh:
+                pickle.dump(self.entries, fh, pickle.HIGHEST_PROTOCOL)
+            os.replace(tempFile, self.cacheFile) # atomic, concurrent readers see old or new file
+            for fileName in os.listdir(self.cacheDir):
+                filePath = os.path.join(self.cacheDir, fileName)
+                if fileName.endswith(".pickle") and filePath != self.cacheFile:
+                    os.remove(filePath) # other cache format or Arelle version
+        except EnvironmentError:
+            pass # cache directory not writable, parsed expressions are not saved
+        self.modified = False
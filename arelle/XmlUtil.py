@@ -801,6 +801,8 @@ def elementFragmentIdentifier(element):
         return elementFragmentIdentifier(element.sourceElement)
     if isinstance(element,etree.ElementBase) and element.get('id'):
         return element.get('id')  # "short hand pointer" for element fragment identifier
+    elif not isinstance(element,etree.ElementBase) and getattr(element, "id", None):
+        return element.id  # fact retained without its element, e.g., stored or streamed fact
     else:
         childSequence = [""] # "" represents document element for / (root) on the join below
         while element is not None:
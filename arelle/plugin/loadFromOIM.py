@@ -772,7 +772,13 @@ def loadFromOIM(cntlr, error, warning, modelXbrl, oimFile, mappedUri, oimObject=
                   initialComment="extracted from OIM {}".format(mappedUri),
                   documentEncoding="utf-8")
             modelXbrl.modelDocument.inDTS = True
+            if modelXbrl.modelManager.factStore:
+                from arelle.ModelFactStore import FactStore
+                factStore = modelXbrl.factStore = FactStore(modelXbrl)
+            else:
+                factStore = None
         else: # API implementation
+            factStore = None # instance document is saved with its facts
             modelXbrl = ModelXbrl.create(
                 cntlr.modelManager, 
                 Type.INSTANCE, 
@@ -1002,6 +1008,8 @@ def loadFromOIM(cntlr, error, warning, modelXbrl, oimFile, mappedUri, oimObject=
                 firstCntxUnitFactElt = f
             
             xmlValidate(modelXbrl, f)
+            if factStore is not None:
+                factStore.storeFact(f)
                     
         currentAction = "creating footnotes"
         footnoteLinks = OrderedDict() # ELR elements
@@ -1237,6 +1245,11 @@ def guiXbrlLoaded(cntlr, modelXbrl, attach, *args, **kwargs):
 
 def cmdLineXbrlLoaded(cntlr, options, modelXbrl, *args, **kwargs):
     if options.saveOIMinstance and getattr(modelXbrl, "loadedFromOIM", False):
+        if modelXbrl.factStore:
+            modelXbrl.error("arelleOIMloader:factStoreSave",
+                            _("The instance can not be saved, its facts are in a fact store instead of the instance document, remove option --factStore."),
+                            modelObject=modelXbrl)
+            return
         doc = modelXbrl.modelDocument
         cntlr.showStatus(_("Saving XBRL instance: {0}").format(doc.basename))
         responseZipStream = kwargs.get("responseZipStream")
@@ -1,10 +1,15 @@
 '''
 StreamingExtensions is a plug-in to both GUI menu and command line/web service
 that provides an alternative approach to big instance documents without building a DOM, to save
-memory footprint.  lxml iterparse is used to parse the big instance.  ModelObjects are specialized by features
-for efficiency and to avoid dependency on an underlying DOM.
+memory footprint.  The big instance is read once, by chunks fed to an lxml XMLPullParser, whose events
+are processed as they are parsed.  ModelObjects are specialized by features for efficiency and to avoid
+dependency on an underlying DOM.
 
-(Note that this module is based on a parser target, an alternate based on iterparse is under examples/plugin.)
+The xbrl-streamable-instance header is checked when the first child of xbrli:xbrl is parsed, an instance
+without it is left to the DOM loader.  Instead of the file, any binary stream with a read method, such as
+socket.makefile("rb") of an upload which is still arriving, may be streamed by the stream parameter of load:
+   ModelXbrl.load(modelManager, uri, stream=binaryStream)
+(uri names the instance and is the base of its relative hrefs, such an instance must be streamable.)
 
 (c) Copyright 2013 Mark V Systems Limited, All rights reserved.
 
@@ -15,7 +20,7 @@ Calls these plug-in classes:
    Streaming.Finish(modelXbrl): notifies that streaming is finished
 '''
 
-import io, os, time, sys, re, gc
+import os, time, sys, re, gc
 from decimal import Decimal, InvalidOperation
 from lxml import etree
 from arelle import XbrlConst, XmlUtil, XmlValidate, ValidateXbrlDimensions
@@ -23,13 +28,15 @@ from arelle.ModelDocument import ModelDocument, Type
 from arelle.ModelObjectFactory import parser
 from arelle.ModelObject import ModelObject
 from arelle.ModelInstanceObject import ModelFact
+from arelle.ModelFactStore import FactStore
 from arelle.PluginManager import pluginClassMethods
-from arelle.Validate import Validate
+from arelle.ValidateXbrlStreaming import ValidateXbrlStreaming, FACTS_BATCH_SIZE
 from arelle.HashUtil import md5hash, Md5Sum
 
 _streamingExtensionsCheck = True  # check streaming if enabled except for CmdLine, then only when requested
 _streamingExtensionsValidate = False
 _streamingValidatePlugin = False
+STREAMING_READ_SIZE = 65536 # bytes read and fed to the pull parser at a time
     
 class NotInstanceDocumentException(Exception):
     def __init__(self):
@@ -62,206 +69,66 @@ def precedingComment(elt):
     return comment or None
 
 def streamingExtensionsLoader(modelXbrl, mappedUri, filepath, *args, **kwargs):
-    # check if big instance and has header with an initial incomplete tree walk (just 2 elements
+    # streams the instance in a single pass when its header precedes the first child of xbrli:xbrl, else returns None
     if not _streamingExtensionsCheck:
         return None
     
     # track whether modelXbrl has been validated by this streaming extension
     modelXbrl._streamingExtensionValidated = False
         
-    def logSyntaxErrors(parsercontext):
-        for error in parsercontext.error_log:
+    def logSyntaxErrors(parsercontext, fromError=0):
+        for error in parsercontext.error_log[fromError:]:
             modelXbrl.error("xmlSchema:syntax",
                     _("%(error)s, %(fileName)s, line %(line)s, column %(column)s, %(sourceAction)s source element"),
                     modelObject=modelXbrl, fileName=os.path.basename(filepath), 
                     error=error.message, line=error.line, column=error.column, sourceAction="streaming")
-    #### note: written for iterparse of lxml prior to version 3.3, otherwise rewrite to use XmlPullParser ###
-    #### note: iterparse wants a binary file, but file is text mode
-    _file, = modelXbrl.fileSource.file(filepath, binary=True)
+    # the instance is read once, by chunks fed to an XMLPullParser, from its file or archive member, or from a
+    # binary stream provided by the caller, such as socket.makefile("rb") of an upload which is still arriving
+    _stream = kwargs.get("stream")
+    if _stream is not None:
+        _file = _stream
+    else:
+        _file, = modelXbrl.fileSource.file(filepath, binary=True)
     startedAt = time.time()
     modelXbrl.profileActivity()
-    ''' this seems twice as slow as iterparse
-    class instInfoTarget():
-        def __init__(self, element_factory=None, parser=None):
-            self.newTree = True
-            self.streamingAspects = None
-            self.foundInstance = False
-            self.creationSoftwareComment = ''
-            self.currentEltTag = "(before xbrli:xbrl)"
-            self.numRootFacts = 0
-        def start(self, tag, attrib, nsmap=None):
-            if self.newTree:
-                if tag == "{http://www.xbrl.org/2003/instance}xbrl":
-                    self.foundInstance = True
-                    self.newTree = False
-                else: # break 
-                    raise NotInstanceDocumentException()
-            elif not tag.startswith("{http://www.xbrl.org/"):
-                self.numRootFacts += 1
-                if self.numRootFacts % 1000 == 0:
-                    modelXbrl.profileActivity("... streaming tree check", minTimeToShow=20.0)
-            self.currentEltTag = tag
-        def end(self, tag):
-            pass
-        def data(self, data):
-            pass
-        def comment(self, text):
-            if not self.foundInstance: # accumulate comments before xbrli:xbrl
-                self.creationSoftwareComment += ('\n' if self.creationSoftwareComment else '') + text
-            elif not self.creationSoftwareComment:
-                self.creationSoftwareComment = text # or first comment after xbrli:xbrl
-        def pi(self, target, data):
-            if target == "xbrl-streamable-instance":
-                if self.currentEltTag == "{http://www.xbrl.org/2003/instance}xbrl":
-                    self.streamingAspects = dict(etree.PI(target,data).attrib.copy()) # dereference target results
+    _data = _file.read(STREAMING_READ_SIZE)
+    _encoding = XmlUtil.encoding(_data)
+    streamingParser = etree.XMLPullParser(events=("start","end"), huge_tree=True, base_url=filepath)
+    syntaxErrors = []
+    def streamingEvents(data):
+        ''' yields parse events as each chunk of the instance is read and fed to the parser '''
+        while True:
+            try:
+                if data:
+                    streamingParser.feed(data)
                 else:
-                    modelXbrl.error("streamingExtensions:headerMisplaced",
-                            _("Header is misplaced: %(target)s, must follow xbrli:xbrl element but was found at %(element)s"),
-                            modelObject=modelXbrl, target=target, element=self.currentEltTag)
-        def close(self):
-            if not self.creationSoftwareComment:
-                self.creationSoftwareComment = None
-            return True
-    instInfo = instInfoTarget()
-    infoParser = etree.XMLParser(recover=True, huge_tree=True, target=instInfo)
-    try:
-        etree.parse(_file, parser=infoParser, base_url=filepath)
-    except NotInstanceDocumentException:
-        pass
-    '''
-    foundErrors = False
-    foundInstance = False
-    streamingAspects = None
-    creationSoftwareComment = None
-    instInfoNumRootFacts = 0
-    numElts = 0
-    elt = None
-    instInfoContext = etree.iterparse(_file, events=("start","end"), huge_tree=True)
-    try:
-        for event, elt in instInfoContext:
-            if event == "start":
-                if elt.getparent() is not None:
-                    if elt.getparent().tag == "{http://www.xbrl.org/2003/instance}xbrl":
-                        if not foundInstance:
-                            foundInstance = True
-                            pi = precedingProcessingInstruction(elt, "xbrl-streamable-instance")
-                            if pi is None:
-                                break
-                            else:
-                                streamingAspects = dict(pi.attrib.copy())
-                                if creationSoftwareComment is None:
-                                    creationSoftwareComment = precedingComment(elt)
-                        if not elt.tag.startswith("{http://www.xbrl.org/"):
-                            instInfoNumRootFacts += 1
-                            if instInfoNumRootFacts % 1000 == 0:
-                                modelXbrl.profileActivity("... streaming tree check", minTimeToShow=20.0)
-                    elif not foundInstance:       
-                        break
-                elif elt.tag == "{http://www.xbrl.org/2003/instance}xbrl":
-                    creationSoftwareComment = precedingComment(elt)
-                    if precedingProcessingInstruction(elt, "xbrl-streamable-instance") is not None:
-                        modelXbrl.error("streamingExtensions:headerMisplaced",
-                                _("Header is misplaced: %(error)s, must follow xbrli:xbrl element"),
-                                modelObject=elt)
-            elif event == "end":
-                elt.clear()
-                numElts += 1
-                if numElts % 1000 == 0 and elt.getparent() is not None:
-                    while elt.getprevious() is not None and elt.getparent() is not None:
-                        del elt.getparent()[0]
-    except etree.XMLSyntaxError as err:
-        modelXbrl.error("xmlSchema:syntax",
-                _("Unrecoverable error: %(error)s"),
-                error=err)
-        _file.close()
-        return err
-        
-    _file.seek(0,io.SEEK_SET) # allow reparsing
-    if not foundInstance or streamingAspects is None:
-        del elt
-        _file.close()
-        return None
-    modelXbrl.profileStat(_("streaming tree check"), time.time() - startedAt)
-    startedAt = time.time()
-    try:
-        version = Decimal(streamingAspects.get("version"))
-        if int(version) != 1:
-            modelXbrl.error("streamingExtensions:unsupportedVersion",
-                    _("Streaming version %(version)s, major version number must be 1"),
-                    modelObject=elt, version=version)
-            foundErrors = True
-    except (InvalidOperation, OverflowError):
-        modelXbrl.error("streamingExtensions:versionError",
-                _("Version %(version)s, number must be 1.n"),
-                modelObject=elt, version=streamingAspects.get("version", "(none)"))
-        foundErrors = True
-    for bufAspect in ("contextBuffer", "unitBuffer", "footnoteBuffer"):
-        try:
-            bufLimit = Decimal(streamingAspects.get(bufAspect, "INF"))
-            if bufLimit < 1 or (bufLimit.is_finite() and bufLimit % 1 != 0):
-                raise InvalidOperation
-            elif bufAspect == "contextBuffer":
-                contextBufferLimit = bufLimit
-            elif bufAspect == "unitBuffer":
-                unitBufferLimit = bufLimit
-            elif bufAspect == "footnoteBuffer":
-                footnoteBufferLimit = bufLimit
-        except InvalidOperation:
-            modelXbrl.error("streamingExtensions:valueError",
-                    _("Streaming %(attrib)s %(value)s, number must be a positive integer or INF"),
-                    modelObject=elt, attrib=bufAspect, value=streamingAspects.get(bufAspect))
-            foundErrors = True
-    if _streamingExtensionsValidate:
-        incompatibleValidations = []
-        _validateDisclosureSystem = modelXbrl.modelManager.validateDisclosureSystem
-        _disclosureSystem = modelXbrl.modelManager.disclosureSystem
-        if _validateDisclosureSystem and _disclosureSystem.validationType == "EFM":
-            incompatibleValidations.append("EFM")
-        if _validateDisclosureSystem and _disclosureSystem.validationType == "GFM":
-            incompatibleValidations.append("GFM")
-        if _validateDisclosureSystem and _disclosureSystem.validationType == "HMRC":
-            incompatibleValidations.append("HMRC")
-        if modelXbrl.modelManager.validateCalcLB:
-            incompatibleValidations.append("calculation LB")
-        if incompatibleValidations:
-            modelXbrl.error("streamingExtensions:incompatibleValidation",
-                    _("Streaming instance validation does not support %(incompatibleValidations)s validation"),
-                    modelObject=modelXbrl, incompatibleValidations=', '.join(incompatibleValidations))
-            foundErrors = True
-    if instInfoContext.error_log:
-        foundErrors = True
-    logSyntaxErrors(instInfoContext)
-    del instInfoContext # dereference
-
-    for pluginMethod in pluginClassMethods("Streaming.BlockStreaming"):
-        _blockingPluginName = pluginMethod(modelXbrl)
-        if _blockingPluginName: # name of blocking plugin is returned
-            modelXbrl.error("streamingExtensions:incompatiblePlugIn",
-                    _("Streaming instance not supported by plugin %(blockingPlugin)s"),
-                    modelObject=modelXbrl, blockingPlugin=_blockingPluginName)
-            foundErrors = True
-    
-    if foundErrors:
-        _file.close()
-        return None
-
-    _encoding = XmlUtil.encoding(_file.read(512))
-    _file.seek(0,io.SEEK_SET) # allow reparsing
-
-    if _streamingExtensionsValidate:
-        validator = Validate(modelXbrl)
-        instValidator = validator.instValidator
+                    streamingParser.close()
+            except etree.XMLSyntaxError as err:
+                syntaxErrors.append(err) # unrecoverable, stops streaming
+                return
+            for event in streamingParser.read_events():
+                yield event
+            if not data:
+                break
+            data = _file.read(STREAMING_READ_SIZE)
+    from arelle.ModelObjectFactory import setParserElementClassLookup
+    modelXbrl.isStreamingMode = True # must be set before setting element class lookup
+    (_parser, _parserLookupName, _parserLookupClass) = setParserElementClassLookup(streamingParser, modelXbrl)
 
+    streaming = None # determined by the xbrl-streamable-instance header before the first child of xbrli:xbrl
+    foundErrors = False
+    numHeaderSyntaxErrors = 0
+    rootElt = None
+    modelDocument = None
+    streamingValidator = instValidator = None
     contextBuffer = []
     contextsToDrop = []
     unitBuffer = []
     unitsToDrop = []
     footnoteBuffer = []
     footnoteLinksToDrop = []
-    
-    _streamingFactsPlugin = any(True for pluginMethod in pluginClassMethods("Streaming.Facts"))
-    _streamingValidateFactsPlugin = (_streamingExtensionsValidate and 
-                                     any(True for pluginMethod in pluginClassMethods("Streaming.ValidateFacts")))
+    factsBatch = []
+    _streamingFactsPlugin = _streamingValidateFactsPlugin = _batchingFacts = False
 
     ''' this is very much slower than iterparse
     class modelLoaderTarget():
@@ -516,62 +383,162 @@ def streamingExtensionsLoader(modelXbrl, mappedUri, filepath, *args, **kwargs):
     etree.parse(_file, parser=_parser, base_url=filepath)
     logSyntaxErrors(_parser)
     '''
-    # replace modelLoaderTarget with iterparse (as it now supports CustomElementClassLookup)
-    streamingParserContext = etree.iterparse(_file, events=("start","end"), huge_tree=True)
-    from arelle.ModelObjectFactory import setParserElementClassLookup
-    modelXbrl.isStreamingMode = True # must be set before setting element class lookup
-    (_parser, _parserLookupName, _parserLookupClass) = setParserElementClassLookup(streamingParserContext, modelXbrl)
-    foundInstance = False
     beforeInstanceStream = beforeStartStreamingPlugin = True
     numRootFacts = 0
     factsCheckVersion = None
+    mdlObj = None
     def factCheckFact(fact):
         modelDocument._factsCheckMd5s += fact.md5sum
         for _tupleFact in fact.modelTupleFacts:
             factCheckFact(_tupleFact)
-    for event, mdlObj in streamingParserContext:
+    def processFactsBatch():
+        if streamingValidator is not None:
+            streamingValidator.validateFacts(factsBatch)
+        # can block facts deletion if required data not yet available, such as numeric unit for DpmDB
+        if _streamingValidateFactsPlugin:
+            for pluginMethod in pluginClassMethods("Streaming.ValidateFacts"):
+                pluginMethod(instValidator, factsBatch)
+        if _streamingFactsPlugin:
+            for pluginMethod in pluginClassMethods("Streaming.Facts"):
+                pluginMethod(modelXbrl, factsBatch)
+        for fact in factsBatch:
+            if modelXbrl.factStore is not None:
+                modelXbrl.factStore.storeFact(fact) # batch has been processed, keep its facts compactly
+            else:
+                dropFact(modelXbrl, fact, modelXbrl.facts)
+        for cntx in contextsToDrop:
+            dropContext(modelXbrl, cntx)
+        for unit in unitsToDrop:
+            dropUnit(modelXbrl, unit)
+        for footnoteLink in footnoteLinksToDrop:
+            dropFootnoteLink(modelXbrl, footnoteLink)
+        del factsBatch[:]
+        del contextsToDrop[:]
+        del unitsToDrop[:]
+        del footnoteLinksToDrop[:]
+    for event, mdlObj in streamingEvents(_data):
         if event == "start":
-            if mdlObj.tag == "{http://www.xbrl.org/2003/instance}xbrl":
-                modelDocument = ModelDocument(modelXbrl, Type.INSTANCE, mappedUri, filepath, mdlObj.getroottree())
+            if streaming is None:
+                if rootElt is None: # document element
+                    if mdlObj.tag != "{http://www.xbrl.org/2003/instance}xbrl":
+                        streaming = False
+                        break
+                    rootElt = mdlObj
+                    if precedingProcessingInstruction(mdlObj, "xbrl-streamable-instance") is not None:
+                        modelXbrl.error("streamingExtensions:headerMisplaced",
+                                _("Header is misplaced: %(error)s, must follow xbrli:xbrl element"),
+                                modelObject=mdlObj)
+                    continue
+                # first child of xbrli:xbrl, the instance is streamed if the header precedes it
+                pi = precedingProcessingInstruction(mdlObj, "xbrl-streamable-instance")
+                if pi is None:
+                    streaming = False
+                    break
+                streamingAspects = dict(pi.attrib.copy())
+                try:
+                    version = Decimal(streamingAspects.get("version"))
+                    if int(version) != 1:
+                        modelXbrl.error("streamingExtensions:unsupportedVersion",
+                                _("Streaming version %(version)s, major version number must be 1"),
+                                modelObject=mdlObj, version=version)
+                        foundErrors = True
+                except (InvalidOperation, OverflowError):
+                    modelXbrl.error("streamingExtensions:versionError",
+                            _("Version %(version)s, number must be 1.n"),
+                            modelObject=mdlObj, version=streamingAspects.get("version", "(none)"))
+                    foundErrors = True
+                for bufAspect in ("contextBuffer", "unitBuffer", "footnoteBuffer"):
+                    try:
+                        bufLimit = Decimal(streamingAspects.get(bufAspect, "INF"))
+                        if bufLimit < 1 or (bufLimit.is_finite() and bufLimit % 1 != 0):
+                            raise InvalidOperation
+                        elif bufAspect == "contextBuffer":
+                            contextBufferLimit = bufLimit
+                        elif bufAspect == "unitBuffer":
+                            unitBufferLimit = bufLimit
+                        elif bufAspect == "footnoteBuffer":
+                            footnoteBufferLimit = bufLimit
+                    except InvalidOperation:
+                        modelXbrl.error("streamingExtensions:valueError",
+                                _("Streaming %(attrib)s %(value)s, number must be a positive integer or INF"),
+                                modelObject=mdlObj, attrib=bufAspect, value=streamingAspects.get(bufAspect))
+                        foundErrors = True
+                if _streamingExtensionsValidate:
+                    incompatibleValidations = []
+                    _validateDisclosureSystem = modelXbrl.modelManager.validateDisclosureSystem
+                    _disclosureSystem = modelXbrl.modelManager.disclosureSystem
+                    if _validateDisclosureSystem and _disclosureSystem.validationType == "EFM":
+                        incompatibleValidations.append("EFM")
+                    if _validateDisclosureSystem and _disclosureSystem.validationType == "GFM":
+                        incompatibleValidations.append("GFM")
+                    if _validateDisclosureSystem and _disclosureSystem.validationType == "HMRC":
+                        incompatibleValidations.append("HMRC")
+                    if incompatibleValidations:
+                        modelXbrl.error("streamingExtensions:incompatibleValidation",
+                                _("Streaming instance validation does not support %(incompatibleValidations)s validation"),
+                                modelObject=modelXbrl, incompatibleValidations=', '.join(incompatibleValidations))
+                        foundErrors = True
+                numHeaderSyntaxErrors = len(streamingParser.error_log)
+                if numHeaderSyntaxErrors:
+                    foundErrors = True
+                logSyntaxErrors(streamingParser)
+                for pluginMethod in pluginClassMethods("Streaming.BlockStreaming"):
+                    _blockingPluginName = pluginMethod(modelXbrl)
+                    if _blockingPluginName: # name of blocking plugin is returned
+                        modelXbrl.error("streamingExtensions:incompatiblePlugIn",
+                                _("Streaming instance not supported by plugin %(blockingPlugin)s"),
+                                modelObject=modelXbrl, blockingPlugin=_blockingPluginName)
+                        foundErrors = True
+                if foundErrors:
+                    streaming = False
+                    break
+                streaming = True
+                if modelXbrl.modelManager.factStore:
+                    # facts are kept in a fact store, its facts reference their contexts and units, which are not dropped
+                    modelXbrl.factStore = FactStore(modelXbrl)
+                    contextBufferLimit = unitBufferLimit = Decimal("INF")
+                if _streamingExtensionsValidate:
+                    streamingValidator = ValidateXbrlStreaming(modelXbrl)
+                    instValidator = streamingValidator.instValidator
+                _streamingFactsPlugin = any(True for pluginMethod in pluginClassMethods("Streaming.Facts"))
+                _streamingValidateFactsPlugin = (_streamingExtensionsValidate and 
+                                                 any(True for pluginMethod in pluginClassMethods("Streaming.ValidateFacts")))
+                # facts are processed in batches, dropping contexts, units and footnote links after the facts referencing them
+                _batchingFacts = streamingValidator is not None or _streamingFactsPlugin or _streamingValidateFactsPlugin
+                modelDocument = ModelDocument(modelXbrl, Type.INSTANCE, mappedUri, filepath, rootElt.getroottree())
                 modelXbrl.modelDocument = modelDocument # needed for incremental validation
-                mdlObj.init(modelDocument)
+                rootElt.init(modelDocument)
                 modelDocument.parser = _parser # needed for XmlUtil addChild's makeelement 
                 modelDocument.parserLookupName = _parserLookupName
                 modelDocument.parserLookupClass = _parserLookupClass
-                modelDocument.xmlRootElement = mdlObj
-                modelDocument.schemaLocationElements.add(mdlObj)
+                modelDocument.xmlRootElement = rootElt
+                modelDocument.schemaLocationElements.add(rootElt)
                 modelDocument.documentEncoding = _encoding
-                modelDocument._creationSoftwareComment = precedingComment(mdlObj)
+                modelDocument._creationSoftwareComment = precedingComment(rootElt)
                 modelDocument._factsCheckMd5s = Md5Sum()
                 modelXbrl.info("streamingExtensions:streaming",
                                _("Stream processing this instance."),
                                modelObject = modelDocument)
-            elif mdlObj.getparent() is not None:
-                mdlObj._init() # requires discovery as part of start elements
-                if mdlObj.getparent().tag == "{http://www.xbrl.org/2003/instance}xbrl":
-                    if not foundInstance:
-                        foundInstance = True
-                        pi = precedingProcessingInstruction(mdlObj, "xbrl-facts-check")
-                        if pi is not None:
-                            factsCheckVersion = pi.attrib.get("version", None)
-                elif not foundInstance:       
-                    break
-                ns = mdlObj.qname.namespaceURI
-                ln = mdlObj.qname.localName
-                if beforeInstanceStream:
-                    if ((ns == XbrlConst.link and ln not in ("schemaRef", "linkbaseRef")) or
-                        (ns == XbrlConst.xbrli and ln in ("context", "unit")) or
-                        (ns not in (XbrlConst.link, XbrlConst.xbrli))):
-                        beforeInstanceStream = False
-                        if _streamingExtensionsValidate:
-                            instValidator.validate(modelXbrl, modelXbrl.modelManager.formulaOptions.typedParameters(modelXbrl.prefixedNamespaces))
-                        else: # need default dimensions
-                            ValidateXbrlDimensions.loadDimensionDefaults(modelXbrl)
-                elif not beforeInstanceStream and beforeStartStreamingPlugin:
-                    for pluginMethod in pluginClassMethods("Streaming.Start"):
-                        pluginMethod(modelXbrl)
-                    beforeStartStreamingPlugin = False
-        elif event == "end":
+                pi = precedingProcessingInstruction(mdlObj, "xbrl-facts-check")
+                if pi is not None:
+                    factsCheckVersion = pi.attrib.get("version", None)
+            mdlObj._init() # requires discovery as part of start elements
+            ns = mdlObj.qname.namespaceURI
+            ln = mdlObj.qname.localName
+            if beforeInstanceStream:
+                if ((ns == XbrlConst.link and ln not in ("schemaRef", "linkbaseRef")) or
+                    (ns == XbrlConst.xbrli and ln in ("context", "unit")) or
+                    (ns not in (XbrlConst.link, XbrlConst.xbrli))):
+                    beforeInstanceStream = False
+                    if streamingValidator is not None:
+                        streamingValidator.start()
+                    else: # need default dimensions
+                        ValidateXbrlDimensions.loadDimensionDefaults(modelXbrl)
+            elif not beforeInstanceStream and beforeStartStreamingPlugin:
+                for pluginMethod in pluginClassMethods("Streaming.Start"):
+                    pluginMethod(modelXbrl)
+                beforeStartStreamingPlugin = False
+        elif event == "end" and streaming:
             parentMdlObj = mdlObj.getparent()
             ns = mdlObj.namespaceURI
             ln = mdlObj.localName
@@ -585,7 +552,7 @@ def streamingExtensionsLoader(modelXbrl, mappedUri, filepath, *args, **kwargs):
                         if len(contextBuffer) >= contextBufferLimit:
                             # drop before adding as dropped may have same id as added
                             cntx = contextBuffer.pop(0)
-                            if _streamingFactsPlugin or _streamingValidateFactsPlugin:
+                            if _batchingFacts:
                                 contextsToDrop.append(cntx)
                             else:
                                 dropContext(modelXbrl, cntx)
@@ -595,17 +562,13 @@ def streamingExtensionsLoader(modelXbrl, mappedUri, filepath, *args, **kwargs):
                         modelDocument.contextDiscover(mdlObj)
                         if contextBufferLimit.is_finite():
                             contextBuffer.append(mdlObj)
-                    if _streamingExtensionsValidate:
-                        contextsToCheck = (mdlObj,)
-                        instValidator.checkContexts(contextsToCheck)
-                        if modelXbrl.hasXDT:
-                            instValidator.checkContextsDimensions(contextsToCheck)
-                        del contextsToCheck # dereference
+                    if streamingValidator is not None:
+                        streamingValidator.validateContexts((mdlObj,))
                 elif ln == "unit":
                     if len(unitBuffer) >= unitBufferLimit:
                         # drop before additing as dropped may have same id as added
                         unit = unitBuffer.pop(0)
-                        if _streamingFactsPlugin or _streamingValidateFactsPlugin:
+                        if _batchingFacts:
                             unitsToDrop.append(unit)
                         else:
                             dropUnit(modelXbrl, unit)
@@ -615,39 +578,12 @@ def streamingExtensionsLoader(modelXbrl, mappedUri, filepath, *args, **kwargs):
                     modelDocument.unitDiscover(mdlObj)
                     if unitBufferLimit.is_finite():
                         unitBuffer.append(mdlObj)
-                    if _streamingExtensionsValidate:
-                        instValidator.checkUnits( (mdlObj,) )
+                    if streamingValidator is not None:
+                        streamingValidator.validateUnits((mdlObj,))
                 elif ln == "xbrl": # end of document
-                    # check remaining batched facts if any
-                    if _streamingFactsPlugin or _streamingValidateFactsPlugin:
-                        # plugin attempts to process batch of all root facts not yet processed (not just current one)
-                        # finish any final batch of facts
-                        if len(modelXbrl.facts) > 0:
-                            factsToCheck = modelXbrl.facts.copy()
-                            # can block facts deletion if required data not yet available, such as numeric unit for DpmDB
-                            if _streamingValidateFactsPlugin:
-                                for pluginMethod in pluginClassMethods("Streaming.ValidateFacts"):
-                                    pluginMethod(instValidator, factsToCheck)
-                            if _streamingFactsPlugin:
-                                for pluginMethod in pluginClassMethods("Streaming.Facts"):
-                                    pluginMethod(modelXbrl, factsToCheck)
-                            for fact in factsToCheck:
-                                dropFact(modelXbrl, fact, modelXbrl.facts)
-                                #>>del parentMdlObj[parentMdlObj.index(fact)]
-                            for cntx in contextsToDrop:
-                                dropContext(modelXbrl, cntx)
-                                #>>del parentMdlObj[parentMdlObj.index(cntx)]
-                            for unit in unitsToDrop:
-                                dropUnit(modelXbrl, unit)
-                                #>>del parentMdlObj[parentMdlObj.index(unit)]
-                            for footnoteLink in footnoteLinksToDrop:
-                                dropFootnoteLink(modelXbrl, footnoteLink)
-                                #>>del parentMdlObj[parentMdlObj.index(footnoteLink)]
-                            fact = cntx = unit = footnoteLink = None
-                            del contextsToDrop[:]
-                            del unitsToDrop[:]
-                            del footnoteLinksToDrop[:]
-                            del factsToCheck
+                    # process remaining batch of facts if any
+                    if factsBatch:
+                        processFactsBatch()
                     # check remaining footnote refs
                     for footnoteLink in footnoteBuffer:
                         checkFootnoteHrefs(modelXbrl, footnoteLink)
@@ -672,6 +608,8 @@ def streamingExtensionsLoader(modelXbrl, mappedUri, filepath, *args, **kwargs):
                                         modelXbrl.error("streamingExtensions:xbrlFactsCheckError",
                                                 _("Invalid sum-of-md5s %(sumOfMd5)s"),
                                                 modelObject=modelXbrl, sumOfMd5=_matchGroups[1])
+                    if streamingValidator is not None:
+                        streamingValidator.finish()
                     if _streamingValidateFactsPlugin:
                         for pluginMethod in pluginClassMethods("Streaming.ValidateFinish"):
                             pluginMethod(instValidator)
@@ -689,14 +627,14 @@ def streamingExtensionsLoader(modelXbrl, mappedUri, filepath, *args, **kwargs):
                     modelDocument.linkbaseDiscover(footnoteLinks, inInstance=True)
                     if footnoteBufferLimit.is_finite():
                         footnoteBuffer.append(mdlObj)
-                    if _streamingExtensionsValidate:
-                        instValidator.checkLinks(footnoteLinks)
+                    if streamingValidator is not None:
+                        streamingValidator.validateFootnoteLinks(footnoteLinks)
                         if len(footnoteBuffer) > footnoteBufferLimit:
                             # check that hrefObjects for locators were all satisfied
                                 # drop before addition as dropped may have same id as added
                             footnoteLink = footnoteBuffer.pop(0)
                             checkFootnoteHrefs(modelXbrl, footnoteLink)
-                            if _streamingValidateFactsPlugin:
+                            if _batchingFacts:
                                 footnoteLinksToDrop.append(footnoteLink)
                             else:
                                 dropFootnoteLink(modelXbrl, footnoteLink)
@@ -709,44 +647,12 @@ def streamingExtensionsLoader(modelXbrl, mappedUri, filepath, *args, **kwargs):
                 modelDocument.factDiscover(mdlObj, modelXbrl.facts)
                 if factsCheckVersion:
                     factCheckFact(mdlObj)
-                if _streamingExtensionsValidate or _streamingFactsPlugin or _streamingValidateFactsPlugin:
-                    factsToCheck = (mdlObj,)  # validate current fact by itself
-                    if _streamingExtensionsValidate:
-                        instValidator.checkFacts(factsToCheck)
-                        if modelXbrl.hasXDT:
-                            instValidator.checkFactsDimensions(factsToCheck)
-                    if _streamingFactsPlugin or _streamingValidateFactsPlugin:
-                        # plugin attempts to process batch of all root facts not yet processed (not just current one)
-                        # use batches of 1000 facts
-                        if len(modelXbrl.facts) > 1000:
-                            factsToCheck = modelXbrl.facts.copy()
-                            # can block facts deletion if required data not yet available, such as numeric unit for DpmDB
-                            if _streamingValidateFactsPlugin:
-                                for pluginMethod in pluginClassMethods("Streaming.ValidateFacts"):
-                                    pluginMethod(instValidator, factsToCheck)
-                            if _streamingFactsPlugin:
-                                for pluginMethod in pluginClassMethods("Streaming.Facts"):
-                                    pluginMethod(modelXbrl, factsToCheck)
-                            for fact in factsToCheck:
-                                dropFact(modelXbrl, fact, modelXbrl.facts)
-                                #>>del parentMdlObj[parentMdlObj.index(fact)]
-                            for cntx in contextsToDrop:
-                                dropContext(modelXbrl, cntx)
-                                #>>del parentMdlObj[parentMdlObj.index(cntx)]
-                            for unit in unitsToDrop:
-                                dropUnit(modelXbrl, unit)
-                                #>>del parentMdlObj[parentMdlObj.index(unit)]
-                            for footnoteLink in footnoteLinksToDrop:
-                                dropFootnoteLink(modelXbrl, footnoteLink)
-                                #>>del parentMdlObj[parentMdlObj.index(footnoteLink)]
-                            fact = cntx = unit = footnoteLink = None
-                            del contextsToDrop[:]
-                            del unitsToDrop[:]
-                            del footnoteLinksToDrop[:]
-                            del factsToCheck # dereference fact or batch of facts
-                    else:
-                        dropFact(modelXbrl, mdlObj, modelXbrl.facts) # single fact has been processed
-                        #>>del parentMdlObj[parentMdlObj.index(mdlObj)]
+                if _batchingFacts:
+                    factsBatch.append(mdlObj)
+                    if len(factsBatch) >= FACTS_BATCH_SIZE:
+                        processFactsBatch()
+                elif modelXbrl.factStore is not None:
+                    modelXbrl.factStore.storeFact(mdlObj)
                 if numRootFacts % 1000 == 0:
                     pass
                     #modelXbrl.profileActivity("... streaming fact {0} of {1} {2:.2f}%".format(self.numRootFacts, instInfoNumRootFacts, 
@@ -756,14 +662,32 @@ def streamingExtensionsLoader(modelXbrl, mappedUri, filepath, *args, **kwargs):
                     #sys.stdout.write ("\rAt fact {} of {} mem {}".format(numRootFacts, instInfoNumRootFacts, modelXbrl.modelManager.cntlr.memoryUsed))
     if mdlObj is not None:
         mdlObj.clear()
-    del _parser, _parserLookupName, _parserLookupClass                
-                
-    if _streamingExtensionsValidate and validator is not None:
+    del _parser, _parserLookupName, _parserLookupClass, rootElt, mdlObj
+    if _stream is None:
         _file.close()
+
+    if syntaxErrors:
+        modelXbrl.error("xmlSchema:syntax",
+                _("Unrecoverable error: %(error)s"),
+                error=syntaxErrors[0])
+    elif streaming:
+        logSyntaxErrors(streamingParser, numHeaderSyntaxErrors)
+    del streamingParser
+    if streamingValidator is not None:
         del instValidator
-        validator.close()
+        streamingValidator.close()
         # track that modelXbrl has been validated by this streaming extension
-        modelXbrl._streamingExtensionValidated = True
+        modelXbrl._streamingExtensionValidated = not syntaxErrors
+    if syntaxErrors:
+        return syntaxErrors[0]
+    if not streaming:
+        modelXbrl.isStreamingMode = False
+        if _stream is not None: # not rereadable by the DOM loader
+            modelXbrl.error("streamingExtensions:streamNotStreamable",
+                    _("Instance stream %(file)s is not a streamable instance"),
+                    modelObject=modelXbrl, file=os.path.basename(filepath))
+            return NotInstanceDocumentException()
+        return None # loaded by the DOM loader
         
     modelXbrl.profileStat(_("streaming complete"), time.time() - startedAt)
     return modelXbrl.modelDocument
@@ -838,7 +762,7 @@ __pluginInfo__ = {
     'name': 'Streaming Extensions Loader',
     'version': '0.9',
     'description': "This plug-in loads big XBRL instances without building a DOM in memory.  "
-                    "lxml iterparse parses XBRL directly into an object model without a DOM.  ",
+                    "lxml XMLPullParser parses XBRL directly into an object model without a DOM.  ",
     'license': 'Apache-2',
     'author': 'Mark V Systems Limited',
     'copyright': '(c) Copyright 2014 Mark V Systems Limited, All rights reserved.',
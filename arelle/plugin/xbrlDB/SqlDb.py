@@ -4,7 +4,7 @@ This module provides database interfaces to postgres SQL
 (c) Copyright 2013 Mark V Systems Limited, California US, All rights reserved.  
 Mark V copyright applies to this software, which is licensed according to the terms of Arelle(r).
 '''
-import sys, os, io, glob, time, re, datetime
+import sys, os, io, glob, time, re, datetime, struct
 from math import isnan, isinf
 from decimal import Decimal
 from arelle.ModelValue import dateTime
@@ -15,6 +15,43 @@ TRACESQLFILE = None
 #TRACESQLFILE = r"z:\temp\sqltraceWin.log"  # uncomment to trace SQL on connection (very big file!!!)
 #TRACESQLFILE = "/Users/hermf/temp/sqltraceUnx.log"  # uncomment to trace SQL on connection (very big file!!!)
 
+BULK_INSERT_ROWS = 10000 # rows per COPY or executemany of bulkInsert
+BULK_VALUE_CLASSES = {str, int, type(None)} # bound as is, other values converted by bulkValue
+
+# postgres binary COPY format: header (signature, flags, extension length), per field int32 length (-1 is NULL) and value
+PG_COPY_BINARY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+PG_COPY_BINARY_TRAILER = struct.pack(">h", -1)
+PG_COPY_NULL = struct.pack(">i", -1)
+PG_EPOCH_DATE = datetime.date(2000, 1, 1)
+PG_EPOCH_DATETIME = datetime.datetime(2000, 1, 1)
+
+def pgCopyBinaryText(value):
+    b = str(value).encode("utf-8")
+    return struct.pack(">i", len(b)) + b
+
+def pgCopyBinaryDate(value):
+    return struct.pack(">ii", 4, (datetime.date(value.year, value.month, value.day) - PG_EPOCH_DATE).days)
+
+def pgCopyBinaryTimestamp(value): # microseconds since epoch, value may be a date
+    delta = datetime.datetime(value.year, value.month, value.day, 
+                              getattr(value, "hour", 0), getattr(value, "minute", 0), getattr(value, "second", 0),
+                              getattr(value, "microsecond", 0)) - PG_EPOCH_DATETIME
+    return struct.pack(">iq", 8, (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds)
+
+pgCopyBinaryEncoders = { # postgres data type: binary COPY field of a (non-None) python value
+    "bigint": lambda value: struct.pack(">iq", 8, int(value)),
+    "integer": lambda value: struct.pack(">ii", 4, int(value)),
+    "smallint": lambda value: struct.pack(">ih", 2, int(value)),
+    "boolean": lambda value: struct.pack(">i?", 1, bool(value)),
+    "double precision": lambda value: struct.pack(">id", 8, float(value)),
+    "real": lambda value: struct.pack(">if", 4, float(value)),
+    "text": pgCopyBinaryText,
+    "character varying": pgCopyBinaryText,
+    "character": pgCopyBinaryText,
+    "date": pgCopyBinaryDate,
+    "timestamp without time zone": pgCopyBinaryTimestamp
+    }
+
 def noop(*args, **kwargs): return 
 class NoopException(Exception):
     pass
@@ -186,11 +223,15 @@ class SqlDbConnection():
                 raise XPDBException("xpgDB:MissingSQLiteInterface",
                                     _("SQLite interface is not installed")) 
             self.conn = sqliteConnect(database, (timeout or 60), detect_types=sqliteParseDecltypes)
+            # bulk loading: larger page cache (in KiB when negative), temporary tables and indices in memory
+            self.conn.execute("PRAGMA cache_size = -65536")
+            self.conn.execute("PRAGMA temp_store = MEMORY")
             self.product = product
             self.syncSequences = False # for object_id coordination of autoincrement values
         else:
             self.product = None
         self.tableColTypes = {}
+        self.tableColDataTypes = {}
         self.tableColDeclaration = {}
         self.accessionId = "(None)"
         self.tempInputTableName = "input{}".format(os.getpid())
@@ -305,7 +346,8 @@ class SqlDbConnection():
             result = self.execute('LOCK TABLES {}'
                                   .format(', '.join(['{} WRITE'.format(t) for t in tableNames])),
                                   close=False, commit=False, fetch=False, action="locking table")
-        elif self.product in ("sqlite",) and isSessionTransaction:
+        elif self.product in ("sqlite",) and isSessionTransaction and not self.conn.in_transaction:
+            # a batch ingestion transaction may already be in progress
             result = self.execute('BEGIN TRANSACTION',
                                   close=False, commit=False, fetch=False, action="locking table")
         # note, there is no lock for MS SQL (as far as I could find)
@@ -545,6 +587,8 @@ class SqlDbConnection():
                                               str))
                                              for name, fulltype, colDecl in colTypes
                                              for typename in (fulltype.partition(' ')[0],))
+            self.tableColDataTypes[table] = dict((name, fulltype)
+                                                 for name, fulltype, colDecl in colTypes)
             if self.product in ('mysql', 'mssql', 'orcl', 'sqlite'):
                 self.tableColDeclaration[table] = dict((name, colDecl)
                                                        for name, fulltype, colDecl in colTypes)
@@ -892,7 +936,126 @@ WITH row_values (%(newCols)s) AS (
                            colTypeFunction[i](colValue)  # convert to int, datetime, etc
                            for i, colValue in enumerate(row))
                      for row in tableRows)
-        
+
+    def allocateIds(self, table, idCol, count, sequence="seq_object"):
+        ''' returns count new ids for idCol of table, allocated from sequence (postgres, mssql) or beyond the
+            autoincrement sequences (sqlite), so rows inserted with these ids need not be selected back for them,
+            or None where ids are assigned by insertion triggers (mysql, orcl)
+        '''
+        if count <= 0:
+            return []
+        if self.product == "postgres":
+            return [row[0]
+                    for row in self.execute("SELECT nextval('{}') FROM generate_series(1, {})".format(sequence, count),
+                                            close=False, action="allocating ids")]
+        elif self.product == "mssql":
+            result = self.execute("SET NOCOUNT ON; DECLARE @first sql_variant; "
+                                  "EXEC sys.sp_sequence_get_range @sequence_name = N'{}', @range_size = {}, "
+                                  "@range_first_value = @first OUTPUT; SELECT CAST(@first AS bigint);"
+                                  .format(sequence, count),
+                                  close=False, action="allocating ids")
+            return list(range(result[0][0], result[0][0] + count))
+        elif self.product == "sqlite":
+            # reserve ids beyond the sequences and the table's ids, within the session transaction
+            lastId = max(self.execute("SELECT MAX(seq) FROM sqlite_sequence", close=False)[0][0] or 0,
+                         self.execute("SELECT MAX({0}) FROM {1}".format(idCol, self.dbTableName(table)),
+                                      close=False)[0][0] or 0)
+            self.execute("UPDATE sqlite_sequence SET seq = {}".format(lastId + count),
+                         close=False, fetch=False, action="allocating ids")
+            return list(range(lastId + 1, lastId + count + 1))
+        return None
+
+    def bulkValue(self, value):
+        # non-finite numbers are NULL as in getTable, dates and booleans as the product's interface binds them
+        if isinstance(value, bool):
+            return value if self.product in ("postgres", "mysql") else int(value)
+        elif isinstance(value, float):
+            return value if _ISFINITE(value) else None
+        elif isinstance(value, Decimal):
+            if not value.is_finite():
+                return None
+            return float(value) if self.product == "sqlite" else value
+        elif isinstance(value, datetime.datetime):
+            if self.product == "sqlite":
+                return "{:04}-{:02}-{:02} {:02}:{:02}:{:02}".format(value.year, value.month, value.day, value.hour, value.minute, value.second)
+            return datetime.datetime(value.year, value.month, value.day, value.hour, value.minute, value.second) # not ModelValue.DateTime
+        elif isinstance(value, datetime.date):
+            if self.product == "sqlite":
+                return "{:04}-{:02}-{:02}".format(value.year, value.month, value.day)
+            return datetime.date(value.year, value.month, value.day)
+        return value
+
+    def bulkInsert(self, table, cols, data, commit=False):
+        ''' inserts rows of data (sequences of values of cols) by the product's bulk loading interface, postgres
+            binary COPY FROM STDIN, else executemany (fast_executemany for mssql), BULK_INSERT_ROWS rows at a time.
+            Nothing is matched or selected back, an id column, if any, must be in cols with ids from allocateIds.
+        '''
+        if not data or not cols:
+            return
+        if not isinstance(data, (list, tuple)):
+            data = list(data)
+        cols = [col.lower() for col in cols]
+        self.columnTypeFunctions(table)
+        try:
+            colDataTypes = [self.tableColDataTypes[table][col] for col in cols]
+        except KeyError as err:
+            raise XPDBException("xpgDB:MissingColumnDefinition",
+                                _("Table %(table)s column definition missing: %(missingColumnName)s"),
+                                table=table, missingColumnName=str(err))
+        _table = self.dbTableName(table)
+        if TRACESQLFILE:
+            with io.open(TRACESQLFILE, "a", encoding='utf-8') as fh:
+                fh.write("\n\n>>> accession {0} table {1} bulk insert row count {2}\n"
+                         .format(self.accessionId, table, len(data)))
+        self.lockTables((_table,)) # mysql locks per operation
+        if self.product == "postgres" and all(colDataType in pgCopyBinaryEncoders for colDataType in colDataTypes):
+            sql = "COPY {0} ({1}) FROM STDIN WITH (FORMAT binary)".format(_table, ', '.join(cols))
+            encoders = [pgCopyBinaryEncoders[colDataType] for colDataType in colDataTypes]
+            fieldCount = struct.pack(">h", len(cols))
+            for i in range(0, len(data), BULK_INSERT_ROWS):
+                stream = io.BytesIO()
+                stream.write(PG_COPY_BINARY_HEADER)
+                for row in data[i:i+BULK_INSERT_ROWS]:
+                    stream.write(fieldCount)
+                    for encoder, value in zip(encoders, row):
+                        if value.__class__ not in BULK_VALUE_CLASSES:
+                            value = self.bulkValue(value)
+                        stream.write(PG_COPY_NULL if value is None else encoder(value))
+                stream.write(PG_COPY_BINARY_TRAILER)
+                stream.seek(0)
+                self.execute(sql, close=False, fetch=False, params={"stream": stream}, action="copying rows")
+        else:
+            if self.product == "orcl":
+                values = ', '.join(":{}".format(i+1) for i in range(len(cols)))
+            elif self.product in ("mssql", "sqlite"):
+                values = ', '.join("?" for col in cols)
+            else: # pg8000 (for data types without binary encoders), pymysql
+                values = ', '.join("%s" for col in cols)
+            sql = "INSERT INTO {0} ({1}) VALUES ({2})".format(_table, ', '.join(cols), values)
+            cursor = self.cursor
+            bulkValue = self.bulkValue
+            if self.product == "mssql":
+                cursor.fast_executemany = True # parameter arrays instead of a round trip per row
+            elif self.product == "orcl":
+                colDeclarations = self.tableColDeclaration[table]
+                cursor.setinputsizes(*[oracleNCLOB if colDeclarations.get(col) == "nclob" else None
+                                       for col in cols])
+            try:
+                for i in range(0, len(data), BULK_INSERT_ROWS):
+                    cursor.executemany(sql, [[value if value.__class__ in BULK_VALUE_CLASSES else bulkValue(value)
+                                              for value in row]
+                                             for row in data[i:i+BULK_INSERT_ROWS]])
+            except Exception as ex:
+                if TRACESQLFILE:
+                    with io.open(TRACESQLFILE, "a", encoding='utf-8') as fh:
+                        fh.write("\n\n>>> EXCEPTION bulk insert error {}\n sql {}\n".format(str(ex), sql))
+                raise
+            finally:
+                if self.product == "mssql":
+                    cursor.fast_executemany = False
+        if commit:
+            self.commit()
+
     def updateTable(self, table, cols=None, data=None, commit=False):
         # generate SQL
         # note: comparison by = will never match NULL fields
@@ -34,9 +34,18 @@ windows
    arelleCmdLine --plugin "xbrlDB"
    arelleCmdLine -f http://sec.org/somewhere/some.rss -v --store-to-XBRL-DB "myserver.com,portnumber,pguser,pgpasswd,database,timeoutseconds"
 
+batch ingestion of the filings of an RSS feed:
+   arelleCmdLine -f http://sec.org/somewhere/some.rss -v --store-to-XBRL-DB 'myserver.com,portnumber,pguser,pgpasswd,database,timeoutseconds,pgSemantic,batchFilings=50'
+
+   keeps one connection open for the feed's filings, with a cache of the ids of documents, data types, aspects,
+   role types and arcrole types already stored (such as of a shared us-gaap DTS), so they are not requeried for
+   each filing, and commits every batchFilings filings in one transaction.  A filing which fails is rolled back to
+   its savepoint without the other filings of the transaction (Postgres, SQLite and Oracle); MySQL (whose table
+   locks commit implicitly) and MSSQL, and parallel RSS worker processes, commit each filing.
+
 '''
 
-import os, time, datetime, logging
+import os, time, datetime, logging, multiprocessing
 from arelle.ModelDocument import Type
 from arelle.ModelDtsObject import ModelConcept, ModelType, ModelResource, ModelRelationship
 from arelle.ModelInstanceObject import ModelFact
@@ -56,9 +65,14 @@ from .primaryDocumentFacts import loadPrimaryDocumentFacts
 from collections import defaultdict
 
 
+_batchConnections = {} # batch ingestion connections, key is (process id, host, port, user, database, product)
+
 def insertIntoDB(modelXbrl, 
                  user=None, password=None, host=None, port=None, database=None, timeout=None,
-                 product=None, entrypoint=None, rssItem=None, **kwargs):
+                 product=None, entrypoint=None, rssItem=None, batchFilings=None, **kwargs):
+    if batchFilings and "rssObject" not in kwargs:
+        return insertIntoBatch(modelXbrl, user, password, host, port, database, timeout, product, 
+                               entrypoint, rssItem, batchFilings)
     xbrlDbConn = None
     try:
         xbrlDbConn = XbrlSqlDatabaseConnection(modelXbrl, user, password, host, port, database, timeout, product)
@@ -76,6 +90,59 @@ def insertIntoDB(modelXbrl,
                 pass
         raise # reraise original exception with original traceback    
         
+def insertIntoBatch(modelXbrl, user, password, host, port, database, timeout, product, entrypoint, rssItem, batchFilings):
+    # connection is kept open for the filings of the batch, until closeBatchConnections
+    key = (os.getpid(), host, port, user, database, product) # forked workers don't use the parent's connection
+    xbrlDbConn = _batchConnections.get(key)
+    if xbrlDbConn is None:
+        xbrlDbConn = XbrlSqlDatabaseConnection(modelXbrl, user, password, host, port, database, timeout, product)
+        try:
+            xbrlDbConn.verifyTables()
+        except Exception:
+            xbrlDbConn.close(rollback=True)
+            raise
+        if product in ("mysql", "mssql") or multiprocessing.current_process().name != "MainProcess":
+            batchFilings = 1 # no savepoints, or worker process may end without closing connection
+        xbrlDbConn.openBatch(batchFilings)
+        _batchConnections[key] = xbrlDbConn
+    else:
+        xbrlDbConn.modelXbrl = modelXbrl
+    try:
+        xbrlDbConn.insertXbrl(entrypoint, rssItem)
+    except Exception:
+        try:
+            xbrlDbConn.rollbackBatchFiling()
+        except XPDBException:
+            raise # prior filings of batch were lost
+        except Exception:
+            del _batchConnections[key]
+            try:
+                xbrlDbConn.close(rollback=True)
+            except Exception:
+                pass
+        raise # reraise original exception with original traceback
+    finally:
+        if not xbrlDbConn.isClosed:
+            xbrlDbConn.clearFilingState()
+            
+def closeBatchConnections():
+    # commits the pending filings of this process's batch connections and closes them
+    pid = os.getpid()
+    commitException = None
+    for key in [key for key in _batchConnections if key[0] == pid]:
+        xbrlDbConn = _batchConnections.pop(key)
+        try:
+            xbrlDbConn.commitBatch()
+            xbrlDbConn.close()
+        except Exception as ex:
+            commitException = commitException or ex
+            try:
+                xbrlDbConn.close(rollback=True)
+            except Exception:
+                pass
+    if commitException is not None:
+        raise commitException
+
 def isDBPort(host, port, timeout=10, product="postgres"):
     return isSqlConnection(host, port, timeout)
 
@@ -92,6 +159,92 @@ XBRLDBTABLES = {
 
 
 class XbrlSqlDatabaseConnection(SqlDbConnection):
+    def __init__(self, *args, **kwargs):
+        super(XbrlSqlDatabaseConnection, self).__init__(*args, **kwargs)
+        self.batchFilings = 0 # filings per transaction of batch ingestion, 0 if not batch ingestion
+        self.clearBatchCache()
+        
+    def clearBatchCache(self):
+        # ids of objects stored by prior filings, document by url, others by (document_id, qname or uri)
+        self.batchCache = {"document": {}, "referenced_documents": set(), "data_type": {}, "aspect": {},
+                           "role_type": {}, "arcrole_type": {}}
+        
+    def openBatch(self, batchFilings):
+        self.batchFilings = batchFilings
+        self.batchRssItems = [] # filings of the transaction not yet committed
+        self.batchFilingStarted = False
+        self.batchCacheSnapshot = None # cache at the filing's savepoint
+        self.batchConnectionAttrs = set(self.__dict__) | {"batchConnectionAttrs"}
+        
+    def beginBatchFiling(self):
+        self.batchFilingStarted = True
+        if self.batchFilings > 1: # savepoint to roll back a failing filing without prior filings of transaction
+            if self.product == "sqlite" and not self.conn.in_transaction:
+                self.execute("BEGIN TRANSACTION", close=False, commit=False, fetch=False, action="beginning transaction")
+            self.execute("SAVEPOINT batch_filing", close=False, commit=False, fetch=False, action="setting savepoint")
+        if self.batchFilings:
+            self.batchCacheSnapshot = dict((name, cache.copy()) for name, cache in self.batchCache.items())
+            
+    def commitFiling(self, rssItem):
+        if not self.batchFilings:
+            self.commit()
+            return
+        self.batchRssItems.append(rssItem)
+        if len(self.batchRssItems) >= self.batchFilings:
+            self.commitBatch()
+        elif self.product != "orcl": # oracle has no savepoint release, it is replaced by next filing's savepoint
+            self.execute("RELEASE SAVEPOINT batch_filing", close=False, commit=False, fetch=False, action="releasing savepoint")
+            
+    def commitBatch(self):
+        rssItems = self.batchRssItems
+        self.batchRssItems = []
+        self.batchCacheSnapshot = None
+        if rssItems:
+            try:
+                self.commit()
+            except Exception as ex:
+                self.rollback()
+                self.clearBatchCache() # may have ids of uncommitted objects
+                raise XPDBException("xpgDB:batchNotCommitted",
+                                    _("Batch transaction commit failed, filings not stored: %(accessionNumbers)s, error: %(error)s"),
+                                    accessionNumbers=", ".join(str(rssItem.accessionNumber) for rssItem in rssItems),
+                                    error=str(ex))
+                
+    def rollbackBatchFiling(self):
+        if not self.batchFilingStarted: # failed before storing anything
+            return
+        if self.batchCacheSnapshot is not None and self.batchFilings > 1:
+            try:
+                self.execute("ROLLBACK TO SAVEPOINT batch_filing", close=False, commit=False, fetch=False, action="rolling back to savepoint")
+                if self.product != "orcl":
+                    self.execute("RELEASE SAVEPOINT batch_filing", close=False, commit=False, fetch=False, action="releasing savepoint")
+                self.batchCache = self.batchCacheSnapshot
+                self.batchCacheSnapshot = None
+                return
+            except Exception:
+                pass # transaction has been aborted, roll back entirely
+        rssItems = self.batchRssItems
+        self.batchRssItems = []
+        self.closeCursor()
+        self.rollback()
+        if rssItems or self.batchCacheSnapshot is None:
+            self.clearBatchCache() # may have ids of rolled back objects
+        else: # nothing else was pending, the cache of committed objects is still valid
+            self.batchCache = self.batchCacheSnapshot
+        self.batchCacheSnapshot = None
+        if rssItems:
+            raise XPDBException("xpgDB:batchRolledBack",
+                                _("Batch transaction rolled back, prior filings not stored: %(accessionNumbers)s"),
+                                accessionNumbers=", ".join(str(rssItem.accessionNumber) for rssItem in rssItems))
+        
+    def clearFilingState(self):
+        # dereference prior filing's model objects, keeping connection, batch and table column state
+        for name in set(self.__dict__) - self.batchConnectionAttrs:
+            if name != "_cursor":
+                del self.__dict__[name]
+        self.batchFilingStarted = False
+        self.batchCacheSnapshot = None
+        
     def verifyTables(self):
         missingTables = XBRLDBTABLES - self.tablesInDB()
         # if no tables, initialize database
@@ -134,6 +287,7 @@ class XbrlSqlDatabaseConnection(SqlDbConnection):
                         
             # at this point we determine what's in the database and provide new tables
             # requires locking most of the table structure
+            self.beginBatchFiling()
             self.lockTables(('entity', 'filing', 'report', 'document', 'referenced_documents'),
                             isSessionTransaction=True) # lock for whole transaction
             
@@ -173,7 +327,7 @@ class XbrlSqlDatabaseConnection(SqlDbConnection):
             
             startedAt = time.time()
             self.showStatus("Committing entries")
-            self.commit()
+            self.commitFiling(rssItem)
             self.modelXbrl.profileStat(_("XbrlSqlDB: insertion committed"), time.time() - startedAt)
             self.showStatus("DB insertion completed", clearAfter=5000)
         except Exception as ex:
@@ -361,17 +515,23 @@ class XbrlSqlDatabaseConnection(SqlDbConnection):
         self.existingDocumentIds = {}
         self.urlDocs = {}
         docUris = set()
+        cachedDocumentIds = self.batchCache["document"]
         for modelDocument in self.modelXbrl.urlDocs.values():
             url = ensureUrl(modelDocument.uri)
             self.urlDocs[url] = modelDocument
             if self.isSemanticDocument(modelDocument):
-                docUris.add(self.dbStr(url))
-        if docUris:
-            results = self.execute("SELECT document_id, document_url FROM {} WHERE document_url IN ({})"
-                                   .format(self.dbTableName("document"),
-                                           ', '.join(docUris)))
-            self.existingDocumentIds = dict((self.urlDocs[self.pyStrFromDbStr(docUrl)],docId) 
-                                            for docId, docUrl in results)
+                if url in cachedDocumentIds:
+                    self.existingDocumentIds[modelDocument] = cachedDocumentIds[url]
+                else:
+                    docUris.add(self.dbStr(url))
+        if docUris or self.existingDocumentIds:
+            if docUris:
+                results = self.execute("SELECT document_id, document_url FROM {} WHERE document_url IN ({})"
+                                       .format(self.dbTableName("document"),
+                                               ', '.join(docUris)))
+                for docId, docUrl in results:
+                    url = self.pyStrFromDbStr(docUrl)
+                    self.existingDocumentIds[self.urlDocs[url]] = cachedDocumentIds[url] = docId
             
             # identify whether taxonomyRelsSetsOwner is existing
             self.isExistingTaxonomyRelSetsOwner = (
@@ -466,8 +626,11 @@ class XbrlSqlDatabaseConnection(SqlDbConnection):
                                   if mdlDoc not in self.existingDocumentIds and 
                                      self.isSemanticDocument(mdlDoc)),
                               checkIfExisting=True)
-        self.documentIds = dict((self.urlDocs[self.pyStrFromDbStr(url)], id) 
-                                for id, url in table)
+        self.documentIds = {}
+        cachedDocumentIds = self.batchCache["document"]
+        for id, url in table:
+            url = self.pyStrFromDbStr(url)
+            self.documentIds[self.urlDocs[url]] = cachedDocumentIds[url] = id
         self.documentIds.update(self.existingDocumentIds)
 
         referencedDocuments = set()
@@ -482,12 +645,14 @@ class XbrlSqlDatabaseConnection(SqlDbConnection):
                        and refDoc in self.documentIds:
                         referencedDocuments.add( (self.documentIds[mdlDoc], self.documentIds[refDoc] ))
         
+        cachedReferencedDocuments = self.batchCache["referenced_documents"]
         table = self.getTable('referenced_documents', 
                               None, # no id column in this table 
                               ('object_id','document_id'), 
                               ('object_id','document_id'), 
-                              referencedDocuments,
+                              referencedDocuments - cachedReferencedDocuments,
                               checkIfExisting=True)
+        cachedReferencedDocuments |= referencedDocuments
         
         instDocId = instSchemaDocId = agencySchemaDocId = stdSchemaDocId = None
         mdlDoc = self.modelXbrl.modelDocument
@@ -550,19 +715,24 @@ class XbrlSqlDatabaseConnection(SqlDbConnection):
                 
         # get existing element IDs
         self.typeQnameId = {}
+        cachedTypeIds = self.batchCache["data_type"]
         if existingDocumentUsedTypes:
-            typeQnameIds = []
+            uncachedTypes = []
+            for modelType in existingDocumentUsedTypes:
+                if modelType.modelDocument in self.documentIds:
+                    typeKey = (self.documentIds[modelType.modelDocument], modelType.qname.clarkNotation)
+                    if typeKey in cachedTypeIds:
+                        self.typeQnameId[modelType.qname] = cachedTypeIds[typeKey]
+                    else:
+                        uncachedTypes.append(typeKey)
             table = self.getTable('data_type', 'data_type_id', 
                                   ('document_id', 'qname',), 
                                   ('document_id', 'qname',), 
-                                  tuple((self.documentIds[modelType.modelDocument],
-                                         modelType.qname.clarkNotation)
-                                        for modelType in existingDocumentUsedTypes
-                                        if modelType.modelDocument in self.documentIds),
+                                  uncachedTypes,
                                   checkIfExisting=True,
                                   insertIfNotMatched=False)
             for typeId, docId, qn in table:
-                self.typeQnameId[qname(qn)] = typeId
+                self.typeQnameId[qname(qn)] = cachedTypeIds[(docId, qn)] = typeId
         
         table = self.getTable('data_type', 'data_type_id', 
                               ('document_id', 'xml_id', 'xml_child_seq',
@@ -580,7 +750,7 @@ class XbrlSqlDatabaseConnection(SqlDbConnection):
                                     if modelType.modelDocument in self.documentIds)
                              )
         for typeId, docId, qn in table:
-            self.typeQnameId[qname(qn)] = typeId
+            self.typeQnameId[qname(qn)] = cachedTypeIds[(docId, qn)] = typeId
         
         updatesToDerivedFrom = set()
         for modelType in filingDocumentTypes:
@@ -601,20 +771,26 @@ class XbrlSqlDatabaseConnection(SqlDbConnection):
         filingDocumentTypes.clear() # dereference
                 
         self.aspectQnameId = {}
+        cachedAspectIds = self.batchCache["aspect"]
         
         # get existing element IDs
         if existingDocumentUsedAspects:
+            uncachedAspects = []
+            for concept in existingDocumentUsedAspects:
+                if concept.modelDocument in self.documentIds:
+                    aspectKey = (self.documentIds[concept.modelDocument], concept.qname.clarkNotation)
+                    if aspectKey in cachedAspectIds:
+                        self.aspectQnameId[concept.qname] = cachedAspectIds[aspectKey]
+                    else:
+                        uncachedAspects.append(aspectKey)
             table = self.getTable('aspect', 'aspect_id', 
                                   ('document_id', 'qname',), 
                                   ('document_id', 'qname',), 
-                                  tuple((self.documentIds[concept.modelDocument],
-                                         concept.qname.clarkNotation)
-                                        for concept in existingDocumentUsedAspects
-                                        if concept.modelDocument in self.documentIds),
+                                  uncachedAspects,
                                   checkIfExisting=True,
                                   insertIfNotMatched=False)
             for aspectId, docId, qn in table:
-                self.aspectQnameId[qname(qn)] = aspectId
+                self.aspectQnameId[qname(qn)] = cachedAspectIds[(docId, qn)] = aspectId
                 
         aspects = []
         for concept in filingDocumentAspects:
@@ -646,7 +822,7 @@ class XbrlSqlDatabaseConnection(SqlDbConnection):
                               aspects
                              )
         for aspectId, docId, qn in table:
-            self.aspectQnameId[qname(qn)] = aspectId
+            self.aspectQnameId[qname(qn)] = cachedAspectIds[(docId, qn)] = aspectId
             
         updatesToSubstitutionGroup = set()
         for concept in filingDocumentAspects:
@@ -670,18 +846,22 @@ class XbrlSqlDatabaseConnection(SqlDbConnection):
                                 for arcroleTypes in self.modelXbrl.arcroleTypes.values()
                                 for arcroleType in arcroleTypes
                                 if arcroleType.modelDocument in self.existingDocumentIds)
+        cachedArcroleTypeIds = self.batchCache["arcrole_type"]
+        self.arcroleTypeIds = dict((arcroleTypeIDs, cachedArcroleTypeIds[arcroleTypeIDs])
+                                   for arcroleTypeIDs in arcroleTypesByIds
+                                   if arcroleTypeIDs in cachedArcroleTypeIds)
         table = self.getTable('arcrole_type', 'arcrole_type_id', 
                               ('document_id', 'arcrole_uri'), 
                               ('document_id', 'arcrole_uri'), 
                               tuple((arcroleTypeIDs[0], # doc Id
                                      arcroleTypeIDs[1] # uri Id
                                      ) 
-                                    for arcroleTypeIDs in arcroleTypesByIds),
+                                    for arcroleTypeIDs in arcroleTypesByIds
+                                    if arcroleTypeIDs not in cachedArcroleTypeIds),
                               checkIfExisting=True,
                               insertIfNotMatched=False)
-        self.arcroleTypeIds = {}
         for arcroleId, docId, uri in table:
-            self.arcroleTypeIds[(docId, uri)] = arcroleId
+            self.arcroleTypeIds[(docId, uri)] = cachedArcroleTypeIds[(docId, uri)] = arcroleId
 
         # added document arcrole type        
         arcroleTypesByIds = dict(((self.documentIds[arcroleType.modelDocument],
@@ -702,7 +882,7 @@ class XbrlSqlDatabaseConnection(SqlDbConnection):
                                     for arcroleTypeIDs, arcroleType in arcroleTypesByIds.items()))
         
         for arcroleId, docId, uri in table:
-            self.arcroleTypeIds[(docId, uri)] = arcroleId
+            self.arcroleTypeIds[(docId, uri)] = cachedArcroleTypeIds[(docId, uri)] = arcroleId
             
         table = self.getTable('used_on', 
                               None, # no record id in this table  
@@ -723,18 +903,22 @@ class XbrlSqlDatabaseConnection(SqlDbConnection):
                               for roleTypes in self.modelXbrl.roleTypes.values()
                               for roleType in roleTypes
                               if roleType.modelDocument in self.existingDocumentIds)
+        cachedRoleTypeIds = self.batchCache["role_type"]
+        self.roleTypeIds = dict((roleTypeIDs, cachedRoleTypeIds[roleTypeIDs])
+                                for roleTypeIDs in roleTypesByIds
+                                if roleTypeIDs in cachedRoleTypeIds)
         table = self.getTable('role_type', 'role_type_id', 
                               ('document_id', 'role_uri'), 
                               ('document_id', 'role_uri'), 
                               tuple((roleTypeIDs[0], # doc Id
                                      roleTypeIDs[1] # uri Id
                                      ) 
-                                    for roleTypeIDs in roleTypesByIds),
+                                    for roleTypeIDs in roleTypesByIds
+                                    if roleTypeIDs not in cachedRoleTypeIds),
                               checkIfExisting=True,
                               insertIfNotMatched=False)
-        self.roleTypeIds = {}
         for roleId, docId, uri in table:
-            self.roleTypeIds[(docId, uri)] = roleId
+            self.roleTypeIds[(docId, uri)] = cachedRoleTypeIds[(docId, uri)] = roleId
         
         # new document role types
         roleTypesByIds = dict(((self.documentIds[roleType.modelDocument],
@@ -753,7 +937,7 @@ class XbrlSqlDatabaseConnection(SqlDbConnection):
                                      roleType.definition) 
                                     for roleTypeIDs, roleType in roleTypesByIds.items()))
         for roleId, docId, uri in table:
-            self.roleTypeIds[(docId, uri)] = roleId
+            self.roleTypeIds[(docId, uri)] = cachedRoleTypeIds[(docId, uri)] = roleId
             
             
         table = self.getTable('used_on', 
@@ -1017,14 +1201,12 @@ class XbrlSqlDatabaseConnection(SqlDbConnection):
                                              for cntx, _cntxDimsSet in cntxAspectValueSelectionSet.items()
                                              if _cntxDimsSet)
                                     
-        table = self.getTable('aspect_value_selection', 
-                              None, 
-                              ('aspect_value_selection_id', 'aspect_id', 'aspect_value_id', 'is_typed_value', 'typed_value'), 
-                              ('aspect_value_selection_id', ), 
-                              tuple((aspectValueSetId, dimId, dimMbrId, isTyped, typedValue)
-                                    for aspectValueSelection, aspectValueSetId in aspectValueSelectionSets.items()
-                                    for dimId, dimMbrId, isTyped, typedValue in aspectValueSelection)
-                              )
+        self.bulkInsert('aspect_value_selection', 
+                        ('aspect_value_selection_id', 'aspect_id', 'aspect_value_id', 'is_typed_value', 'typed_value'), 
+                        tuple((aspectValueSetId, dimId, dimMbrId, isTyped, typedValue)
+                              for aspectValueSelection, aspectValueSetId in aspectValueSelectionSets.items()
+                              for dimId, dimMbrId, isTyped, typedValue in aspectValueSelection)
+                        )
 
         # facts
         def insertFactSet(modelFacts, parentDatapointId):
@@ -1056,16 +1238,25 @@ class XbrlSqlDatabaseConnection(SqlDbConnection):
                                   roundValue(fact.value, fact.precision, fact.decimals) if fact.isNumeric and not fact.isNil else None,
                                   fact.value
                                   ))
-            table = self.getTable('data_point', 'datapoint_id', 
-                                  ('report_id', 'document_id', 'xml_id', 'xml_child_seq', 'source_line', 
-                                   'parent_datapoint_id',  # tuple
-                                   'aspect_id',
-                                   'context_xml_id', 'entity_identifier_id', 'period_id', 'aspect_value_selection_id', 'unit_id',
-                                   'is_nil', 'precision_value', 'decimals_value', 'effective_value', 'value'), 
-                                  ('document_id', 'xml_child_seq'), 
-                                  facts)
-            xmlIdDataPointId = dict(((docId, xml_child_seq), datapointId)
-                                    for datapointId, docId, xml_child_seq in table)
+            dataPointCols = ('report_id', 'document_id', 'xml_id', 'xml_child_seq', 'source_line', 
+                             'parent_datapoint_id',  # tuple
+                             'aspect_id',
+                             'context_xml_id', 'entity_identifier_id', 'period_id', 'aspect_value_selection_id', 'unit_id',
+                             'is_nil', 'precision_value', 'decimals_value', 'effective_value', 'value')
+            datapointIds = self.allocateIds('data_point', 'datapoint_id', len(facts))
+            if datapointIds is not None:
+                # ids allocated ahead of bulk insertion, no matching back of inserted rows
+                self.bulkInsert('data_point', ('datapoint_id',) + dataPointCols,
+                                [(datapointId,) + fact for datapointId, fact in zip(datapointIds, facts)])
+                xmlIdDataPointId = dict(((fact[1], fact[3]), datapointId) # (document_id, xml_child_seq)
+                                        for datapointId, fact in zip(datapointIds, facts))
+            else: # ids assigned by insertion trigger
+                table = self.getTable('data_point', 'datapoint_id', 
+                                      dataPointCols, 
+                                      ('document_id', 'xml_child_seq'), 
+                                      facts)
+                xmlIdDataPointId = dict(((docId, xml_child_seq), datapointId)
+                                        for datapointId, docId, xml_child_seq in table)
             self.factDataPointId.update(xmlIdDataPointId)
             for fact in modelFacts:
                 if fact.isTuple:
@@ -1094,10 +1285,9 @@ class XbrlSqlDatabaseConnection(SqlDbConnection):
                 except KeyError:
                     # print ("missing table data points role or data point")
                     pass
-            table = self.getTable('table_data_points', None, 
-                                  ('report_id', 'object_id', 'table_code', 'datapoint_id'), 
-                                  ('report_id', 'object_id', 'datapoint_id'), 
-                                  tableDataPoints)                                         
+            self.bulkInsert('table_data_points', 
+                            ('report_id', 'object_id', 'table_code', 'datapoint_id'), 
+                            tableDataPoints)
 
     def insertValidationResults(self):
         reportId = self.reportId
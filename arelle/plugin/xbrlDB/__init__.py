@@ -16,7 +16,8 @@ and does not apply to the XBRL US Database schema and description.
 import time, os, io, sys, logging
 from arelle.Locale import format_string
 from .XbrlPublicPostgresDB import insertIntoDB as insertIntoPostgresDB, isDBPort as isPostgresPort
-from .XbrlSemanticSqlDB import insertIntoDB as insertIntoSemanticSqlDB, isDBPort as isSemanticSqlPort
+from .XbrlSemanticSqlDB import insertIntoDB as insertIntoSemanticSqlDB, isDBPort as isSemanticSqlPort, \
+    closeBatchConnections as closeSemanticSqlDBBatchConnections
 from .XbrlOpenSqlDB import insertIntoDB as insertIntoOpenSqlDB
 from .XbrlSemanticGraphDB import insertIntoDB as insertIntoRexsterDB, isDBPort as isRexsterPort
 from .XbrlSemanticRdfDB import insertIntoDB as insertIntoRdfDB, isDBPort as isRdfPort
@@ -181,7 +182,9 @@ def xbrlDBcommandLineOptionExtender(parser, *args, **kwargs):
                       dest="storeIntoXbrlDb", 
                       help=_("Store into XBRL DB.  "
                              "Provides connection string: host,port,user,password,database[,timeout[,{postgres|rexster|rdfDB}]]. "
-                             "Autodetects database type unless 7th parameter is provided.  "))
+                             "Autodetects database type unless 7th parameter is provided.  "
+                             "For an RSS feed into a semantic SQL database, further parameters may be skipLoadedFilings "
+                             "and batchFilings=N, to store the filings on one connection, committing every N filings.  "))
     parser.add_option("--load-from-XBRL-DB", 
                       action="store", 
                       dest="loadFromXbrlDb", 
@@ -195,11 +198,16 @@ def xbrlDBCommandLineXbrlLoaded(cntlr, options, modelXbrl, entrypoint, *args, **
     from arelle.ModelDocument import Type
     if modelXbrl.modelDocument.type == Type.RSSFEED and getattr(options, "storeIntoXbrlDb", False):
         modelXbrl.xbrlDBconnection = options.storeIntoXbrlDb.split(",")
+        modelXbrl.xbrlDBbatchFilings = None
+        for extraArg in modelXbrl.xbrlDBconnection[7:]:
+            argName, _sep, argValue = extraArg.partition("=")
+            if argName == "batchFilings" and argValue.isdigit():
+                modelXbrl.xbrlDBbatchFilings = int(argValue)
         # for semantic SQL database check for loaded filings
         if (len(modelXbrl.xbrlDBconnection) > 7 and
             modelXbrl.xbrlDBconnection[6] in ("mssqlSemantic","mysqlSemantic","orclSemantic",
                                               "pgSemantic","sqliteSemantic","pgOpenDB") and
-            modelXbrl.xbrlDBconnection[7] == "skipLoadedFilings"):
+            "skipLoadedFilings" in modelXbrl.xbrlDBconnection[7:]):
             # specify reloading of cached source documents (may have been corrupted originally or refiled)
             modelXbrl.reloadCache = True
             storeIntoDB(modelXbrl.xbrlDBconnection, modelXbrl, entrypoint=entrypoint, rssObject=modelXbrl.modelDocument)
@@ -214,7 +222,20 @@ def xbrlDBCommandLineXbrlRun(cntlr, options, modelXbrl, entrypoint, *args, **kwa
         
 def xbrlDBvalidateRssItem(val, modelXbrl, rssItem, *args, **kwargs):
     if hasattr(val.modelXbrl, 'xbrlDBconnection'):
-        storeIntoDB(val.modelXbrl.xbrlDBconnection, modelXbrl, rssItem)
+        batchFilings = getattr(val.modelXbrl, 'xbrlDBbatchFilings', None)
+        if batchFilings and dbTypes.get(val.modelXbrl.xbrlDBconnection[6]) is insertIntoSemanticSqlDB:
+            storeIntoDB(val.modelXbrl.xbrlDBconnection, modelXbrl, rssItem, batchFilings=batchFilings)
+        else:
+            storeIntoDB(val.modelXbrl.xbrlDBconnection, modelXbrl, rssItem)
+    
+def xbrlDBvalidateRssFeedFinally(val, *args, **kwargs):
+    if getattr(val.modelXbrl, 'xbrlDBbatchFilings', None):
+        try: # commit filings pending in batch transactions and close batch connections
+            closeSemanticSqlDBBatchConnections()
+        except Exception as ex:
+            val.modelXbrl.error("exception:" + type(ex).__name__,
+                _("XBRL DB batch commit exception: %(error)s"),
+                modelXbrl=val.modelXbrl, error=ex)
     
 def xbrlDBtestcaseVariationXbrlLoaded(val, modelXbrl, *args, **kwargs):
     if _storeIntoDBoptions:
@@ -351,6 +372,7 @@ __pluginInfo__ = {
     'Streaming.Facts': xbrlDBstreamingFacts,
     'Streaming.Finish': xbrlDBfinishStreaming,
     'Validate.RssItem': xbrlDBvalidateRssItem,
+    'Validate.RssFeed.Finally': xbrlDBvalidateRssFeedFinally,
     'TestcaseVariation.Xbrl.Loaded': xbrlDBtestcaseVariationXbrlLoaded,
     'ModelDocument.InstanceSchemaRefRewriter': modelDocumentInstanceSchemaRefRewriter
 }
\ No newline at end of file
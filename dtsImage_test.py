@@ -0,0 +1,120 @@
+'''
+Created on Oct 18, 2026
+
+Use this module to test DTS images of taxonomy schema validation results
+
+$ py.test dtsImage_test.py
+
+It checks that closing an instance which loaded without errors saves an image of the taxonomy
+it references outside its directory, keyed by the schemaRef'd entry point (without the filing's
+own documents), that the next instance referencing the taxonomy restores the same schema
+validation results from the image, that a changed taxonomy document is validated again with
+a new image saved, and that an instance which loaded with errors saves no image.
+
+@author: Mark V Systems Limited
+(c) Copyright 2026 Mark V Systems Limited, All rights reserved.
+'''
+import io, os
+import pytest
+from arelle import Cntlr, DtsImage, ModelXbrl
+
+SCHEMA = '''<xsd:schema xmlns:xsd="http://www.w3.org/2001/XMLSchema" xmlns:xbrli="http://www.xbrl.org/2003/instance"
+ xmlns:link="http://www.xbrl.org/2003/linkbase" xmlns:xlink="http://www.w3.org/1999/xlink"
+ targetNamespace="http://t" elementFormDefault="qualified">
+ <xsd:annotation><xsd:appinfo>
+  <link:linkbaseRef xlink:type="simple" xlink:href="t-lab.xml" xlink:arcrole="http://www.w3.org/1999/xlink/properties/linkbase"/>
+ </xsd:appinfo></xsd:annotation>
+ <xsd:import namespace="http://www.xbrl.org/2003/instance" schemaLocation="http://www.xbrl.org/2003/xbrl-instance-2003-12-31.xsd"/>
+ <xsd:element name="A" id="t_A" type="xbrli:stringItemType" substitutionGroup="xbrli:item" xbrli:periodType="instant"/>
+ <xsd:element name="B" id="t_B" type="xbrli:monetaryItemType" substitutionGroup="xbrli:item" xbrli:periodType="instant"/>
+</xsd:schema>{0}
+'''
+
+LABELS = '''<link:linkbase xmlns:link="http://www.xbrl.org/2003/linkbase" xmlns:xlink="http://www.w3.org/1999/xlink">
+ <link:labelLink xlink:type="extended" xlink:role="http://www.xbrl.org/2003/role/link">
+  <link:loc xlink:type="locator" xlink:href="t.xsd#t_A" xlink:label="A"/>
+  <link:label xlink:type="resource" xlink:label="A_lbl" xlink:role="http://www.xbrl.org/2003/role/label" xml:lang="en">A</link:label>
+  <link:labelArc xlink:type="arc" xlink:arcrole="http://www.xbrl.org/2003/arcrole/concept-label" xlink:from="A" xlink:to="A_lbl"/>
+ </link:labelLink>
+</link:linkbase>
+'''
+
+INSTANCE = '''<xbrli:xbrl xmlns:xbrli="http://www.xbrl.org/2003/instance" xmlns:link="http://www.xbrl.org/2003/linkbase"
+ xmlns:xlink="http://www.w3.org/1999/xlink" xmlns:iso4217="http://www.xbrl.org/2003/iso4217" xmlns:t="http://t">
+ <link:schemaRef xlink:type="simple" xlink:href="../tax/t.xsd"/>
+ <xbrli:context id="c"><xbrli:entity><xbrli:identifier scheme="http://e">E</xbrli:identifier></xbrli:entity>
+  <xbrli:period><xbrli:instant>2026-12-31</xbrli:instant></xbrli:period></xbrli:context>
+ <xbrli:unit id="usd"><xbrli:measure>iso4217:USD</xbrli:measure></xbrli:unit>
+ <t:A contextRef="c">filing</t:A>
+ <t:B contextRef="c" unitRef="usd" decimals="0">{0}</t:B>
+</xbrli:xbrl>
+'''
+
+def writeFile(tmpdir, path, text):
+    filename = os.path.join(str(tmpdir), path)
+    if not os.path.exists(os.path.dirname(filename)):
+        os.makedirs(os.path.dirname(filename))
+    with io.open(filename, "wt", encoding="utf-8") as f:
+        f.write(text)
+    return filename
+
+imageFilename = DtsImage.imageFilename
+
+@pytest.fixture
+def cntlr(tmpdir, monkeypatch):
+    # images are saved in the test's directory instead of the web cache directory
+    monkeypatch.setattr(DtsImage, "imageFilename", lambda modelManager, entryUrl: os.path.join(
+        str(tmpdir), "dtsImage", os.path.basename(imageFilename(modelManager, entryUrl))))
+    cntlr = Cntlr.Cntlr(logFileName="logToBuffer")
+    cntlr.webCache.workOffline = True
+    cntlr.modelManager.dtsImages = True
+    writeFile(tmpdir, "tax/t.xsd", SCHEMA.format(""))
+    writeFile(tmpdir, "tax/t-lab.xml", LABELS)
+    return cntlr
+
+def imageSaves(cntlr):
+    return [record.args["entryPoint"] for record in cntlr.logHandler.logRecordBuffer
+            if record.getMessage().startswith("DTS image saved")]
+
+def load(cntlr, instanceFile):
+    ''' returns (urls of documents restored from images, {taxonomy document url: its schema validation records}) '''
+    cntlr.logHandler.clearLogBuffer()
+    modelXbrl = ModelXbrl.load(cntlr.modelManager, instanceFile)
+    try:
+        restoredUrls = sorted(modelXbrl.dtsImageDocs.keys())
+        records = dict((url, DtsImage.documentRecords(modelDocument))
+                       for url, modelDocument in modelXbrl.urlDocs.items()
+                       if os.path.basename(url) in ("t.xsd", "t-lab.xml"))
+    finally:
+        modelXbrl.close()
+    return restoredUrls, records
+
+def test_instanceSavesImage(tmpdir, cntlr):
+    taxonomyUrls = sorted(os.path.join(str(tmpdir), "tax", name) for name in ("t-lab.xml", "t.xsd"))
+    restoredUrls, records = load(cntlr, writeFile(tmpdir, "f1/i.xml", INSTANCE.format(100)))
+    assert restoredUrls == [] and sorted(records) == taxonomyUrls
+    assert imageSaves(cntlr) == [taxonomyUrls[1]] # keyed by the schemaRef'd entry point
+    image = DtsImage.DtsImage(DtsImage.imageFilename(cntlr.modelManager, taxonomyUrls[1]))
+    assert image.open()
+    assert all(not url.startswith(os.path.join(str(tmpdir), "f1")) for url in image.docs) # filing documents not saved
+    assert set(taxonomyUrls) <= set(image.docs)
+    image.close()
+    # another filing of the taxonomy restores its schema validation results, and saves no image
+    restoredRecords = load(cntlr, writeFile(tmpdir, "f2/i.xml", INSTANCE.format(200)))
+    assert set(taxonomyUrls) <= set(restoredRecords[0])
+    assert restoredRecords[1] == records
+    assert imageSaves(cntlr) == []
+
+def test_changedDocumentSavesImage(tmpdir, cntlr):
+    instanceFile = writeFile(tmpdir, "f1/i.xml", INSTANCE.format(100))
+    load(cntlr, instanceFile)
+    writeFile(tmpdir, "tax/t.xsd", SCHEMA.format("\n<!-- changed -->"))
+    restoredUrls, records = load(cntlr, instanceFile)
+    assert restoredUrls == [] # changed taxonomy is validated again
+    assert imageSaves(cntlr) == [os.path.join(str(tmpdir), "tax", "t.xsd")]
+    assert load(cntlr, instanceFile)[0] != []
+
+def test_instanceWithErrorsSavesNoImage(tmpdir, cntlr):
+    load(cntlr, writeFile(tmpdir, "f1/i.xml", INSTANCE.format("not a number")))
+    assert imageSaves(cntlr) == []
+    assert not os.path.exists(DtsImage.imageFilename(cntlr.modelManager, os.path.join(str(tmpdir), "tax", "t.xsd")))
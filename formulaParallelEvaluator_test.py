@@ -0,0 +1,143 @@
+'''
+Created on Oct 18, 2026
+
+Use this module to test the evaluation of independent assertions in forked worker processes
+
+$ py.test formulaParallelEvaluator_test.py
+
+It evaluates the value and existence assertions of a small instance sequentially and in worker
+processes, and checks that the assertion counts and logged messages are the same, and that an
+assertion whose worker process exits is reported with no evaluations counted, without hanging
+the evaluation of the other assertions.
+
+@author: Mark V Systems Limited
+(c) Copyright 2026 Mark V Systems Limited, All rights reserved.
+'''
+import io, multiprocessing, os
+import pytest
+from arelle import Cntlr, ModelXbrl, ValidateFormula, ValidateXbrlDimensions
+from arelle.ModelFormulaObject import FormulaOptions
+
+pytestmark = pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="requires fork")
+
+SCHEMA = '''<xsd:schema xmlns:xsd="http://www.w3.org/2001/XMLSchema" xmlns:xbrli="http://www.xbrl.org/2003/instance"
+ xmlns:t="http://t" targetNamespace="http://t" elementFormDefault="qualified">
+ <xsd:import namespace="http://www.xbrl.org/2003/instance" schemaLocation="http://www.xbrl.org/2003/xbrl-instance-2003-12-31.xsd"/>
+ <xsd:element name="A" id="t_A" type="xbrli:monetaryItemType" substitutionGroup="xbrli:item" xbrli:periodType="instant"/>
+ <xsd:element name="B" id="t_B" type="xbrli:monetaryItemType" substitutionGroup="xbrli:item" xbrli:periodType="instant"/>
+</xsd:schema>
+'''
+
+ARC = ('<variable:variableArc xlink:type="arc" xlink:arcrole="http://xbrl.org/arcrole/2008/variable-set" '
+       'xlink:from="{0}" xlink:to="{1}" name="{2}"/>')
+FILTER_ARC = ('<variable:variableFilterArc xlink:type="arc" xlink:arcrole="http://xbrl.org/arcrole/2008/variable-filter" '
+              'xlink:from="{0}" xlink:to="{1}" complement="false" cover="true"/>')
+
+LINKBASE = '''<link:linkbase xmlns:link="http://www.xbrl.org/2003/linkbase" xmlns:xlink="http://www.w3.org/1999/xlink"
+ xmlns:gen="http://xbrl.org/2008/generic" xmlns:va="http://xbrl.org/2008/assertion/value"
+ xmlns:ea="http://xbrl.org/2008/assertion/existence" xmlns:variable="http://xbrl.org/2008/variable"
+ xmlns:cf="http://xbrl.org/2008/filter/concept" xmlns:t="http://t">
+ <link:roleRef roleURI="http://www.xbrl.org/2008/role/link" xlink:type="simple" xlink:href="http://www.xbrl.org/2008/generic-link.xsd#standard-link-role"/>
+ <gen:link xlink:type="extended" xlink:role="http://www.xbrl.org/2008/role/link">
+  <va:valueAssertion xlink:type="resource" xlink:label="a1" id="a1" aspectModel="dimensional" implicitFiltering="true" test="$a ge $b"/>
+  <va:valueAssertion xlink:type="resource" xlink:label="a2" id="a2" aspectModel="dimensional" implicitFiltering="true" test="$a lt 400"/>
+  <va:valueAssertion xlink:type="resource" xlink:label="a3" id="a3" aspectModel="dimensional" implicitFiltering="true" test="$b eq 250"/>
+  <va:valueAssertion xlink:type="resource" xlink:label="a4" id="a4" aspectModel="dimensional" implicitFiltering="false" test="sum($s) ge 1000"/>
+  <ea:existenceAssertion xlink:type="resource" xlink:label="a5" id="a5" aspectModel="dimensional" implicitFiltering="true"/>
+  {arcs}
+  <variable:factVariable xlink:type="resource" xlink:label="vA" bindAsSequence="false"/>
+  <variable:factVariable xlink:type="resource" xlink:label="vB" bindAsSequence="false"/>
+  <variable:factVariable xlink:type="resource" xlink:label="vS" bindAsSequence="true"/>
+  <cf:conceptName xlink:type="resource" xlink:label="fA"><cf:concept><cf:qname>t:A</cf:qname></cf:concept></cf:conceptName>
+  <cf:conceptName xlink:type="resource" xlink:label="fB"><cf:concept><cf:qname>t:B</cf:qname></cf:concept></cf:conceptName>
+  {filterArcs}
+ </gen:link>
+</link:linkbase>
+'''
+
+INSTANCE = '''<xbrli:xbrl xmlns:xbrli="http://www.xbrl.org/2003/instance" xmlns:link="http://www.xbrl.org/2003/linkbase"
+ xmlns:xlink="http://www.w3.org/1999/xlink" xmlns:iso4217="http://www.xbrl.org/2003/iso4217" xmlns:t="http://t">
+ <link:schemaRef xlink:type="simple" xlink:href="s.xsd"/>
+ <link:linkbaseRef xlink:type="simple" xlink:href="f.xml" xlink:arcrole="http://www.w3.org/1999/xlink/properties/linkbase"/>
+ <xbrli:unit id="usd"><xbrli:measure>iso4217:USD</xbrli:measure></xbrli:unit>
+ {contexts}
+ {facts}
+</xbrli:xbrl>
+'''
+
+UTR = '''<utr:utr xmlns:utr="http://www.xbrl.org/2009/utr"><utr:units/></utr:utr>
+'''
+
+ASSERTIONS = ("a1", "a2", "a3", "a4", "a5")
+LOST_ASSERTION = "a3"
+
+def writeFixture(tmpdir):
+    contexts = []
+    facts = []
+    for i in range(6):
+        contexts.append('<xbrli:context id="c{0}"><xbrli:entity><xbrli:identifier scheme="http://e">E{0}</xbrli:identifier>'
+                        '</xbrli:entity><xbrli:period><xbrli:instant>2026-12-31</xbrli:instant></xbrli:period></xbrli:context>'
+                        .format(i))
+        facts.append('<t:A contextRef="c{0}" unitRef="usd" decimals="0">{1}</t:A>'.format(i, 100 * i))
+        facts.append('<t:B contextRef="c{0}" unitRef="usd" decimals="0">{1}</t:B>'.format(i, 250 if i % 2 else 200))
+    arcs = [ARC.format("a1", "vA", "a"), ARC.format("a1", "vB", "b"), ARC.format("a2", "vA", "a"),
+            ARC.format("a3", "vB", "b"), ARC.format("a4", "vS", "s"), ARC.format("a5", "vB", "b")]
+    filterArcs = [FILTER_ARC.format("vA", "fA"), FILTER_ARC.format("vB", "fB"), FILTER_ARC.format("vS", "fA")]
+    for name, text in (("utr.xml", UTR), ("s.xsd", SCHEMA),
+                       ("f.xml", LINKBASE.format(arcs="\n  ".join(arcs), filterArcs="\n  ".join(filterArcs))),
+                       ("i.xml", INSTANCE.format(contexts="\n ".join(contexts), facts="\n ".join(facts)))):
+        with io.open(os.path.join(str(tmpdir), name), "wt", encoding="utf-8") as f:
+            f.write(text)
+    return os.path.join(str(tmpdir), "i.xml")
+
+def runFormulas(instanceFile, parallelWorkers):
+    ''' returns ({assertion id: (countSatisfied, countNotSatisfied)}, sorted (messageCode, message) of the formula log) '''
+    cntlr = Cntlr.Cntlr(logFileName="logToBuffer")
+    cntlr.webCache.workOffline = True
+    cntlr.modelManager.disclosureSystem.utrUrl = os.path.join(os.path.dirname(instanceFile), "utr.xml") # no units
+    formulaOptions = cntlr.modelManager.formulaOptions = FormulaOptions()
+    formulaOptions.parallelWorkers = parallelWorkers
+    formulaOptions.traceUnsatisfiedAssertions = True
+    modelXbrl = ModelXbrl.load(cntlr.modelManager, instanceFile)
+    try:
+        assert modelXbrl.modelDocument is not None and not modelXbrl.errors
+        cntlr.logHandler.clearLogBuffer()
+        ValidateXbrlDimensions.loadDimensionDefaults(modelXbrl)
+        modelXbrl.parameters = formulaOptions.typedParameters(modelXbrl.prefixedNamespaces)
+        ValidateFormula.validate(modelXbrl)
+        assert any(record.getMessage() == "Evaluating 5 independent assertions in 3 worker processes"
+                   for record in cntlr.logHandler.logRecordBuffer) == (parallelWorkers > 1)
+        return (dict((modelVariableSet.id, (modelVariableSet.countSatisfied, modelVariableSet.countNotSatisfied))
+                     for modelVariableSet in modelXbrl.modelVariableSets),
+                # messages of an assertion's evaluations are not in a reproducible order
+                sorted((record.messageCode, record.getMessage())
+                       for record in cntlr.logHandler.logRecordBuffer
+                       if "worker processes" not in record.getMessage()))
+    finally:
+        modelXbrl.close()
+
+def test_parallelEvaluation(tmpdir):
+    instanceFile = writeFixture(tmpdir)
+    counts, messages = runFormulas(instanceFile, 0)
+    assert sorted(counts) == list(ASSERTIONS)
+    assert counts["a3"] == (3, 3) and counts["a5"] == (1, 0)
+    assert any(messageCode == "formula:assertionUnsatisfied" for messageCode, message in messages)
+    assert runFormulas(instanceFile, 3) == (counts, messages)
+
+evaluateVariableSet = ValidateFormula.evaluateVariableSet
+
+def exitingEvaluateVariableSet(val, xpathContext, modelVariableSet):
+    if modelVariableSet.id == LOST_ASSERTION and multiprocessing.parent_process() is not None:
+        os._exit(9) # worker process exits during evaluation
+    evaluateVariableSet(val, xpathContext, modelVariableSet)
+
+@pytest.mark.skipif(not hasattr(multiprocessing, "parent_process"), reason="requires python 3.8")
+def test_workerExits(tmpdir, monkeypatch):
+    instanceFile = writeFixture(tmpdir)
+    counts, messages = runFormulas(instanceFile, 0)
+    monkeypatch.setattr(ValidateFormula, "evaluateVariableSet", exitingEvaluateVariableSet)
+    lostCounts, lostMessages = runFormulas(instanceFile, 3)
+    assert lostCounts == dict(counts, **{LOST_ASSERTION: (0, 0)})
+    assert [(messageCode, message) for messageCode, message in lostMessages
+            if messageCode == "arelle:workerProcessExited"] == \
+           [("arelle:workerProcessExited", "Assertion evaluation worker process exited, assertion: a3")]
@@ -0,0 +1,83 @@
+'''
+Created on Oct 18, 2026
+
+Use this module to test the parallel tasks of forked worker processes
+
+$ py.test parallelWorkers_test.py
+
+It checks that task results are returned in task order, that a task whose worker process exits
+(before or after recording its pid) is reported as lost without hanging the parent, that the tasks
+after it proceed, and that captured worker log records and counts are merged into the parent.
+
+@author: Mark V Systems Limited
+(c) Copyright 2026 Mark V Systems Limited, All rights reserved.
+'''
+import logging, multiprocessing, os, time
+import pytest
+from arelle import Cntlr, ModelXbrl, ParallelWorkers
+from arelle.ModelDocument import Type
+from arelle.ParallelWorkers import (parallelTasks, closeParallelTasks, captureWorkerLog, workerLogMark, workerLogSince,
+                                    mergeWorkerLog)
+
+pytestmark = pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="requires fork")
+
+LOST_TASK = 3
+
+def runTasks(task, numTasks=8, **kwargs):
+    lostTasks = []
+    startTime = time.time()
+    pool, results = parallelTasks(multiprocessing.get_context("fork"), 3, task, numTasks,
+                                  lostTask=lostTasks.append, **kwargs)
+    try:
+        results = list(results)
+    finally:
+        closeParallelTasks(pool)
+    return results, lostTasks, time.time() - startTime
+
+def test_orderedResults():
+    results, lostTasks, duration = runTasks(lambda i: (i, os.getpid()), maxtasksperchild=2)
+    assert [i for i, pid in results] == list(range(8))
+    assert len(set(pid for i, pid in results)) > 3 # workers replaced after 2 tasks
+    assert lostTasks == []
+
+def exitingTask(i):
+    if i == LOST_TASK:
+        os._exit(9)
+    return i
+
+def test_workerExits():
+    results, lostTasks, duration = runTasks(exitingTask)
+    assert results == [i if i != LOST_TASK else None for i in range(8)]
+    assert lostTasks == [LOST_TASK]
+    assert duration < 30
+
+performTask = ParallelWorkers.performTask
+
+def exitingPerformTask(i):
+    if i == LOST_TASK:
+        os._exit(9) # before performTask records the worker's pid
+    return performTask(i)
+
+def test_workerExitsBeforeRecordingPid(monkeypatch):
+    monkeypatch.setattr(ParallelWorkers, "performTask", exitingPerformTask)
+    results, lostTasks, duration = runTasks(lambda i: i)
+    assert results == [i if i != LOST_TASK else None for i in range(8)]
+    assert lostTasks == [LOST_TASK]
+    assert duration < 30
+
+def test_workerLog(tmpdir):
+    cntlr = Cntlr.Cntlr(logFileName="logToBuffer")
+    modelXbrl = ModelXbrl.create(cntlr.modelManager, Type.INSTANCE, os.path.join(str(tmpdir), "i.xml"))
+    cntlr.logHandler.clearLogBuffer()
+    def loggingTask(i):
+        logMark = workerLogMark(modelXbrl)
+        modelXbrl.error("test:error{0}".format(i), "error %(i)s", modelXbrl=modelXbrl, i=i)
+        return workerLogSince(modelXbrl, logMark)
+    results, lostTasks, duration = runTasks(loggingTask, numTasks=4, initializer=lambda: captureWorkerLog(modelXbrl))
+    assert cntlr.logHandler.logRecordBuffer == [] # captured by workers
+    for workerLog in results:
+        mergeWorkerLog(modelXbrl, workerLog)
+    assert modelXbrl.errors == ["test:error{0}".format(i) for i in range(4)]
+    assert modelXbrl.logCount == {logging.ERROR: 4}
+    assert [record.messageCode for record in cntlr.logHandler.logRecordBuffer] == ["test:error{0}".format(i) for i in range(4)]
+    modelXbrl.close()
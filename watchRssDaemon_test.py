@@ -0,0 +1,130 @@
+'''
+Created on Oct 18, 2026
+
+Use this module to test the RSS watch daemon against local feeds and filings
+
+$ py.test watchRssDaemon_test.py
+
+It checks that filings are recorded in the ledger once, as validated, skipped by plug-in criteria or
+awaiting retry, that an unmodified feed isn't reloaded until a retry is due, that filings which
+can't be loaded are retried until the retry limit, that backfill processes each archived monthly
+feed, and that --rssBackfill requires the ledger of --rssWatch.
+
+@author: Mark V Systems Limited
+(c) Copyright 2026 Mark V Systems Limited, All rights reserved.
+'''
+import io, os, zipfile
+import pytest
+from arelle import Cntlr, CntlrCmdLine, Validate, WatchRssDaemon
+from arelle.ModelFormulaObject import FormulaOptions
+
+SCHEMA = '''<xsd:schema xmlns:xsd="http://www.w3.org/2001/XMLSchema" xmlns:xbrli="http://www.xbrl.org/2003/instance"
+ targetNamespace="http://t" elementFormDefault="qualified">
+ <xsd:import namespace="http://www.xbrl.org/2003/instance" schemaLocation="http://www.xbrl.org/2003/xbrl-instance-2003-12-31.xsd"/>
+ <xsd:element name="A" id="t_A" type="xbrli:stringItemType" substitutionGroup="xbrli:item" xbrli:periodType="instant"/>
+</xsd:schema>
+'''
+
+INSTANCE = '''<xbrli:xbrl xmlns:xbrli="http://www.xbrl.org/2003/instance" xmlns:link="http://www.xbrl.org/2003/linkbase"
+ xmlns:xlink="http://www.w3.org/1999/xlink" xmlns:t="http://t">
+ <link:schemaRef xlink:type="simple" xlink:href="s.xsd"/>
+ <xbrli:context id="c"><xbrli:entity><xbrli:identifier scheme="http://e">E{0}</xbrli:identifier></xbrli:entity>
+  <xbrli:period><xbrli:instant>2026-12-31</xbrli:instant></xbrli:period></xbrli:context>
+ <t:A contextRef="c">filing {0}</t:A>
+</xbrli:xbrl>
+'''
+
+ITEM = '''<item><title>T{0}</title><pubDate>Mon, 05 Oct 2026 10:00:00 EDT</pubDate>
+<enclosure url="{1}" length="1" type="application/zip"/>
+<edgar:xbrlFiling><edgar:companyName>Co {0}</edgar:companyName><edgar:formType>10-K</edgar:formType>
+<edgar:cikNumber>{0}</edgar:cikNumber><edgar:accessionNumber>{2}</edgar:accessionNumber>
+<edgar:acceptanceDatetime>20261005100000</edgar:acceptanceDatetime><edgar:period>20261231</edgar:period>
+<edgar:xbrlFiles><edgar:xbrlFile edgar:sequence="1" edgar:file="i{0}.xml" edgar:type="EX-101.INS" edgar:url="http://x/i{0}.xml"/>
+</edgar:xbrlFiles></edgar:xbrlFiling></item>
+'''
+
+MISSING = 1 # filing whose zip doesn't exist, so it can't be loaded
+SKIPPED = 2 # filing skipped by plug-in processing criteria
+
+def accessionNumber(feedName, i):
+    return "{0}-{1}".format(feedName, i)
+
+def writeFeed(tmpdir, feedName, numItems=3):
+    items = []
+    for i in range(numItems):
+        zipFile = os.path.join(str(tmpdir), "{0}-f{1}.zip".format(feedName, i))
+        if i != MISSING:
+            with zipfile.ZipFile(zipFile, "w") as zf:
+                zf.writestr("s.xsd", SCHEMA)
+                zf.writestr("i{0}.xml".format(i), INSTANCE.format(i))
+        items.append(ITEM.format(i, zipFile, accessionNumber(feedName, i)))
+    feedFile = os.path.join(str(tmpdir), "{0}.xml".format(feedName))
+    with io.open(feedFile, "wt", encoding="utf-8") as f:
+        f.write('<?xml version="1.0"?>\n<rss version="2.0" xmlns:edgar="http://www.sec.gov/Archives/edgar">'
+                '<channel><title>t</title>\n{0}</channel></rss>\n'.format("".join(items)))
+    return feedFile
+
+@pytest.fixture
+def daemon(tmpdir, monkeypatch):
+    validateRssFeed = Validate.Validate.validateRssFeed
+    def skippingValidateRssFeed(val, rssItems=None):
+        for rssItem in rssItems:
+            if rssItem.accessionNumber.endswith("-{0}".format(SKIPPED)):
+                rssItem.skipRssItem = True # as by xbrlDB skipLoadedFilings
+        validateRssFeed(val, rssItems)
+    monkeypatch.setattr(Validate.Validate, "validateRssFeed", skippingValidateRssFeed)
+    cntlr = Cntlr.Cntlr(logFileName="logToBuffer")
+    cntlr.webCache.workOffline = True
+    cntlr.modelManager.formulaOptions = FormulaOptions()
+    daemon = WatchRssDaemon.WatchRssDaemon(cntlr, os.path.join(str(tmpdir), "ledger.sqlite"),
+                                           os.path.join(str(tmpdir), "metrics.json"))
+    yield daemon
+    daemon.close()
+
+def ledger(daemon):
+    return dict((accessionNumber, (status, attempts))
+                for accessionNumber, status, attempts in
+                daemon.ledger.conn.execute("SELECT accession_number, status, attempts FROM rss_item"))
+
+def logCodes(daemon):
+    return [record.messageCode for record in daemon.cntlr.logHandler.logRecordBuffer]
+
+def test_backfillMonths():
+    assert WatchRssDaemon.backfillMonths("2026-03") == [(2026, 3)]
+    assert WatchRssDaemon.backfillMonths("2025-11:2026-02") == [(2025, 11), (2025, 12), (2026, 1), (2026, 2)]
+
+def test_processFeed(tmpdir, daemon):
+    feedFile = writeFeed(tmpdir, "feed")
+    daemon.processFeed(feedFile)
+    assert ledger(daemon) == {"feed-0": ("pass", 1), "feed-1": ("retry", 1), "feed-2": ("skipped", 1)}
+    assert daemon.metrics["itemsProcessed"] == 2 and daemon.metrics["itemsRetried"] == 1
+    # not modified and no retry due: not reloaded
+    daemon.cntlr.logHandler.clearLogBuffer()
+    daemon.processFeed(feedFile)
+    assert "rssWatch:feedNotModified" in logCodes(daemon)
+    assert daemon.metrics["feedsNotModified"] == 1
+    # retry due: only the filing awaiting retry is processed again
+    daemon.ledger.conn.execute("UPDATE rss_item SET next_attempt = 0 WHERE status = 'retry'")
+    daemon.cntlr.logHandler.clearLogBuffer()
+    daemon.processFeed(feedFile)
+    assert "rssWatch:feedNotModified" not in logCodes(daemon)
+    assert ledger(daemon) == {"feed-0": ("pass", 1), "feed-1": ("retry", 2), "feed-2": ("skipped", 1)}
+    assert os.path.exists(daemon.metricsFile)
+
+def test_backfill(tmpdir, daemon, monkeypatch):
+    monkeypatch.setattr(WatchRssDaemon, "EDGAR_MONTHLY_FEED_URL", os.path.join(str(tmpdir), "xbrlrss-{0:04}-{1:02}.xml"))
+    monkeypatch.setattr(WatchRssDaemon, "RETRY_BACKOFF_SECONDS", 0)
+    for month in ("2026-01", "2026-02"):
+        writeFeed(tmpdir, "xbrlrss-" + month)
+    daemon.backfill("2025-12:2026-02")
+    assert "rssWatch:feedNotLoaded" in logCodes(daemon) # 2025-12 isn't archived
+    # filings which can't be loaded are retried until the retry limit
+    assert ledger(daemon) == dict(
+        (accessionNumber("xbrlrss-" + month, i), status)
+        for month in ("2026-01", "2026-02")
+        for i, status in enumerate((("pass", 1), ("failed", WatchRssDaemon.RETRY_LIMIT), ("skipped", 1))))
+
+def test_backfillRequiresLedger(capsys):
+    with pytest.raises(SystemExit):
+        CntlrCmdLine.parseAndRun(["--rssBackfill", "2026-01"])
+    assert "--rssBackfill requires" in capsys.readouterr().err
@@ -0,0 +1,85 @@
+'''
+Created on Oct 18, 2026
+
+Use this module to test warming the web cache for entry points against a local stand-in http server
+
+$ py.test webCacheManifest_test.py
+
+It checks that the DTS closure of an entry point is retrieved once, by the urls the disclosure system
+maps them to (as discovery retrieves them), into the cache manifest, that manifest urls are then
+taken from the cache without retrieval, and that verifyCache removes entries of altered files.
+
+@author: Mark V Systems Limited
+(c) Copyright 2026 Mark V Systems Limited, All rights reserved.
+'''
+import io, os, threading
+import pytest
+from arelle import Cntlr, WebCacheManifest
+from arelle.WebCache import WebCache
+from webCache_test import StandInServer
+
+ENTRY = '''<xsd:schema xmlns:xsd="http://www.w3.org/2001/XMLSchema" targetNamespace="http://e">
+ <xsd:import namespace="http://b" schemaLocation="{0}"/>
+ <xsd:include schemaLocation="e-inc.xsd"/>
+</xsd:schema>
+'''
+
+@pytest.fixture
+def server():
+    server = StandInServer()
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    # documents are only on the mirror, which the disclosure system maps the remote urls to
+    server.documents["/mirror/e.xsd"] = (ENTRY.format(server.url("/remote/b.xsd")).encode("utf-8"), '"e"')
+    server.documents["/mirror/e-inc.xsd"] = (b'<xsd:schema xmlns:xsd="http://www.w3.org/2001/XMLSchema" targetNamespace="http://e"/>', '"i"')
+    server.documents["/mirror/b.xsd"] = (b'<xsd:schema xmlns:xsd="http://www.w3.org/2001/XMLSchema" targetNamespace="http://b"/>', None)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def cntlr(tmpdir, server):
+    cntlr = Cntlr.Cntlr(logFileName="logToBuffer")
+    cntlr.userAppDir = str(tmpdir) # cache and manifest in the test directory
+    cntlr.webCache = WebCache(cntlr, None)
+    cntlr.modelManager.disclosureSystem.mappedPaths = [(server.url("/remote/"), server.url("/mirror/"))]
+    yield cntlr
+    cntlr.webCache.cancelPrefetches()
+    cntlr.webCache.connectionPool.clear()
+
+def logCodes(cntlr):
+    return [record.messageCode for record in cntlr.logHandler.logRecordBuffer]
+
+def test_warmCache(tmpdir, server, cntlr):
+    entrypointsFile = os.path.join(str(tmpdir), "entrypoints.txt")
+    with io.open(entrypointsFile, "wt", encoding="utf-8") as f:
+        f.write("# entry points\n{0}\n".format(server.url("/remote/e.xsd")))
+    assert WebCacheManifest.warmCache(cntlr, entrypointsFile)
+    mirrorPaths = ["/mirror/b.xsd", "/mirror/e-inc.xsd", "/mirror/e.xsd"]
+    # each document is retrieved once, only by its mapped url
+    assert sorted(path for path, connection, headers, status in server.requests) == mirrorPaths
+    webCache = cntlr.webCache
+    assert sorted(webCache.cacheManifest) == [server.url(path) for path in mirrorPaths]
+    # manifest urls are taken from the cache
+    numRequests = len(server.requests)
+    webCache.maxAgeSeconds = 0
+    for url in webCache.cacheManifest:
+        assert os.path.exists(webCache.getfilename(url))
+    assert len(server.requests) == numRequests
+    # the saved manifest is verified, an altered file's entry is removed
+    cntlr.logHandler.clearLogBuffer()
+    assert WebCacheManifest.verifyCache(cntlr)
+    with io.open(webCache.getfilename(server.url("/mirror/b.xsd"), filenameOnly=True), "ab") as f:
+        f.write(b"<!-- altered -->")
+    assert not WebCacheManifest.verifyCache(cntlr)
+    assert "webCache:verifyCacheError" in logCodes(cntlr)
+    assert server.url("/mirror/b.xsd") not in webCache.cacheManifest
+
+def test_warmCacheOffline(tmpdir, cntlr):
+    cntlr.webCache.workOffline = True
+    entrypointsFile = os.path.join(str(tmpdir), "entrypoints.txt")
+    with io.open(entrypointsFile, "wt", encoding="utf-8") as f:
+        f.write("http://example.com/e.xsd\n")
+    assert not WebCacheManifest.warmCache(cntlr, entrypointsFile)
+    assert logCodes(cntlr) == ["webCache:warmCacheOffline"]
@@ -0,0 +1,187 @@
+'''
+Created on Oct 18, 2026
+
+Use this module to test the web cache against a local stand-in http server
+
+$ py.test webCache_test.py
+
+It checks that retrievals reuse kept-alive connections, that cached files due for rechecking are
+conditionally retrieved (If-None-Match or If-Modified-Since), keeping the cached file on a not
+modified (304) response, and that prefetched urls are retrieved once into the cache.
+
+@author: Mark V Systems Limited
+(c) Copyright 2026 Mark V Systems Limited, All rights reserved.
+'''
+import io, json, os, threading, time
+from concurrent.futures import wait as waitForFutures
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+import pytest
+from arelle import Cntlr
+from arelle.WebCache import WebCache
+
+LAST_MODIFIED = formatdate(1700000000, usegmt=True)
+
+class StandInServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        HTTPServer.__init__(self, ("127.0.0.1", 0), StandInRequestHandler)
+        self.documents = {} # path: (content, etag or None)
+        self.requests = [] # (path, connection number, request headers, response status)
+        self.connections = 0
+        self.delay = 0
+        self.lock = threading.Lock()
+
+    def url(self, path):
+        return "http://127.0.0.1:{0}{1}".format(self.server_port, path)
+
+class StandInRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1" # keep-alive
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        with self.server.lock:
+            self.server.connections += 1
+            self.connection_number = self.server.connections
+
+    def do_GET(self):
+        if self.server.delay:
+            time.sleep(self.server.delay)
+        document = self.server.documents.get(self.path)
+        if document is None:
+            status = 404
+        else:
+            content, etag = document
+            if etag and self.headers["If-None-Match"] == etag:
+                status = 304
+            elif not etag and self.headers["If-Modified-Since"] == LAST_MODIFIED:
+                status = 304
+            else:
+                status = 200
+        with self.server.lock:
+            self.server.requests.append((self.path, self.connection_number, dict(self.headers), status))
+        self.send_response(status)
+        if status == 200:
+            if etag:
+                self.send_header("ETag", etag)
+            else:
+                self.send_header("Last-Modified", LAST_MODIFIED)
+            self.send_header("Content-Type", "text/xml")
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+        else:
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def server():
+    server = StandInServer()
+    for i in range(6):
+        server.documents["/doc{0}.xml".format(i)] = ("<doc{0}/>".format(i).encode("utf-8"), '"etag{0}"'.format(i) if i % 2 == 0 else None)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def webCache(tmpdir):
+    cntlr = Cntlr.Cntlr(logFileName="logToBuffer")
+    cntlr.userAppDir = str(tmpdir) # cache and url check times in the test directory
+    webCache = WebCache(cntlr, None)
+    yield webCache
+    webCache.cancelPrefetches()
+    webCache.connectionPool.clear()
+
+def readFile(filepath):
+    with io.open(filepath, "rb") as f:
+        return f.read()
+
+def test_connectionReuse(server, webCache):
+    for i in range(4):
+        filepath = webCache.getfilename(server.url("/doc{0}.xml".format(i)))
+        assert readFile(filepath) == "<doc{0}/>".format(i).encode("utf-8")
+    assert [status for path, connection, headers, status in server.requests] == [200] * 4
+    assert server.connections == 1
+
+def test_notModified(server, webCache):
+    etagUrl, lastModifiedUrl = server.url("/doc0.xml"), server.url("/doc1.xml")
+    etagFilepath = webCache.getfilename(etagUrl)
+    lastModifiedFilepath = webCache.getfilename(lastModifiedUrl)
+    checkTimes = dict(webCache.cachedUrlCheckTimes)
+    time.sleep(1.1) # check times have seconds resolution
+    # rechecked when due, by conditional retrieval
+    webCache.maxAgeSeconds = 0
+    assert webCache.getfilename(etagUrl) == etagFilepath
+    assert webCache.getfilename(lastModifiedUrl) == lastModifiedFilepath
+    (path0, c0, headers0, status0), (path1, c1, headers1, status1) = server.requests[2:]
+    assert headers0["If-None-Match"] == '"etag0"' and status0 == 304
+    assert headers1["If-Modified-Since"] == LAST_MODIFIED and status1 == 304
+    assert readFile(etagFilepath) == b"<doc0/>"
+    assert readFile(lastModifiedFilepath) == b"<doc1/>"
+    assert all(webCache.cachedUrlCheckTimes[url] > checkTimes[url] for url in (etagUrl, lastModifiedUrl))
+    # a changed document is retrieved again
+    server.documents["/doc0.xml"] = (b"<changed/>", '"etag0changed"')
+    assert readFile(webCache.getfilename(etagUrl)) == b"<changed/>"
+    assert server.requests[-1][3] == 200
+    assert webCache.cachedUrlValidators[etagUrl] == {"etag": '"etag0changed"'}
+    # validators and check times are saved
+    webCache.saveUrlCheckTimes()
+    with io.open(webCache.urlValidatorsJsonFile, "rt", encoding="utf-8") as f:
+        assert json.load(f)[lastModifiedUrl] == {"lastModified": LAST_MODIFIED}
+    assert server.connections == 1
+
+def test_prefetch(server, webCache):
+    urls = [server.url("/doc{0}.xml".format(i)) for i in range(6)]
+    webCache.prefetch(urls)
+    for i, url in enumerate(urls):
+        filepath = webCache.getfilename(url) # waits for prefetch
+        assert readFile(filepath) == "<doc{0}/>".format(i).encode("utf-8")
+    assert sorted(path for path, connection, headers, status in server.requests) == ["/doc{0}.xml".format(i) for i in range(6)]
+    assert not webCache.prefetchFutures
+    # cached urls not due for rechecking are not prefetched again
+    webCache.prefetch(urls)
+    assert not webCache.prefetchFutures
+    assert len(server.requests) == 6
+    # due for rechecking, prefetches conditionally retrieve
+    webCache.maxAgeSeconds = 0
+    webCache.prefetch(urls)
+    waitForFutures(list(webCache.prefetchFutures.values()))
+    assert [status for path, connection, headers, status in server.requests[6:]] == [304] * 6
+    assert readFile(webCache.getfilename(urls[0], filenameOnly=True)) == b"<doc0/>"
+
+def test_saveDuringPrefetch(server, webCache):
+    server.delay = 0.2
+    webCache.maxConnections = 2
+    urls = [server.url("/doc{0}.xml".format(i)) for i in range(6)]
+    webCache.prefetch(urls)
+    webCache.saveUrlCheckTimes() # cancels pending prefetches, waits for those in progress
+    assert not webCache.prefetchFutures
+    with io.open(webCache.urlCheckJsonFile, "rt", encoding="utf-8") as f:
+        savedCheckTimes = json.load(f)
+    assert 1 <= len(savedCheckTimes) < 6
+    assert not any(name.endswith(".tmp") for dirpath, dirnames, filenames in os.walk(webCache.cacheDir) for name in filenames)
+    # cancelled prefetches are retrieved on demand
+    for i, url in enumerate(urls):
+        assert readFile(webCache.getfilename(url)) == "<doc{0}/>".format(i).encode("utf-8")
+    assert len(server.requests) == 6
+
+def test_concurrentRetrieval(server, webCache):
+    server.delay = 0.2
+    url = server.url("/doc0.xml")
+    filepaths = []
+    threads = [threading.Thread(target=lambda: filepaths.append(webCache.getfilename(url))) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(set(filepaths)) == 1 and readFile(filepaths[0]) == b"<doc0/>"
+    assert len(server.requests) == 1 # threads retrieving the same url wait for each other
+    assert not webCache.urlLocks
@@ -0,0 +1,152 @@
+'''
+Created on Oct 18, 2026
+
+Use this module to test storing into an SQLite semantic XBRL database
+
+$ py.test xbrlDB_test.py
+
+It stores a small instance, with tuple and dimensional facts and table data points, through the bulk
+insertion of data points (allocateIds and bulkInsert), and through the getTable insertion of data
+points which is used where ids are assigned by insertion triggers, and checks that the stored data
+points, aspect value selections and table data points are the same, and that the sqlite_sequence
+autoincrement sequences are moved past the data point ids allocated by bulk insertion.
+
+@author: Mark V Systems Limited
+(c) Copyright 2026 Mark V Systems Limited, All rights reserved.
+'''
+import io, os, sqlite3
+import pytest
+from arelle import Cntlr, ModelXbrl
+from arelle.plugin.xbrlDB import XbrlSemanticSqlDB
+from arelle.plugin.xbrlDB.SqlDb import SqlDbConnection
+
+SCHEMA = '''<xsd:schema xmlns:xsd="http://www.w3.org/2001/XMLSchema" xmlns:xbrli="http://www.xbrl.org/2003/instance"
+ xmlns:link="http://www.xbrl.org/2003/linkbase" xmlns:xbrldt="http://xbrl.org/2005/xbrldt"
+ xmlns:t="http://t" targetNamespace="http://t" elementFormDefault="qualified">
+ <xsd:annotation><xsd:appinfo>
+  <link:roleType roleURI="http://t/role/table" id="table">
+   <link:definition>0001 - Statement - Table</link:definition>
+   <link:usedOn>link:presentationLink</link:usedOn>
+  </link:roleType>
+ </xsd:appinfo></xsd:annotation>
+ <xsd:import namespace="http://www.xbrl.org/2003/instance" schemaLocation="http://www.xbrl.org/2003/xbrl-instance-2003-12-31.xsd"/>
+ <xsd:import namespace="http://www.xbrl.org/2003/linkbase" schemaLocation="http://www.xbrl.org/2003/xbrl-linkbase-2003-12-31.xsd"/>
+ <xsd:import namespace="http://xbrl.org/2005/xbrldt" schemaLocation="http://www.xbrl.org/2005/xbrldt-2005.xsd"/>
+ <xsd:element name="A" id="t_A" type="xbrli:monetaryItemType" substitutionGroup="xbrli:item" xbrli:periodType="instant" nillable="true"/>
+ <xsd:element name="S" id="t_S" type="xbrli:stringItemType" substitutionGroup="xbrli:item" xbrli:periodType="duration"/>
+ <xsd:element name="D" id="t_D" type="xbrli:stringItemType" substitutionGroup="xbrldt:dimensionItem" xbrli:periodType="duration" abstract="true"/>
+ <xsd:element name="M0" id="t_M0" type="xbrli:stringItemType" substitutionGroup="xbrli:item" xbrli:periodType="duration" abstract="true"/>
+ <xsd:element name="M1" id="t_M1" type="xbrli:stringItemType" substitutionGroup="xbrli:item" xbrli:periodType="duration" abstract="true"/>
+ <xsd:element name="T" id="t_T" substitutionGroup="xbrli:tuple">
+  <xsd:complexType><xsd:sequence>
+   <xsd:element ref="t:A" minOccurs="0"/><xsd:element ref="t:S" minOccurs="0"/>
+  </xsd:sequence></xsd:complexType>
+ </xsd:element>
+</xsd:schema>
+'''
+
+INSTANCE = '''<xbrli:xbrl xmlns:xbrli="http://www.xbrl.org/2003/instance" xmlns:link="http://www.xbrl.org/2003/linkbase"
+ xmlns:xlink="http://www.w3.org/1999/xlink" xmlns:xbrldi="http://xbrl.org/2006/xbrldi" xmlns:iso4217="http://www.xbrl.org/2003/iso4217"
+ xmlns:t="http://t">
+ <link:schemaRef xlink:type="simple" xlink:href="s.xsd"/>
+ {contexts}
+ <xbrli:unit id="usd"><xbrli:measure>iso4217:USD</xbrli:measure></xbrli:unit>
+ {facts}
+ <t:T><t:A contextRef="i0" unitRef="usd" decimals="0">7</t:A><t:S contextRef="d0">in tuple</t:S></t:T>
+ <t:A contextRef="i0" unitRef="usd" xsi:nil="true" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"/>
+</xbrli:xbrl>
+'''
+
+def writeFixture(tmpdir):
+    contexts = []
+    facts = []
+    for i in range(3):
+        segment = ('<xbrli:segment><xbrldi:explicitMember dimension="t:D">t:M{0}</xbrldi:explicitMember></xbrli:segment>'
+                   .format(i - 1) if i else "")
+        contexts.append('<xbrli:context id="i{0}"><xbrli:entity><xbrli:identifier scheme="http://s">e</xbrli:identifier>{1}'
+                        '</xbrli:entity><xbrli:period><xbrli:instant>2026-12-31</xbrli:instant></xbrli:period></xbrli:context>'
+                        .format(i, segment))
+        contexts.append('<xbrli:context id="d{0}"><xbrli:entity><xbrli:identifier scheme="http://s">e</xbrli:identifier>{1}'
+                        '</xbrli:entity><xbrli:period><xbrli:startDate>2026-01-01</xbrli:startDate><xbrli:endDate>2026-12-31'
+                        '</xbrli:endDate></xbrli:period></xbrli:context>'
+                        .format(i, segment))
+        facts.append('<t:A contextRef="i{0}" unitRef="usd" decimals="-3">{1}</t:A>'.format(i, 1000 * (i + 1) + 499))
+        facts.append('<t:S contextRef="d{0}">text {0}</t:S>'.format(i))
+    for name, text in (("s.xsd", SCHEMA),
+                       ("i.xml", INSTANCE.format(contexts="\n ".join(contexts), facts="\n ".join(facts)))):
+        with io.open(os.path.join(str(tmpdir), name), "wt", encoding="utf-8") as f:
+            f.write(text)
+    return os.path.join(str(tmpdir), "i.xml")
+
+@pytest.fixture
+def modelXbrl(tmpdir, monkeypatch):
+    cntlr = Cntlr.Cntlr(logFileName="logToBuffer")
+    modelXbrl = ModelXbrl.load(cntlr.modelManager, writeFixture(tmpdir))
+    assert modelXbrl.modelDocument is not None and len(modelXbrl.facts) == 8
+    # table data points of the non-tuple facts (tableFacts identifies them only for EFM and HMRC)
+    roleType = modelXbrl.roleTypes["http://t/role/table"][0]
+    monkeypatch.setattr(XbrlSemanticSqlDB, "tableFacts",
+                        lambda dts: [(roleType, "T0001", fact) for fact in dts.facts if not fact.isTuple])
+    yield modelXbrl
+    modelXbrl.close()
+
+GETTABLE_MATCH_COLS = {"aspect_value_selection": ("aspect_value_selection_id",),
+                       "table_data_points": ("report_id", "object_id", "datapoint_id")}
+
+def getTableInsert(self, table, cols, data, commit=False):
+    # insertion by getTable, as where data point ids are assigned by insertion triggers
+    self.getTable(table, None, cols, GETTABLE_MATCH_COLS[table], data, commit=commit)
+
+def storeInstance(modelXbrl, database):
+    XbrlSemanticSqlDB.insertIntoDB(modelXbrl, database=database, product="sqlite")
+
+def storedDataPoints(database):
+    ''' returns stored data points, aspect value selections and table data points, with the (database specific)
+        ids of data points and aspect value selection sets replaced by their xml_child_seq and aspect value selections '''
+    conn = sqlite3.connect(database)
+    try:
+        aspectValueSelections = {}
+        for row in conn.execute("SELECT aspect_value_selection_id, aspect_id, aspect_value_id, is_typed_value, typed_value "
+                                "FROM aspect_value_selection"):
+            aspectValueSelections.setdefault(row[0], set()).add(row[1:])
+        dataPoints = conn.execute("SELECT datapoint_id, xml_child_seq, parent_datapoint_id, aspect_value_selection_id, "
+                                  "report_id, document_id, xml_id, source_line, aspect_id, context_xml_id, entity_identifier_id, "
+                                  "period_id, unit_id, is_nil, precision_value, decimals_value, effective_value, value "
+                                  "FROM data_point").fetchall()
+        dataPointSeq = dict((row[0], row[1]) for row in dataPoints)
+        return (set((row[1], dataPointSeq.get(row[2]), frozenset(aspectValueSelections.get(row[3], ()))) + row[4:]
+                    for row in dataPoints),
+                set((reportId, objectId, tableCode, dataPointSeq[datapointId])
+                    for reportId, objectId, tableCode, datapointId in
+                    conn.execute("SELECT report_id, object_id, table_code, datapoint_id FROM table_data_points")),
+                dataPointSeq)
+    finally:
+        conn.close()
+
+def test_bulkInsertDataPoints(tmpdir, monkeypatch, modelXbrl):
+    bulkDatabase = os.path.join(str(tmpdir), "bulk.sqlite")
+    storeInstance(modelXbrl, bulkDatabase)
+    dataPoints, tableDataPoints, dataPointSeq = storedDataPoints(bulkDatabase)
+    assert len(dataPoints) == 10 # including the tuple's data point and its children
+    assert len(tableDataPoints) == 7
+    assert sum(1 for dataPoint in dataPoints if dataPoint[1] is not None) == 2 # tuple children
+    assert sum(1 for dataPoint in dataPoints if dataPoint[2]) == 4 # dimensional
+    # autoincrement sequences are past the allocated data point ids
+    conn = sqlite3.connect(bulkDatabase)
+    try:
+        assert min(seq for name, seq in conn.execute("SELECT name, seq FROM sqlite_sequence")) >= max(dataPointSeq)
+    finally:
+        conn.close()
+    # storing again (sqlite getTable does not report the filing as existing, so its data points are stored
+    # again) allocates ids beyond the prior ones
+    storeInstance(modelXbrl, bulkDatabase)
+    newDataPointIds = set(storedDataPoints(bulkDatabase)[2]) - set(dataPointSeq)
+    assert len(newDataPointIds) == 10 and min(newDataPointIds) > max(dataPointSeq)
+
+    getTableDatabase = os.path.join(str(tmpdir), "getTable.sqlite")
+    monkeypatch.setattr(SqlDbConnection, "allocateIds", lambda self, *args, **kwargs: None)
+    monkeypatch.setattr(SqlDbConnection, "bulkInsert", getTableInsert)
+    storeInstance(modelXbrl, getTableDatabase)
+    getTableDataPoints, getTableTableDataPoints, getTableDataPointSeq = storedDataPoints(getTableDatabase)
+    assert getTableDataPoints == dataPoints
+    assert getTableTableDataPoints == tableDataPoints